@@ -0,0 +1,373 @@
+"""
+End-to-end benchmark of the framework itself, against the local stand-in app.
+
+Measures the framework's own overhead on a reproducible target:
+    - driver startup / quit (chromedriver per browser vs. shared chromedriver)
+    - startup and first navigation with a fresh vs. pre-warmed profile template
+    - login via UI and via saved cookies
+    - wait-helper latency beyond the app's built-in delays
+    - screenshot and screen-recorder overhead
+    - HTML report generation (pytest-html on vs. off for a synthetic suite)
+
+Browser measurements are skipped when Chrome/chromedriver is not available;
+the stand-in app and report measurements always run.
+
+Usage:
+    python -m benchmarks.bench_e2e
+    python -m benchmarks.bench_e2e --repeat 5 --headed
+"""
+import argparse
+import importlib.util
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+from benchmarks.results import RESULTS_DIR, record_results, compare_with_previous, print_results
+from standin_app.server import StandinApp, USERS, SLOW_PAGE_DELAY_MS, DYNAMIC_ITEM_DELAY_MS
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+EMAIL, PASSWORD = next(iter(USERS.items()))
+
+# Synthetic suite for the report benchmark. It runs under a copy of the framework in a
+# temporary directory, so its fake tests never reach the project's duration store,
+# results database or artifact index.
+FRAMEWORK_FILES = ("conftest.py", "config.py", "pytest.ini", "utils", "page_objects")
+REPORT_TESTS = 200
+_REPORT_TEST_SOURCE = '''
+import logging
+import pytest
+
+@pytest.mark.parametrize("n", range({count}))
+def test_synthetic(n):
+    print(f"step {{n}}: " + "x" * 200)
+    logging.getLogger("TestExecution").info("log line %s", n)
+    assert n % 25 != 24
+'''
+
+
+def best_of(func, repeat):
+    """
+    Run a measurement several times.
+
+    Args:
+        func: Callable returning the measured duration in seconds
+        repeat: Number of runs
+
+    Returns:
+        Best (lowest) duration in seconds
+    """
+    return min(func() for _ in range(repeat))
+
+
+def timed(func, *args, **kwargs):
+    """
+    Time a single call.
+
+    Returns:
+        Duration in seconds
+    """
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+# --- Stand-in app ---
+
+def bench_app(app, repeat):
+    """Round trip of a plain page request (baseline for everything else)."""
+    def request():
+        with urllib.request.urlopen(app.url + "/login", timeout=5) as response:
+            response.read()
+    return {"app GET /login": best_of(lambda: timed(request), repeat)}
+
+
+# --- Browser ---
+
+def start_driver(headless=True, arguments=()):
+    """
+    Start Chrome the way conftest's driver fixture does.
+
+    Args:
+        headless: Run without a visible window
+        arguments: Extra Chrome arguments (e.g. --user-data-dir)
+
+    Returns:
+        WebDriver instance
+    """
+    from selenium import webdriver
+    from config import DRIVER_POOL_SIZE, DRIVER_CONNECT_TIMEOUT, DRIVER_READ_TIMEOUT
+    from utils.connection_pool import configure_connection
+
+    options = webdriver.ChromeOptions()
+    options.add_argument("--start-maximized")
+    if headless:
+        options.add_argument("--headless=new")
+    for argument in arguments:
+        options.add_argument(argument)
+    driver = webdriver.Chrome(options=options)
+    configure_connection(driver, DRIVER_POOL_SIZE, DRIVER_CONNECT_TIMEOUT, DRIVER_READ_TIMEOUT)
+    return driver
+
+
+def bench_driver_startup(repeat, headless):
+    """Driver startup and quit, with a chromedriver per browser and on a shared chromedriver."""
+    from selenium import webdriver
+    from utils.driver_service import DriverService
+
+    startups, quits = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        driver = start_driver(headless)
+        startups.append(time.perf_counter() - start)
+        quits.append(timed(driver.quit))
+
+    def options():
+        chrome_options = webdriver.ChromeOptions()
+        chrome_options.add_argument("--start-maximized")
+        if headless:
+            chrome_options.add_argument("--headless=new")
+        return chrome_options
+
+    service = DriverService()
+    shared_startups, shared_quits = [], []
+    try:
+        service.new_driver(options()).quit()  # chromedriver start is paid once per worker
+        for _ in range(repeat):
+            start = time.perf_counter()
+            driver = service.new_driver(options())
+            shared_startups.append(time.perf_counter() - start)
+            shared_quits.append(timed(driver.quit))
+    finally:
+        service.stop()
+    return {"driver startup": min(startups), "driver quit": min(quits),
+            "driver startup (shared service)": min(shared_startups),
+            "driver quit (shared service)": min(shared_quits)}
+
+
+def bench_profile_template(app, repeat, headless):
+    """Startup and first navigation with a fresh profile vs. a clone of a warmed template."""
+    import tempfile
+    from utils.browser_profile import FIRST_RUN_ARGS, ProfileTemplate
+
+    def launch(user_data_dir):
+        return start_driver(headless, (*FIRST_RUN_ARGS, f"--user-data-dir={user_data_dir}"))
+
+    def measure(make_profile):
+        startups, navigations = [], []
+        for _ in range(repeat):
+            start = time.perf_counter()  # clone time counts as startup
+            profile = make_profile()
+            driver = launch(profile)
+            startups.append(time.perf_counter() - start)
+            try:
+                navigations.append(timed(driver.get, app.url + "/login"))
+            finally:
+                driver.quit()
+                shutil.rmtree(profile, ignore_errors=True)
+        return min(startups), min(navigations)
+
+    root = Path(tempfile.mkdtemp(prefix="bench-profiles-"))
+    try:
+        template = ProfileTemplate("bench", app.url, ["/login"], root=root)
+        build = timed(template.build, launch)
+        fresh = measure(lambda: tempfile.mkdtemp(prefix="fresh-", dir=root))
+        cloned = measure(lambda: str(template.clone()))
+        clone = timed(lambda: template.discard(template.clone()))
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    return {
+        "profile template build": build,
+        f"profile clone ({template.clone_method})": clone,
+        "startup (fresh profile)": fresh[0],
+        "first navigation (fresh profile)": fresh[1],
+        "startup (profile template)": cloned[0],
+        "first navigation (profile template)": cloned[1],
+    }
+
+
+def bench_login(driver, app, repeat):
+    """Login via the UI (LoginPage) and via saved cookies (logged_in_driver path)."""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+    from page_objects.login_page import LoginPage
+
+    def ui_login():
+        driver.delete_all_cookies()
+        start = time.perf_counter()
+        LoginPage(driver, app.url).login(EMAIL, PASSWORD)
+        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "sidebar")))
+        return time.perf_counter() - start
+
+    ui = best_of(ui_login, repeat)
+    cookies = driver.get_cookies()
+
+    def cookie_login():
+        driver.delete_all_cookies()
+        start = time.perf_counter()
+        driver.get(app.url)
+        for cookie in cookies:
+            driver.add_cookie(cookie)
+        driver.get(app.url + "/dashboard")
+        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "sidebar")))
+        return time.perf_counter() - start
+
+    return {"login via UI": ui, "login via cookie": best_of(cookie_login, repeat)}
+
+
+def bench_waits(driver, app, repeat):
+    """Wait-helper latency minus the delays built into the stand-in pages."""
+    from selenium.webdriver.common.by import By
+    from utils.wait_helpers import CustomWaitHelpers, wait_for_loading_spinner
+    from utils.wait_helpers import element_attribute, element_count, text_in_element
+
+    waits = CustomWaitHelpers(driver)
+
+    def page_load():
+        driver.get(app.url + "/dashboard")
+        return timed(waits.wait_for_page_load)
+
+    def element_count_overhead():
+        driver.get(app.url + "/dynamic-page")
+        elapsed = timed(waits.wait_for_element_count, (By.CLASS_NAME, "list-item"), 10)
+        return elapsed - 10 * DYNAMIC_ITEM_DELAY_MS / 1000
+
+    def loading_spinner():
+        driver.get(app.url + "/slow-page")
+        elapsed = timed(wait_for_loading_spinner, driver, (By.CLASS_NAME, "loading-spinner"))
+        return elapsed - SLOW_PAGE_DELAY_MS / 1000
+
+    items, success, button = (By.CLASS_NAME, "list-item"), (By.ID, "success-message"), (By.ID, "submit-button")
+
+    def sequential_waits():
+        # test_wait_for_dynamic_content before composite waits: three loops one after another
+        driver.get(app.url + "/dynamic-page")
+        start = time.perf_counter()
+        waits.wait_for_element_count(items, 10)
+        waits.wait_for_text_in_element(success, "Success")
+        waits.wait_for_element_attribute(button, "disabled", None)
+        return time.perf_counter() - start - 10 * DYNAMIC_ITEM_DELAY_MS / 1000
+
+    def composite_wait():
+        driver.get(app.url + "/dynamic-page")
+        elapsed = timed(waits.wait_for_all, {"items": element_count(items, 10),
+                                             "success": text_in_element(success, "Success"),
+                                             "button": element_attribute(button, "disabled", None)})
+        return elapsed - 10 * DYNAMIC_ITEM_DELAY_MS / 1000
+
+    return {
+        "wait_for_page_load": best_of(page_load, repeat),
+        "wait_for_element_count overhead": best_of(element_count_overhead, repeat),
+        "wait_for_loading_spinner overhead": best_of(loading_spinner, repeat),
+        "dynamic content, 3 sequential waits overhead": best_of(sequential_waits, repeat),
+        "dynamic content, composite wait overhead": best_of(composite_wait, repeat),
+    }
+
+
+def bench_screenshots(driver, app, repeat):
+    """Screenshot capture (as done on failure) and screen recorder start/stop."""
+    from utils.recorder import ScreenRecorder
+
+    driver.get(app.url + "/dashboard")
+    results = {"screenshot": best_of(lambda: timed(driver.get_screenshot_as_png), repeat)}
+
+    if not all(importlib.util.find_spec(name) for name in ("cv2", "mss")):
+        print("Recorder benchmark skipped: opencv-python/mss not installed")
+        return results
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    video_path = RESULTS_DIR / "bench_recording.mp4"
+    recorder = ScreenRecorder(str(video_path))
+    try:
+        start = time.perf_counter()
+        recorder.start()
+        results["recorder start"] = time.perf_counter() - start
+        time.sleep(1)
+        results["recorder stop"] = timed(recorder.stop)
+    except Exception as e:
+        # Needs cv2/mss and a display
+        print(f"Recorder benchmark failed: {e}")
+    finally:
+        recorder.stop()
+        video_path.unlink(missing_ok=True)
+    return results
+
+
+# --- Reporting ---
+
+def bench_report(repeat, count=REPORT_TESTS):
+    """pytest run time of a synthetic suite with and without the HTML report."""
+    project = Path(tempfile.mkdtemp(prefix="bench_report_"))
+    for name in FRAMEWORK_FILES:
+        source = PROJECT_ROOT / name
+        if source.is_dir():
+            shutil.copytree(source, project / name, ignore=shutil.ignore_patterns("__pycache__"))
+        else:
+            shutil.copy2(source, project / name)
+    suite_dir = project / "tests"
+    suite_dir.mkdir()
+    (suite_dir / "test_synthetic.py").write_text(_REPORT_TEST_SOURCE.format(count=count), encoding="utf-8")
+    report_path = project / "report.html"
+    base = [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider",
+            "--circuit-breaker", "off", str(suite_dir)]
+
+    def run(extra):
+        start = time.perf_counter()
+        subprocess.run(base + extra, capture_output=True, cwd=project)
+        return time.perf_counter() - start
+
+    try:
+        without_html = best_of(lambda: run(["-p", "no:html"]), repeat)
+        with_html = best_of(lambda: run([f"--html={report_path}", "--self-contained-html"]), repeat)
+    finally:
+        shutil.rmtree(project, ignore_errors=True)
+    return {
+        f"pytest {count} tests (no report)": without_html,
+        f"pytest {count} tests (html report)": with_html,
+        "html report overhead": max(0.0, with_html - without_html),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="End-to-end framework benchmark against the stand-in app")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement")
+    parser.add_argument("--headed", action="store_true", help="Run Chrome with a visible window")
+    parser.add_argument("--skip-browser", action="store_true", help="Only app and report benchmarks")
+    parser.add_argument("--no-save", action="store_true", help="Do not append to history")
+    args = parser.parse_args(argv)
+
+    app = StandinApp().start()
+    results = {}
+    try:
+        results.update(bench_app(app, args.repeat))
+        if not args.skip_browser:
+            try:
+                results.update(bench_driver_startup(args.repeat, not args.headed))
+                results.update(bench_profile_template(app, args.repeat, not args.headed))
+                driver = start_driver(not args.headed)
+            except Exception as e:
+                print(f"Browser benchmarks skipped (Chrome not available): {e}")
+            else:
+                try:
+                    results.update(bench_login(driver, app, args.repeat))
+                    results.update(bench_waits(driver, app, args.repeat))
+                    results.update(bench_screenshots(driver, app, args.repeat))
+                finally:
+                    driver.quit()
+        results.update(bench_report(args.repeat))
+    finally:
+        app.stop()
+
+    regressions = compare_with_previous("e2e", results)
+    print_results("e2e", results, regressions)
+    if not args.no_save:
+        print(f"\nSaved to: {record_results('e2e', results)}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""
+Startup benchmark: import time of the project's modules.
+
+Each module is imported in a fresh interpreter so results are not skewed by
+modules already cached in sys.modules.
+
+Usage:
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --repeat 5
+"""
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+from benchmarks.results import record_results, compare_with_previous, print_results
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# Modules loaded while pytest collects the suite
+MODULES = [
+    "config",
+    "conftest",
+    "utils.logger",
+    "utils.wait_helpers",
+    "utils.recorder",
+    "page_objects.base_page",
+    "page_objects.login_page",
+    "page_objects.dashboard_page",
+    "tests.test_data",
+]
+
+_TIMER = (
+    "import time, importlib; t = time.perf_counter(); "
+    "importlib.import_module({module!r}); print(time.perf_counter() - t)"
+)
+
+
+def time_import(module, repeat=3):
+    """
+    Measure import time of a module in a fresh interpreter.
+
+    Args:
+        module: Dotted module name
+        repeat: Number of runs (best time is kept)
+
+    Returns:
+        Best import time in seconds
+    """
+    timings = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-c", _TIMER.format(module=module)],
+            capture_output=True, text=True, check=True, cwd=PROJECT_ROOT,
+        )
+        timings.append(float(result.stdout.strip().splitlines()[-1]))
+    return min(timings)
+
+
+def time_collection(repeat=3):
+    """
+    Measure wall time of `pytest --collect-only`.
+
+    Args:
+        repeat: Number of runs (best time is kept)
+
+    Returns:
+        Best collection time in seconds
+    """
+    import time
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-m", "pytest", "--collect-only", "-q", "-p", "no:cacheprovider"],
+            capture_output=True, cwd=PROJECT_ROOT,
+        )
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure project import/startup time")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement")
+    parser.add_argument("--no-save", action="store_true", help="Do not append to history")
+    args = parser.parse_args(argv)
+
+    results = {f"import {module}": time_import(module, args.repeat) for module in MODULES}
+    results["pytest --collect-only"] = time_collection(args.repeat)
+
+    regressions = compare_with_previous("startup", results)
+    print_results("startup", results, regressions)
+    if not args.no_save:
+        print(f"\nSaved to: {record_results('startup', results)}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
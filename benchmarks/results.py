@@ -0,0 +1,104 @@
+import json
+import subprocess
+import time
+from pathlib import Path
+
+# Benchmark history is appended here, one JSON line per run
+RESULTS_DIR = Path(__file__).parent.parent / "artifacts" / "benchmarks"
+
+
+def get_commit():
+    """
+    Get short hash of the current git commit.
+
+    Returns:
+        Commit hash string, or "unknown" outside a git checkout
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=Path(__file__).parent.parent,
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def record_results(suite, results):
+    """
+    Append benchmark results to the suite history file.
+
+    Args:
+        suite: Benchmark suite name (e.g. "startup")
+        results: Dict of metric name -> value (seconds)
+
+    Returns:
+        Path to the history file
+    """
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    history_file = RESULTS_DIR / f"{suite}.jsonl"
+    entry = {
+        "timestamp": time.strftime('%Y-%m-%d %H:%M:%S'),
+        "commit": get_commit(),
+        "results": results,
+    }
+    with open(history_file, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry) + "\n")
+    return history_file
+
+
+def load_history(suite):
+    """
+    Load all recorded runs of a benchmark suite.
+
+    Args:
+        suite: Benchmark suite name
+
+    Returns:
+        List of history entries, oldest first
+    """
+    history_file = RESULTS_DIR / f"{suite}.jsonl"
+    if not history_file.exists():
+        return []
+    with open(history_file, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def compare_with_previous(suite, results, threshold=0.2):
+    """
+    Compare results with the previous recorded run.
+
+    Args:
+        suite: Benchmark suite name
+        results: Dict of metric name -> value for the current run
+        threshold: Relative slowdown that counts as a regression (0.2 = 20%)
+
+    Returns:
+        List of (metric, previous, current) tuples that regressed
+    """
+    history = load_history(suite)
+    if not history:
+        return []
+    previous = history[-1]["results"]
+    regressions = []
+    for metric, current in results.items():
+        before = previous.get(metric)
+        if before and current > before * (1 + threshold):
+            regressions.append((metric, before, current))
+    return regressions
+
+
+def print_results(suite, results, regressions=()):
+    """
+    Print benchmark results as a table.
+
+    Args:
+        suite: Benchmark suite name
+        results: Dict of metric name -> value (seconds)
+        regressions: Output of compare_with_previous()
+    """
+    regressed = {metric for metric, _, _ in regressions}
+    print(f"\n=== Benchmark: {suite} ===")
+    for metric, value in results.items():
+        flag = "  <-- REGRESSION" if metric in regressed else ""
+        print(f"  {metric:<45} {value * 1000:>10.1f} ms{flag}")
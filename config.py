@@ -16,6 +16,12 @@ ENVIRONMENTS = {
         "username": "staging-user@example.com",
         "password": "staging-password"
     },
+    "local": {
+        # Stand-in app: python -m standin_app.server --port 8000
+        "url": "http://127.0.0.1:8000",
+        "username": "user@example.com",
+        "password": "password123"
+    },
     "prod": {
         "url": "https://your-app-url.com",
         "username": "prod-user@example.com",
@@ -35,3 +41,66 @@ IMPLICIT_WAIT = 10
 # Screenshot Configuration
 SCREENSHOT_ON_FAILURE = True
 SCREENSHOT_PATH = "artifacts/screenshots"
+
+# Circuit Breaker Configuration
+# Health probe sebelum browser pertama diluncurkan + stop cepat saat environment down
+CIRCUIT_BREAKER_THRESHOLD = 3  # consecutive infrastructure failures
+HEALTH_CHECK_PATHS = ["/"]
+HEALTH_CHECK_TIMEOUT = 5  # seconds per request
+
+# WebDriver Connection Pool (koneksi keep-alive ke chromedriver)
+DRIVER_POOL_SIZE = int(os.getenv('DRIVER_POOL_SIZE', 4))  # connections per chromedriver
+DRIVER_CONNECT_TIMEOUT = 5  # seconds
+DRIVER_READ_TIMEOUT = 120  # seconds
+DRIVER_LATENCY_STATS = True  # p50/p95/p99 per command at session end
+
+# Browser State Snapshots (cookies + storage per environment/user, lihat utils/browser_state.py)
+STATE_SNAPSHOT_TTL = 3600  # seconds
+
+# Parallel Runner Autoscaling (python -m utils.parallel_runner, lihat utils/parallel_runner.py)
+PARALLEL_MAX_WORKERS = int(os.getenv('PARALLEL_MAX_WORKERS', 0))  # 0 = CPU count
+PARALLEL_BROWSER_MEMORY_MB = 500  # memory per worker browser
+PARALLEL_MEMORY_RESERVE_MB = 1024  # always left free
+PARALLEL_HIGH_LOAD = 0.9  # load per CPU; shrink above
+PARALLEL_LOW_LOAD = 0.6  # load per CPU; grow below
+PARALLEL_TIMEOUT_RATE = 0.1  # share of recent tests failing on wait timeouts; shrink above
+PARALLEL_LAUNCH_INTERVAL = 2.0  # seconds between browser launches (doubled per pressure reason)
+PARALLEL_ADJUST_INTERVAL = 5.0  # seconds between worker target changes
+
+# Pre-warmed Chrome Profile Template (pytest --profile-template, lihat utils/browser_profile.py)
+PROFILE_TEMPLATE_MAX_AGE = 24 * 3600  # seconds; rebuilt afterwards (also on Chrome upgrade)
+PROFILE_WARM_PATHS = ["/", "/login"]  # pages whose static assets are cached in the template
+
+# Artifact Store (index + retensi per tipe, lihat utils/artifact_store.py)
+ARTIFACT_RETENTION = {
+    "log": {"max_age_days": 14, "max_size_mb": 200},
+    "screenshot": {"max_age_days": 30, "max_size_mb": 500},
+    "video": {"max_age_days": 7, "max_size_mb": 2000},
+    "report": {"max_age_days": 30, "max_size_mb": 500},
+    "browser_log": {"max_age_days": 30, "max_size_mb": 200},
+    "dom_snapshot": {"max_age_days": 30, "max_size_mb": 500},
+    "soak": {"max_age_days": 90, "max_size_mb": 200},
+    "load_report": {"max_age_days": 90, "max_size_mb": 100},
+    "locator_profile": {"max_age_days": 90, "max_size_mb": 50},
+}
+ARTIFACT_COMPRESS_AFTER = 600  # seconds without writes before a log is gzipped
+
+# Results Database (SQLite, lihat utils/results_db.py)
+RESULTS_DB_ENABLED = True  # stream every run into artifacts/results/results.db
+
+# Browser Console/Network Capture (ring buffer per browser, ditulis hanya untuk test yang gagal)
+BROWSER_LOG_CAPTURE = True
+BROWSER_LOG_CONSOLE_SIZE = 200  # console messages kept per browser
+BROWSER_LOG_NETWORK_SIZE = 200  # request summaries kept per browser
+
+# DOM Snapshot saat Gagal (content-addressed, lihat utils/dom_snapshot.py)
+DOM_SNAPSHOT_ON_FAILURE = True
+DOM_SNAPSHOT_MAX_CHARS = 5_000_000  # serialized DOM kept per snapshot (larger pages are truncated)
+
+# Soak Mode (pytest --soak / python -m utils.soak, lihat utils/soak.py)
+# Relative growth between first and last window medians flagged as a leak
+SOAK_GROWTH_THRESHOLDS = {"js_heap_mb": 0.1, "nodes": 0.1, "listeners": 0.1, "rss_mb": 0.1, "duration": 0.25}
+
+# Locator Profiler (pytest --profile-locators / --strict-locators, lihat utils/locator_profiler.py)
+LOCATOR_BUDGET_MS = 1.0  # mean in-page resolution cost per locator; over it is flagged (--strict-locators fails)
+LOCATOR_PROFILE_REPEATS = 20  # resolutions per locator and page
@@ -2,38 +2,157 @@ import pytest
 from pathlib import Path
 import time
 import os
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 import json
 from config import BASE_URL, USERNAME, PASSWORD, SCREENSHOT_ON_FAILURE, SCREENSHOT_PATH
-from utils.logger import CustomLogger
+from config import CIRCUIT_BREAKER_THRESHOLD, HEALTH_CHECK_PATHS, HEALTH_CHECK_TIMEOUT
+from config import DRIVER_POOL_SIZE, DRIVER_CONNECT_TIMEOUT, DRIVER_READ_TIMEOUT, DRIVER_LATENCY_STATS
+from config import STATE_SNAPSHOT_TTL
+from config import ENVIRONMENT, PROFILE_TEMPLATE_MAX_AGE, PROFILE_WARM_PATHS
+from config import ARTIFACT_COMPRESS_AFTER, RESULTS_DB_ENABLED
+from config import BROWSER_LOG_CAPTURE, BROWSER_LOG_CONSOLE_SIZE, BROWSER_LOG_NETWORK_SIZE
+from config import DOM_SNAPSHOT_ON_FAILURE, DOM_SNAPSHOT_MAX_CHARS
+from config import LOCATOR_BUDGET_MS, LOCATOR_PROFILE_REPEATS
+from utils.browser_state import state_fixture
+from utils.logger import LazyLogger
+
+# Selenium and pytest_html are imported inside the fixtures/hooks that use
+# them, so `pytest --collect-only` and `-k` selection stay fast.
 
 # --- Global Config ---
 VIDEO_PATH = Path(__file__).parent / "artifacts/videos"
 SCREENSHOT_DIR = Path(__file__).parent / SCREENSHOT_PATH
 
 # --- Setup Global Logger ---
-logger = CustomLogger.get_logger("TestExecution")
+# Log file is only created on first use, never during collection
+logger = LazyLogger("TestExecution")
 
 # --- Basic Setup Fixtures ---
 
+def _get_latency_recorder(config):
+    """Session-wide WebDriver command latency recorder (None if disabled)."""
+    if not DRIVER_LATENCY_STATS:
+        return None
+    if not hasattr(config, "_latency_recorder"):
+        from utils.connection_pool import LatencyRecorder
+
+        config._latency_recorder = LatencyRecorder()
+    return config._latency_recorder
+
+def _chrome_options(*arguments):
+    """Chrome options shared by every browser the framework launches."""
+    from selenium import webdriver
+
+    chrome_options = webdriver.ChromeOptions()
+    chrome_options.add_argument("--start-maximized")
+    for argument in arguments:
+        chrome_options.add_argument(argument)
+    return chrome_options
+
+def _launch_chrome(config, chrome_options):
+    """Start a Chrome session on the shared chromedriver, or with its own (--driver-service)."""
+    if config.getoption("driver_service") == "per-session":
+        from selenium import webdriver
+
+        return webdriver.Chrome(options=chrome_options)
+    if not hasattr(config, "_driver_service"):
+        from utils.driver_service import DriverService
+
+        config._driver_service = DriverService()
+    return config._driver_service.new_driver(chrome_options)
+
+def _profile_template(config, rebuild=False):
+    """Session's warmed profile template, built first if missing or stale (--profile-template)."""
+    if rebuild or not hasattr(config, "_profile_template"):
+        from utils.browser_profile import FIRST_RUN_ARGS, ProfileTemplate
+
+        template = ProfileTemplate(ENVIRONMENT, BASE_URL, PROFILE_WARM_PATHS, PROFILE_TEMPLATE_MAX_AGE)
+
+        def launch(user_data_dir):
+            return _launch_chrome(config, _chrome_options(*FIRST_RUN_ARGS, f"--user-data-dir={user_data_dir}"))
+
+        if template.ensure(launch, rebuild=rebuild or config.getoption("rebuild_profile")):
+            logger.info(f"Profile template rebuilt: {template.path}")
+        config._profile_template = template
+    return config._profile_template
+
+def _create_driver(config):
+    """Launch Chrome with the framework's connection pool and instrumentation."""
+    from utils.connection_pool import configure_connection
+
+    clone, arguments = None, ()
+    if config.getoption("profile_template"):
+        from utils.browser_profile import FIRST_RUN_ARGS
+
+        clone = _profile_template(config).clone()
+        arguments = (*FIRST_RUN_ARGS, f"--user-data-dir={clone}")
+    chrome_options = _chrome_options(*arguments)
+    if BROWSER_LOG_CAPTURE:
+        from utils.browser_logs import enable_log_capture
+
+        enable_log_capture(chrome_options)
+    try:
+        driver = _launch_chrome(config, chrome_options)
+    except Exception:
+        if clone is not None:
+            _profile_template(config).discard(clone)
+        raise
+    driver.profile_clone = clone
+    if clone is not None and _profile_template(config).is_stale(driver.capabilities.get("browserVersion")):
+        # Chrome was upgraded since the template was built: rebuild it for the next browsers
+        _profile_template(config, rebuild=True)
+    configure_connection(driver, DRIVER_POOL_SIZE, DRIVER_CONNECT_TIMEOUT, DRIVER_READ_TIMEOUT,
+                         recorder=_get_latency_recorder(config))
+    profiler = getattr(config, "_profiler", None)
+    if profiler is not None:
+        profiler.instrument(driver.command_executor)
+    _enable_virtual_time(config, driver)
+    locator_profiler = getattr(config, "_locator_profiler", None)
+    if locator_profiler is not None:
+        # Page objects report their first use on a live page (page_objects/elements.py)
+        driver.locator_profiler = locator_profiler
+    if BROWSER_LOG_CAPTURE:
+        from utils.browser_logs import BrowserLogBuffer
+
+        # Rolling console/network buffers, only written out when a test fails
+        driver.log_buffer = BrowserLogBuffer(driver, BROWSER_LOG_CONSOLE_SIZE, BROWSER_LOG_NETWORK_SIZE).start()
+    return driver
+
+def _quit_driver(driver):
+    """Quit a browser from _create_driver and delete its profile clone."""
+    if getattr(driver, "log_buffer", None) is not None:
+        driver.log_buffer.stop()
+    try:
+        driver.quit()
+    finally:
+        if getattr(driver, "profile_clone", None) is not None:
+            from utils.browser_profile import ProfileTemplate
+
+            ProfileTemplate.discard(driver.profile_clone)
+
+def _enable_virtual_time(config, driver):
+    """Switch the current tab to virtual time (--virtual-time)."""
+    if config.getoption("virtual_time"):
+        from utils.virtual_time import enable_virtual_time
+
+        if not enable_virtual_time(driver, animations=config.getoption("keep_animations")):
+            logger.warning("Virtual time not supported by this browser, using real time")
+
 @pytest.fixture(scope="function")
 def driver(request):
     """Fixture to set up and tear down WebDriver."""
-    chrome_options = webdriver.ChromeOptions()
-    chrome_options.add_argument("--start-maximized")
-    driver = webdriver.Chrome(options=chrome_options)
+    driver = _create_driver(request.config)
     
     yield driver
     
     # Teardown
-    driver.quit()
+    _quit_driver(driver)
+
+def _login(driver):
+    """Log in via saved cookies, falling back to the login UI."""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
 
-@pytest.fixture(scope="function")
-def logged_in_driver(driver):
-    """Handles the login process, provides logged-in driver."""
     session_file_path = Path(__file__).parent / "session.json"
     
     try:
@@ -85,14 +204,575 @@ def logged_in_driver(driver):
         with open(session_file_path, "w") as f:
             json.dump(driver.get_cookies(), f)
         logger.info("Cookie baru telah disimpan.")
+
+@state_fixture("dashboard", ttl=STATE_SNAPSHOT_TTL,
+               verify=lambda driver: bool(driver.find_elements("id", "sidebar")))
+def dashboard_state(driver):
+    """Logged-in driver on the dashboard, restored from a snapshot instead of logging in."""
+    _login(driver)
+
+@pytest.fixture(scope="session")
+def _tab_pool(request):
+    """Shared logged-in browser whose tabs serve @pytest.mark.tab_pool tests."""
+    from utils.tab_pool import TabPool
+
+    driver = _create_driver(request.config)
+    try:
+        _login(driver)
+        pool = TabPool(driver, request.config.getoption("tab_pool"), BASE_URL, driver.get_cookies())
+        driver.get("about:blank")
+        request.config._tab_pool = pool
+        yield pool
+    finally:
+        _quit_driver(driver)
+
+@pytest.fixture(scope="function")
+def logged_in_driver(request):
+    """Handles the login process, provides logged-in driver."""
+    if request.config.getoption("tab_pool") != "off" and request.node.get_closest_marker("tab_pool"):
+        # Fresh tab of the shared, already logged-in browser
+        pool = request.getfixturevalue("_tab_pool")
+        lease = pool.acquire(request.node.nodeid)
+        request.node._tab_lease = lease
+        if getattr(pool.driver, "log_buffer", None) is not None:
+            pool.driver.log_buffer.clear()  # previous tests' console/network entries
+        pool.driver.failed_locator = None
+        _enable_virtual_time(request.config, pool.driver)
+        pool.driver.get(BASE_URL + "/dashboard")
+        yield pool.driver
+        pool.release(lease)
+        return
     
+    driver = request.getfixturevalue("driver")
+    _login(driver)
     yield driver
 
+# --- Command Line Options ---
+
+def pytest_addoption(parser):
+    """Register framework command line options."""
+    group = parser.getgroup("impact", "test impact analysis")
+    group.addoption("--impact-base", action="store", default=None, metavar="REF",
+                    help="Run only tests affected by changes since git REF")
+    group.addoption("--impact-record", action="store_true", default=False,
+                    help="Record page_objects coverage per test into the impact index")
+
+    group = parser.getgroup("scheduling", "duration-aware scheduling and sharding")
+    group.addoption("--shard-count", action="store", type=int, default=None, metavar="N",
+                    help="Split the suite into N duration-balanced shards")
+    group.addoption("--shard-index", action="store", type=int, default=None, metavar="I",
+                    help="Run shard I (0-based) of --shard-count (default 0)")
+    group.addoption("--durations-file", action="store", default=os.getenv("SHARD_DURATIONS_FILE"), metavar="PATH",
+                    help="Shared duration store all shards read (default $SHARD_DURATIONS_FILE); without it "
+                         "shards are split from fixture-group defaults")
+    group.addoption("--group-fixtures", action="store_true", default=False,
+                    help="Run tests sharing a browser fixture together")
+
+    group = parser.getgroup("flaky", "flaky test retry and quarantine")
+    group.addoption("--flaky-retries", action="store", type=int, default=0, metavar="N",
+                    help="Rerun timing-related failures up to N times with the same browser")
+    group.addoption("--quarantine", action="store", default="run",
+                    choices=["run", "last", "skip", "only"],
+                    help="Handling of known-flaky tests: run normally, run last, skip, or run only them")
+
+    group = parser.getgroup("profile", "webdriver command profiler")
+    group.addoption("--profile", action="store_true", default=False,
+                    help="Profile WebDriver commands, waits and sleeps per test and page-object method")
+    group.addoption("--profile-top", action="store", type=int, default=15, metavar="N",
+                    help="Number of hot spots in the profile summary")
+
+    group = parser.getgroup("browser_state", "browser-state snapshots")
+    group.addoption("--refresh-states", action="store_true", default=False,
+                    help="Ignore cached browser-state snapshots and rebuild them through the UI")
+
+    group = parser.getgroup("tab_pool", "shared-browser tab pool")
+    group.addoption("--tab-pool", action="store", default="off", choices=["off", "tab", "context"],
+                    help="Run @pytest.mark.tab_pool tests in tabs of one shared logged-in browser "
+                         "(context: each tab in an isolated browser context)")
+
+    group = parser.getgroup("driver_service", "chromedriver service")
+    group.addoption("--driver-service", action="store", default="shared", choices=["shared", "per-session"],
+                    help="Create every browser session on one long-lived chromedriver per worker (shared), "
+                         "or spawn a chromedriver per browser (per-session)")
+
+    group = parser.getgroup("profile_template", "pre-warmed browser profile")
+    group.addoption("--profile-template", action="store_true", default=False,
+                    help="Launch every browser from a clone of a warmed per-environment Chrome profile")
+    group.addoption("--rebuild-profile", action="store_true", default=False,
+                    help="With --profile-template, rebuild the template even if it is fresh")
+
+    group = parser.getgroup("virtual_time", "deterministic virtual time")
+    group.addoption("--virtual-time", action="store_true", default=False,
+                    help="Fast-forward page timers and disable CSS animations (Chrome)")
+    group.addoption("--keep-animations", action="store_true", default=False,
+                    help="With --virtual-time, keep CSS transitions/animations enabled")
+
+    group = parser.getgroup("soak", "soak mode (resource growth over many iterations)")
+    group.addoption("--soak", action="store", default=None, metavar="DURATION",
+                    help="Repeat each selected test on its browser for DURATION (e.g. 30m, 2h), sampling JS heap, "
+                         "DOM nodes, listeners and browser RSS; fail on sustained growth")
+    group.addoption("--soak-iterations", action="store", type=int, default=None, metavar="N",
+                    help="Stop soaking a test after N iterations")
+
+    group = parser.getgroup("locators", "locator performance analyzer")
+    group.addoption("--profile-locators", action="store_true", default=False,
+                    help="Time every locator declared on the page objects on the live pages they are used on; "
+                         "rank them and suggest faster equivalents")
+    group.addoption("--strict-locators", action="store_true", default=False,
+                    help="Like --profile-locators, and fail tests reaching a page whose locators exceed the budget")
+    group.addoption("--locator-budget", action="store", type=float, default=LOCATOR_BUDGET_MS, metavar="MS",
+                    help=f"Resolution budget per locator in ms (default {LOCATOR_BUDGET_MS})")
+
+    group = parser.getgroup("circuit_breaker", "environment health circuit breaker")
+    group.addoption("--circuit-breaker", action="store", default="skip",
+                    choices=["skip", "abort", "off"],
+                    help="When the environment is down: skip remaining browser tests, abort the run, or keep going")
+
+# --- Test Impact Analysis ---
+
+def pytest_collection_modifyitems(config, items):
+    """Select (impact analysis), shard and order the collected tests."""
+    _select_affected_tests(config, items)
+    # Shard before quarantine: quarantine.json is per machine, the shard split must not be
+    _schedule_tests(config, items)
+    _apply_quarantine(config, items)
+
+def _select_affected_tests(config, items):
+    """Deselect tests not affected by changes since --impact-base."""
+    base = config.getoption("impact_base")
+    if not base:
+        return
+    from utils import impact_analysis
+
+    index = impact_analysis.build_index()
+    selected, _ = impact_analysis.select_tests(index, impact_analysis.git_diff(base))
+    keep, drop = impact_analysis.affected_items(items, index, selected)
+    if drop:
+        config.hook.pytest_deselected(items=drop)
+        items[:] = keep
+    logger.info(f"Impact analysis vs {base}: {len(keep)} selected, {len(drop)} deselected")
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    """Record which page-object methods a test calls (--impact-record)."""
+    _profile_phase(item, "call")
+    if not item.config.getoption("impact_record"):
+        yield
+        return
+    from utils.impact_analysis import CoverageRecorder
+
+    recorder = CoverageRecorder()
+    recorder.start()
+    try:
+        yield
+    finally:
+        # Parametrized variants share one entry: union of what they call
+        coverage = item.config.__dict__.setdefault("_impact_coverage", {})
+        coverage.setdefault(item.nodeid.split("[", 1)[0], set()).update(recorder.stop())
+
+# --- Duration-aware Scheduling ---
+
+# Total duration (setup + call + teardown) per test node id in this run
+_test_durations = {}
+
+def _schedule_tests(config, items):
+    """Keep only this shard's tests and order them by fixture group."""
+    shard_count, shard_index = config.getoption("shard_count"), config.getoption("shard_index")
+    if shard_count is None:
+        if shard_index is not None:
+            raise pytest.UsageError("--shard-index needs --shard-count")
+        shard_count = 1
+    shard_index = shard_index or 0
+    if shard_count < 1:
+        raise pytest.UsageError("--shard-count must be at least 1")
+    if not 0 <= shard_index < shard_count:
+        raise pytest.UsageError(f"--shard-index {shard_index} out of range for --shard-count {shard_count} "
+                                f"(0 to {shard_count - 1})")
+    if shard_count <= 1 and not config.getoption("group_fixtures"):
+        return
+    from utils import scheduler
+
+    durations_file = config.getoption("durations_file")
+    if durations_file:
+        if not Path(durations_file).is_file():
+            raise pytest.UsageError(f"--durations-file {durations_file} does not exist")
+        store = scheduler.DurationStore(durations_file)
+    elif shard_count > 1:
+        # Each machine's own history differs: every shard must cut the same split
+        store = None
+    else:
+        store = scheduler.DurationStore()
+    tests = [(item.nodeid, scheduler.fixture_group(item.fixturenames)) for item in items]
+    last = _quarantined(config) if config.getoption("quarantine") == "last" else ()
+    ordered, estimate = scheduler.plan(tests, store, shard_count, shard_index, last)
+
+    by_nodeid = {item.nodeid: item for item in items}
+    keep = [by_nodeid[nodeid] for nodeid in ordered]
+    selected = set(ordered)
+    drop = [item for item in items if item.nodeid not in selected]
+    if drop:
+        config.hook.pytest_deselected(items=drop)
+    items[:] = keep
+    logger.info(f"Shard {shard_index}/{shard_count}: "
+                f"{len(keep)} tests, estimated {estimate:.1f}s")
+
+# --- Flaky Test Retry & Quarantine ---
+
+def _quarantined(config):
+    """Base node ids of the known-flaky tests (loaded once per session)."""
+    if not hasattr(config, "_quarantined"):
+        from utils.flaky import QuarantineStore
+
+        config._quarantined = QuarantineStore().quarantined()
+    return config._quarantined
+
+def _apply_quarantine(config, items):
+    """Deselect or reorder known-flaky tests according to --quarantine."""
+    mode = config.getoption("quarantine")
+    if mode == "run":
+        return
+    quarantined = _quarantined(config)
+    is_flaky = lambda item: item.nodeid.split("[", 1)[0] in quarantined
+    if mode == "last":
+        items.sort(key=is_flaky)  # stable: keeps the rest in order
+        return
+    keep = [item for item in items if is_flaky(item) == (mode == "only")]
+    drop = [item for item in items if is_flaky(item) != (mode == "only")]
+    if drop:
+        config.hook.pytest_deselected(items=drop)
+        items[:] = keep
+    logger.info(f"Quarantine ({mode}): {len(keep)} selected, {len(drop)} deselected")
+
+def _run_soak(item, driver, iteration, reset):
+    """Repeat a test on its browser (--soak); fail it if a resource keeps growing."""
+    from utils.soak import ResourceSampler, parse_duration, run_soak
+
+    if driver is None:
+        raise pytest.UsageError(f"{item.nodeid}: --soak needs a test using the driver or logged_in_driver fixture")
+    duration = item.config.getoption("soak")
+    result = run_soak(item.name, iteration, ResourceSampler(driver), parse_duration(duration) if duration else None,
+                      item.config.getoption("soak_iterations"), reset)
+    item._soak_result = result
+    item.config.__dict__.setdefault("_soak_results", []).append(result)
+    store = getattr(item.config, "_artifact_store", None)
+    if store is not None:
+        store.add("soak", result.path, test=item.nodeid)
+    if result.flagged:
+        raise AssertionError(f"Sustained resource growth while soaking:\n{result.summary()}")
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_pyfunc_call(pyfuncitem):
+    """Rerun timing-related failures in-process, keeping the warm browser."""
+    marker = pyfuncitem.get_closest_marker("flaky")
+    retries = pyfuncitem.config.getoption("flaky_retries")
+    if marker:
+        from utils.flaky import marker_retries
+
+        retries = marker_retries(marker, retries)
+    data = pyfuncitem.get_closest_marker("data")
+    batch = data is not None and data.kwargs.get("batch", False)
+    soak = pyfuncitem.config.getoption("soak") or pyfuncitem.config.getoption("soak_iterations")
+    if retries <= 0 and not batch and not soak:
+        return None  # default pytest call
+    from utils.flaky import run_with_retries, reset_page_state
+
+    driver = None
+    landing_url = None
+    if 'logged_in_driver' in pyfuncitem.funcargs:
+        driver = pyfuncitem.funcargs['logged_in_driver']
+        landing_url = BASE_URL + "/dashboard"  # where logged_in_driver leaves the browser
+    elif 'driver' in pyfuncitem.funcargs:
+        driver = pyfuncitem.funcargs['driver']
+    reset = (lambda: reset_page_state(driver, landing_url)) if driver else None
+    lease = getattr(pyfuncitem, "_tab_lease", None)
+    if lease is not None:
+        # Shared browser: only reset this test's tab
+        reset = lambda: lease.reset(landing_url)
+
+    testargs = {arg: pyfuncitem.funcargs[arg] for arg in pyfuncitem._fixtureinfo.argnames}
+    if soak:
+        _run_soak(pyfuncitem, driver, lambda: pyfuncitem.obj(**testargs), reset)
+        return True
+    if batch:
+        # All data rows in sequence, sharing this item's warm fixtures
+        from utils.data_provider import marker_cases, run_batch
+
+        _, cases = marker_cases(data, pyfuncitem._fixtureinfo.argnames)
+        run = (lambda func, kwargs: run_with_retries(func, kwargs, retries, reset)) if retries > 0 else None
+        try:
+            pyfuncitem._data_results = run_batch(pyfuncitem.obj, testargs, cases, run, reset)
+        except BaseException as e:
+            pyfuncitem._data_results = getattr(e, "data_results", None)
+            raise
+        return True
+    try:
+        pyfuncitem._retry_attempts = run_with_retries(pyfuncitem.obj, testargs, retries, reset)
+    except BaseException as e:
+        pyfuncitem._retry_attempts = getattr(e, "retry_attempts", None)
+        raise
+    return True
+
+def pytest_generate_tests(metafunc):
+    """Expand @pytest.mark.data tests from test_data.py, CSV/JSONL files or combinations."""
+    marker = metafunc.definition.get_closest_marker("data")
+    if marker is None:
+        return
+    from utils.data_provider import marker_cases
+
+    argnames, cases = marker_cases(marker, metafunc.fixturenames)
+    if not argnames:
+        raise pytest.UsageError(f"{metafunc.definition.nodeid}: no data rows, or no data column matches the test arguments")
+    if marker.kwargs.get("batch", False):
+        # One item; rows are streamed again and run in sequence at call time
+        _, values = next(cases)
+        params = [pytest.param(*values.values(), id="batch")]
+    else:
+        params = [pytest.param(*values.values(), id=case_id) for case_id, values in cases]
+    metafunc.parametrize(argnames, params)
+
+# --- Environment Circuit Breaker ---
+
+def _get_circuit_breaker(config):
+    """Create the session circuit breaker, probing the environment once."""
+    breaker = getattr(config, "_circuit_breaker", None)
+    if breaker is None:
+        from utils.circuit_breaker import CircuitBreaker, probe_environment
+
+        breaker = config._circuit_breaker = CircuitBreaker(CIRCUIT_BREAKER_THRESHOLD)
+        result = probe_environment(BASE_URL, HEALTH_CHECK_PATHS, HEALTH_CHECK_TIMEOUT)
+        logger.info(f"Environment health probe: {result.reason} ({result.duration:.2f}s)")
+        if not result.ok:
+            breaker.trip(f"Environment health probe failed: {result.reason}")
+    return breaker
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item):
+    """Skip browser tests right away once the circuit breaker is open."""
+    _profile_phase(item, "setup")
+    from utils.circuit_breaker import uses_browser
+
+    mode = item.config.getoption("circuit_breaker")
+    if mode == "off" or not uses_browser(item.fixturenames):
+        return
+    breaker = _get_circuit_breaker(item.config)
+    if breaker.is_open:
+        breaker.skipped += 1
+        if mode == "abort":
+            item.session.shouldfail = f"Circuit breaker open: {breaker.reason}"
+        pytest.skip(f"Circuit breaker open: {breaker.reason}")
+
+def _update_circuit_breaker(item, call, rep):
+    """Count consecutive infrastructure failures of browser tests."""
+    breaker = getattr(item.config, "_circuit_breaker", None)
+    if breaker is None or rep.skipped or rep.when == 'teardown':
+        return
+    from utils.circuit_breaker import is_infrastructure_failure
+
+    if rep.failed:
+        exc = call.excinfo.value if call.excinfo else None
+        if is_infrastructure_failure(rep.when, item.fixturenames, exc):
+            message = str(exc).strip().splitlines()
+            breaker.record_failure(f"{item.nodeid}: {message[0] if message else type(exc).__name__}")
+            if breaker.is_open:
+                logger.error(f"Circuit breaker opened: {breaker.reason}")
+            return
+    if rep.when == 'call':
+        # The test reached the application, so the environment is up
+        breaker.record_success()
+
+def pytest_terminal_summary(terminalreporter, config):
+    """Report circuit breaker state and WebDriver command latencies."""
+    recorder = getattr(config, "_latency_recorder", None)
+    if recorder is not None and recorder.samples:
+        terminalreporter.section("webdriver command latency (ms)")
+        for line in recorder.format_summary().splitlines():
+            terminalreporter.write_line(line)
+        terminalreporter.write_line(f"Saved to: {recorder.save()}")
+
+    profiler = getattr(config, "_profiler", None)
+    if profiler is not None:
+        profiler.end_phase()
+        profiler.unpatch_sleep()
+        top = config.getoption("profile_top")
+        terminalreporter.section(f"webdriver profile (top {top})")
+        for line in profiler.format_top(top).splitlines():
+            terminalreporter.write_line(line)
+        folded_path, json_path = profiler.save(top)
+        terminalreporter.write_line(f"Flame graph input: {folded_path}")
+        terminalreporter.write_line(f"Per-test breakdown: {json_path}")
+
+    driver_service = getattr(config, "_driver_service", None)
+    if driver_service is not None and driver_service.sessions:
+        terminalreporter.section("driver service")
+        terminalreporter.write_line(driver_service.summary())
+
+    tab_pool = getattr(config, "_tab_pool", None)
+    if tab_pool is not None:
+        terminalreporter.section("tab pool")
+        terminalreporter.write_line(tab_pool.summary())
+
+    soak_results = getattr(config, "_soak_results", None)
+    if soak_results:
+        terminalreporter.section("soak")
+        for result in soak_results:
+            terminalreporter.write_line(result.summary())
+
+    locator_profiler = getattr(config, "_locator_profiler", None)
+    if locator_profiler is not None and locator_profiler.stats:
+        terminalreporter.section("locator profile")
+        for line in locator_profiler.format().splitlines():
+            terminalreporter.write_line(line)
+        terminalreporter.write_line(f"Saved to: {config._locator_profile_path}")
+
+    dom_snapshots = getattr(config, "_dom_snapshots", None)
+    if dom_snapshots is not None and dom_snapshots.captured:
+        terminalreporter.section("dom snapshots")
+        terminalreporter.write_line(dom_snapshots.summary())
+
+    artifact_store = getattr(config, "_artifact_store", None)
+    if artifact_store is not None and (artifact_store.entries(run_id=artifact_store.run_id)
+                                       or artifact_store.compressed or artifact_store.pruned):
+        terminalreporter.section("artifacts")
+        terminalreporter.write_line(artifact_store.summary())
+
+    breaker = getattr(config, "_circuit_breaker", None)
+    if breaker is not None and breaker.is_open:
+        terminalreporter.section("circuit breaker")
+        terminalreporter.write_line(f"OPEN: {breaker.reason}")
+        terminalreporter.write_line(f"{breaker.skipped} browser test(s) skipped without launching a browser")
+
+def pytest_runtest_logreport(report):
+    """Accumulate per-phase durations for the duration store."""
+    if report.skipped:
+        # A skipped test says nothing about how long it takes to run
+        _test_durations[report.nodeid] = None
+    if _test_durations.get(report.nodeid, 0.0) is None:
+        return
+    _test_durations[report.nodeid] = _test_durations.get(report.nodeid, 0.0) + report.duration
+
+def pytest_sessionfinish(session):
+    """Stop the shared chromedriver; save test results, durations, flakiness statistics and page_objects coverage."""
+    driver_service = getattr(session.config, "_driver_service", None)
+    if driver_service is not None:
+        driver_service.stop()
+
+    breaker = getattr(session.config, "_circuit_breaker", None)
+    if breaker is not None and breaker.is_open and session.exitstatus == 0:
+        # Skipped-because-environment-down must not look like a green run
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+    if _test_durations and not session.config.option.collectonly:
+        from utils.scheduler import DurationStore
+
+        store = DurationStore()
+        for nodeid, duration in _test_durations.items():
+            if duration is not None:
+                store.update(nodeid, duration)
+        store.save()
+
+    retried = getattr(session.config, "_retry_results", None)
+    if retried:
+        from utils.flaky import QuarantineStore
+
+        quarantine = QuarantineStore()
+        for nodeid, runs in retried.items():
+            for attempts in runs:
+                quarantine.record(nodeid, attempts)
+        quarantine.save()
+
+    coverage = getattr(session.config, "_impact_coverage", None)
+    if coverage:
+        from utils import impact_analysis
+
+        index = impact_analysis.build_index()
+        index["coverage"].update({nodeid: sorted(calls) for nodeid, calls in coverage.items()})
+        impact_analysis.save_index(index)
+
+    dom_snapshots = getattr(session.config, "_dom_snapshots", None)
+    if dom_snapshots is not None:
+        dom_snapshots.finish()  # before the artifact store applies retention
+
+    locator_profiler = getattr(session.config, "_locator_profiler", None)
+    if locator_profiler is not None and locator_profiler.stats:
+        session.config._locator_profile_path = locator_profiler.save()
+        if getattr(session.config, "_artifact_store", None) is not None:
+            session.config._artifact_store.add("locator_profile", session.config._locator_profile_path)
+        if locator_profiler.strict and locator_profiler.violations and session.exitstatus == 0:
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+    results_writer = getattr(session.config, "_results_writer", None)
+    if results_writer is not None:
+        results_writer.finish(session.exitstatus)
+
+    artifact_store = getattr(session.config, "_artifact_store", None)
+    if artifact_store is not None:
+        import logging
+
+        # This run's log files, then retention once background compression is done
+        for log in logging.Logger.manager.loggerDict.values():
+            for handler in getattr(log, "handlers", ()):  # placeholders have none
+                log_file = getattr(handler, "baseFilename", None)
+                if log_file and Path(log_file).exists():
+                    handler.flush()
+                    artifact_store.add("log", log_file)
+        artifact_store.finish()
+
+def pytest_unconfigure(config):
+    """Index the HTML report, which pytest-html writes at the very end of the session."""
+    artifact_store = getattr(config, "_artifact_store", None)
+    htmlpath = getattr(config.option, "htmlpath", None)
+    if artifact_store is not None and htmlpath and Path(htmlpath).exists():
+        artifact_store.add("report", htmlpath)
+
+# --- WebDriver Profiler ---
+
+def _profile_phase(item, phase):
+    """Attribute profiled time to the test phase that is starting."""
+    profiler = getattr(item.config, "_profiler", None)
+    if profiler is not None:
+        profiler.end_phase()
+        profiler.start_phase(item.nodeid, phase)
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_teardown(item):
+    """Track the teardown phase for the profiler."""
+    _profile_phase(item, "teardown")
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_html_results_summary(prefix, summary, postfix, session):
+    """Add the profiler's top-N hot spots to the HTML report."""
+    profiler = getattr(session.config, "_profiler", None)
+    if profiler is not None:
+        profiler.end_phase()
+        postfix.append(profiler.html_top(session.config.getoption("profile_top")))
+
 # --- Hooks for HTML Report ---
 
 def pytest_configure(config):
     """Auto-generate HTML report with timestamp."""
-    if not config.option.htmlpath:
+    if config.option.collectonly or config.option.help:
+        # No report (and no reports/ directory) for collection-only and --help runs
+        return
+    if config.getoption("profile"):
+        from utils.profiler import CommandProfiler
+
+        config._profiler = CommandProfiler()
+        config._profiler.patch_sleep()
+    if config.getoption("profile_locators") or config.getoption("strict_locators"):
+        from utils.locator_profiler import LocatorProfiler
+
+        config._locator_profiler = LocatorProfiler(config.getoption("locator_budget"),
+                                                   config.getoption("strict_locators"), LOCATOR_PROFILE_REPEATS)
+    from utils.artifact_store import ArtifactStore
+
+    # Index, log compression and retention for artifacts/ and reports/
+    config._artifact_store = ArtifactStore()
+    config._artifact_store.start_background(ARTIFACT_COMPRESS_AFTER)
+    if RESULTS_DB_ENABLED:
+        from utils.results_db import ResultsWriter
+
+        config._results_writer = ResultsWriter(config._artifact_store.run_id, ENVIRONMENT)
+    if config.pluginmanager.hasplugin("html") and not config.option.htmlpath:
         reports_dir = Path('reports')
         reports_dir.mkdir(exist_ok=True)
         timestamp = time.strftime('%Y%m%d_%H%M%S')
@@ -103,10 +783,11 @@ def pytest_configure(config):
         config.option.htmlpath = str(reports_dir / f"{base_name}.html")
         config.option.self_contained_html = True
 
-import pytest_html
-
+@pytest.hookimpl(optionalhook=True)
 def pytest_html_results_table_row(report, cells):
     """Add captured logs to HTML report."""
+    import pytest_html
+
     if report.passed or report.failed or report.skipped:
         log_content = ""
         for section in report.sections:
@@ -119,12 +800,78 @@ def pytest_html_results_table_row(report, cells):
 
 # --- Screenshot on Failure ---
 
+def _dom_snapshots(config):
+    """Session-wide failure DOM snapshot writer."""
+    if not hasattr(config, "_dom_snapshots"):
+        from utils.dom_snapshot import DomSnapshotWriter
+
+        config._dom_snapshots = DomSnapshotWriter(store=getattr(config, "_artifact_store", None),
+                                                  max_chars=DOM_SNAPSHOT_MAX_CHARS)
+    return config._dom_snapshots
+
+def _save_dom_snapshot(item, rep, driver):
+    """Snapshot the DOM of a failed test and link the viewer from the report."""
+    locator = getattr(driver, "failed_locator", None)
+    try:
+        snapshot = _dom_snapshots(item.config).capture(driver, locator, test=item.nodeid)
+    except Exception as e:
+        logger.error(f"❌ Failed to take DOM snapshot: {e}")
+        return
+    driver.failed_locator = None
+    lines = [f"Viewer: {snapshot['viewer']}", f"{snapshot['nodes']} nodes, stored as {snapshot['path']}"]
+    if locator:
+        lines.insert(0, f"Failed locator: {locator[0]}={locator[1]}")
+    if snapshot["truncated"]:
+        lines.append("Truncated at DOM_SNAPSHOT_MAX_CHARS")
+    rep.sections.append(("DOM snapshot", "\n".join(lines)))
+    rep.user_properties.append(("artifact", str(snapshot["path"])))
+    if hasattr(rep, 'extra'):
+        import pytest_html
+
+        rep.extra = getattr(rep, 'extra', []) + [pytest_html.extras.url(snapshot["viewer"], name="DOM snapshot")]
+
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     """Take screenshot on test failure."""
     outcome = yield
     rep = outcome.get_result()
     
+    # Record retry attempts (--flaky-retries / @pytest.mark.flaky)
+    attempts = getattr(item, "_retry_attempts", None)
+    if rep.when == 'call' and attempts:
+        from utils.flaky import format_attempts
+
+        if len(attempts) > 1:
+            rep.sections.append(("Retry attempts", format_attempts(attempts)))
+        rep.user_properties.append(("attempts", len(attempts)))
+        # Parametrized variants share one quarantine entry: one recorded run each
+        retried = item.config.__dict__.setdefault("_retry_results", {})
+        retried.setdefault(item.nodeid.split("[", 1)[0], []).append(attempts)
+    
+    soak_result = getattr(item, "_soak_result", None)
+    if rep.when == 'call' and soak_result is not None:
+        rep.sections.append(("Soak", soak_result.summary()))
+        rep.user_properties.append(("artifact", str(soak_result.path)))
+    
+    data_results = getattr(item, "_data_results", None)
+    if rep.when == 'call' and data_results:
+        from utils.data_provider import format_results
+
+        rep.sections.append(("Data rows", format_results(data_results)))
+    
+    _update_circuit_breaker(item, call, rep)
+    
+    # Per-test time breakdown (--profile)
+    profiler = getattr(item.config, "_profiler", None)
+    if profiler is not None and rep.when == 'call':
+        profiler.end_phase()
+        rep.sections.append(("WebDriver profile", profiler.format_breakdown(item.nodeid)))
+    
+    lease = getattr(item, "_tab_lease", None)
+    if lease is not None and rep.failed:
+        # Which tab/windows of the shared browser belong to this failure
+        rep.sections.append(("Browser tab", lease.describe()))
+    
     if rep.when == 'call' and rep.failed and SCREENSHOT_ON_FAILURE:
         # Get driver from test fixtures
         driver = None
@@ -147,11 +894,44 @@ def pytest_runtest_makereport(item, call):
             try:
                 driver.save_screenshot(str(screenshot_path))
                 logger.info(f"📸 Screenshot saved: {screenshot_path}")
+                rep.user_properties.append(("artifact", str(screenshot_path)))
+                store = getattr(item.config, "_artifact_store", None)
+                if store is not None:
+                    store.add("screenshot", screenshot_path, test=item.nodeid)
                 
                 # Add screenshot to HTML report
+                import pytest_html
+
                 if hasattr(rep, 'extra'):
                     extra = getattr(rep, 'extra', [])
                     extra.append(pytest_html.extras.image(str(screenshot_path)))
                     rep.extra = extra
             except Exception as e:
                 logger.error(f"❌ Failed to take screenshot: {e}")
+            
+            log_buffer = getattr(driver, "log_buffer", None)
+            if log_buffer is not None:
+                from utils.browser_logs import write_failure_logs
+
+                try:
+                    log_path, problems = write_failure_logs(log_buffer, test_name)
+                    rep.sections.append(("Browser logs", f"{problems or 'No console errors or failed requests'}"
+                                                         f"\nFull console/network log: {log_path}"))
+                    rep.user_properties.append(("artifact", str(log_path)))
+                    store = getattr(item.config, "_artifact_store", None)
+                    if store is not None:
+                        store.add("browser_log", log_path, test=item.nodeid)
+                except Exception as e:
+                    logger.error(f"❌ Failed to save browser logs: {e}")
+            
+            if DOM_SNAPSHOT_ON_FAILURE:
+                _save_dom_snapshot(item, rep, driver)
+    
+    results_writer = getattr(item.config, "_results_writer", None)
+    if results_writer is not None:
+        from utils.results_db import marker_names
+
+        properties = dict(rep.user_properties)
+        results_writer.record(item.nodeid, rep.when, rep.outcome, rep.duration, marker_names(item),
+                              retries=max(0, properties.get("attempts", 1) - 1),
+                              artifacts=[value for name, value in rep.user_properties if name == "artifact"])
@@ -0,0 +1,133 @@
+from utils.async_driver import AsyncWebDriverWait, AsyncEC
+
+class AsyncBasePage:
+    """Async counterpart of BasePage, for use with AsyncWebDriver."""
+    
+    def __init__(self, driver):
+        """
+        Initialize async base page.
+        
+        Args:
+            driver: AsyncWebDriver instance
+        """
+        self.driver = driver
+        self.wait = AsyncWebDriverWait(driver, 10)
+    
+    async def find_element(self, by, value):
+        """
+        Find element with explicit wait.
+        
+        Args:
+            by: Selenium By locator type
+            value: Locator value
+            
+        Returns:
+            AsyncWebElement
+        """
+        return await self.wait.until(AsyncEC.presence_of_element_located((by, value)))
+    
+    async def find_elements(self, by, value):
+        """
+        Find multiple elements.
+        
+        Args:
+            by: Selenium By locator type
+            value: Locator value
+            
+        Returns:
+            List of AsyncWebElements
+        """
+        return await self.driver.find_elements(by, value)
+    
+    async def click(self, by, value):
+        """
+        Click element with explicit wait.
+        
+        Args:
+            by: Selenium By locator type
+            value: Locator value
+        """
+        element = await self.wait.until(AsyncEC.element_to_be_clickable((by, value)))
+        await element.click()
+    
+    async def input_text(self, by, value, text):
+        """
+        Input text into element.
+        
+        Args:
+            by: Selenium By locator type
+            value: Locator value
+            text: Text to input
+        """
+        element = await self.find_element(by, value)
+        await element.clear()
+        await element.send_keys(text)
+    
+    async def get_text(self, by, value):
+        """
+        Get text from element.
+        
+        Args:
+            by: Selenium By locator type
+            value: Locator value
+            
+        Returns:
+            Element text
+        """
+        element = await self.find_element(by, value)
+        return await element.text()
+    
+    async def is_displayed(self, by, value):
+        """
+        Check if element is displayed.
+        
+        Args:
+            by: Selenium By locator type
+            value: Locator value
+            
+        Returns:
+            Boolean
+        """
+        try:
+            element = await self.find_element(by, value)
+            return await element.is_displayed()
+        except Exception:
+            return False
+    
+    async def wait_for_url(self, url, timeout=10):
+        """
+        Wait for URL to match.
+        
+        Args:
+            url: Expected URL
+            timeout: Maximum wait time in seconds
+        """
+        await AsyncWebDriverWait(self.driver, timeout).until(AsyncEC.url_to_be(url))
+    
+    async def wait_for_url_contains(self, partial_url, timeout=10):
+        """
+        Wait for URL to contain partial string.
+        
+        Args:
+            partial_url: Partial URL string
+            timeout: Maximum wait time in seconds
+        """
+        await AsyncWebDriverWait(self.driver, timeout).until(AsyncEC.url_contains(partial_url))
+    
+    async def get_current_url(self):
+        """
+        Get current page URL.
+        
+        Returns:
+            Current URL string
+        """
+        return await self.driver.current_url()
+    
+    async def navigate_to(self, url):
+        """
+        Navigate to URL.
+        
+        Args:
+            url: URL to navigate to
+        """
+        await self.driver.get(url)
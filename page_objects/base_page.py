@@ -1,10 +1,21 @@
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
+from page_objects.elements import (check_elements, compile_elements, note_failed_locator, note_page_in_use,
+                                   wait_until_ready)
 
 class BasePage:
     """Base class for all page objects."""
     
+    # Compiled per class from its Element declarations (see page_objects/elements.py)
+    _element_map = {}
+    _element_groups = {}
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._element_map, cls._element_groups = compile_elements(cls)
+    
     def __init__(self, driver):
         """
         Initialize base page.
@@ -14,6 +25,59 @@ class BasePage:
         """
         self.driver = driver
         self.wait = WebDriverWait(driver, 10)
+        self._element_cache = {}
+    
+    def _group_elements(self, group):
+        """Elements of a batch group (all declared elements if group is None)."""
+        if group is None:
+            return dict(self._element_map)
+        names = self._element_groups.get(group)
+        if not names:
+            raise ValueError(f"{type(self).__name__} has no elements in group {group!r}")
+        return {name: self._element_map[name] for name in names}
+    
+    def check_ready(self, group="ready"):
+        """
+        Check a group of elements in one round trip.
+        
+        Args:
+            group: Batch group name (None for all declared elements)
+            
+        Returns:
+            Dict of element name -> Boolean
+        """
+        return check_elements(self.driver, self._group_elements(group))
+    
+    def is_ready(self, group="ready"):
+        """
+        Check if every element of a group is ready (one round trip).
+        
+        Args:
+            group: Batch group name (None for all declared elements)
+            
+        Returns:
+            Boolean
+        """
+        return all(self.check_ready(group).values())
+    
+    def wait_until_ready(self, group="ready", timeout=10):
+        """
+        Wait until every element of a group is ready, checking them in batch.
+        
+        Args:
+            group: Batch group name (None for all declared elements)
+            timeout: Maximum wait time in seconds
+        """
+        wait_until_ready(self.driver, self._group_elements(group), timeout)
+        note_page_in_use(self)
+    
+    def _until(self, condition, by, value):
+        """Wait for condition((by, value)), remembering the locator if the wait times out."""
+        try:
+            return self.wait.until(condition((by, value)))
+        except TimeoutException:
+            note_failed_locator(self.driver, (by, value))
+            raise
     
     def find_element(self, by, value):
         """
@@ -26,7 +90,7 @@ class BasePage:
         Returns:
             WebElement
         """
-        return self.wait.until(EC.presence_of_element_located((by, value)))
+        return self._until(EC.presence_of_element_located, by, value)
     
     def find_elements(self, by, value):
         """
@@ -49,7 +113,7 @@ class BasePage:
             by: Selenium By locator type
             value: Locator value
         """
-        element = self.wait.until(EC.element_to_be_clickable((by, value)))
+        element = self._until(EC.element_to_be_clickable, by, value)
         element.click()
     
     def input_text(self, by, value, text):
@@ -134,4 +198,5 @@ class BasePage:
         Args:
             url: URL to navigate to
         """
+        self._element_cache.clear()
         self.driver.get(url)
@@ -1,15 +1,16 @@
 from selenium.webdriver.common.by import By
-from Pages.base_page import BasePage
+from page_objects.base_page import BasePage
+from page_objects.elements import Element
 
 class DashboardPage(BasePage):
     """Page Object Model for Dashboard page."""
     
     # Locators
-    SIDEBAR = (By.ID, "sidebar")
-    PAGE_TITLE = (By.TAG_NAME, "h1")
-    USER_MENU = (By.CLASS_NAME, "user-menu")
-    LOGOUT_BUTTON = (By.LINK_TEXT, "Logout")
-    NOTIFICATION_ICON = (By.ID, "notification-icon")
+    SIDEBAR = Element(By.ID, "sidebar", group="ready")
+    PAGE_TITLE = Element(By.TAG_NAME, "h1", group="ready")
+    USER_MENU = Element(By.CLASS_NAME, "user-menu", wait="clickable")
+    LOGOUT_BUTTON = Element(By.LINK_TEXT, "Logout", wait="clickable")
+    NOTIFICATION_ICON = Element(By.ID, "notification-icon")
     
     def __init__(self, driver, base_url):
         """
@@ -34,7 +35,7 @@ class DashboardPage(BasePage):
         Returns:
             Boolean
         """
-        return self.is_displayed(*self.SIDEBAR)
+        return self.SIDEBAR.is_displayed()
     
     def get_page_title(self):
         """
@@ -43,16 +44,16 @@ class DashboardPage(BasePage):
         Returns:
             Page title string
         """
-        return self.get_text(*self.PAGE_TITLE)
+        return self.PAGE_TITLE.get_text()
     
     def click_user_menu(self):
         """Click user menu."""
-        self.click(*self.USER_MENU)
+        self.USER_MENU.click()
     
     def logout(self):
         """Perform logout action."""
         self.click_user_menu()
-        self.click(*self.LOGOUT_BUTTON)
+        self.LOGOUT_BUTTON.click()
     
     def is_notification_displayed(self):
         """
@@ -61,4 +62,4 @@ class DashboardPage(BasePage):
         Returns:
             Boolean
         """
-        return self.is_displayed(*self.NOTIFICATION_ICON)
+        return self.NOTIFICATION_ICON.is_displayed()
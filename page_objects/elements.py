@@ -0,0 +1,341 @@
+"""
+Declarative element descriptors for page objects.
+
+Locators are declared once at class level, with their wait and caching
+policy and the batch groups they belong to:
+
+    class DashboardPage(BasePage):
+        SIDEBAR = Element(By.ID, "sidebar", group="ready")
+        USER_MENU = Element(By.CLASS_NAME, "user-menu", wait="clickable")
+        NOTIFICATION_ICON = (By.ID, "notification-icon")   # plain tuples work too
+
+    page.SIDEBAR.is_displayed()
+    page.USER_MENU.click()
+    page.wait_until_ready()        # whole "ready" group in one round trip
+
+Element is a tuple subclass, so `*self.SIDEBAR`, `EC.*(self.SIDEBAR)` and
+`driver.find_element(*DashboardPage.SIDEBAR)` keep working unchanged.
+BasePage compiles the descriptors of each class once, when the class is
+defined, into `_element_map` / `_element_groups`.
+"""
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from utils.locator_profiler import LocatorBudgetExceeded
+from utils.locators import compile_locator
+
+WAIT_POLICIES = ("present", "visible", "clickable", "none")
+
+_CONDITIONS = {
+    "present": EC.presence_of_element_located,
+    "visible": EC.visibility_of_element_located,
+    "clickable": EC.element_to_be_clickable,
+}
+
+# Checks a list of locators in the page and returns one boolean per locator.
+# arguments[0]: [[using, value, require_visible, require_enabled], ...]
+BATCH_READY_SCRIPT = """
+var checks = arguments[0], results = [];
+function locate(using, value) {
+  if (using === 'css selector') return document.querySelector(value);
+  if (using === 'xpath') {
+    return document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null)
+      .singleNodeValue;
+  }
+  var links = document.getElementsByTagName('a');
+  for (var i = 0; i < links.length; i++) {
+    var text = links[i].textContent.trim();
+    if (using === 'link text' ? text === value : text.indexOf(value) !== -1) return links[i];
+  }
+  return null;
+}
+for (var i = 0; i < checks.length; i++) {
+  var el = locate(checks[i][0], checks[i][1]), ok = !!el;
+  if (ok && checks[i][2]) {
+    var style = window.getComputedStyle(el);
+    ok = style.visibility !== 'hidden' && style.display !== 'none' && el.getClientRects().length > 0;
+  }
+  if (ok && checks[i][3]) ok = !el.disabled;
+  results.push(ok);
+}
+return results;
+"""
+
+
+def note_failed_locator(driver, locator):
+    """
+    Remember the locator a wait gave up on, for the failure DOM snapshot.
+
+    Args:
+        driver: WebDriver instance
+        locator: (by, value) tuple
+    """
+    try:
+        driver.failed_locator = tuple(locator)
+    except AttributeError:
+        pass  # driver object that takes no attributes
+
+
+def note_page_in_use(page):
+    """
+    Let the locator profiler (pytest --profile-locators) time the page's locators on the live page.
+
+    Args:
+        page: BasePage instance that just found an element on its page
+    """
+    profiler = getattr(page.driver, "locator_profiler", None)
+    if profiler is not None:
+        profiler.observe(page)
+
+
+class Element(tuple):
+    """Class-level element declaration: (by, value) plus wait/cache/group policy."""
+
+    def __new__(cls, by, value, wait="present", timeout=None, cache=False, group=()):
+        """
+        Declare an element.
+
+        Args:
+            by: Selenium By locator type
+            value: Locator value
+            wait: "present", "visible", "clickable" or "none" (no explicit wait)
+            timeout: Wait timeout in seconds (page default if None)
+            cache: Reuse the located WebElement until it goes stale
+            group: Batch group name or names (e.g. "ready")
+        """
+        if wait not in WAIT_POLICIES:
+            raise ValueError(f"wait must be one of {WAIT_POLICIES}, got {wait!r}")
+        element = super().__new__(cls, (by, value))
+        element.wait = wait
+        element.timeout = timeout
+        element.cache = cache
+        element.groups = (group,) if isinstance(group, str) else tuple(group)
+        element.compiled = compile_locator(by, value)
+        element.name = None
+        return element
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, page, owner=None):
+        if page is None:
+            return self
+        return BoundElement(page, self)
+
+    def __repr__(self):
+        return f"Element({self[0]!r}, {self[1]!r}, wait={self.wait!r})"
+
+    @property
+    def locator(self):
+        """(by, value) tuple as declared."""
+        return tuple(self)
+
+
+class BoundElement(tuple):
+    """An Element accessed through a page instance; the generated accessors."""
+
+    def __new__(cls, page, element):
+        bound = super().__new__(cls, element)
+        bound.page = page
+        bound.element = element
+        return bound
+
+    def __repr__(self):
+        return f"<{type(self.page).__name__}.{self.element.name} {tuple(self)!r}>"
+
+    def _wait(self, timeout=None):
+        timeout = timeout if timeout is not None else self.element.timeout
+        if timeout is None:
+            return self.page.wait
+        return WebDriverWait(self.page.driver, timeout)
+
+    def find(self, wait=None, timeout=None):
+        """
+        Locate the element according to its wait and caching policy.
+
+        Args:
+            wait: Override the declared wait policy
+            timeout: Override the declared timeout
+
+        Returns:
+            WebElement
+        """
+        element = self.element
+        cache = self.page._element_cache
+        if element.cache and element.name in cache:
+            return cache[element.name]
+
+        policy = wait or element.wait
+        if policy == "none":
+            found = self.page.driver.find_element(*element.compiled)
+        else:
+            try:
+                found = self._wait(timeout).until(_CONDITIONS[policy](element.compiled))
+            except TimeoutException:
+                note_failed_locator(self.page.driver, element.compiled)
+                raise
+        note_page_in_use(self.page)
+        if element.cache:
+            cache[element.name] = found
+        return found
+
+    def _act(self, action, wait=None):
+        """Run action(WebElement), re-locating once if a cached element went stale."""
+        try:
+            return action(self.find(wait))
+        except StaleElementReferenceException:
+            if not self.element.cache:
+                raise
+            self.page._element_cache.pop(self.element.name, None)
+            return action(self.find(wait))
+
+    def find_all(self):
+        """
+        Locate all matching elements without waiting.
+
+        Returns:
+            List of WebElements
+        """
+        return self.page.driver.find_elements(*self.element.compiled)
+
+    def click(self):
+        """Click the element once it is clickable."""
+        self._act(lambda found: found.click(), wait="clickable")
+
+    def input_text(self, text):
+        """
+        Clear the element and type text into it.
+
+        Args:
+            text: Text to input
+        """
+        def type_text(found):
+            found.clear()
+            found.send_keys(text)
+        self._act(type_text)
+
+    def get_text(self):
+        """
+        Get the element text.
+
+        Returns:
+            Element text
+        """
+        return self._act(lambda found: found.text)
+
+    def get_attribute(self, name):
+        """
+        Get an element attribute.
+
+        Args:
+            name: Attribute name
+
+        Returns:
+            Attribute value or None
+        """
+        return self._act(lambda found: found.get_attribute(name))
+
+    def is_displayed(self):
+        """
+        Check if the element is displayed, without waiting for it to become visible.
+
+        Returns:
+            Boolean
+        """
+        # A present but hidden element answers False at once, whatever the declared wait
+        wait = "none" if self.element.wait == "none" else "present"
+        try:
+            return self._act(lambda found: found.is_displayed(), wait=wait)
+        except LocatorBudgetExceeded:
+            raise  # --strict-locators failure, not a hidden element
+        except Exception:
+            return False
+
+    def is_present(self):
+        """
+        Check if the element exists right now (no wait).
+
+        Returns:
+            Boolean
+        """
+        return bool(self.find_all())
+
+
+def compile_elements(cls):
+    """
+    Build the element map and batch groups of a page class.
+
+    Plain (By, value) tuples declared in UPPER_CASE are upgraded to Element
+    descriptors with the default policy.
+
+    Args:
+        cls: Page object class
+
+    Returns:
+        Tuple of (element map name -> Element, group name -> tuple of names)
+    """
+    for name, value in list(vars(cls).items()):
+        if (name.isupper() and type(value) is tuple and len(value) == 2
+                and isinstance(value[0], str) and isinstance(value[1], str)
+                and value[0] in vars(By).values()):
+            element = Element(*value)
+            element.__set_name__(cls, name)
+            setattr(cls, name, element)
+
+    elements = {}
+    for klass in reversed(cls.__mro__):
+        for name, value in vars(klass).items():
+            if isinstance(value, Element):
+                elements[name] = value
+    groups = {}
+    for name, element in elements.items():
+        for group in element.groups:
+            groups.setdefault(group, []).append(name)
+    return elements, {group: tuple(names) for group, names in groups.items()}
+
+
+def check_elements(driver, elements):
+    """
+    Check several elements in a single script round trip.
+
+    Args:
+        driver: Selenium WebDriver instance
+        elements: Dict of name -> Element
+
+    Returns:
+        Dict of name -> Boolean (present, and visible/enabled as the wait policy requires)
+    """
+    checks = [[*element.compiled, element.wait in ("visible", "clickable"), element.wait == "clickable"]
+              for element in elements.values()]
+    results = driver.execute_script(BATCH_READY_SCRIPT, checks) or [False] * len(checks)
+    return dict(zip(elements, results))
+
+
+def wait_until_ready(driver, elements, timeout=10, poll_frequency=0.2):
+    """
+    Wait until every element passes check_elements().
+
+    Args:
+        driver: Selenium WebDriver instance
+        elements: Dict of name -> Element
+        timeout: Maximum wait time in seconds
+        poll_frequency: Seconds between checks
+
+    Raises:
+        TimeoutException: Listing the elements that never became ready
+    """
+    last = {}
+
+    def all_ready(driver):
+        last.update(check_elements(driver, elements))
+        return all(last.values())
+
+    try:
+        WebDriverWait(driver, timeout, poll_frequency).until(all_ready)
+    except TimeoutException:
+        missing = [name for name, ok in last.items() if not ok]
+        if missing:
+            note_failed_locator(driver, elements[missing[0]].compiled)
+        raise TimeoutException(f"Elements not ready after {timeout}s: {', '.join(missing)}")
@@ -1,15 +1,16 @@
 from selenium.webdriver.common.by import By
 from page_objects.base_page import BasePage
+from page_objects.elements import Element
 
 class LoginPage(BasePage):
     """Page Object Model for Login page."""
     
     # Locators
-    LOGIN_LINK = (By.LINK_TEXT, "Login")
-    EMAIL_FIELD = (By.NAME, "email")
-    PASSWORD_FIELD = (By.NAME, "password")
-    LOGIN_BUTTON = (By.CLASS_NAME, "login-button")
-    ERROR_MESSAGE = (By.CLASS_NAME, "error-message")
+    LOGIN_LINK = Element(By.LINK_TEXT, "Login", wait="clickable")
+    EMAIL_FIELD = Element(By.NAME, "email", group="ready")
+    PASSWORD_FIELD = Element(By.NAME, "password", group="ready")
+    LOGIN_BUTTON = Element(By.CLASS_NAME, "login-button", wait="clickable", group="ready")
+    ERROR_MESSAGE = Element(By.CLASS_NAME, "error-message", wait="visible")
     
     def __init__(self, driver, base_url):
         """
@@ -25,7 +26,7 @@ class LoginPage(BasePage):
     def navigate_to_login(self):
         """Navigate to the application and click login link."""
         self.navigate_to(self.base_url)
-        self.click(*self.LOGIN_LINK)
+        self.LOGIN_LINK.click()
     
     def enter_email(self, email):
         """
@@ -34,7 +35,7 @@ class LoginPage(BasePage):
         Args:
             email: Email address string
         """
-        self.input_text(*self.EMAIL_FIELD, email)
+        self.EMAIL_FIELD.input_text(email)
     
     def enter_password(self, password):
         """
@@ -43,11 +44,11 @@ class LoginPage(BasePage):
         Args:
             password: Password string
         """
-        self.input_text(*self.PASSWORD_FIELD, password)
+        self.PASSWORD_FIELD.input_text(password)
     
     def click_login_button(self):
         """Click the login button."""
-        self.click(*self.LOGIN_BUTTON)
+        self.LOGIN_BUTTON.click()
     
     def login(self, email, password):
         """
@@ -69,7 +70,7 @@ class LoginPage(BasePage):
         Returns:
             Error message string
         """
-        return self.get_text(*self.ERROR_MESSAGE)
+        return self.ERROR_MESSAGE.get_text()
     
     def is_error_displayed(self):
         """
@@ -78,4 +79,4 @@ class LoginPage(BasePage):
         Returns:
             Boolean
         """
-        return self.is_displayed(*self.ERROR_MESSAGE)
+        return self.ERROR_MESSAGE.is_displayed()
@@ -0,0 +1,3 @@
+from standin_app.server import StandinApp
+
+__all__ = ["StandinApp"]
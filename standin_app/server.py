@@ -0,0 +1,256 @@
+"""
+Local stand-in for the application under test.
+
+Serves the pages the example tests and page objects assume, so the
+framework can be run and benchmarked offline (ENV=local):
+
+    /               home page with a "Login" link
+    /login          email/password form with .login-button and .error-message
+    /dashboard      #sidebar, h1, .user-menu with a "Logout" link, #notification-icon
+    /logout         clears the session and redirects to /login
+    /slow-page      .loading-spinner that hides after SLOW_PAGE_DELAY_MS, then .main-content
+    /dynamic-page   10 .list-item loaded one by one, #success-message, #submit-button
+    /form-page      #input-field + #submit-button showing .success-message
+    /example-page   #example-element
+
+Usage:
+    python -m standin_app.server --port 8000
+    ENV=local pytest -s
+"""
+import argparse
+import http.server
+import secrets
+import threading
+from http.cookies import SimpleCookie
+from urllib.parse import parse_qs
+
+# Same accounts as tests/test_data.py (valid_user, admin_user)
+USERS = {
+    "user@example.com": "password123",
+    "admin@example.com": "adminpass123",
+}
+
+SESSION_COOKIE = "session_id"
+SLOW_PAGE_DELAY_MS = 1500
+DYNAMIC_ITEM_DELAY_MS = 100
+
+_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title>
+<link rel="stylesheet" href="/static/app.css"></head>
+<body>{body}</body></html>"""
+
+_CSS = """body { font-family: sans-serif; margin: 0; }
+#sidebar { position: fixed; left: 0; top: 0; bottom: 0; width: 180px; background: #eee; }
+main { margin-left: 200px; padding: 16px; }
+.user-menu-items { display: none; }
+.user-menu.open .user-menu-items { display: block; }
+.loading-spinner { width: 40px; height: 40px; border: 4px solid #ccc; border-top-color: #333;
+                   border-radius: 50%; animation: spin 1s linear infinite; }
+@keyframes spin { to { transform: rotate(360deg); } }
+.hidden { display: none; }
+"""
+
+_HOME = """<h1>Welcome</h1><a href="/login">Login</a>"""
+
+_LOGIN = """<h1>Login</h1>
+<form method="post" action="/login">
+  <input type="email" name="email" placeholder="Email">
+  <input type="password" name="password" placeholder="Password">
+  <button type="submit" class="login-button">Sign in</button>
+</form>
+{error}"""
+
+_DASHBOARD = """<nav id="sidebar"><a href="/dashboard">Dashboard</a><a href="/form-page">Form</a>
+<span id="profile-menu">Profile</span></nav>
+<main>
+  <h1>Dashboard</h1>
+  <span id="notification-icon">&#128276;</span>
+  <div class="user-menu" onclick="this.classList.toggle('open')">{user}
+    <div class="user-menu-items"><a href="/logout">Logout</a></div>
+  </div>
+</main>"""
+
+_SLOW_PAGE = """<div class="loading-spinner"></div>
+<div class="main-content hidden"><button>Content loaded</button></div>
+<script>
+setTimeout(function () {{
+  document.querySelector('.loading-spinner').classList.add('hidden');
+  document.querySelector('.main-content').classList.remove('hidden');
+}}, {delay});
+</script>"""
+
+_DYNAMIC_PAGE = """<ul id="list"></ul>
+<div id="success-message"></div>
+<button id="submit-button" disabled>Submit</button>
+<script>
+var count = 0;
+var timer = setInterval(function () {{
+  var item = document.createElement('li');
+  item.className = 'list-item';
+  item.textContent = 'Item ' + (++count);
+  document.getElementById('list').appendChild(item);
+  if (count === 10) {{
+    clearInterval(timer);
+    document.getElementById('success-message').textContent = 'Success';
+    document.getElementById('submit-button').removeAttribute('disabled');
+  }}
+}}, {delay});
+</script>"""
+
+_FORM_PAGE = """<input id="input-field" type="text">
+<button id="submit-button" onclick="
+  var msg = document.createElement('div');
+  msg.className = 'success-message';
+  msg.textContent = 'Success: ' + document.getElementById('input-field').value;
+  document.body.appendChild(msg);">Submit</button>"""
+
+_EXAMPLE_PAGE = """<div id="example-element">Example element</div>"""
+
+
+class _Server(http.server.ThreadingHTTPServer):
+    # Load replays open hundreds of connections at once (socketserver's default backlog is 5)
+    request_queue_size = 512
+    daemon_threads = True
+
+
+class StandinApp:
+    """Threaded HTTP server for the stand-in application."""
+
+    def __init__(self, host="127.0.0.1", port=0):
+        """
+        Initialize stand-in app.
+
+        Args:
+            host: Interface to listen on
+            port: Port (a free one if 0)
+        """
+        self.sessions = {}
+        app = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                app.handle(self, "GET")
+
+            def do_POST(self):
+                app.handle(self, "POST")
+
+        self.httpd = _Server((host, port), Handler)
+        self.url = f"http://{host}:{self.httpd.server_port}"
+        self._thread = None
+
+    def start(self):
+        """
+        Serve in a background thread.
+
+        Returns:
+            self
+        """
+        self._thread = threading.Thread(
+            target=self.httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    # --- Request handling ---
+
+    def _user(self, handler):
+        cookie = SimpleCookie(handler.headers.get("Cookie", ""))
+        morsel = cookie.get(SESSION_COOKIE)
+        return self.sessions.get(morsel.value) if morsel else None
+
+    def _send(self, handler, status, body="", content_type="text/html; charset=utf-8", headers=()):
+        payload = body.encode("utf-8")
+        handler.send_response(status)
+        handler.send_header("Content-Type", content_type)
+        handler.send_header("Content-Length", str(len(payload)))
+        for name, value in headers:
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(payload)
+
+    def _page(self, handler, title, body, status=200):
+        self._send(handler, status, _PAGE.format(title=title, body=body))
+
+    def _redirect(self, handler, location, headers=()):
+        self._send(handler, 302, headers=[("Location", location), *headers])
+
+    def handle(self, handler, method):
+        """
+        Route one request.
+
+        Args:
+            handler: BaseHTTPRequestHandler for the request
+            method: "GET" or "POST"
+        """
+        path = handler.path.split("?", 1)[0]
+        user = self._user(handler)
+
+        if path == "/static/app.css":
+            return self._send(handler, 200, _CSS, "text/css")
+        if path == "/":
+            return self._page(handler, "Home", _HOME)
+        if path == "/login" and method == "POST":
+            length = int(handler.headers.get("Content-Length") or 0)
+            form = parse_qs(handler.rfile.read(length).decode("utf-8"))
+            email = form.get("email", [""])[0]
+            password = form.get("password", [""])[0]
+            if USERS.get(email) == password:
+                session_id = secrets.token_hex(16)
+                self.sessions[session_id] = email
+                return self._redirect(handler, "/dashboard",
+                                      [("Set-Cookie", f"{SESSION_COOKIE}={session_id}; Path=/; HttpOnly")])
+            error = '<div class="error-message">Invalid credentials</div>'
+            return self._page(handler, "Login", _LOGIN.format(error=error), status=401)
+        if path == "/login":
+            return self._page(handler, "Login", _LOGIN.format(error=""))
+        if path == "/logout":
+            cookie = SimpleCookie(handler.headers.get("Cookie", ""))
+            if SESSION_COOKIE in cookie:
+                self.sessions.pop(cookie[SESSION_COOKIE].value, None)
+            return self._redirect(handler, "/login",
+                                  [("Set-Cookie", f"{SESSION_COOKIE}=; Path=/; Max-Age=0")])
+
+        # Everything below requires a session
+        protected = {
+            "/dashboard": ("Dashboard", lambda: _DASHBOARD.format(user=user)),
+            "/slow-page": ("Slow page", lambda: _SLOW_PAGE.format(delay=SLOW_PAGE_DELAY_MS)),
+            "/dynamic-page": ("Dynamic page", lambda: _DYNAMIC_PAGE.format(delay=DYNAMIC_ITEM_DELAY_MS)),
+            "/form-page": ("Form page", lambda: _FORM_PAGE),
+            "/example-page": ("Example page", lambda: _EXAMPLE_PAGE),
+        }
+        if path in protected:
+            if user is None:
+                return self._redirect(handler, "/login")
+            title, render = protected[path]
+            return self._page(handler, title, render())
+        return self._page(handler, "Not found", "<h1>Not found</h1>", status=404)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the local stand-in application")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args(argv)
+
+    app = StandinApp(args.host, args.port)
+    print(f"Stand-in app running at {app.url} (Ctrl+C to stop)")
+    try:
+        app.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        app.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
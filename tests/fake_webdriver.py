@@ -0,0 +1,186 @@
+"""
+Minimal in-process W3C WebDriver server for framework unit tests.
+
+Serves a fake page with a few elements so driver-level code (async client,
+connection pooling, profiling) can be tested without Chrome.
+"""
+import http.server
+import json
+import re
+import threading
+import uuid
+
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+
+# css selector -> element properties on the fake page
+ELEMENTS = {
+    '[id="sidebar"]': {"text": "Menu", "displayed": True, "enabled": True},
+    '[name="email"]': {"text": "", "displayed": True, "enabled": True},
+    ".login-button": {"text": "Login", "displayed": True, "enabled": True},
+    ".loading-spinner": {"text": "", "displayed": False, "enabled": True},
+}
+
+# Opaque element ids, as a real driver would hand out
+ELEMENT_IDS = {selector: f"element-{i}" for i, selector in enumerate(ELEMENTS)}
+SELECTORS = {element_id: selector for selector, element_id in ELEMENT_IDS.items()}
+
+
+class FakeWebDriverServer:
+    """Threaded fake WebDriver endpoint on a free localhost port."""
+
+    def __init__(self, port=0):
+        self.sessions = {}
+        self.requests = []
+        self.connections = set()
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def _handle(self, method):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else None
+                server.requests.append((method, self.path))
+                server.connections.add(self.client_address)
+                status, value = server.dispatch(method, self.path, body)
+                payload = json.dumps({"value": value}).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                self._handle("GET")
+
+            def do_POST(self):
+                self._handle("POST")
+
+            def do_DELETE(self):
+                self._handle("DELETE")
+
+        self.httpd = http.server.ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}"
+
+    def start(self):
+        threading.Thread(target=self.httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def dispatch(self, method, path, body):
+        if path == "/status":
+            return 200, {"ready": True, "message": "fake"}
+        if method == "POST" and path == "/session":
+            session_id = uuid.uuid4().hex
+            self.sessions[session_id] = {"url": "about:blank", "cookies": [], "storage": {},
+                                         "windows": ["main"], "window": "main", "logs": {}}
+            return 200, {"sessionId": session_id, "capabilities": {"browserName": "chrome"}}
+
+        match = re.match(r"^/session/(\w+)(/.*)?$", path)
+        if not match or match.group(1) not in self.sessions:
+            return 404, {"error": "invalid session id", "message": path}
+        session = self.sessions[match.group(1)]
+        command = match.group(2) or ""
+
+        if method == "DELETE" and command == "":
+            del self.sessions[match.group(1)]
+            return 200, None
+        if command == "/url":
+            if method == "POST":
+                session["url"] = body["url"]
+                return 200, None
+            return 200, session["url"]
+        if command == "/title":
+            return 200, "Fake Page"
+        if command in ("/element", "/elements"):
+            props = ELEMENTS.get(body["value"])
+            if command == "/elements":
+                return 200, [{ELEMENT_KEY: ELEMENT_IDS[body["value"]]}] if props else []
+            if not props:
+                return 404, {"error": "no such element", "message": f"Unable to locate {body['value']}"}
+            return 200, {ELEMENT_KEY: ELEMENT_IDS[body["value"]]}
+        if command == "/execute/sync":
+            args = body.get("args") or []
+            if args and isinstance(args[0], dict) and ELEMENT_KEY in args[0]:
+                # selenium's isDisplayed atom takes the element only,
+                # its getAttribute atom takes (element, name)
+                props = ELEMENTS[SELECTORS[args[0][ELEMENT_KEY]]]
+                return 200, props["displayed"] if len(args) == 1 else None
+            if "var checks = arguments[0]" in body["script"]:
+                # page_objects.elements batch readiness check
+                return 200, [value in ELEMENTS
+                             and (not visible or ELEMENTS[value]["displayed"])
+                             and (not enabled or ELEMENTS[value]["enabled"])
+                             for _, value, visible, enabled in args[0]]
+            if "readyState" in body["script"]:
+                return 200, "complete"
+            if "jQuery" in body["script"]:
+                return 500, {"error": "javascript error", "message": "jQuery is not defined"}
+            return 200, None
+        if command == "/se/log":
+            # chromedriver hands out new entries once, then forgets them
+            return 200, session["logs"].pop(body["type"], [])
+        if command == "/cookie":
+            if method == "POST":
+                session["cookies"].append(body["cookie"])
+                return 200, None
+            if method == "DELETE":
+                session["cookies"] = []
+                return 200, None
+            return 200, session["cookies"]
+        if command == "/window/handles":
+            return 200, list(session["windows"])
+        if command == "/window/new":
+            handle = f"tab-{uuid.uuid4().hex[:8]}"
+            session["windows"].append(handle)
+            return 200, {"handle": handle, "type": "tab"}
+        if command == "/window":
+            if method == "POST":
+                if body["handle"] not in session["windows"]:
+                    return 404, {"error": "no such window", "message": body["handle"]}
+                session["window"] = body["handle"]
+                return 200, None
+            if method == "DELETE":
+                session["windows"].remove(session["window"])
+                return 200, list(session["windows"])
+            return 200, session["window"]
+        if command == "/screenshot":
+            return 200, "iVBORw0KGgo="
+        if command == "/goog/cdp/execute":
+            session.setdefault("cdp", []).append(body["cmd"])
+            return 200, {}
+
+        element = re.match(r"^/element/(.+?)/(\w+)$", command)
+        if element:
+            props = ELEMENTS[SELECTORS[element.group(1)]]
+            action = element.group(2)
+            if action in ("click", "clear", "value"):
+                return 200, None
+            if action == "rect":
+                return 200, {"x": 10, "y": 20, "width": 100, "height": 30}
+            if action == "attribute":
+                return 200, None
+            return 200, props[action]
+        return 404, {"error": "unknown command", "message": f"{method} {path}"}
+
+
+def main(argv=None):
+    """Serve until killed, taking chromedriver's --port=N argument (stand-in chromedriver executable)."""
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=0)
+    args, _ = parser.parse_known_args(argv)
+    FakeWebDriverServer(args.port).httpd.serve_forever(poll_interval=0.05)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import gzip
+import os
+import time
+
+from utils import artifact_store
+from utils.artifact_store import ArtifactStore
+
+
+def _write(root, relative, size=100, age=0):
+    path = root / relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+    if age:
+        stamp = time.time() - age
+        os.utime(path, (stamp, stamp))
+    return path
+
+
+def test_add_and_query_without_scanning(tmp_path):
+    store = ArtifactStore("run1", root=tmp_path)
+    shot = _write(tmp_path, "artifacts/screenshots/test_login_1.png")
+    store.add("screenshot", shot, test="tests/test_example.py::test_login")
+    store.add("report", _write(tmp_path, "reports/report.html"))
+
+    assert [e["path"] for e in store.entries("screenshot")] == ["artifacts/screenshots/test_login_1.png"]
+    assert store.entries(test="test_login")[0]["run"] == "run1"
+    assert len(store.entries(run_id="run1")) == 2
+    assert store.entries(run_id="other") == []
+
+
+def test_reconcile_and_compress_logs(tmp_path):
+    store = ArtifactStore("run2", root=tmp_path)
+    old_log = _write(tmp_path, "artifacts/logs/test_log_old.log", size=5000, age=3600)
+    _write(tmp_path, "artifacts/logs/test_log_current.log", size=100)
+    _write(tmp_path, "artifacts/videos/test_a.mp4")
+
+    assert store.reconcile() == (3, 0)
+    assert store.compress_logs(min_idle=600) == 1
+
+    assert not old_log.exists()
+    with gzip.open(tmp_path / "artifacts/logs/test_log_old.log.gz") as f:
+        assert f.read() == b"x" * 5000
+    logs = {e["path"]: e for e in store.entries("log")}
+    assert set(logs) == {"artifacts/logs/test_log_old.log.gz", "artifacts/logs/test_log_current.log"}
+    assert logs["artifacts/logs/test_log_old.log.gz"]["size"] < 5000
+
+    (tmp_path / "artifacts/videos/test_a.mp4").unlink()
+    assert store.reconcile() == (0, 1)
+    assert store.entries("video") == []
+
+
+def test_prune_by_age_then_size(tmp_path, monkeypatch):
+    monkeypatch.setattr(artifact_store, "_retention",
+                        lambda artifact_type: {"max_age_days": 1, "max_size_mb": 250 / (1024 * 1024)})
+    store = ArtifactStore("run3", root=tmp_path)
+    expired = _write(tmp_path, "artifacts/screenshots/expired.png", age=2 * 86400)
+    oldest = _write(tmp_path, "artifacts/screenshots/oldest.png", age=300)
+    newer = _write(tmp_path, "artifacts/screenshots/newer.png", age=200)
+    newest = _write(tmp_path, "artifacts/screenshots/newest.png", age=100)
+    store.reconcile()
+
+    deleted = store.prune()
+    assert sorted(e["path"].rsplit("/", 1)[1] for e in deleted) == ["expired.png", "oldest.png"]
+    assert not expired.exists() and not oldest.exists()
+    assert newer.exists() and newest.exists()
+    assert [e["path"] for e in store.entries("screenshot")] == [
+        "artifacts/screenshots/newer.png", "artifacts/screenshots/newest.png"]
+
+    # Superseded and deleted lines are dropped from the index
+    assert store.compact() > 0
+    assert len(store.index_path.read_text().splitlines()) == 2
+
+
+def test_background_maintenance_finishes_before_retention(tmp_path):
+    _write(tmp_path, "artifacts/logs/test_log_old.log", age=3600)
+    store = ArtifactStore("run4", root=tmp_path)
+    store.start_background(min_idle=600)
+    store.finish()
+    assert store.compressed == 1
+    assert "1 old log(s) compressed" in store.summary()
@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+
+from page_objects.async_base_page import AsyncBasePage
+from tests.fake_webdriver import FakeWebDriverServer
+from utils.async_driver import AsyncHTTPPool, AsyncWebDriver, run_concurrent_sessions
+from utils.async_wait_helpers import AsyncCustomWaitHelpers
+
+
+@pytest.fixture
+def webdriver_server():
+    server = FakeWebDriverServer().start()
+    yield server
+    server.stop()
+
+
+def test_page_object_api(webdriver_server):
+    async def scenario():
+        driver = await AsyncWebDriver.create(webdriver_server.url)
+        try:
+            page = AsyncBasePage(driver)
+            await page.navigate_to("https://app.test/dashboard")
+            assert await page.get_current_url() == "https://app.test/dashboard"
+            assert await page.is_displayed(By.ID, "sidebar")
+            assert await page.get_text(By.ID, "sidebar") == "Menu"
+            await page.input_text(By.NAME, "email", "user@example.com")
+            await page.click(By.CLASS_NAME, "login-button")
+            with pytest.raises(NoSuchElementException):
+                await driver.find_element(By.ID, "missing")
+        finally:
+            await driver.quit()
+
+    asyncio.run(scenario())
+    assert webdriver_server.sessions == {}
+
+
+def test_wait_helpers(webdriver_server):
+    async def scenario():
+        driver = await AsyncWebDriver.create(webdriver_server.url)
+        try:
+            helpers = AsyncCustomWaitHelpers(driver, default_timeout=1)
+            assert await helpers.wait_for_page_load()
+            assert await helpers.wait_for_ajax_complete()  # no jQuery on page
+            assert await helpers.wait_for_element_clickable((By.ID, "sidebar"))
+            assert await helpers.wait_until_element_disappears((By.CLASS_NAME, "loading-spinner"))
+            assert await helpers.wait_for_element_count((By.ID, "sidebar"), 1)
+            assert not await helpers.wait_for_text_in_element((By.ID, "sidebar"), "Logout", timeout=0.1)
+        finally:
+            await driver.quit()
+
+    asyncio.run(scenario())
+
+
+def test_many_sessions_share_a_small_connection_pool(webdriver_server):
+    async def dashboard_user(driver, index):
+        page = AsyncBasePage(driver)
+        await page.navigate_to(f"https://app.test/dashboard?user={index}")
+        return await page.is_displayed(By.ID, "sidebar")
+
+    results = asyncio.run(run_concurrent_sessions(webdriver_server.url, 20, dashboard_user, pool_size=4))
+    assert results == [True] * 20
+    # 20 sessions x several commands went over at most 4 keep-alive connections
+    assert len(webdriver_server.connections) <= 4
+    assert webdriver_server.sessions == {}
+
+
+def test_failed_retry_closes_its_connection():
+    class Writer:
+        closed = False
+
+        def close(self):
+            self.closed = True
+
+    pool = AsyncHTTPPool("http://127.0.0.1:1")
+    stale, fresh = (None, Writer()), (None, Writer())
+    pool._idle.append(stale)
+
+    async def open_fresh():
+        return fresh
+
+    async def send(conn, *args):
+        raise ConnectionResetError("reset")
+
+    pool._open, pool._send = open_fresh, send
+    with pytest.raises(ConnectionResetError):
+        asyncio.run(pool.send("GET", "/"))
+    assert stale[1].closed and fresh[1].closed
@@ -0,0 +1,74 @@
+import gzip
+import json
+
+import pytest
+from selenium import webdriver
+
+from tests.fake_webdriver import FakeWebDriverServer
+from utils.browser_logs import BrowserLogBuffer, enable_log_capture, write_failure_logs
+
+
+def _network(method, **params):
+    return {"message": json.dumps({"message": {"method": method, "params": params}}), "level": "INFO"}
+
+
+@pytest.fixture
+def session():
+    server = FakeWebDriverServer().start()
+    driver = webdriver.Remote(command_executor=server.url, options=enable_log_capture(webdriver.ChromeOptions()))
+    yield driver, server.sessions[driver.session_id]["logs"]
+    driver.quit()
+    server.stop()
+
+
+def test_console_and_network_are_summarised(session):
+    driver, logs = session
+    logs["browser"] = [{"level": "SEVERE", "message": "app.js 12 Uncaught TypeError: x is undefined",
+                        "source": "javascript", "timestamp": 1}]
+    logs["performance"] = [
+        _network("Network.requestWillBeSent", requestId="1", timestamp=10.0, type="XHR",
+                 request={"method": "POST", "url": "https://app.test/api/save"}),
+        _network("Network.responseReceived", requestId="1", response={"status": 500}),
+        _network("Network.loadingFinished", requestId="1", timestamp=10.25),
+        _network("Network.requestWillBeSent", requestId="2", timestamp=11.0, type="Script",
+                 request={"method": "GET", "url": "https://cdn.test/lib.js"}),
+        _network("Network.loadingFailed", requestId="2", timestamp=11.5, errorText="net::ERR_NAME_NOT_RESOLVED"),
+        _network("Page.frameNavigated", frame={}),
+    ]
+    buffer = BrowserLogBuffer(driver)
+    assert buffer.drain() == 7
+    assert buffer.drain() == 0  # entries are handed out once
+
+    assert buffer.network[0] == {"method": "POST", "url": "https://app.test/api/save", "type": "XHR",
+                                 "status": 500, "error": None, "start": 10.0, "duration_ms": 250.0}
+    assert buffer.network[1]["error"] == "net::ERR_NAME_NOT_RESOLVED"
+    assert not buffer.in_flight
+
+
+def test_ring_buffers_are_bounded(session):
+    driver, logs = session
+    logs["browser"] = [{"level": "INFO", "message": "m" * 5000, "timestamp": i} for i in range(50)]
+    buffer = BrowserLogBuffer(driver, console_size=10)
+    buffer.drain()
+    assert len(buffer.console) == 10
+    assert buffer.dropped == 40
+    assert buffer.console[-1]["time"] == 49
+    assert len(buffer.console[-1]["message"]) == 500
+
+
+def test_failure_logs_are_written_gzipped(session, tmp_path):
+    driver, logs = session
+    buffer = BrowserLogBuffer(driver, interval=0.01).start()
+    logs["browser"] = [{"level": "WARNING", "message": "deprecated API", "timestamp": 1}]
+    logs["performance"] = [_network("Network.requestWillBeSent", requestId="9", timestamp=1.0, type="XHR",
+                                    request={"method": "GET", "url": "https://app.test/api/slow"})]
+    buffer.stop()
+
+    path, problems = write_failure_logs(buffer, "test_login[admin]", tmp_path)
+    assert path.name.startswith("test_login_admin_") and path.suffix == ".gz"
+    with gzip.open(path, "rt") as f:
+        saved = json.load(f)
+    assert saved["console"][0]["message"] == "deprecated API"
+    assert saved["network"][0]["error"] == "pending"
+    assert problems == ("Console:\n  [WARNING] deprecated API\n"
+                        "Failed requests:\n  GET https://app.test/api/slow -> pending")
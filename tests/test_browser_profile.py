@@ -0,0 +1,101 @@
+import json
+import time
+
+from utils.browser_profile import MANIFEST_NAME, ProfileTemplate
+
+
+class FakeChrome:
+    """Writes what Chrome would leave in a user-data-dir after visiting pages."""
+
+    def __init__(self, user_data_dir):
+        self.user_data_dir = user_data_dir
+        self.capabilities = {"browserVersion": "120.0"}
+        self.visited = []
+
+    def get(self, url):
+        self.visited.append(url)
+        cache = self.user_data_dir / "Default" / "Cache" / "Cache_Data"
+        cache.mkdir(parents=True, exist_ok=True)
+        (cache / f"entry_{len(self.visited)}").write_text(url)
+
+    def quit(self):
+        (self.user_data_dir / "SingletonLock").write_text("host-123")
+        (self.user_data_dir / "Default" / "Sessions").mkdir(parents=True, exist_ok=True)
+        (self.user_data_dir / "Default" / "Cookies").write_text("cookies")
+
+
+def _launcher(launched):
+    def launch(user_data_dir):
+        from pathlib import Path
+        driver = FakeChrome(Path(user_data_dir))
+        launched.append(driver)
+        return driver
+    return launch
+
+
+def test_build_warms_cache_and_strips_session_state(tmp_path):
+    launched = []
+    template = ProfileTemplate("dev", "http://app/", ["/", "/login"], root=tmp_path)
+    assert template.ensure(_launcher(launched))
+
+    assert launched[0].visited == ["http://app/", "http://app/login"]
+    assert (template.path / "First Run").exists()
+    assert len(list((template.path / "Default" / "Cache" / "Cache_Data").iterdir())) == 2
+    for volatile in ("SingletonLock", "Default/Sessions", "Default/Cookies"):
+        assert not (template.path / volatile).exists()
+    manifest = json.loads((template.path / MANIFEST_NAME).read_text())
+    assert manifest["browser_version"] == "120.0"
+
+    # Fresh template is reused
+    assert not template.ensure(_launcher(launched))
+    assert len(launched) == 1
+
+
+def test_template_goes_stale(tmp_path):
+    template = ProfileTemplate("dev", "http://app", ["/"], max_age=60, root=tmp_path)
+    template.build(_launcher([]))
+    assert not template.is_stale("120.0")
+    assert template.is_stale("121.0")
+    assert ProfileTemplate("dev", "http://app", ["/", "/login"], root=tmp_path).is_stale()
+
+    manifest_path = template.path / MANIFEST_NAME
+    manifest = json.loads(manifest_path.read_text())
+    manifest["created"] = time.time() - 120
+    manifest_path.write_text(json.dumps(manifest))
+    assert template.is_stale()
+
+
+def test_clones_are_independent_copies(tmp_path):
+    template = ProfileTemplate("dev", "http://app", ["/"], root=tmp_path)
+    template.build(_launcher([]))
+
+    first, second = template.clone(), template.clone()
+    assert first != second
+    assert template.clone_method in ("reflink", "copy")
+    assert not (first / MANIFEST_NAME).exists()
+    entry = first / "Default" / "Cache" / "Cache_Data" / "entry_1"
+    entry.write_text("changed by the browser")
+    assert (template.path / "Default" / "Cache" / "Cache_Data" / "entry_1").read_text() == "http://app/"
+
+    template.discard(first)
+    assert not first.exists() and second.exists()
+
+
+def test_clone_waits_for_a_rebuild_swap(tmp_path):
+    import threading
+
+    template = ProfileTemplate("dev", "http://app", ["/"], root=tmp_path)
+    template.build(_launcher([]))
+    clones = []
+    with template._locked():  # a rebuild (other worker) is swapping the template in
+        worker = threading.Thread(target=lambda: clones.append(template.clone()))
+        worker.start()
+        worker.join(0.3)
+        assert worker.is_alive() and not clones
+    worker.join(5)
+    assert (clones[0] / "Default" / "Cache" / "Cache_Data" / "entry_1").exists()
+
+    template.build(_launcher([]))  # rebuild replaces the live template
+    assert template.manifest() is not None
+    assert sorted(p.name for p in template.directory.iterdir() if p.name.startswith("template")) == \
+        ["template", "template.lock"]
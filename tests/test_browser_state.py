@@ -0,0 +1,47 @@
+import time
+
+import pytest
+from selenium import webdriver
+
+from tests.fake_webdriver import FakeWebDriverServer
+from utils.browser_state import StateCache, capture_state, restore_state
+
+
+@pytest.fixture
+def remote_driver():
+    server = FakeWebDriverServer().start()
+    driver = webdriver.Remote(command_executor=server.url, options=webdriver.ChromeOptions())
+    yield server, driver
+    driver.quit()
+    server.stop()
+
+
+def test_capture_and_restore(remote_driver):
+    server, driver = remote_driver
+    driver.get("https://app.test/dashboard")
+    driver.add_cookie({"name": "session_id", "value": "abc"})
+    snapshot = capture_state(driver)
+    assert snapshot["url"] == "https://app.test/dashboard"
+    assert [c["name"] for c in snapshot["cookies"]] == ["session_id"]
+
+    driver.delete_all_cookies()
+    driver.get("https://other.test/")
+    expired = {"name": "old", "value": "x", "expiry": int(time.time()) - 10}
+    restore_state(driver, {**snapshot, "cookies": snapshot["cookies"] + [expired]})
+    assert driver.current_url == "https://app.test/dashboard"
+    assert [c["name"] for c in driver.get_cookies()] == ["session_id"]
+
+
+def test_state_cache_per_user_with_ttl(tmp_path):
+    cache = StateCache("dev", "user@example.com", ttl=60, root=tmp_path)
+    assert cache.load("dashboard") is None
+    path = cache.save("dashboard", {"url": "https://app.test/", "created": time.time()})
+    assert path == tmp_path / "dev" / "user@example.com" / "dashboard.json"
+    assert cache.load("dashboard")["url"] == "https://app.test/"
+    # Other users never see it; expired snapshots are ignored
+    assert StateCache("dev", "admin@example.com", root=tmp_path).load("dashboard") is None
+    cache.save("stale", {"url": "https://app.test/", "created": time.time() - 120})
+    assert cache.load("stale") is None
+    assert cache.load("stale", ttl=300) is not None
+    cache.invalidate("dashboard")
+    assert cache.load("dashboard") is None
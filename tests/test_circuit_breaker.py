@@ -0,0 +1,52 @@
+import http.server
+import threading
+
+import pytest
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from utils.circuit_breaker import CircuitBreaker, is_infrastructure_failure, probe_environment
+
+
+@pytest.fixture
+def http_server():
+    """Local server answering 200 on / and 503 on /down."""
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(503 if self.path == "/down" else 200)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+def test_probe_environment(http_server):
+    assert probe_environment(http_server).ok
+    result = probe_environment(http_server, paths=("/", "/down"))
+    assert not result.ok and "503" in result.reason
+    assert not probe_environment("http://127.0.0.1:1", timeout=1).ok
+
+
+def test_breaker_trips_after_consecutive_failures():
+    breaker = CircuitBreaker(threshold=3)
+    breaker.record_failure("a")
+    breaker.record_failure("b")
+    breaker.record_success()
+    breaker.record_failure("c")
+    breaker.record_failure("d")
+    assert not breaker.is_open
+    breaker.record_failure("e")
+    assert breaker.is_open
+    assert "3 consecutive" in breaker.reason and "e" in breaker.reason
+
+
+def test_failure_classification():
+    browser = ["driver", "logged_in_driver"]
+    assert is_infrastructure_failure("setup", browser, TimeoutException("login"))
+    assert is_infrastructure_failure("call", browser, WebDriverException("unknown error: net::ERR_CONNECTION_REFUSED"))
+    assert not is_infrastructure_failure("call", browser, AssertionError("Sidebar should be visible"))
+    assert not is_infrastructure_failure("setup", ["tmp_path"], RuntimeError("boom"))
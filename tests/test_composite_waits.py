@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+
+from utils import async_wait_helpers
+from utils.wait_helpers import (COMPOSITE_SCRIPT, CustomWaitHelpers, element_count, text_in_element,
+                                url_contains, wait_for_conditions)
+
+ITEMS = (By.CLASS_NAME, "list-item")
+SUCCESS = (By.ID, "success-message")
+ERROR = (By.ID, "error-message")
+
+
+class TickDriver:
+    """Answers COMPOSITE_SCRIPT from a schedule: selector (or URL part) -> tick it becomes true."""
+
+    def __init__(self, ready_at):
+        self.ready_at = ready_at
+        self.ticks = 0
+        self.checked = []
+
+    def execute_script(self, script, checks):
+        assert script == COMPOSITE_SCRIPT
+        self.ticks += 1
+        self.checked.append(len(checks))
+        return [self.ticks >= self.ready_at.get(value if value is not None else arg, 99)
+                for _, _, value, arg in checks]
+
+
+def test_all_conditions_share_one_poll_loop():
+    driver = TickDriver({".list-item": 3, '[id="success-message"]': 2, "/dashboard": 1})
+    result = CustomWaitHelpers(driver).wait_for_all({
+        "items": element_count(ITEMS, 10),
+        "success": text_in_element(SUCCESS, "Success"),
+        "url": url_contains("/dashboard"),
+    }, timeout=5)
+
+    assert result and result.first == "url"
+    assert list(result.met) == ["url", "success", "items"]
+    assert result.met["url"] <= result.met["success"] <= result.met["items"] == result.elapsed
+    # One script call per tick, and met conditions are not checked again
+    assert driver.checked == [3, 2, 1]
+
+
+def test_first_of_and_timeout():
+    driver = TickDriver({'[id="error-message"]': 2, '[id="success-message"]': 4})
+    conditions = {"success": text_in_element(SUCCESS, "Success"), "error": text_in_element(ERROR, "Error")}
+    result = wait_for_conditions(driver, conditions, "first", timeout=5, poll=0)
+    assert (result.first, list(result.met)) == ("error", ["error"])
+
+    result = wait_for_conditions(TickDriver({}), {"success": text_in_element(SUCCESS, "Success")}, timeout=0.05)
+    assert not result
+    assert result.pending == ["success"]
+    assert "success: not met" in result.describe()
+
+
+def test_callables_run_in_the_same_loop():
+    calls = []
+
+    def appears_on_second_call(driver):
+        calls.append(1)
+        if len(calls) < 2:
+            raise NoSuchElementException()
+        return True
+
+    driver = TickDriver({'[id="success-message"]': 1})
+    result = wait_for_conditions(driver, {"custom": appears_on_second_call,
+                                          "success": text_in_element(SUCCESS, "Success")}, "all", 5, poll=0)
+    assert result and len(calls) == 2 and driver.ticks == 1
+
+    with pytest.raises(ValueError):
+        wait_for_conditions(driver, {}, "all")
+
+
+def test_async_composite_wait():
+    class AsyncTickDriver(TickDriver):
+        async def execute_script(self, script, checks):
+            return super().execute_script(script, checks)
+
+    driver = AsyncTickDriver({'[id="success-message"]': 2})
+    result = asyncio.run(async_wait_helpers.wait_for_conditions(
+        driver, {"success": text_in_element(SUCCESS, "Success")}, "any", timeout=5, poll=0))
+    assert result.met and driver.ticks == 2
@@ -0,0 +1,66 @@
+import threading
+
+import pytest
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+
+from page_objects.base_page import BasePage
+from tests.fake_webdriver import FakeWebDriverServer
+from utils.connection_pool import LatencyRecorder, configure_connection, percentile
+
+
+@pytest.fixture
+def remote_driver():
+    server = FakeWebDriverServer().start()
+    driver = webdriver.Remote(command_executor=server.url, options=webdriver.ChromeOptions())
+    yield server, driver
+    driver.quit()
+    server.stop()
+
+
+def test_commands_reuse_pooled_connections_and_are_timed(remote_driver):
+    server, driver = remote_driver
+    recorder = LatencyRecorder()
+    assert configure_connection(driver, pool_size=2, recorder=recorder)
+    server.connections.clear()
+
+    page = BasePage(driver)
+    for _ in range(20):
+        page.navigate_to("https://app.test/dashboard")
+        assert page.is_displayed(By.ID, "sidebar")
+
+    assert len(server.connections) == 1
+    summary = recorder.summary()
+    assert summary["get"]["count"] == 20
+    assert summary["findElement"]["count"] == 20
+    assert summary["w3cExecuteScript"]["p99"] >= summary["w3cExecuteScript"]["p50"]  # isDisplayed atom
+    assert "findElement" in recorder.format_summary()
+
+
+def test_instrumenting_twice_records_once(remote_driver):
+    _, driver = remote_driver
+    recorder = LatencyRecorder()
+    configure_connection(driver, recorder=recorder)
+    configure_connection(driver, recorder=recorder)
+    driver.get("https://app.test/")
+    assert recorder.summary()["get"]["count"] == 1
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 99) == 99
+    assert percentile([7], 99) == 7
+    assert percentile([], 50) == 0.0
+
+
+def test_background_thread_commands_are_not_timed(remote_driver):
+    _, driver = remote_driver
+    recorder = LatencyRecorder()
+    configure_connection(driver, recorder=recorder)
+    drain = threading.Thread(target=driver.get, args=("https://app.test/",))
+    drain.start()
+    drain.join()
+    driver.get("https://app.test/")
+    assert recorder.summary()["get"]["count"] == 1
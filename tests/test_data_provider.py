@@ -0,0 +1,75 @@
+import itertools
+
+import pytest
+
+from utils.data_provider import DataBatchFailure, iter_cases, marker_cases, pairwise, run_batch
+
+
+def test_test_data_constants_and_files(tmp_path):
+    assert [case_id for case_id, _ in iter_cases("TEST_USERS", only=["valid_user", "admin_user"])] == \
+        ["valid_user", "admin_user"]
+    assert [row["value"] for _, row in iter_cases("SEARCH_KEYWORDS", limit=2)] == ["selenium", "automation"]
+
+    jsonl = tmp_path / "cases.jsonl"
+    jsonl.write_text('{"id": "a", "q": "x ", "n": 1}\n\n{"q": "x", "n": 2}\n{"q": "y", "n": 3}\n')
+    # Rows equivalent for the columns the test uses are dropped
+    assert [case_id for case_id, _ in iter_cases(str(jsonl), keys=["q"])] == ["a", "line4"]
+    assert len(list(iter_cases(str(jsonl)))) == 3
+    assert [row["email"] for _, row in iter_cases("login_cases.csv", limit=1)] == ["user@example.com"]
+
+
+def test_pairwise_covers_all_pairs():
+    factors = {"a": [1, 2, 3], "b": ["x", "y", "z"], "c": [True, False], "d": ["p", "q"]}
+    rows = list(pairwise(factors))
+    assert len(rows) < 3 * 3 * 2 * 2
+    for first, second in itertools.combinations(factors, 2):
+        covered = {(row[first], row[second]) for row in rows}
+        assert covered == set(itertools.product(factors[first], factors[second]))
+
+
+def test_batch_runs_every_row_and_reports_failures():
+    resets = []
+
+    def check(value):
+        assert value != "automation"
+
+    mark = pytest.mark.data("SEARCH_KEYWORDS").mark
+    _, cases = marker_cases(mark, ["data_row"])
+    with pytest.raises(DataBatchFailure, match="1 of 4 data rows failed") as exc_info:
+        run_batch(lambda data_row: check(data_row["value"]), {}, cases, reset=lambda: resets.append(1))
+    assert [r["outcome"] for r in exc_info.value.data_results] == ["passed", "failed", "passed", "passed"]
+    assert len(resets) == 3
+
+
+def test_marker_cases_project_used_columns():
+    mark = pytest.mark.data(combine={"user": ["valid_user", "admin_user"], "page": ["/a", "/b"]}).mark
+    argnames, cases = marker_cases(mark, ["logged_in_driver", "page"])
+    # Only "page" is used by the test: combinations differing in "user" are equivalent
+    assert argnames == ["page"]
+    assert list(cases) == [("valid_user-/a", {"page": "/a"}), ("valid_user-/b", {"page": "/b"})]
+
+
+def test_falsy_ids_are_kept(tmp_path):
+    jsonl = tmp_path / "ids.jsonl"
+    jsonl.write_text('{"id": 0, "q": "a"}\n{"id": "", "q": "b"}\n{"q": "c"}\n')
+    csv_file = tmp_path / "ids.csv"
+    csv_file.write_text("id,q\n0,a\n,b\n")
+    assert [case_id for case_id, _ in iter_cases(str(jsonl))] == ["0", "", "line3"]
+    assert [case_id for case_id, _ in iter_cases(str(csv_file))] == ["0", ""]
+
+
+def test_batch_reports_pytest_fail_and_skip_per_row():
+    def check(value):
+        if value == "selenium":
+            pytest.skip("not on this browser")
+        if value == "automation":
+            pytest.fail("wrong result")
+
+    _, cases = marker_cases(pytest.mark.data("SEARCH_KEYWORDS").mark, ["data_row"])
+    with pytest.raises(DataBatchFailure, match="1 of 4 data rows failed") as exc_info:
+        run_batch(lambda data_row: check(data_row["value"]), {}, cases)
+    assert [r["outcome"] for r in exc_info.value.data_results] == ["skipped", "failed", "passed", "passed"]
+
+    _, cases = marker_cases(pytest.mark.data("SEARCH_KEYWORDS", limit=2).mark, ["data_row"])
+    with pytest.raises(pytest.skip.Exception, match="All 2 data rows skipped"):
+        run_batch(lambda data_row: pytest.skip("off"), {}, cases)
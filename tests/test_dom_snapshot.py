@@ -0,0 +1,74 @@
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+
+from page_objects.base_page import BasePage
+from utils import dom_snapshot
+from utils.artifact_store import ArtifactStore
+from utils.dom_snapshot import DomSnapshotWriter
+
+PAGE = "<!DOCTYPE html><html><head></head><body><form id=\"login\"></form></body></html>"
+
+
+class FakeDriver:
+    def __init__(self, html=PAGE):
+        self.html = html
+        self.scripts = 0
+
+    def execute_script(self, script, *args):
+        self.scripts += 1
+        return {"url": "http://app/login", "title": "Login", "html": self.html, "nodes": 5, "truncated": False}
+
+
+def test_identical_pages_are_stored_once(tmp_path):
+    store = ArtifactStore("run1", root=tmp_path)
+    writer = DomSnapshotWriter(tmp_path / "artifacts/dom", store=store)
+    driver = FakeDriver()
+    first = writer.capture(driver, (By.ID, "username"), test="t::a")
+    second = writer.capture(driver, None, test="t::b")
+    other = writer.capture(FakeDriver(PAGE.replace("login", "dashboard")), test="t::c")
+    writer.finish()
+
+    assert driver.scripts == 2  # one script call per capture
+    assert first["digest"] == second["digest"] != other["digest"]
+    assert (writer.captured, writer.stored) == (3, 2)
+    assert sorted(p.name for p in (tmp_path / "artifacts/dom").iterdir()) == sorted(
+        [f"{first['digest']}.js", f"{other['digest']}.js", "viewer.html"])
+    assert dom_snapshot.decode(first["path"].read_bytes()) == PAGE
+    assert {e["test"] for e in store.entries("dom_snapshot")} == {"t::b", "t::c"}  # re-added on repeat
+
+
+def test_viewer_link_carries_snapshot_and_locator(tmp_path):
+    writer = DomSnapshotWriter(tmp_path)
+    snapshot = writer.capture(FakeDriver(), (By.CSS_SELECTOR, "#login button"), test="t::a")
+    writer.finish()
+
+    link = urlparse(snapshot["viewer"])
+    assert link.path.endswith("/viewer.html")
+    params = parse_qs(link.fragment)
+    assert params["snapshot"] == [snapshot["digest"]]
+    assert (params["by"], params["value"]) == (["css selector"], ["#login button"])
+    assert "window.domSnapshot" in (tmp_path / "viewer.html").read_text()
+
+
+def test_show_command_decompresses(tmp_path, capsys):
+    writer = DomSnapshotWriter(tmp_path)
+    digest = writer.capture(FakeDriver())["digest"]
+    writer.finish()
+    assert dom_snapshot.main(["show", digest, "--dir", str(tmp_path)]) == 0
+    assert capsys.readouterr().out == PAGE
+
+
+def test_base_page_remembers_failed_locator():
+    class Driver:
+        def find_element(self, by, value):
+            from selenium.common.exceptions import NoSuchElementException
+            raise NoSuchElementException()
+
+    page = BasePage(Driver())
+    page.wait._timeout = 0
+    with pytest.raises(TimeoutException):
+        page.find_element(By.ID, "missing")
+    assert page.driver.failed_locator == (By.ID, "missing")
@@ -0,0 +1,71 @@
+import os
+import stat
+import sys
+from pathlib import Path
+
+import pytest
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+
+from utils.driver_service import DriverService
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="stand-in chromedriver is a shebang script")
+
+
+@pytest.fixture
+def service(tmp_path):
+    # Executable taking chromedriver's --port=N, serving the fake W3C endpoint
+    executable = tmp_path / "chromedriver"
+    executable.write_text(f"#!{sys.executable}\n"
+                          f"import sys\nsys.path.insert(0, {str(PROJECT_ROOT)!r})\n"
+                          "from tests.fake_webdriver import main\nmain(sys.argv[1:])\n")
+    executable.chmod(executable.stat().st_mode | stat.S_IEXEC)
+    started = []
+
+    def factory(options):
+        started.append(Service(executable_path=str(executable)))
+        return started[-1], None
+
+    driver_service = DriverService(factory)
+    driver_service.started = started
+    yield driver_service
+    driver_service.stop()
+
+
+def test_sessions_share_one_process(service):
+    first = service.new_driver(webdriver.ChromeOptions())
+    pid = service.service.process.pid
+    first.get("https://app.test/login")
+    first.quit()
+    second = service.new_driver(webdriver.ChromeOptions())
+    assert second.current_url == "about:blank"
+    second.quit()
+
+    assert service.service.process.pid == pid
+    assert len(service.started) == 1
+    assert service.sessions == 2
+    assert service.summary() == "2 browser session(s) on one shared chromedriver"
+
+
+def test_crashed_process_is_restarted(service):
+    service.new_driver(webdriver.ChromeOptions()).quit()
+    crashed = service.service.process
+    crashed.kill()
+    crashed.wait()
+
+    driver = service.new_driver(webdriver.ChromeOptions())
+    driver.quit()
+    assert service.service.process is not crashed and service.is_running()
+    assert service.restarts == 1
+    assert "restarted 1 time(s)" in service.summary()
+
+
+def test_stop_shuts_down_the_process(service):
+    service.new_driver(webdriver.ChromeOptions()).quit()
+    process = service.service.process
+    service.stop()
+    assert process.poll() is not None
+    assert not service.is_running()
+    service.stop()  # idempotent
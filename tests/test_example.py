@@ -5,6 +5,7 @@ from selenium.webdriver.support import expected_conditions as EC
 from config import BASE_URL
 
 @pytest.mark.example_suite
+@pytest.mark.tab_pool
 def test_example_navigation(logged_in_driver):
     """Example test case - navigate to a page."""
     driver = logged_in_driver
@@ -0,0 +1,112 @@
+from types import SimpleNamespace
+
+import pytest
+from selenium.common.exceptions import TimeoutException
+
+from utils import flaky
+
+
+def test_retry_reuses_fixtures_and_resets_page_state():
+    calls, resets = [], []
+    session = object()
+
+    def flaky_test(logged_in_driver):
+        calls.append(logged_in_driver)
+        if len(calls) < 3:
+            raise TimeoutException("sidebar not visible yet")
+
+    attempts = flaky.run_with_retries(flaky_test, {"logged_in_driver": session}, retries=2,
+                                      reset=lambda: resets.append(True))
+    assert [a["outcome"] for a in attempts] == ["failed", "failed", "passed"]
+    assert calls == [session, session, session]
+    assert len(resets) == 2
+    assert "Attempt 1: failed" in flaky.format_attempts(attempts)
+
+
+def test_non_timing_failures_are_not_retried():
+    calls = []
+
+    def broken_test():
+        calls.append(1)
+        assert False, "real bug"
+
+    with pytest.raises(AssertionError) as excinfo:
+        flaky.run_with_retries(broken_test, {}, retries=3)
+    assert len(calls) == 1
+    assert len(excinfo.value.retry_attempts) == 1
+
+
+def test_retries_exhausted_raises_last_error():
+    def always_times_out():
+        raise TimeoutException("spinner")
+
+    with pytest.raises(TimeoutException) as excinfo:
+        flaky.run_with_retries(always_times_out, {}, retries=1)
+    assert len(excinfo.value.retry_attempts) == 2
+
+
+def test_quarantine_store(tmp_path):
+    store = flaky.QuarantineStore(tmp_path / "quarantine.json")
+    passed = [{"attempt": 1, "outcome": "passed", "duration": 0.1, "error": None}]
+    retried = [{"attempt": 1, "outcome": "failed", "duration": 0.1, "error": "Timeout"}] + \
+              [{"attempt": 2, "outcome": "passed", "duration": 0.1, "error": None}]
+
+    for attempts in (passed, retried, passed):
+        store.record("t::flaky", attempts)
+    for _ in range(3):
+        store.record("t::stable", passed)
+    store.save()
+
+    reloaded = flaky.QuarantineStore(tmp_path / "quarantine.json")
+    assert reloaded.flake_rate("t::flaky") == pytest.approx(1 / 3)
+    assert reloaded.quarantined() == {"t::flaky"}
+
+
+def test_marker_retries_positional_or_keyword():
+    assert flaky.marker_retries(pytest.mark.flaky(3).mark, 0) == 3
+    assert flaky.marker_retries(pytest.mark.flaky(retries=2).mark, 0) == 2
+    assert flaky.marker_retries(pytest.mark.flaky.mark, 0) == 1
+    assert flaky.marker_retries(pytest.mark.flaky.mark, 4) == 4
+
+
+def test_skips_are_not_recorded_as_attempts():
+    calls = []
+
+    def skipped_on_retry():
+        calls.append(1)
+        if len(calls) == 1:
+            raise TimeoutException("spinner")
+        pytest.skip("feature disabled")
+
+    with pytest.raises(pytest.skip.Exception) as excinfo:
+        flaky.run_with_retries(skipped_on_retry, {}, retries=2)
+    assert len(calls) == 2
+    assert not hasattr(excinfo.value, "retry_attempts")
+
+    with pytest.raises(pytest.fail.Exception) as excinfo:
+        flaky.run_with_retries(lambda: pytest.fail("broken"), {}, retries=2)
+    assert [a["outcome"] for a in excinfo.value.retry_attempts] == ["failed"]
+
+
+def test_shards_are_cut_before_the_per_machine_quarantine(monkeypatch):
+    import conftest
+
+    class Config:
+        def __init__(self, shard_index):
+            self.options = {"impact_base": None, "shard_count": 2, "shard_index": shard_index,
+                            "group_fixtures": False, "durations_file": None, "quarantine": "skip"}
+            self.hook = SimpleNamespace(pytest_deselected=lambda items: None)
+
+        def getoption(self, name):
+            return self.options[name]
+
+    nodeids = [f"tests/test_x.py::test_{i}" for i in range(8)]
+    ran = []
+    # Each machine has seen different flaky tests
+    for shard_index, flaky_here in ((0, {nodeids[0], nodeids[1]}), (1, {nodeids[2]})):
+        monkeypatch.setattr(flaky.QuarantineStore, "quarantined", lambda self, known=flaky_here: known)
+        items = [SimpleNamespace(nodeid=nodeid, fixturenames=["driver"]) for nodeid in nodeids]
+        conftest.pytest_collection_modifyitems(Config(shard_index), items)
+        ran += [item.nodeid for item in items]
+    assert len(ran) == len(set(ran))
+    assert set(nodeids) - set(ran) <= {nodeids[0], nodeids[1], nodeids[2]}
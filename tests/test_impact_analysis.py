@@ -0,0 +1,241 @@
+import textwrap
+
+from utils import impact_analysis
+
+CONFTEST = '''
+import pytest
+from utils.helpers import helper
+
+@pytest.fixture
+def driver(request):
+    yield "driver"
+
+@pytest.fixture
+def logged_in_driver(request):
+    driver = request.getfixturevalue("driver")
+    _login(driver)
+    yield driver
+
+def _login(driver):
+    from utils.session import restore
+    restore(driver)
+
+def pytest_runtest_call(item):
+    from utils.optional import feature
+    feature()
+'''
+
+BASE_PAGE = '''
+class BasePage:
+    def click(self):
+        pass
+
+    def get_text(self):
+        pass
+'''
+
+LOGIN_PAGE = '''
+from page_objects.base_page import BasePage
+
+class LoginPage(BasePage):
+    LOGIN_LINK = ("link text", "Login")
+
+    def login(self):
+        self.click()
+
+    def get_error_message(self):
+        return self.get_text()
+'''
+
+TEST_DATA = '''
+TEST_USERS = {
+    "valid_user": {
+        "email": "user@example.com",
+    },
+    "invalid_user": {
+        "email": "invalid@example.com",
+    },
+}
+'''
+
+TESTS = '''
+import pytest
+from page_objects.login_page import LoginPage
+from tests.test_data import TEST_USERS
+
+@pytest.mark.login_suite
+def test_valid(driver):
+    LoginPage().login()
+    TEST_USERS["valid_user"]
+
+def test_invalid(driver):
+    LoginPage().get_error_message()
+    TEST_USERS["invalid_user"]
+
+def test_config(logged_in_driver):
+    assert True
+'''
+
+
+def _project(tmp_path):
+    files = {
+        "conftest.py": CONFTEST,
+        "utils/__init__.py": "",
+        "utils/helpers.py": "def helper():\n    pass\n",
+        "utils/session.py": "def restore(driver):\n    pass\n",
+        "utils/optional.py": "from page_objects.login_page import LoginPage\n\ndef feature():\n    pass\n",
+        "page_objects/__init__.py": "",
+        "page_objects/base_page.py": BASE_PAGE,
+        "page_objects/login_page.py": LOGIN_PAGE,
+        "tests/__init__.py": "",
+        "tests/test_data.py": TEST_DATA,
+        "tests/test_login.py": TESTS,
+    }
+    for rel, content in files.items():
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(textwrap.dedent(content))
+    index = impact_analysis.load_index(tmp_path / "missing.json")
+    impact_analysis.update_index(index, tmp_path)
+    return index
+
+
+def _line_of(tmp_path, rel, text):
+    lines = (tmp_path / rel).read_text().splitlines()
+    return next(i for i, line in enumerate(lines, 1) if text in line)
+
+
+def test_page_object_method_change_selects_its_users(tmp_path):
+    index = _project(tmp_path)
+    line = _line_of(tmp_path, "page_objects/login_page.py", "self.click()")
+    selected, _ = impact_analysis.select_tests(index, {"page_objects/login_page.py": {line}})
+    # Statically both tests use LoginPage
+    assert selected == ["tests/test_login.py::test_invalid", "tests/test_login.py::test_valid"]
+
+    # Runtime coverage narrows it to the test that called login()
+    index["coverage"] = {
+        "tests/test_login.py::test_valid": ["page_objects/login_page.py::LoginPage.login"],
+        "tests/test_login.py::test_invalid": ["page_objects/login_page.py::LoginPage.get_error_message"],
+    }
+    selected, _ = impact_analysis.select_tests(index, {"page_objects/login_page.py": {line}})
+    assert selected == ["tests/test_login.py::test_valid"]
+
+
+def test_test_data_key_change(tmp_path):
+    index = _project(tmp_path)
+    line = _line_of(tmp_path, "tests/test_data.py", "invalid@example.com")
+    selected, reasons = impact_analysis.select_tests(index, {"tests/test_data.py": {line}})
+    assert selected == ["tests/test_login.py::test_invalid"]
+    assert "TEST_USERS.invalid_user" in reasons[selected[0]]
+
+
+def test_fixture_change_follows_fixture_dependencies(tmp_path):
+    index = _project(tmp_path)
+    line = _line_of(tmp_path, "conftest.py", 'yield "driver"')
+    selected, _ = impact_analysis.select_tests(index, {"conftest.py": {line}})
+    assert len(selected) == 3
+
+    # logged_in_driver requests driver via request.getfixturevalue()
+    line = _line_of(tmp_path, "conftest.py", "yield driver")
+    selected, _ = impact_analysis.select_tests(index, {"conftest.py": {line}})
+    assert selected == ["tests/test_login.py::test_config"]
+
+
+def test_global_and_unrelated_changes(tmp_path):
+    index = _project(tmp_path)
+    # Modules imported by conftest affect everything
+    selected, _ = impact_analysis.select_tests(index, {"utils/helpers.py": {1}})
+    assert len(selected) == 3
+    selected, _ = impact_analysis.select_tests(index, {"README.md": None})
+    assert selected == []
+
+
+def test_conftest_lazy_imports_are_not_global(tmp_path):
+    index = _project(tmp_path)
+    # Imported inside a hook: only tests that import it themselves
+    selected, _ = impact_analysis.select_tests(index, {"utils/optional.py": None})
+    assert selected == []
+    selected, _ = impact_analysis.select_tests(index, {"page_objects/login_page.py": None})
+    assert selected == ["tests/test_login.py::test_invalid", "tests/test_login.py::test_valid"]
+    # Imported by a helper of a fixture: the tests using that fixture
+    selected, reasons = impact_analysis.select_tests(index, {"utils/session.py": None})
+    assert selected == ["tests/test_login.py::test_config"]
+    assert reasons[selected[0]] == "fixture dependency changed: utils/session.py"
+
+
+def test_data_marker_sources_are_dependencies(tmp_path):
+    index = _project(tmp_path)
+    (tmp_path / "tests/test_cases.py").write_text(textwrap.dedent('''
+        import pytest
+
+        @pytest.mark.data("login_cases.csv", batch=True)
+        def test_from_csv(driver, email):
+            pass
+
+        @pytest.mark.data("TEST_USERS", only=["valid_user"])
+        def test_from_constant(driver, email):
+            pass
+        '''))
+    impact_analysis.update_index(index, tmp_path)
+
+    selected, reasons = impact_analysis.select_tests(index, {"tests/data/login_cases.csv": None})
+    assert selected == ["tests/test_cases.py::test_from_csv"]
+    assert reasons[selected[0]] == "data file changed: tests/data/login_cases.csv"
+    line = _line_of(tmp_path, "tests/test_data.py", "user@example.com")
+    selected, _ = impact_analysis.select_tests(index, {"tests/test_data.py": {line}})
+    assert selected == ["tests/test_cases.py::test_from_constant", "tests/test_login.py::test_valid"]
+
+
+def test_index_is_updated_incrementally(tmp_path):
+    index = _project(tmp_path)
+    assert impact_analysis.update_index(index, tmp_path) == []
+    (tmp_path / "tests/test_login.py").write_text(textwrap.dedent(TESTS) + "\ndef test_new():\n    pass\n")
+    assert impact_analysis.update_index(index, tmp_path) == ["tests/test_login.py"]
+    assert "test_new" in index["files"]["tests/test_login.py"]["analysis"]["tests"]
+
+
+def test_parse_diff():
+    diff = textwrap.dedent('''\
+        diff --git a/page_objects/login_page.py b/page_objects/login_page.py
+        --- a/page_objects/login_page.py
+        +++ b/page_objects/login_page.py
+        @@ -10,2 +10,3 @@ class LoginPage(BasePage):
+        @@ -20 +21,0 @@ class LoginPage(BasePage):
+        diff --git a/old.py b/old.py
+        --- a/old.py
+        +++ /dev/null
+        @@ -1,3 +0,0 @@
+        ''')
+    changes = impact_analysis.parse_diff(diff)
+    assert changes["page_objects/login_page.py"] == {10, 11, 12, 21}
+    assert changes["old.py"] is None
+
+
+def test_page_object_change_in_this_repo_selects_only_its_dependents(tmp_path):
+    # conftest loads utils.soak / utils.locator_profiler lazily; their imports must not make page objects global
+    index = impact_analysis.build_index(index_path=tmp_path / "index.json")
+    all_tests = [f"{rel}::{name}" for rel, entry in index["files"].items() for name in entry["analysis"]["tests"]]
+    selected, reasons = impact_analysis.select_tests(index, {"page_objects/login_page.py": None})
+
+    assert selected and len(selected) < len(all_tests)
+    assert all(reason.startswith("dependency changed: page_objects/login_page.py") for reason in reasons.values())
+    files = {nodeid.split("::")[0] for nodeid in selected}
+    assert "tests/test_pom_example.py" in files
+    assert not {"tests/test_startup.py", "tests/test_artifact_store.py", "tests/test_impact_analysis.py"} & files
+
+
+def test_driver_fixture_change_in_this_repo_selects_logged_in_driver_tests(tmp_path):
+    index = impact_analysis.build_index(index_path=tmp_path / "index.json")
+    conftest = index["files"]["conftest.py"]["analysis"]
+    assert "driver" in conftest["fixtures"]["logged_in_driver"]
+
+    line = _line_of(impact_analysis.PROJECT_ROOT, "conftest.py", "def driver(")
+    selected, reasons = impact_analysis.select_tests(index, {"conftest.py": {line + 1}})
+    assert "tests/test_pom_example.py::test_dashboard_elements" in selected
+    assert reasons["tests/test_pom_example.py::test_dashboard_elements"] == "fixture changed: driver"
+
+
+def test_data_file_change_in_this_repo_selects_its_data_driven_tests(tmp_path):
+    index = impact_analysis.build_index(index_path=tmp_path / "index.json")
+    selected, _ = impact_analysis.select_tests(index, {"tests/data/login_cases.csv": None})
+    assert selected and all(nodeid.startswith("tests/test_with_enhancements.py::") for nodeid in selected)
@@ -0,0 +1,95 @@
+import asyncio
+import json
+
+from standin_app.server import StandinApp
+from tests.test_data import TEST_USERS
+from utils.artifact_store import ArtifactStore
+from utils.load_replay import LoadReport, parse_network_events, parameterize, percentiles, replay, save_report
+
+BASE = "http://app.test"
+FORM = "application/x-www-form-urlencoded"
+
+
+def event(method, **params):
+    return {"message": json.dumps({"message": {"method": method, "params": params}})}
+
+
+def sent(request_id, url, kind="Document", method="GET", body=None, headers=None, redirect=None):
+    request = {"url": url, "method": method, "headers": headers or {}}
+    if body is not None:
+        request["postData"] = body
+    params = {"requestId": request_id, "type": kind, "request": request}
+    if redirect:
+        params["redirectResponse"] = {"status": redirect}
+    return event("Network.requestWillBeSent", **params)
+
+
+def received(request_id, status):
+    return event("Network.responseReceived", requestId=request_id, response={"status": status})
+
+
+def login_recording():
+    """Performance log of opening /login and submitting the form, as chromedriver reports it."""
+    login = "email=user%40example.com&password=password123"
+    open_login = [sent("1", f"{BASE}/login"), received("1", 200),
+                  sent("2", f"{BASE}/static/app.css", kind="Stylesheet"), received("2", 200),
+                  sent("3", "https://cdn.other/analytics.js", kind="Script")]
+    submit = [sent("4", f"{BASE}/login", method="POST", body=login,
+                   headers={"Content-Type": FORM, "Cookie": "session_id=recorded", "Origin": BASE}),
+              sent("4", f"{BASE}/dashboard", redirect=302), received("4", 200)]
+    dashboard = [sent("5", f"{BASE}/dashboard"), received("5", 200)]
+    logout = [sent("6", f"{BASE}/logout"), sent("6", f"{BASE}/login", redirect=302), received("6", 200)]
+    steps = {"open login": open_login, "login": submit, "dashboard": dashboard, "logout": logout}
+    return {"journey": "login_dashboard", "recorded_from": BASE, "steps": [
+        {"name": name, "requests": parameterize(parse_network_events(events, BASE), TEST_USERS)}
+        for name, events in steps.items()]}
+
+
+def test_recording_keeps_app_requests_and_parameterizes_credentials():
+    steps = {step["name"]: step["requests"] for step in login_recording()["steps"]}
+
+    assert [(r["method"], r["path"], r["status"]) for r in steps["open login"]] == [("GET", "/login", 200)]
+    post, redirected = steps["login"]
+    assert (post["path"], post["status"], redirected["path"]) == ("/login", 302, "/dashboard")
+    assert post["body"] == "email={{email}}&password={{password}}"
+    # Session cookies come from each virtual user's jar, never from the recording
+    assert post["headers"] == {"Content-Type": FORM}
+
+
+def test_percentiles_nearest_rank():
+    assert percentiles(list(range(1, 101))) == {50: 50, 90: 90, 95: 95, 99: 99}
+    assert percentiles([7]) == {50: 7, 90: 7, 95: 7, 99: 7}
+    assert percentiles([]) == {}
+
+
+def test_replay_against_standin_app(tmp_path):
+    accounts = [TEST_USERS["valid_user"], TEST_USERS["admin_user"]]
+    app = StandinApp().start()
+    try:
+        report = asyncio.run(replay(login_recording(), app.url, users=100, iterations=2, accounts=accounts))
+    finally:
+        app.stop()
+
+    summary = report.to_dict()
+    assert summary["errors"] == 0, summary["error_samples"]
+    assert summary["iterations"] == 200 and summary["requests"] == 200 * 6
+    assert list(summary["steps"]) == ["open login", "login", "dashboard", "logout"]
+    assert all(stats["count"] == 200 and stats["p50"] <= stats["p99"] for stats in summary["steps"].values())
+
+    path = save_report(report, tmp_path / "artifacts/load", ArtifactStore("run1", root=tmp_path))
+    assert json.loads(path.read_text())["users"] == 100
+    assert "login" in report.format()
+
+
+def test_replay_flags_status_changes():
+    recording = login_recording()
+    recording["steps"] = recording["steps"][1:3]  # login with a wrong password
+    app = StandinApp().start()
+    try:
+        report = asyncio.run(replay(recording, app.url, users=3, accounts=[TEST_USERS["invalid_user"]]))
+    finally:
+        app.stop()
+
+    assert isinstance(report, LoadReport)
+    assert report.errors == {"login": 6, "dashboard": 3}
+    assert "recorded 302" in report.error_samples[0]
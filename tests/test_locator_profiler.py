@@ -0,0 +1,108 @@
+import json
+
+import pytest
+from selenium.webdriver.common.by import By
+
+from page_objects.base_page import BasePage
+from page_objects.elements import Element
+from utils.locator_profiler import PROFILE_SCRIPT, LocatorBudgetExceeded, LocatorProfiler, page_classes
+
+
+class ProfiledPage(BasePage):
+    LINK = Element(By.LINK_TEXT, "Logout")
+    TITLE = Element(By.TAG_NAME, "h1")
+    FIELD = Element(By.ID, "email")
+    MISSING = Element(By.CLASS_NAME, "error-message")
+
+
+# compiled locator -> what PROFILE_SCRIPT measures in the page
+MEASURED = {
+    ("link text", "Logout"): {"count": 1, "ms": 0.8, "suggestion": ["id", "logout"], "suggestion_ms": 0.002},
+    ("css selector", "h1"): {"count": 3, "ms": 0.004, "suggestion": ["css selector", "#main > h1"],
+                             "suggestion_ms": 0.003},
+    ("css selector", '[id="email"]'): {"count": 1, "ms": 0.002, "suggestion": ["id", "email"],
+                                       "suggestion_ms": 0.002},
+    ("css selector", ".error-message"): {"count": 0, "ms": 0.003, "suggestion": None, "suggestion_ms": None},
+}
+
+
+class FakeDriver:
+    def __init__(self, url="http://app/dashboard"):
+        self.current_url = url
+        self.scripts = 0
+
+    def execute_script(self, script, checks, repeats):
+        assert script == PROFILE_SCRIPT
+        self.scripts += 1
+        return {"nodes": 120, "results": [MEASURED[tuple(check)] for check in checks]}
+
+    def find_element(self, by, value):
+        return object()
+
+
+def test_ranking_and_suggestions():
+    profiler = LocatorProfiler()
+    profiler.observe(ProfiledPage(FakeDriver()))
+
+    ranked = profiler.ranked()
+    assert [stat["element"] for stat in ranked] == ["LINK", "TITLE", "MISSING", "FIELD"]
+    suggestions = {stat["element"]: profiler.suggestion(stat) for stat in ranked}
+    # Slow strategy and ambiguous match get a suggestion; an id that is already fast does not
+    assert suggestions == {"LINK": ("id", "logout"), "TITLE": ("css selector", "#main > h1"),
+                           "MISSING": None, "FIELD": None}
+    assert "-> id='logout'" in profiler.format()
+
+
+def test_each_page_class_is_profiled_once_per_path():
+    profiler = LocatorProfiler()
+    driver = FakeDriver()
+    page = ProfiledPage(driver)
+    driver.locator_profiler = profiler
+    page.FIELD.find(wait="none")
+    page.TITLE.find(wait="none")
+    ProfiledPage(driver).FIELD.find(wait="none")
+    assert driver.scripts == 1
+
+    driver.current_url = "http://app/settings?tab=1"
+    ProfiledPage(driver).FIELD.find(wait="none")
+    assert driver.scripts == 2
+    assert set(profiler.pages) == {("ProfiledPage", "/dashboard"), ("ProfiledPage", "/settings")}
+
+
+def test_strict_mode_fails_over_budget():
+    profiler = LocatorProfiler(budget_ms=0.5, strict=True)
+    with pytest.raises(LocatorBudgetExceeded, match="LINK"):
+        profiler.observe(ProfiledPage(FakeDriver()))
+    assert [stat["element"] for stat in profiler.violations] == ["LINK"]
+
+    lenient = LocatorProfiler(budget_ms=0.5)
+    lenient.observe(ProfiledPage(FakeDriver()))
+    assert len(lenient.violations) == 1
+
+
+def test_report_lists_unprofiled_page_objects(tmp_path):
+    profiler = LocatorProfiler()
+    profiler.observe(ProfiledPage(FakeDriver()))
+    data = json.loads(profiler.save(tmp_path).read_text())
+
+    assert {"LoginPage", "DashboardPage", "ProfiledPage"} <= set(page_classes())
+    assert "LoginPage.LOGIN_LINK" in data["unprofiled"]
+    assert data["locators"][0]["suggested"] == ["id", "logout"]
+
+
+def test_page_object_is_profiled_again_after_navigating():
+    driver = FakeDriver("http://app/")
+    driver.locator_profiler = LocatorProfiler()
+    page = ProfiledPage(driver)
+    page.LINK.find(wait="none")  # e.g. LoginPage.LOGIN_LINK on the home page
+    driver.current_url = "http://app/login"
+    page.FIELD.find(wait="none")
+    assert set(driver.locator_profiler.pages) == {("ProfiledPage", "/"), ("ProfiledPage", "/login")}
+
+
+def test_strict_failure_is_not_swallowed_by_is_displayed():
+    driver = FakeDriver()
+    driver.find_element = lambda by, value: type("Found", (), {"is_displayed": lambda self: True})()
+    driver.locator_profiler = LocatorProfiler(budget_ms=0.5, strict=True)
+    with pytest.raises(LocatorBudgetExceeded):
+        ProfiledPage(driver).FIELD.is_displayed()
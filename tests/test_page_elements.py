@@ -0,0 +1,72 @@
+import time
+
+import pytest
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+
+from page_objects.base_page import BasePage
+from page_objects.dashboard_page import DashboardPage
+from page_objects.elements import Element
+from tests.fake_webdriver import FakeWebDriverServer
+
+
+class FakePage(BasePage):
+    SIDEBAR = Element(By.ID, "sidebar", cache=True, group="ready")
+    EMAIL = Element(By.NAME, "email", wait="visible", group=("ready", "form"))
+    SPINNER = Element(By.CLASS_NAME, "loading-spinner", wait="visible", timeout=0.3, group="loading")
+    LOGIN_BUTTON = (By.CLASS_NAME, "login-button")
+
+
+@pytest.fixture
+def remote_driver():
+    server = FakeWebDriverServer().start()
+    driver = webdriver.Remote(command_executor=server.url, options=webdriver.ChromeOptions())
+    yield server, driver
+    driver.quit()
+    server.stop()
+
+
+def test_elements_compiled_per_class():
+    assert list(FakePage._element_map) == ["SIDEBAR", "EMAIL", "SPINNER", "LOGIN_BUTTON"]
+    assert FakePage._element_groups == {"ready": ("SIDEBAR", "EMAIL"), "form": ("EMAIL",), "loading": ("SPINNER",)}
+    # Plain tuples are upgraded but still behave like tuples
+    assert isinstance(FakePage.LOGIN_BUTTON, Element)
+    assert FakePage.LOGIN_BUTTON == (By.CLASS_NAME, "login-button")
+    assert FakePage.SIDEBAR.compiled == (By.CSS_SELECTOR, '[id="sidebar"]')
+    assert DashboardPage._element_groups["ready"] == ("SIDEBAR", "PAGE_TITLE")
+
+
+def test_accessors_and_batched_readiness(remote_driver):
+    server, driver = remote_driver
+    page = FakePage(driver)
+    by, value = page.SIDEBAR
+    assert (by, value) == (By.ID, "sidebar")
+    assert page.SIDEBAR.get_text() == "Menu"
+    assert page.EMAIL.is_displayed()
+    page.LOGIN_BUTTON.click()
+    assert not page.SPINNER.is_displayed()
+
+    # Cached elements are looked up once
+    finds = len([r for r in server.requests if r[1].endswith("/element")])
+    page.SIDEBAR.get_text()
+    assert len([r for r in server.requests if r[1].endswith("/element")]) == finds
+
+    assert page.check_ready() == {"SIDEBAR": True, "EMAIL": True}
+    requests = len(server.requests)
+    page.wait_until_ready()
+    assert len(server.requests) == requests + 1
+    assert not page.is_ready("loading")
+    with pytest.raises(TimeoutException, match="SPINNER"):
+        page.wait_until_ready("loading", timeout=0.3)
+
+
+def test_is_displayed_does_not_wait_for_visibility(remote_driver):
+    _, driver = remote_driver
+
+    class HiddenErrorPage(BasePage):
+        ERROR = Element(By.CLASS_NAME, "loading-spinner", wait="visible", timeout=5)
+
+    start = time.perf_counter()
+    assert not HiddenErrorPage(driver).ERROR.is_displayed()
+    assert time.perf_counter() - start < 2
@@ -0,0 +1,101 @@
+import json
+import xml.etree.ElementTree as ET
+
+from utils import parallel_runner
+from utils.parallel_runner import Autoscaler
+
+IDLE = {"load": 0.1, "memory_mb": 16000}
+
+
+def _autoscaler(tmp_path=None, **kwargs):
+    settings = dict(max_workers=4, browser_memory_mb=500, memory_reserve_mb=1000, high_load=0.9, low_load=0.6,
+                    timeout_rate_limit=0.1, launch_interval=2.0, adjust_interval=5.0)
+    settings.update(kwargs)
+    return Autoscaler(log_path=tmp_path / "decisions.jsonl" if tmp_path else None, **settings)
+
+
+def test_ramps_up_while_idle_up_to_max_workers():
+    scaler = _autoscaler()
+    targets = [scaler.decide(IDLE, active=scaler.target, now=t * 5.0) for t in range(6)]
+    assert targets == [2, 3, 4, 4, 4, 4]
+
+
+def test_memory_limits_capacity():
+    scaler = _autoscaler()
+    # 2000 MB free - 1000 reserve = room for 2 more browsers next to the running one
+    assert scaler.capacity({"load": 0.1, "memory_mb": 2000}, active=1) == 3
+    scaler.target = 4
+    assert scaler.decide({"load": 0.1, "memory_mb": 1200}, active=1, now=0.0) == 1
+
+
+def test_shrinks_under_cpu_pressure_and_throttles_launches(tmp_path):
+    scaler = _autoscaler(tmp_path)
+    scaler.target = 4
+    assert scaler.decide({"load": 1.5, "memory_mb": 16000}, active=4, now=0.0) == 3
+    # No further change until the adjust interval has passed
+    assert scaler.decide({"load": 1.5, "memory_mb": 16000}, active=4, now=1.0) == 3
+    assert scaler.decide({"load": 1.5, "memory_mb": 16000}, active=3, now=5.0) == 2
+
+    scaler.launched(now=10.0)
+    assert scaler.current_launch_interval() == 4.0
+    assert not scaler.may_launch(active=1, now=12.0)
+    assert scaler.may_launch(active=1, now=14.0)
+    assert not scaler.may_launch(active=2, now=14.0)
+
+    decisions = [json.loads(line) for line in open(tmp_path / "decisions.jsonl")]
+    assert [d["target"] for d in decisions] == [3, 2]
+    assert decisions[0]["reason"] == "pressure: cpu load 1.50"
+
+
+def test_timeout_rate_counts_as_pressure():
+    scaler = _autoscaler()
+    scaler.target = 3
+    scaler.record(tests=8, timeouts=2)
+    assert scaler.timeout_rate == 0.25
+    assert scaler.decide(IDLE, active=3, now=0.0) == 2
+    assert scaler.decisions[-1]["reason"] == "pressure: timeout rate 25%"
+
+
+def test_parse_junit_counts_wait_timeouts(tmp_path):
+    report = tmp_path / "chunk.xml"
+    report.write_text(
+        '<testsuites><testsuite>'
+        '<testcase name="a"/>'
+        '<testcase name="b"><failure message="selenium.common.exceptions.TimeoutException: Message:"/></testcase>'
+        '<testcase name="c"><failure message="AssertionError">assert 1 == 2</failure></testcase>'
+        '</testsuite></testsuites>')
+    assert parallel_runner.parse_junit(report) == {"tests": 3, "failed": 2, "timeouts": 1}
+    assert parallel_runner.parse_junit(tmp_path / "missing.xml") == {"tests": 0, "failed": 0, "timeouts": 0}
+
+
+def test_read_available_memory(tmp_path):
+    meminfo = tmp_path / "meminfo"
+    meminfo.write_text("MemTotal:       16384000 kB\nMemAvailable:    8192000 kB\n")
+    assert parallel_runner.read_available_memory_mb(meminfo) == 8000
+    assert parallel_runner.read_available_memory_mb(tmp_path / "missing") is None
+
+
+def test_failed_collection_is_not_a_green_run(tmp_path, capsys):
+    result = parallel_runner.run(["--no-such-option"], run_dir=tmp_path, sampler=lambda: IDLE)
+    assert result["exit_code"] == 4 and result["chunks"] == 0  # pytest usage error
+    assert "--no-such-option" in capsys.readouterr().err
+
+
+def test_worker_args_drop_test_paths():
+    args = ["-m", "example_suite", "tests/test_scheduler.py::test_plan", "tests", "-k", "login",
+            "--deselect", "tests/test_flaky.py", "--durations-file=ci/durations.json"]
+    assert parallel_runner.worker_args(args) == ["-m", "example_suite", "-k", "login",
+                                                 "--deselect", "tests/test_flaky.py",
+                                                 "--durations-file=ci/durations.json"]
+
+
+def test_each_test_runs_exactly_once(tmp_path):
+    args = ["-q", "tests/test_scheduler.py"]
+    collected = parallel_runner.collect(args)
+    result = parallel_runner.run(args, chunk_size=2, run_dir=tmp_path, sampler=lambda: IDLE)
+
+    ran = []
+    for junit in sorted(tmp_path.glob("chunk_*.xml")):
+        ran += [case.get("name") for case in ET.parse(junit).getroot().iter("testcase")]
+    assert result["exit_code"] == 0
+    assert result["tests"] == len(collected) == len(ran) == len(set(ran))
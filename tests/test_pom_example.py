@@ -42,6 +42,7 @@ def test_login_with_invalid_credentials(driver):
     print("--- Test: Invalid login handled correctly (POM) ---")
 
 @pytest.mark.dashboard_suite
+@pytest.mark.tab_pool
 def test_dashboard_elements(logged_in_driver):
     """Test dashboard page elements using Page Object Model."""
     
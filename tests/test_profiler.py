@@ -0,0 +1,70 @@
+import time
+import threading
+
+import pytest
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+
+from page_objects.login_page import LoginPage
+from tests.fake_webdriver import FakeWebDriverServer
+from utils.profiler import CommandProfiler
+from utils.wait_helpers import CustomWaitHelpers
+
+
+@pytest.fixture
+def profiled():
+    server = FakeWebDriverServer().start()
+    driver = webdriver.Remote(command_executor=server.url, options=webdriver.ChromeOptions())
+    profiler = CommandProfiler()
+    profiler.instrument(driver.command_executor)
+    profiler.patch_sleep()
+    yield profiler, driver
+    profiler.unpatch_sleep()
+    driver.quit()
+    server.stop()
+
+
+def test_commands_are_attributed_to_page_object_methods(profiled):
+    profiler, driver = profiled
+    profiler.start_phase("t::login", "call")
+    page = LoginPage(driver, "https://app.test")
+    page.enter_email("user@example.com")
+    page.click_login_button()
+    profiler.end_phase()
+
+    top = {(row["caller"], row["operation"]) for row in profiler.top()}
+    assert ("LoginPage.enter_email", "findElement") in top
+    assert ("LoginPage.enter_email", "sendKeysToElement") in top
+    assert ("LoginPage.click_login_button", "clickElement") in top
+
+    folded = profiler.folded_stacks()
+    assert any(line.startswith("t::login;call;test_profiler:test_commands_are_attributed_to_page_object_methods;"
+                               "LoginPage.enter_email;BoundElement.input_text;")
+               for line in folded)
+
+
+def test_wait_and_sleep_are_separated(profiled):
+    profiler, driver = profiled
+    profiler.start_phase("t::spinner", "call")
+    # Count never matches on the fake page: WebDriverWait polls until timeout
+    CustomWaitHelpers(driver).wait_for_element_count((By.ID, "sidebar"), 3, timeout=0.6)
+    time.sleep(0.05)
+    profiler.end_phase()
+
+    breakdown = profiler.test_breakdown("t::spinner")
+    assert breakdown["wait"] > 0.4
+    assert 0.04 < breakdown["sleep"] < 0.2
+    assert breakdown["command"] > 0
+    assert breakdown["total"] >= breakdown["wait"] + breakdown["sleep"]
+    assert "wait" in profiler.format_breakdown("t::spinner")
+
+
+def test_background_thread_commands_are_not_test_time(profiled):
+    profiler, driver = profiled
+    profiler.start_phase("t::drained", "call")
+    # e.g. the browser log buffer draining getLog while the test runs
+    drain = threading.Thread(target=driver.get, args=("https://app.test/",))
+    drain.start()
+    drain.join()
+    profiler.end_phase()
+    assert profiler.test_breakdown("t::drained")["command"] == 0
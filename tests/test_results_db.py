@@ -0,0 +1,82 @@
+import json
+import time
+
+from utils import results_db
+from utils.results_db import ResultsWriter
+
+DAY = 86400
+NOW = 1_800_000_000.0
+
+
+def _insert(connection, nodeid, started, duration, outcome="passed", run_id="r"):
+    connection.execute("INSERT INTO tests (run_id, nodeid, started, outcome, call, duration) VALUES (?, ?, ?, ?, ?, ?)",
+                       (run_id, nodeid, started, outcome, duration, duration))
+
+
+def test_writer_assembles_phases_and_batches(tmp_path):
+    path = tmp_path / "results.db"
+    writer = ResultsWriter("run1", "dev", path, batch_size=2)
+    writer.record("t::a", "setup", "passed", 0.5, ["smoke"])
+    writer.record("t::a", "call", "failed", 2.0, retries=1, artifacts=["artifacts/screenshots/a.png"])
+    writer.record("t::a", "teardown", "passed", 0.1)
+    writer.record("t::b", "setup", "failed", 0.2)
+    assert writer.written == 0  # one finished test buffered
+    writer.record("t::b", "teardown", "passed", 0.0)
+    assert writer.written == 2
+    writer.record("t::c", "setup", "skipped", 0.0)
+    writer.finish(1)
+
+    connection = results_db.connect(path)
+    rows = {r["nodeid"]: r for r in connection.execute("SELECT * FROM tests")}
+    assert rows["t::a"]["outcome"] == "failed"
+    assert rows["t::a"]["markers"] == "smoke"
+    assert (rows["t::a"]["setup"], rows["t::a"]["call"], rows["t::a"]["teardown"]) == (0.5, 2.0, 0.1)
+    assert abs(rows["t::a"]["duration"] - 2.6) < 1e-9
+    assert rows["t::a"]["retries"] == 1
+    assert json.loads(rows["t::a"]["artifacts"]) == ["artifacts/screenshots/a.png"]
+    assert rows["t::b"]["outcome"] == "error"
+    assert rows["t::c"]["outcome"] == "skipped"
+    run = results_db.latest_runs(connection)[0]
+    assert (run["id"], run["environment"], run["tests"], run["failed"], run["exitstatus"]) == ("run1", "dev", 3, 2, 1)
+
+
+def test_slowest_and_trend(tmp_path):
+    connection = results_db.connect(tmp_path / "results.db")
+    for day in range(10):
+        _insert(connection, "t::login", NOW - day * DAY, 5.0 + day)
+        _insert(connection, "t::quick", NOW - day * DAY, 0.1, "failed" if day == 0 else "passed")
+
+    slowest = results_db.slowest(connection, limit=1, days=3, now=NOW + 1)
+    assert [(r["nodeid"], r["runs"], r["avg"]) for r in slowest] == [("t::login", 3, 6.0)]
+
+    days = results_db.trend(connection, "quick", days=2, now=NOW + 1)
+    assert [r["runs"] for r in days] == [1, 1]
+    assert sum(r["failed"] for r in days) == 1
+
+
+def test_regressions_compare_recent_and_baseline_windows(tmp_path):
+    connection = results_db.connect(tmp_path / "results.db")
+    for day in range(1, 30):
+        recent = day <= 7
+        _insert(connection, "t::slower", NOW - day * DAY, 8.0 if recent else 4.0)
+        _insert(connection, "t::stable", NOW - day * DAY, 3.0)
+        _insert(connection, "t::breaking", NOW - day * DAY, 1.0, "failed" if recent and day % 2 else "passed")
+
+    found = {r["nodeid"]: r for r in results_db.regressions(connection, days=7, baseline_days=30, now=NOW)}
+    assert set(found) == {"t::slower", "t::breaking"}
+    assert found["t::slower"]["ratio"] == 2.0
+    assert found["t::breaking"]["recent_fail_rate"] > 0.5
+
+
+def test_regressions_with_zero_baseline(tmp_path, capsys):
+    path = tmp_path / "results.db"
+    connection = results_db.connect(path)
+    now = time.time()
+    for day in range(1, 30):
+        _insert(connection, "t::was_instant", now - (day - 0.5) * DAY, 2.0 if day <= 7 else 0.0)
+    connection.commit()
+
+    found = results_db.regressions(connection, days=7, baseline_days=30, now=now)
+    assert [(r["nodeid"], r["ratio"]) for r in found] == [("t::was_instant", None)]
+    assert results_db.main(["--db", str(path), "regressions"]) == 0
+    assert capsys.readouterr().out.startswith("x-  0.00s -> 2.00s")
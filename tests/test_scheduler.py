@@ -0,0 +1,96 @@
+from types import SimpleNamespace
+
+import pytest
+
+from utils import scheduler
+
+
+def _store(tmp_path, durations):
+    store = scheduler.DurationStore(tmp_path / "durations.json")
+    for nodeid, duration in durations.items():
+        store.update(nodeid, duration)
+    return store
+
+
+def test_duration_store_round_trip_and_moving_average(tmp_path):
+    store = _store(tmp_path, {"t::a": 10.0})
+    store.update("t::a", 20.0)
+    store.save()
+
+    reloaded = scheduler.DurationStore(tmp_path / "durations.json")
+    assert reloaded.get("t::a") == 10.0 * (1 - scheduler.EWMA_ALPHA) + 20.0 * scheduler.EWMA_ALPHA
+    assert reloaded.durations["t::a"]["runs"] == 2
+    assert reloaded.get("t::missing") is None
+
+
+def test_fixture_group():
+    assert scheduler.fixture_group(["request", "logged_in_driver", "driver"]) == "logged_in_driver"
+    assert scheduler.fixture_group(["driver"]) == "driver"
+    assert scheduler.fixture_group(["tmp_path"]) == "none"
+
+
+def test_lpt_shards_are_balanced(tmp_path):
+    durations = {"t::spinner": 30.0, "t::a": 10.0, "t::b": 10.0, "t::c": 10.0, "t::config": 0.1}
+    store = _store(tmp_path, durations)
+    tests = [(nodeid, "driver") for nodeid in durations]
+    estimates = scheduler.estimate_durations(tests, store)
+
+    shards = scheduler.split_shards(tests, estimates, 2)
+    loads = sorted(sum(estimates[n] for n, _ in shard) for shard in shards)
+    assert loads == [30.0, 30.1]
+    assert sorted(n for shard in shards for n, _ in shard) == sorted(durations)
+
+
+def test_unknown_tests_use_group_median_or_default(tmp_path):
+    store = _store(tmp_path, {"t::a": 4.0, "t::b": 6.0})
+    tests = [("t::a", "driver"), ("t::b", "driver"), ("t::new", "driver"), ("t::login", "logged_in_driver")]
+    estimates = scheduler.estimate_durations(tests, store)
+    assert estimates["t::new"] == 5.0
+    assert estimates["t::login"] == scheduler.DEFAULT_DURATIONS["logged_in_driver"]
+
+
+def test_plan_orders_by_fixture_group(tmp_path):
+    store = _store(tmp_path, {"t::a": 1.0, "t::b": 5.0, "t::c": 2.0, "t::d": 0.1})
+    tests = [("t::a", "logged_in_driver"), ("t::b", "driver"), ("t::c", "logged_in_driver"), ("t::d", "none")]
+    ordered, estimate = scheduler.plan(tests, store, last=["t::b"])
+    assert ordered == ["t::d", "t::c", "t::a", "t::b"]
+    assert estimate == 8.1
+
+
+def test_shards_without_shared_store_are_deterministic(tmp_path):
+    tests = [(f"t::{i}", "driver" if i % 2 else "none") for i in range(9)]
+    machine_a = _store(tmp_path / "a", {"t::1": 50.0, "t::3": 1.0})
+    machine_b = _store(tmp_path / "b", {"t::5": 40.0})
+    # Different local histories would cut different splits ...
+    split_a = [scheduler.plan(tests, machine_a, 3, i)[0] for i in range(3)]
+    split_b = [scheduler.plan(tests, machine_b, 3, i)[0] for i in range(3)]
+    assert split_a != split_b
+    # ... so shards without a shared store use the group defaults: every test exactly once
+    shards = [scheduler.plan(tests, None, 3, i)[0] for i in range(3)]
+    assert sorted(n for shard in shards for n in shard) == sorted(n for n, _ in tests)
+
+
+def test_merge_shard_stores(tmp_path):
+    shard0 = _store(tmp_path / "0", {"t::a": 5.0})
+    shard1 = _store(tmp_path / "1", {"t::b": 7.0})
+    shared = _store(tmp_path / "shared", {"t::a": 1.0})
+    shared.update("t::a", 1.0)
+
+    assert scheduler.merge_stores(shared, [shard0, shard1]) == 1
+    assert (shared.get("t::a"), shared.get("t::b")) == (1.0, 7.0)  # more runs wins
+
+
+@pytest.mark.parametrize("shard_count, shard_index, message", [
+    (2, 2, "out of range"),
+    (2, -1, "out of range"),
+    (None, 1, "needs --shard-count"),
+    (0, None, "at least 1"),
+])
+def test_invalid_shard_options_are_usage_errors(shard_count, shard_index, message):
+    import conftest
+
+    options = {"shard_count": shard_count, "shard_index": shard_index, "group_fixtures": False,
+               "durations_file": None, "quarantine": "run"}
+    config = SimpleNamespace(getoption=options.get)
+    with pytest.raises(pytest.UsageError, match=message):
+        conftest._schedule_tests(config, [])
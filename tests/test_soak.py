@@ -0,0 +1,75 @@
+import csv
+import os
+
+import pytest
+
+from utils import soak
+from utils.soak import ResourceSampler, detect_growth, parse_duration, run_soak
+
+
+def test_parse_duration():
+    assert parse_duration("90") == 90
+    assert parse_duration("30m") == 1800
+    assert parse_duration("1.5h") == 5400
+    with pytest.raises(ValueError):
+        parse_duration("soon")
+
+
+def test_detect_growth_flags_only_sustained_growth():
+    leak = [100 + i for i in range(100)]  # +1 per iteration
+    sawtooth = [100 + (i % 10) * 5 for i in range(100)]  # GC drops it back every 10 iterations
+    spike = [100] * 100
+    spike[60] = 500
+    flagged = detect_growth({"nodes": leak, "js_heap_mb": sawtooth, "listeners": spike, "rss_mb": [None] * 100})
+    assert set(flagged) == {"nodes"}
+    assert flagged["nodes"]["growth"] > 0.5
+    assert detect_growth({"nodes": leak[:10]}) == {}  # too few samples
+
+
+class FakeSampler:
+    def __init__(self):
+        self.count = 0
+
+    def sample(self):
+        self.count += 1
+        return {"js_heap_mb": 10.0, "nodes": 500 + 10 * self.count, "listeners": 40, "rss_mb": None}
+
+
+def test_run_soak_writes_series_and_flags(tmp_path):
+    now = [0.0]
+
+    def clock():
+        now[0] += 1.0
+        return now[0]
+
+    resets = []
+    result = run_soak("dashboard", lambda: None, FakeSampler(), duration=None, iterations=50,
+                      reset=lambda: resets.append(1), directory=tmp_path, clock=clock)
+
+    assert result.iterations == 50 and len(resets) == 49
+    assert set(result.flagged) == {"nodes"}
+    assert "GROWTH nodes" in result.summary()
+    with open(result.path, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 50
+    assert rows[0]["nodes"] == "510" and rows[0]["rss_mb"] == "" and rows[0]["duration"] == "1.0"
+
+    stopped = run_soak("short", lambda: None, FakeSampler(), duration=10, directory=tmp_path, clock=clock)
+    assert 0 < stopped.iterations < 10 and stopped.flagged == {}
+
+
+def test_resource_sampler_reads_cdp_metrics_and_rss(monkeypatch):
+    class Driver:
+        capabilities = {"chrome": {"userDataDir": "/tmp/profile"}}
+
+        def execute_cdp_cmd(self, cmd, params):
+            if cmd == "Performance.getMetrics":
+                return {"metrics": [{"name": "JSHeapUsedSize", "value": 2 * 1024 * 1024},
+                                    {"name": "Nodes", "value": 321}, {"name": "JSEventListeners", "value": 12}]}
+            return {}
+
+    monkeypatch.setattr(soak, "find_browser_pid", lambda user_data_dir: os.getpid())
+    reading = ResourceSampler(Driver()).sample()
+    assert (reading["js_heap_mb"], reading["nodes"], reading["listeners"]) == (2.0, 321, 12)
+    if os.path.isdir("/proc"):
+        assert reading["rss_mb"] > 1
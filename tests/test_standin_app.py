@@ -0,0 +1,41 @@
+import http.cookiejar
+import urllib.error
+import urllib.parse
+import urllib.request
+
+import pytest
+
+from standin_app import StandinApp
+
+
+@pytest.fixture
+def app():
+    app = StandinApp().start()
+    yield app
+    app.stop()
+
+
+def test_login_flow(app):
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+
+    # Protected pages redirect to the login form without a session
+    with opener.open(app.url + "/dashboard") as response:
+        assert response.url.endswith("/login")
+        assert 'class="login-button"' in response.read().decode()
+
+    form = urllib.parse.urlencode({"email": "user@example.com", "password": "password123"}).encode()
+    with opener.open(app.url + "/login", data=form) as response:
+        assert response.url.endswith("/dashboard")
+        assert 'id="sidebar"' in response.read().decode()
+
+    with opener.open(app.url + "/logout") as response:
+        assert response.url.endswith("/login")
+    assert not app.sessions
+
+
+def test_invalid_login_shows_error(app):
+    form = urllib.parse.urlencode({"email": "user@example.com", "password": "wrong"}).encode()
+    with pytest.raises(urllib.error.HTTPError) as exc_info:
+        urllib.request.urlopen(app.url + "/login", data=form)
+    assert exc_info.value.code == 401
+    assert 'class="error-message"' in exc_info.value.read().decode()
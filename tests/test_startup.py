@@ -0,0 +1,52 @@
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+def _loaded_modules(module):
+    """Import a module in a fresh interpreter and return sys.modules keys."""
+    code = f"import sys, {module}; print(' '.join(sys.modules))"
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True, text=True, check=True, cwd=PROJECT_ROOT,
+    )
+    return set(result.stdout.split())
+
+
+def test_conftest_does_not_import_selenium_or_html():
+    """conftest.py should defer selenium and pytest_html until first use."""
+    loaded = _loaded_modules("conftest")
+    assert "selenium.webdriver" not in loaded
+    assert "pytest_html" not in loaded
+
+
+def test_recorder_does_not_import_video_libs():
+    """utils.recorder should only load cv2/numpy/mss when recording starts."""
+    loaded = _loaded_modules("utils.recorder")
+    assert not {"cv2", "numpy", "mss"} & loaded
+
+
+def test_wait_helpers_do_not_import_page_objects():
+    """utils must not depend on page_objects (page objects build on the wait helpers, not the reverse)."""
+    loaded = _loaded_modules("utils.wait_helpers")
+    assert not {name for name in loaded if name.startswith("page_objects")}
+
+
+def test_lazy_logger_has_no_side_effects(tmp_path):
+    """LazyLogger must not create the logger until it is used."""
+    from utils.logger import LazyLogger, CustomLogger
+
+    lazy = LazyLogger("LazyLoggerCheck", log_file=tmp_path / "lazy.log")
+    assert "LazyLoggerCheck" not in CustomLogger._loggers
+    assert not (tmp_path / "lazy.log").exists()
+    lazy.info("first use")
+    try:
+        assert "LazyLoggerCheck" in CustomLogger._loggers
+        assert (tmp_path / "lazy.log").exists()
+    finally:
+        logger = CustomLogger._loggers.pop("LazyLoggerCheck")
+        for handler in list(logger.handlers):
+            handler.close()
+            logger.removeHandler(handler)
@@ -0,0 +1,45 @@
+import pytest
+from selenium import webdriver
+
+from tests.fake_webdriver import FakeWebDriverServer
+from utils.tab_pool import TabPool
+
+
+@pytest.fixture
+def remote_driver():
+    server = FakeWebDriverServer().start()
+    driver = webdriver.Remote(command_executor=server.url, options=webdriver.ChromeOptions())
+    yield driver
+    driver.quit()
+    server.stop()
+
+
+def test_each_test_gets_a_fresh_tab(remote_driver):
+    pool = TabPool(remote_driver)
+    first = pool.acquire("t::a")
+    assert remote_driver.current_window_handle == first.handle != pool.home_handle
+    pool.release(first)
+    second = pool.acquire("t::b")
+    assert second.handle != first.handle
+    assert remote_driver.window_handles == [pool.home_handle, second.handle]
+    pool.release(second)
+    assert remote_driver.window_handles == [pool.home_handle]
+    assert remote_driver.current_window_handle == pool.home_handle
+    assert not pool.leaked
+
+
+def test_windows_left_open_are_closed_and_attributed(remote_driver):
+    pool = TabPool(remote_driver)
+    lease = pool.acquire("t::popup")
+    remote_driver.switch_to.new_window("window")
+    popup = remote_driver.current_window_handle
+    assert f"window opened by this test: {popup}" in lease.describe()
+
+    lease.reset("https://app.test/dashboard")
+    assert remote_driver.window_handles == [pool.home_handle, lease.handle]
+    assert remote_driver.current_url == "https://app.test/dashboard"
+
+    pool.release(lease)
+    assert remote_driver.window_handles == [pool.home_handle]
+    assert pool.leaked == [("t::popup", popup)]
+    assert "t::popup" in pool.summary()
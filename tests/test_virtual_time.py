@@ -0,0 +1,55 @@
+import asyncio
+import time
+
+import pytest
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+
+from tests.fake_webdriver import FakeWebDriverServer
+from utils import async_wait_helpers
+from utils.async_driver import AsyncWebDriver
+from utils.virtual_time import enable_virtual_time, enable_virtual_time_async, is_virtual_time
+from utils.wait_helpers import wait_for_element_stable
+
+
+@pytest.fixture
+def webdriver_server():
+    server = FakeWebDriverServer().start()
+    yield server
+    server.stop()
+
+
+def test_enable_virtual_time_async(webdriver_server):
+    async def scenario():
+        driver = await AsyncWebDriver.create(webdriver_server.url)
+        try:
+            assert not is_virtual_time(driver)
+            assert await enable_virtual_time_async(driver)
+            assert is_virtual_time(driver)
+            commands = next(iter(webdriver_server.sessions.values()))["cdp"]
+            assert commands[0] == "Emulation.setVirtualTimePolicy"
+            assert "Page.addScriptToEvaluateOnNewDocument" in commands
+
+            start = time.perf_counter()
+            assert await async_wait_helpers.wait_for_element_stable(driver, (By.ID, "sidebar"), stable_time=1)
+            assert time.perf_counter() - start < 0.5
+        finally:
+            await driver.quit()
+
+    asyncio.run(scenario())
+
+
+def test_enable_virtual_time_skips_stability_grace_period(webdriver_server):
+    driver = webdriver.Remote(command_executor=webdriver_server.url, options=webdriver.ChromeOptions())
+    try:
+        start = time.perf_counter()
+        assert wait_for_element_stable(driver, (By.ID, "sidebar"), stable_time=0.5)
+        real_time = time.perf_counter() - start
+
+        assert enable_virtual_time(driver)
+        assert "Emulation.setVirtualTimePolicy" in next(iter(webdriver_server.sessions.values()))["cdp"]
+        start = time.perf_counter()
+        assert wait_for_element_stable(driver, (By.ID, "sidebar"), stable_time=0.5)
+        assert time.perf_counter() - start < real_time / 2
+    finally:
+        driver.quit()
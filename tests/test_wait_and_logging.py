@@ -1,6 +1,7 @@
 import pytest
 from selenium.webdriver.common.by import By
 from utils.wait_helpers import CustomWaitHelpers, wait_for_loading_spinner
+from utils.wait_helpers import element_attribute, element_count, text_in_element
 from utils.logger import CustomLogger, StepLogger
 from config import BASE_URL
 
@@ -120,28 +121,22 @@ def test_wait_for_dynamic_content(logged_in_driver):
     logger.info(f"Navigating to: {BASE_URL}/dynamic-page")
     driver.get(BASE_URL + "/dynamic-page")
     
-    # Wait for specific number of items to load
+    # Wait for 10 items, the success text and the enabled button together:
+    # one poll loop, so the total is the slowest of the three, not the sum
     items_locator = (By.CLASS_NAME, "list-item")
-    logger.info("Waiting for 10 items to load...")
-    
-    if wait_helper.wait_for_element_count(items_locator, count=10, timeout=15):
-        logger.info("✓ All 10 items loaded")
-    else:
-        logger.warning("⚠ Timeout waiting for items")
-    
-    # Wait for specific text to appear
     success_msg_locator = (By.ID, "success-message")
-    logger.info("Waiting for success message...")
-    
-    if wait_helper.wait_for_text_in_element(success_msg_locator, "Success", timeout=10):
-        logger.info("✓ Success message displayed")
-    
-    # Wait for element attribute change (e.g., disabled -> enabled)
     button_locator = (By.ID, "submit-button")
-    logger.info("Waiting for submit button to be enabled...")
-    
-    if wait_helper.wait_for_element_attribute(button_locator, "disabled", None, timeout=10):
-        logger.info("✓ Submit button is enabled")
+    logger.info("Waiting for 10 items, success message and enabled submit button...")
+    
+    result = wait_helper.wait_for_all({
+        "items": element_count(items_locator, 10),
+        "success": text_in_element(success_msg_locator, "Success"),
+        "button enabled": element_attribute(button_locator, "disabled", None),
+    }, timeout=15)
+    for name, seconds in result.met.items():
+        logger.info(f"✓ {name} after {seconds:.2f}s")
+    if not result:
+        logger.warning(f"⚠ Timeout waiting for dynamic content:\n{result.describe()}")
     
     logger.info("=== Test completed ===")
 
@@ -46,6 +46,30 @@ def test_invalid_login_with_test_data(driver):
     
     print("--- Test: Invalid login handled correctly ---")
 
+@pytest.mark.login_suite
+@pytest.mark.data("login_cases.csv", batch=True)
+def test_login_cases_from_csv(driver, email, password, expected):
+    """Example: Data-driven login, all rows of tests/data/login_cases.csv in one browser"""
+    
+    login_page = LoginPage(driver, BASE_URL)
+    dashboard_page = DashboardPage(driver, BASE_URL)
+    
+    login_page.login(email, password)
+    
+    if expected == "dashboard":
+        dashboard_page.wait_for_url_contains("/dashboard")
+        assert dashboard_page.is_sidebar_displayed()
+    else:
+        assert login_page.is_error_displayed(), "Error message should be displayed"
+
+@pytest.mark.dashboard_suite
+def test_dashboard_from_state_snapshot(dashboard_state):
+    """Example: Start from a cached logged-in dashboard state instead of logging in via the UI"""
+    
+    dashboard_page = DashboardPage(dashboard_state, BASE_URL)
+    dashboard_page.navigate_to_dashboard()
+    assert dashboard_page.is_sidebar_displayed()
+
 @pytest.mark.example_suite
 def test_environment_config(logged_in_driver):
     """Example: Test showing environment configuration"""
@@ -0,0 +1,418 @@
+"""
+Artifact store: index, background log compression and retention.
+
+Logs, screenshots, videos, HTML reports and failed tests' browser logs
+are recorded in a compact append-only index (artifacts/index.jsonl, one
+line per artifact: run id, test id, type, path, size, time), so tooling
+can find the artifacts of a run or test without listing directories:
+
+    python -m utils.artifact_store list --type screenshot --test test_login
+    python -m utils.artifact_store stats
+    python -m utils.artifact_store prune            # apply retention now
+
+During a pytest session a background thread gzips the log files of
+earlier runs, picks up artifacts written outside the framework, and drops
+index entries whose files are gone. At session end retention is enforced
+per type: files older than the type's max age are deleted, then the
+oldest ones until the type fits its size budget (ARTIFACT_RETENTION in
+config.py).
+"""
+import argparse
+import gzip
+import json
+import os
+import queue
+import shutil
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+INDEX_PATH = PROJECT_ROOT / "artifacts" / "index.jsonl"
+
+# type -> (directory relative to the project root, file patterns)
+ARTIFACT_TYPES = {
+    "log": ("artifacts/logs", ("*.log", "*.log.gz")),
+    "screenshot": ("artifacts/screenshots", ("*.png",)),
+    "video": ("artifacts/videos", ("*.mp4",)),
+    "report": ("reports", ("*.html",)),
+    "browser_log": ("artifacts/browser_logs", ("*.json.gz",)),
+    "dom_snapshot": ("artifacts/dom", ("*.js",)),
+    "soak": ("artifacts/soak", ("*.csv",)),
+    "load_report": ("artifacts/load", ("*.json",)),
+    "locator_profile": ("artifacts/locators", ("*.json",)),
+}
+
+# Defaults when config.py has no ARTIFACT_RETENTION entry for a type
+DEFAULT_RETENTION = {"max_age_days": 30, "max_size_mb": 500}
+
+# Logs untouched for this long are finished and get compressed (seconds)
+DEFAULT_COMPRESS_AFTER = 600
+
+# Rewrite the index once this share of its lines are stale
+COMPACT_RATIO = 0.5
+
+
+def _retention(artifact_type):
+    try:
+        from config import ARTIFACT_RETENTION
+    except ImportError:
+        return DEFAULT_RETENTION
+    return {**DEFAULT_RETENTION, **ARTIFACT_RETENTION.get(artifact_type, {})}
+
+
+def new_run_id():
+    """
+    Run id shared by all artifacts of one run.
+
+    Worker processes of a parallel run inherit ARTIFACT_RUN_ID from the runner.
+
+    Returns:
+        String
+    """
+    return os.getenv("ARTIFACT_RUN_ID") or f"{time.strftime('%Y%m%d_%H%M%S')}_{os.getpid()}"
+
+
+def compress_file(path):
+    """
+    Gzip a file next to itself and delete the original.
+
+    Args:
+        path: File to compress
+
+    Returns:
+        Path to the .gz file
+    """
+    path = Path(path)
+    target = path.with_name(path.name + ".gz")
+    tmp_path = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    with open(path, "rb") as source, gzip.open(tmp_path, "wb", compresslevel=6) as out:
+        shutil.copyfileobj(source, out, 1024 * 1024)
+    shutil.copystat(path, tmp_path)
+    tmp_path.replace(target)
+    path.unlink()
+    return target
+
+
+class ArtifactStore:
+    """Index and retention of run artifacts."""
+
+    def __init__(self, run_id=None, root=PROJECT_ROOT, index_path=None):
+        """
+        Initialize artifact store.
+
+        Args:
+            run_id: Id of the current run (new_run_id() if None)
+            root: Project root the artifact directories live under
+            index_path: Index file (artifacts/index.jsonl under root if None)
+        """
+        self.run_id = run_id or new_run_id()
+        self.root = Path(root)
+        self.index_path = Path(index_path) if index_path else self.root / INDEX_PATH.relative_to(PROJECT_ROOT)
+        self._queue = queue.Queue()
+        self._thread = None
+        self.compressed = 0
+        self.pruned = []
+
+    # --- Index ---
+
+    @contextmanager
+    def _locked(self):
+        """Serialise index writes between processes (parallel workers)."""
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.index_path.with_suffix(".lock"), "w") as lock:
+            try:
+                import fcntl
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            except ImportError:
+                pass
+            yield
+
+    def _relative(self, path):
+        path = Path(path).resolve()
+        try:
+            return path.relative_to(self.root.resolve()).as_posix()
+        except ValueError:
+            return str(path)
+
+    def _append(self, entries):
+        with self._locked(), open(self.index_path, "a", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+    def add(self, artifact_type, path, test=None, run_id=None):
+        """
+        Record an artifact in the index.
+
+        Args:
+            artifact_type: Key of ARTIFACT_TYPES (e.g. "screenshot")
+            path: Artifact file
+            test: Test node id (None for run-level artifacts)
+            run_id: Run id (this store's run if None)
+
+        Returns:
+            Index entry dict
+        """
+        entry = {"run": run_id or self.run_id, "test": test, "type": artifact_type,
+                 "path": self._relative(path), "size": Path(path).stat().st_size, "time": time.time()}
+        self._append([entry])
+        return entry
+
+    def _read(self):
+        """Index lines in order (later lines for the same path win)."""
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                lines = [json.loads(line) for line in f if line.strip()]
+        except (OSError, ValueError):
+            return [], 0
+        entries = {}
+        for line in lines:
+            if line.get("deleted"):
+                entries.pop(line["path"], None)
+            else:
+                entries[line["path"]] = line
+        return list(entries.values()), len(lines)
+
+    def entries(self, artifact_type=None, run_id=None, test=None):
+        """
+        Query the index.
+
+        Args:
+            artifact_type: Only this type
+            run_id: Only this run
+            test: Only tests whose node id contains this text
+
+        Returns:
+            List of entry dicts, oldest first
+        """
+        entries, _ = self._read()
+        return [e for e in sorted(entries, key=lambda e: e["time"])
+                if (artifact_type is None or e["type"] == artifact_type)
+                and (run_id is None or e["run"] == run_id)
+                and (test is None or test in (e["test"] or ""))]
+
+    def _forget(self, paths):
+        self._append([{"path": path, "deleted": True} for path in paths])
+
+    def compact(self):
+        """
+        Rewrite the index without superseded and deleted lines.
+
+        Returns:
+            Number of lines dropped
+        """
+        with self._locked():
+            entries, lines = self._read()
+            tmp_path = self.index_path.with_name(f"{self.index_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for entry in sorted(entries, key=lambda e: e["time"]):
+                    f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            tmp_path.replace(self.index_path)
+        return lines - len(entries)
+
+    # --- Maintenance ---
+
+    def _scan(self, artifact_type):
+        directory, patterns = ARTIFACT_TYPES[artifact_type]
+        directory = self.root / directory
+        for pattern in patterns:
+            yield from directory.glob(pattern)
+
+    def reconcile(self):
+        """
+        Index artifacts written outside the store and forget files that are gone.
+
+        Returns:
+            Tuple of (added, forgotten) counts
+        """
+        entries, _ = self._read()
+        known = {e["path"] for e in entries}
+        added = []
+        for artifact_type in ARTIFACT_TYPES:
+            for path in self._scan(artifact_type):
+                relative = self._relative(path)
+                if relative not in known:
+                    stat = path.stat()
+                    added.append({"run": None, "test": None, "type": artifact_type, "path": relative,
+                                  "size": stat.st_size, "time": stat.st_mtime})
+        gone = [e["path"] for e in entries if not (self.root / e["path"]).exists()]
+        if added:
+            self._append(added)
+        if gone:
+            self._forget(gone)
+        return len(added), len(gone)
+
+    def compress_logs(self, min_idle=DEFAULT_COMPRESS_AFTER, now=None):
+        """
+        Gzip finished log files and update their index entries.
+
+        Args:
+            min_idle: Only logs not written to for this many seconds (so the
+                logs of this run and of concurrent workers stay untouched)
+            now: Current time (time.time() if None)
+
+        Returns:
+            Number of files compressed
+        """
+        now = time.time() if now is None else now
+        by_path = {e["path"]: e for e in self.entries("log")}
+        count = 0
+        for path in self._scan("log"):
+            if path.suffix != ".log":
+                continue
+            relative = self._relative(path)
+            try:
+                mtime = path.stat().st_mtime
+                if now - mtime < min_idle:
+                    continue
+                target = compress_file(path)
+            except OSError:
+                continue  # still open on Windows, or removed meanwhile
+            entry = by_path.get(relative, {"run": None, "test": None, "time": mtime})
+            self._forget([relative])
+            self._append([{**entry, "type": "log", "path": self._relative(target),
+                           "size": target.stat().st_size}])
+            count += 1
+        self.compressed += count
+        return count
+
+    def prune(self, now=None):
+        """
+        Enforce age and size retention per artifact type.
+
+        Args:
+            now: Current time (time.time() if None)
+
+        Returns:
+            List of deleted entry dicts
+        """
+        now = time.time() if now is None else now
+        deleted = []
+        for artifact_type in ARTIFACT_TYPES:
+            policy = _retention(artifact_type)
+            entries = self.entries(artifact_type)
+            max_age = policy["max_age_days"] * 86400
+            expired = [e for e in entries if now - e["time"] > max_age]
+            kept = [e for e in entries if now - e["time"] <= max_age]
+            budget = policy["max_size_mb"] * 1024 * 1024
+            total = sum(e["size"] for e in kept)
+            while kept and total > budget:
+                oldest = kept.pop(0)
+                expired.append(oldest)
+                total -= oldest["size"]
+            for entry in expired:
+                (self.root / entry["path"]).unlink(missing_ok=True)
+            deleted.extend(expired)
+        if deleted:
+            self._forget([e["path"] for e in deleted])
+        self.pruned.extend(deleted)
+        return deleted
+
+    def maintain(self, min_idle=DEFAULT_COMPRESS_AFTER):
+        """Reconcile the index, compress finished logs and compact the index if needed."""
+        self.reconcile()
+        self.compress_logs(min_idle)
+        entries, lines = self._read()
+        if lines and (lines - len(entries)) / lines > COMPACT_RATIO:
+            self.compact()
+
+    # --- Background worker ---
+
+    def start_background(self, min_idle=DEFAULT_COMPRESS_AFTER):
+        """
+        Run maintain() in a background thread.
+
+        Args:
+            min_idle: Seconds a log must be unmodified before it is compressed
+        """
+        def worker():
+            while True:
+                task = self._queue.get()
+                if task is None:
+                    return
+                try:
+                    task()
+                except Exception:
+                    pass  # housekeeping must never fail a run
+
+        self._thread = threading.Thread(target=worker, name="artifact-store", daemon=True)
+        self._thread.start()
+        self._queue.put(lambda: self.maintain(min_idle))
+
+    def finish(self, timeout=30):
+        """
+        Wait for background work, then apply retention.
+
+        Args:
+            timeout: Seconds to wait for the background thread
+
+        Returns:
+            List of deleted entry dicts
+        """
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+        return self.prune()
+
+    def summary(self):
+        """
+        Summary of this run's artifacts for the terminal report.
+
+        Returns:
+            String
+        """
+        entries = self.entries(run_id=self.run_id)
+        size = sum(e["size"] for e in entries) / (1024 * 1024)
+        text = f"{len(entries)} artifact(s) indexed for run {self.run_id} ({size:.1f} MB)"
+        if self.compressed:
+            text += f"; {self.compressed} old log(s) compressed"
+        if self.pruned:
+            text += f"; {len(self.pruned)} file(s) removed by retention"
+        return text
+
+
+def _format_size(size):
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query and maintain the artifact index")
+    commands = parser.add_subparsers(dest="command", required=True)
+    listing = commands.add_parser("list", help="List indexed artifacts")
+    listing.add_argument("--type", choices=sorted(ARTIFACT_TYPES), help="Only this artifact type")
+    listing.add_argument("--run", help="Only this run id")
+    listing.add_argument("--test", help="Only tests whose node id contains this text")
+    commands.add_parser("stats", help="Count and size per artifact type")
+    commands.add_parser("prune", help="Apply retention now")
+    commands.add_parser("reindex", help="Index unrecorded files, forget deleted ones, compact")
+    args = parser.parse_args(argv)
+
+    store = ArtifactStore(run_id="cli")
+    if args.command == "list":
+        for e in store.entries(args.type, args.run, args.test):
+            print(f"{e['type']:<10} {_format_size(e['size']):>9}  {e['run'] or '-':<24} {e['path']}"
+                  + (f"  [{e['test']}]" if e["test"] else ""))
+    elif args.command == "stats":
+        for artifact_type in ARTIFACT_TYPES:
+            entries = store.entries(artifact_type)
+            policy = _retention(artifact_type)
+            print(f"{artifact_type:<10} {len(entries):>6} files {_format_size(sum(e['size'] for e in entries)):>9}"
+                  f"  (keep {policy['max_age_days']} days, {policy['max_size_mb']} MB)")
+    elif args.command == "prune":
+        deleted = store.prune()
+        print(f"Removed {len(deleted)} file(s), {_format_size(sum(e['size'] for e in deleted))}")
+    else:
+        added, forgotten = store.reconcile()
+        store.compact()
+        print(f"Indexed {added} new file(s), forgot {forgotten} missing file(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,733 @@
+"""
+Asyncio WebDriver client for driving many browsers from one process.
+
+Speaks the W3C WebDriver protocol directly to a chromedriver (or any
+WebDriver endpoint) over a pooled keep-alive HTTP connection, so a single
+event loop can run dozens of headless browser sessions concurrently, e.g.
+several users hitting /dashboard at the same time.
+
+Errors are raised as the usual selenium exception types, and locators use
+the same (By.TYPE, "value") tuples as the rest of the framework.
+
+Usage:
+    async def main():
+        service = await ChromeDriverService.start()
+        try:
+            drivers = await asyncio.gather(*[
+                AsyncWebDriver.create(service.url) for _ in range(10)
+            ])
+            await asyncio.gather(*[d.get(BASE_URL + "/dashboard") for d in drivers])
+        finally:
+            await asyncio.gather(*[d.quit() for d in drivers])
+            await service.stop()
+"""
+import asyncio
+import base64
+import json
+import shutil
+import socket
+import time
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import (
+    ElementClickInterceptedException,
+    ElementNotInteractableException,
+    InvalidSelectorException,
+    JavascriptException,
+    NoAlertPresentException,
+    NoSuchElementException,
+    NoSuchWindowException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
+from selenium.webdriver.common.by import By
+
+# W3C element reference key
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+
+# W3C error code -> selenium exception
+ERROR_CODES = {
+    "no such element": NoSuchElementException,
+    "stale element reference": StaleElementReferenceException,
+    "element click intercepted": ElementClickInterceptedException,
+    "element not interactable": ElementNotInteractableException,
+    "invalid selector": InvalidSelectorException,
+    "javascript error": JavascriptException,
+    "no such alert": NoAlertPresentException,
+    "no such window": NoSuchWindowException,
+    "timeout": TimeoutException,
+    "script timeout": TimeoutException,
+}
+
+DEFAULT_CAPABILITIES = {
+    "browserName": "chrome",
+    "goog:chromeOptions": {"args": ["--headless=new", "--window-size=1920,1080"]},
+}
+
+
+# --- HTTP connection pool ---
+
+JSON_HEADERS = (("Accept", "application/json"), ("Content-Type", "application/json;charset=UTF-8"))
+
+class AsyncHTTPPool:
+    """Keep-alive HTTP/1.1 connection pool for one host, built on asyncio streams."""
+
+    def __init__(self, base_url, size=16, timeout=120):
+        """
+        Initialize connection pool.
+
+        Args:
+            base_url: Server URL (e.g. "http://127.0.0.1:9515")
+            size: Maximum number of concurrent connections
+            timeout: Timeout per request in seconds
+        """
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.prefix = parts.path.rstrip("/")
+        self.size = size
+        self.timeout = timeout
+        self._idle = []
+        self._semaphore = asyncio.Semaphore(size)
+        self.connections_opened = 0
+
+    async def _open(self):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            # Small request/response pairs: don't wait for Nagle/delayed ACK
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.connections_opened += 1
+        return reader, writer
+
+    async def _send(self, conn, method, path, payload, headers):
+        reader, writer = conn
+        head = (
+            f"{method} {self.prefix}{path} HTTP/1.1\r\n"
+            f"Host: {self.host}:{self.port}\r\n"
+            + "".join(f"{name}: {value}\r\n" for name, value in headers)
+            + f"Content-Length: {len(payload)}\r\n"
+            "Connection: keep-alive\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + payload)
+        await writer.drain()
+
+        status_line = await reader.readuntil(b"\r\n")
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await reader.readuntil(b"\r\n")
+            if line == b"\r\n":
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            name = name.strip().lower()
+            if name == "set-cookie":
+                headers.setdefault(name, []).append(value.strip())
+            else:
+                headers[name] = value.strip()
+
+        if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            data = b""
+        elif "content-length" in headers:
+            data = await reader.readexactly(int(headers["content-length"]))
+        elif headers.get("transfer-encoding", "").lower() == "chunked":
+            data = b""
+            while True:
+                chunk_size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                if chunk_size == 0:
+                    await reader.readuntil(b"\r\n")
+                    break
+                data += await reader.readexactly(chunk_size)
+                await reader.readexactly(2)
+        else:
+            data = await reader.read()
+            headers["connection"] = "close"
+        keep_alive = headers.get("connection", "").lower() != "close"
+        return status, headers, data, keep_alive
+
+    async def send(self, method, path, payload=b"", headers=()):
+        """
+        Send a raw request on a pooled connection.
+
+        Args:
+            method: HTTP method
+            path: Request path (with query string)
+            payload: Request body bytes
+            headers: Extra (name, value) request headers
+
+        Returns:
+            Tuple of (status code, response headers dict with lower-case names
+            and "set-cookie" as a list, body bytes)
+        """
+        async with self._semaphore:
+            conn, reused = (self._idle.pop(), True) if self._idle else (await self._open(), False)
+            try:
+                status, response_headers, data, keep_alive = await asyncio.wait_for(
+                    self._send(conn, method, path, payload, headers), self.timeout)
+            except (asyncio.IncompleteReadError, ConnectionError) as e:
+                conn[1].close()
+                if not reused or getattr(e, "partial", b""):
+                    raise
+                # Idle connection was closed by the server: retry once on a fresh one
+                conn = await self._open()
+                try:
+                    status, response_headers, data, keep_alive = await asyncio.wait_for(
+                        self._send(conn, method, path, payload, headers), self.timeout)
+                except BaseException:
+                    conn[1].close()  # the outer handler only covers the first attempt
+                    raise
+            except BaseException:
+                conn[1].close()
+                raise
+            if keep_alive:
+                self._idle.append(conn)
+            else:
+                conn[1].close()
+        return status, response_headers, data
+
+    async def request(self, method, path, body=None):
+        """
+        Send a request and return the decoded JSON response.
+
+        Args:
+            method: HTTP method
+            path: Request path
+            body: JSON-serializable body (None for no body)
+
+        Returns:
+            Tuple of (status code, decoded JSON or None)
+        """
+        payload = b"" if body is None else json.dumps(body).encode("utf-8")
+        status, _, data = await self.send(method, path, payload, JSON_HEADERS)
+        return status, json.loads(data) if data else None
+
+    async def close(self):
+        """Close all idle connections."""
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+
+
+# --- WebDriver client ---
+
+def _to_w3c_locator(by, value):
+    """Convert a selenium locator to a W3C (using, value) pair, like selenium does."""
+    if by == By.ID:
+        return "css selector", f'[id="{value}"]'
+    if by == By.NAME:
+        return "css selector", f'[name="{value}"]'
+    if by == By.CLASS_NAME:
+        return "css selector", f".{value}"
+    return by, value
+
+
+def _raise_for_error(status, response):
+    """Raise the selenium exception matching a W3C error response."""
+    value = (response or {}).get("value")
+    if status < 400 and not (isinstance(value, dict) and "error" in value):
+        return
+    error = value.get("error", "unknown error") if isinstance(value, dict) else "unknown error"
+    message = value.get("message", "") if isinstance(value, dict) else str(value)
+    raise ERROR_CODES.get(error, WebDriverException)(f"{error}: {message}")
+
+
+class AsyncWebElement:
+    """Async counterpart of selenium's WebElement."""
+
+    def __init__(self, driver, element_id):
+        """
+        Initialize element reference.
+
+        Args:
+            driver: Owning AsyncWebDriver
+            element_id: W3C element id
+        """
+        self.driver = driver
+        self.id = element_id
+
+    async def _command(self, method, path, body=None):
+        return await self.driver.command(method, f"/element/{self.id}{path}", body)
+
+    async def click(self):
+        """Click the element."""
+        await self._command("POST", "/click", {})
+
+    async def clear(self):
+        """Clear a text input."""
+        await self._command("POST", "/clear", {})
+
+    async def send_keys(self, text):
+        """
+        Type text into the element.
+
+        Args:
+            text: Text to type
+        """
+        await self._command("POST", "/value", {"text": str(text)})
+
+    async def text(self):
+        """Get the visible text."""
+        return await self._command("GET", "/text")
+
+    async def get_attribute(self, name):
+        """
+        Get an attribute value.
+
+        Args:
+            name: Attribute name
+
+        Returns:
+            Attribute value or None
+        """
+        return await self._command("GET", f"/attribute/{name}")
+
+    async def is_displayed(self):
+        """Check whether the element is displayed."""
+        return await self._command("GET", "/displayed")
+
+    async def is_enabled(self):
+        """Check whether the element is enabled."""
+        return await self._command("GET", "/enabled")
+
+    async def rect(self):
+        """Get the element rectangle (x, y, width, height)."""
+        return await self._command("GET", "/rect")
+
+    async def location(self):
+        """Get the element position as {"x": .., "y": ..} (like WebElement.location)."""
+        rect = await self.rect()
+        return {"x": round(rect["x"]), "y": round(rect["y"])}
+
+    async def find_element(self, by, value):
+        """Find a child element."""
+        using, value = _to_w3c_locator(by, value)
+        result = await self._command("POST", "/element", {"using": using, "value": value})
+        return AsyncWebElement(self.driver, result[ELEMENT_KEY])
+
+    def __eq__(self, other):
+        return isinstance(other, AsyncWebElement) and other.id == self.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+
+class AsyncWebDriver:
+    """Async WebDriver session speaking W3C WebDriver over a pooled connection."""
+
+    def __init__(self, pool, session_id, capabilities=None, owns_pool=False):
+        """
+        Initialize a driver around an existing session.
+
+        Args:
+            pool: AsyncHTTPPool connected to the WebDriver server
+            session_id: WebDriver session id
+            capabilities: Capabilities returned by the server
+            owns_pool: Close the pool on quit()
+        """
+        self.pool = pool
+        self.session_id = session_id
+        self.capabilities = capabilities or {}
+        self._owns_pool = owns_pool
+
+    @classmethod
+    async def create(cls, remote_url=None, capabilities=None, pool=None):
+        """
+        Start a new browser session.
+
+        Args:
+            remote_url: WebDriver server URL (ignored if pool is given)
+            capabilities: alwaysMatch capabilities (headless Chrome by default)
+            pool: Shared AsyncHTTPPool (recommended for many sessions)
+
+        Returns:
+            AsyncWebDriver
+        """
+        owns_pool = pool is None
+        pool = pool or AsyncHTTPPool(remote_url)
+        body = {"capabilities": {"alwaysMatch": capabilities or DEFAULT_CAPABILITIES}}
+        status, response = await pool.request("POST", "/session", body)
+        _raise_for_error(status, response)
+        value = response["value"]
+        return cls(pool, value["sessionId"], value.get("capabilities"), owns_pool)
+
+    async def command(self, method, path, body=None):
+        """
+        Execute a raw session command.
+
+        Args:
+            method: HTTP method
+            path: Path relative to /session/{id}
+            body: JSON body
+
+        Returns:
+            The "value" of the response
+        """
+        status, response = await self.pool.request(method, f"/session/{self.session_id}{path}", body)
+        _raise_for_error(status, response)
+        return (response or {}).get("value")
+
+    async def quit(self):
+        """End the session (and close the pool if the driver owns it)."""
+        try:
+            await self.command("DELETE", "")
+        finally:
+            if self._owns_pool:
+                await self.pool.close()
+
+    # Navigation
+
+    async def get(self, url):
+        """Navigate to a URL."""
+        await self.command("POST", "/url", {"url": url})
+
+    async def current_url(self):
+        """Get the current URL."""
+        return await self.command("GET", "/url")
+
+    async def title(self):
+        """Get the page title."""
+        return await self.command("GET", "/title")
+
+    async def refresh(self):
+        """Reload the page."""
+        await self.command("POST", "/refresh", {})
+
+    # Elements
+
+    async def find_element(self, by, value):
+        """
+        Find an element.
+
+        Args:
+            by: Selenium By locator type
+            value: Locator value
+
+        Returns:
+            AsyncWebElement
+
+        Raises:
+            NoSuchElementException
+        """
+        using, value = _to_w3c_locator(by, value)
+        result = await self.command("POST", "/element", {"using": using, "value": value})
+        return AsyncWebElement(self, result[ELEMENT_KEY])
+
+    async def find_elements(self, by, value):
+        """
+        Find all matching elements.
+
+        Args:
+            by: Selenium By locator type
+            value: Locator value
+
+        Returns:
+            List of AsyncWebElements
+        """
+        using, value = _to_w3c_locator(by, value)
+        result = await self.command("POST", "/elements", {"using": using, "value": value})
+        return [AsyncWebElement(self, item[ELEMENT_KEY]) for item in result]
+
+    # Scripts
+
+    def _wrap(self, value):
+        """Convert element references in a script result to AsyncWebElements."""
+        if isinstance(value, dict) and ELEMENT_KEY in value:
+            return AsyncWebElement(self, value[ELEMENT_KEY])
+        if isinstance(value, list):
+            return [self._wrap(v) for v in value]
+        return value
+
+    async def execute_script(self, script, *args):
+        """
+        Execute synchronous JavaScript in the page.
+
+        Args:
+            script: Script body
+            *args: Arguments (AsyncWebElements are passed as elements)
+
+        Returns:
+            Script result
+        """
+        args = [{ELEMENT_KEY: a.id} if isinstance(a, AsyncWebElement) else a for a in args]
+        return self._wrap(await self.command("POST", "/execute/sync", {"script": script, "args": args}))
+
+    async def execute_cdp_cmd(self, cmd, params=None):
+        """
+        Execute a Chrome DevTools Protocol command (chromedriver only).
+
+        Args:
+            cmd: Command name (e.g. "Emulation.setVirtualTimePolicy")
+            params: Command parameters
+
+        Returns:
+            Command result
+        """
+        return await self.command("POST", "/goog/cdp/execute", {"cmd": cmd, "params": params or {}})
+
+    # Windows, cookies, alerts, screenshots
+
+    async def window_handles(self):
+        """Get all window handles."""
+        return await self.command("GET", "/window/handles")
+
+    async def switch_to_window(self, handle):
+        """Switch to a window or tab."""
+        await self.command("POST", "/window", {"handle": handle})
+
+    async def new_window(self, type_hint="tab"):
+        """
+        Open a new tab or window.
+
+        Returns:
+            Handle of the new window
+        """
+        result = await self.command("POST", "/window/new", {"type": type_hint})
+        return result["handle"]
+
+    async def close_window(self):
+        """Close the current window."""
+        await self.command("DELETE", "/window")
+
+    async def get_cookies(self):
+        """Get all cookies."""
+        return await self.command("GET", "/cookie")
+
+    async def add_cookie(self, cookie):
+        """Add a cookie."""
+        await self.command("POST", "/cookie", {"cookie": cookie})
+
+    async def delete_all_cookies(self):
+        """Delete all cookies."""
+        await self.command("DELETE", "/cookie")
+
+    async def accept_alert(self):
+        """Accept the open alert."""
+        await self.command("POST", "/alert/accept", {})
+
+    async def alert_text(self):
+        """Get the text of the open alert."""
+        return await self.command("GET", "/alert/text")
+
+    async def get_screenshot_as_png(self):
+        """Take a screenshot as PNG bytes."""
+        return base64.b64decode(await self.command("GET", "/screenshot"))
+
+    async def save_screenshot(self, filename):
+        """Save a screenshot to a file."""
+        png = await self.get_screenshot_as_png()
+        with open(filename, "wb") as f:
+            f.write(png)
+        return True
+
+
+# --- Waits and expected conditions ---
+
+class AsyncWebDriverWait:
+    """Async counterpart of selenium's WebDriverWait."""
+
+    def __init__(self, driver, timeout, poll_frequency=0.5,
+                 ignored_exceptions=(NoSuchElementException,)):
+        """
+        Initialize wait.
+
+        Args:
+            driver: AsyncWebDriver
+            timeout: Maximum wait time in seconds
+            poll_frequency: Seconds between polls
+            ignored_exceptions: Exceptions treated as "not yet"
+        """
+        self.driver = driver
+        self.timeout = timeout
+        self.poll_frequency = poll_frequency
+        self.ignored_exceptions = tuple(ignored_exceptions)
+
+    async def until(self, condition, message=""):
+        """
+        Wait until an async condition returns a truthy value.
+
+        Args:
+            condition: Async callable taking the driver
+            message: Message for the TimeoutException
+
+        Returns:
+            The condition's value
+
+        Raises:
+            TimeoutException
+        """
+        end_time = time.monotonic() + self.timeout
+        while True:
+            try:
+                value = await condition(self.driver)
+                if value:
+                    return value
+            except self.ignored_exceptions:
+                pass
+            if time.monotonic() > end_time:
+                raise TimeoutException(message)
+            # Other sessions on the event loop run while this one sleeps
+            await asyncio.sleep(self.poll_frequency)
+
+
+class AsyncEC:
+    """Async versions of the expected conditions used in this framework."""
+
+    @staticmethod
+    def presence_of_element_located(locator):
+        """Element is present in the DOM."""
+        async def condition(driver):
+            return await driver.find_element(*locator)
+        return condition
+
+    @staticmethod
+    def element_to_be_clickable(locator):
+        """Element is visible and enabled."""
+        async def condition(driver):
+            element = await driver.find_element(*locator)
+            if await element.is_displayed() and await element.is_enabled():
+                return element
+            return False
+        return condition
+
+    @staticmethod
+    def invisibility_of_element_located(locator):
+        """Element is hidden or gone."""
+        async def condition(driver):
+            try:
+                return not await (await driver.find_element(*locator)).is_displayed()
+            except (NoSuchElementException, StaleElementReferenceException):
+                return True
+        return condition
+
+    @staticmethod
+    def text_to_be_present_in_element(locator, text):
+        """Element text contains the given text."""
+        async def condition(driver):
+            try:
+                return text in await (await driver.find_element(*locator)).text()
+            except StaleElementReferenceException:
+                return False
+        return condition
+
+    @staticmethod
+    def url_to_be(url):
+        """Current URL equals the given URL."""
+        async def condition(driver):
+            return await driver.current_url() == url
+        return condition
+
+    @staticmethod
+    def url_contains(partial_url):
+        """Current URL contains the given string."""
+        async def condition(driver):
+            return partial_url in await driver.current_url()
+        return condition
+
+    @staticmethod
+    def alert_is_present():
+        """An alert is open."""
+        async def condition(driver):
+            try:
+                await driver.alert_text()
+                return True
+            except NoAlertPresentException:
+                return False
+        return condition
+
+
+# --- chromedriver process ---
+
+class ChromeDriverService:
+    """A chromedriver process that many async sessions can share."""
+
+    def __init__(self, process, port):
+        """
+        Initialize service wrapper.
+
+        Args:
+            process: asyncio subprocess running chromedriver
+            port: Port chromedriver listens on
+        """
+        self.process = process
+        self.port = port
+        self.url = f"http://127.0.0.1:{port}"
+
+    @classmethod
+    async def start(cls, executable=None, port=0, timeout=20):
+        """
+        Start chromedriver and wait until it accepts sessions.
+
+        Args:
+            executable: Path to chromedriver (found on PATH if None)
+            port: Port to listen on (a free one if 0)
+            timeout: Seconds to wait for readiness
+
+        Returns:
+            ChromeDriverService
+        """
+        executable = executable or shutil.which("chromedriver")
+        if not executable:
+            raise WebDriverException("chromedriver not found on PATH")
+        if not port:
+            with socket.socket() as s:
+                s.bind(("127.0.0.1", 0))
+                port = s.getsockname()[1]
+        process = await asyncio.create_subprocess_exec(
+            executable, f"--port={port}",
+            stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL)
+        service = cls(process, port)
+
+        pool = AsyncHTTPPool(service.url, size=1, timeout=2)
+        end_time = time.monotonic() + timeout
+        try:
+            while True:
+                try:
+                    _, response = await pool.request("GET", "/status")
+                    if response["value"].get("ready"):
+                        return service
+                except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+                    pass
+                if process.returncode is not None or time.monotonic() > end_time:
+                    await service.stop()
+                    raise WebDriverException(f"chromedriver did not start on port {port}")
+                await asyncio.sleep(0.05)
+        finally:
+            await pool.close()
+
+    async def stop(self):
+        """Stop the chromedriver process."""
+        if self.process.returncode is None:
+            self.process.terminate()
+            await self.process.wait()
+
+
+async def run_concurrent_sessions(remote_url, count, scenario, capabilities=None, pool_size=None):
+    """
+    Run the same async scenario in many browser sessions concurrently.
+
+    Args:
+        remote_url: WebDriver server URL
+        count: Number of sessions
+        scenario: Async callable taking (driver, index)
+        capabilities: Session capabilities (headless Chrome by default)
+        pool_size: Connection pool size (defaults to count)
+
+    Returns:
+        List of scenario results (exceptions are returned, not raised)
+    """
+    pool = AsyncHTTPPool(remote_url, size=pool_size or count)
+    drivers = []
+    try:
+        created = await asyncio.gather(
+            *[AsyncWebDriver.create(capabilities=capabilities, pool=pool) for _ in range(count)],
+            return_exceptions=True)
+        drivers = [d for d in created if isinstance(d, AsyncWebDriver)]
+        errors = [e for e in created if isinstance(e, BaseException)]
+        if errors:
+            raise errors[0]
+        return await asyncio.gather(
+            *[scenario(driver, i) for i, driver in enumerate(drivers)], return_exceptions=True)
+    finally:
+        await asyncio.gather(*[driver.quit() for driver in drivers], return_exceptions=True)
+        await pool.close()
@@ -0,0 +1,317 @@
+import asyncio
+import time
+
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException
+from utils.async_driver import AsyncWebDriverWait, AsyncEC
+from utils.virtual_time import is_virtual_time
+from utils.wait_helpers import VIRTUAL_TIME_POLL, VIRTUAL_TIME_APPEAR_TIMEOUT
+from utils.wait_helpers import COMPOSITE_POLL, COMPOSITE_SCRIPT, WaitResult, split_conditions
+
+class AsyncCustomWaitHelpers:
+    """Async counterpart of CustomWaitHelpers, for use with AsyncWebDriver."""
+    
+    def __init__(self, driver, default_timeout=10):
+        """
+        Initialize async wait helpers.
+        
+        Args:
+            driver: AsyncWebDriver instance
+            default_timeout: Default timeout in seconds
+        """
+        self.driver = driver
+        self.default_timeout = default_timeout
+    
+    async def _until(self, condition, timeout):
+        """Wait for an async condition; return its value or None on timeout."""
+        try:
+            return await AsyncWebDriverWait(self.driver, timeout or self.default_timeout).until(condition)
+        except TimeoutException:
+            return None
+    
+    async def wait_until_element_disappears(self, locator, timeout=None):
+        """
+        Wait until element disappears from DOM (useful for loading spinners, overlays).
+        
+        Args:
+            locator: Tuple of (By.TYPE, "value")
+            timeout: Maximum wait time in seconds
+            
+        Returns:
+            True if element disappeared, False otherwise
+        """
+        return bool(await self._until(AsyncEC.invisibility_of_element_located(locator), timeout))
+    
+    async def wait_for_ajax_complete(self, timeout=None):
+        """
+        Wait until all jQuery AJAX requests are complete.
+        
+        Args:
+            timeout: Maximum wait time in seconds
+            
+        Returns:
+            True if AJAX completed, False otherwise
+        """
+        async def condition(driver):
+            return await driver.execute_script("return jQuery.active == 0")
+        try:
+            return bool(await self._until(condition, timeout))
+        except Exception:
+            # jQuery might not be loaded
+            return True
+    
+    async def wait_for_page_load(self, timeout=None):
+        """
+        Wait until page is fully loaded (document.readyState = complete).
+        
+        Args:
+            timeout: Maximum wait time in seconds
+            
+        Returns:
+            True if page loaded, False otherwise
+        """
+        async def condition(driver):
+            return await driver.execute_script("return document.readyState") == "complete"
+        return bool(await self._until(condition, timeout))
+    
+    async def wait_for_element_attribute(self, locator, attribute, value, timeout=None):
+        """
+        Wait until element attribute has specific value.
+        
+        Args:
+            locator: Tuple of (By.TYPE, "value")
+            attribute: Attribute name (e.g., "class", "disabled")
+            value: Expected attribute value
+            timeout: Maximum wait time in seconds
+            
+        Returns:
+            True if attribute matches, False otherwise
+        """
+        async def condition(driver):
+            element = await driver.find_element(*locator)
+            return await element.get_attribute(attribute) == value
+        return bool(await self._until(condition, timeout))
+    
+    async def wait_for_element_count(self, locator, count, timeout=None):
+        """
+        Wait until number of elements matches expected count.
+        
+        Args:
+            locator: Tuple of (By.TYPE, "value")
+            count: Expected number of elements
+            timeout: Maximum wait time in seconds
+            
+        Returns:
+            True if count matches, False otherwise
+        """
+        async def condition(driver):
+            return len(await driver.find_elements(*locator)) == count
+        return bool(await self._until(condition, timeout))
+    
+    async def wait_for_element_clickable(self, locator, timeout=None):
+        """
+        Wait until element is clickable (visible and enabled).
+        
+        Args:
+            locator: Tuple of (By.TYPE, "value")
+            timeout: Maximum wait time in seconds
+            
+        Returns:
+            AsyncWebElement if clickable, None otherwise
+        """
+        return await self._until(AsyncEC.element_to_be_clickable(locator), timeout)
+    
+    async def wait_for_text_in_element(self, locator, text, timeout=None):
+        """
+        Wait until element contains specific text.
+        
+        Args:
+            locator: Tuple of (By.TYPE, "value")
+            text: Expected text in element
+            timeout: Maximum wait time in seconds
+            
+        Returns:
+            True if text present, False otherwise
+        """
+        return bool(await self._until(AsyncEC.text_to_be_present_in_element(locator, text), timeout))
+    
+    async def wait_for_url_contains(self, partial_url, timeout=None):
+        """
+        Wait until URL contains partial string.
+        
+        Args:
+            partial_url: Partial URL string
+            timeout: Maximum wait time in seconds
+            
+        Returns:
+            True if URL contains string, False otherwise
+        """
+        return bool(await self._until(AsyncEC.url_contains(partial_url), timeout))
+    
+    async def wait_for_alert_present(self, timeout=None):
+        """
+        Wait until alert is present.
+        
+        Args:
+            timeout: Maximum wait time in seconds
+            
+        Returns:
+            True if alert present, False otherwise
+        """
+        return bool(await self._until(AsyncEC.alert_is_present(), timeout))
+    
+    async def wait_for_new_window(self, current_window_count, timeout=None):
+        """
+        Wait until new window/tab is opened.
+        
+        Args:
+            current_window_count: Current number of windows
+            timeout: Maximum wait time in seconds
+            
+        Returns:
+            True if new window opened, False otherwise
+        """
+        async def condition(driver):
+            return len(await driver.window_handles()) > current_window_count
+        return bool(await self._until(condition, timeout))
+    
+    async def wait_for_all(self, conditions, timeout=None):
+        """
+        Wait until every condition is met, checking them together in one poll loop.
+        
+        Args:
+            conditions: Dict of name -> condition (see wait_for_conditions)
+            timeout: Maximum wait time in seconds for the whole set
+            
+        Returns:
+            WaitResult (truthy if all were met; .met maps name -> seconds until met)
+        """
+        return await wait_for_conditions(self.driver, conditions, "all", timeout or self.default_timeout)
+    
+    async def wait_for_any(self, conditions, timeout=None):
+        """
+        Wait until at least one condition is met.
+        
+        Args:
+            conditions: Dict of name -> condition (see wait_for_conditions)
+            timeout: Maximum wait time in seconds
+            
+        Returns:
+            WaitResult (truthy if any was met; .met holds every condition met by then)
+        """
+        return await wait_for_conditions(self.driver, conditions, "any", timeout or self.default_timeout)
+    
+    async def wait_for_first(self, conditions, timeout=None):
+        """
+        Wait for whichever condition is met first (e.g. success vs. error message).
+        
+        Args:
+            conditions: Dict of name -> condition (see wait_for_conditions)
+            timeout: Maximum wait time in seconds
+            
+        Returns:
+            WaitResult (truthy if one was met; .first is its name)
+        """
+        return await wait_for_conditions(self.driver, conditions, "first", timeout or self.default_timeout)
+
+
+# Standalone helper functions (alternative to class-based)
+
+async def wait_for_loading_spinner(driver, spinner_locator, timeout=10):
+    """
+    Wait for loading spinner to appear and disappear.
+    
+    Args:
+        driver: AsyncWebDriver instance
+        spinner_locator: Tuple of (By.TYPE, "value") for spinner
+        timeout: Maximum wait time in seconds
+    """
+    appear_timeout, poll = 2, 0.5
+    if is_virtual_time(driver):
+        appear_timeout, poll = VIRTUAL_TIME_APPEAR_TIMEOUT, VIRTUAL_TIME_POLL
+    try:
+        # Wait for spinner to appear
+        await AsyncWebDriverWait(driver, appear_timeout, poll).until(
+            AsyncEC.presence_of_element_located(spinner_locator))
+        # Wait for spinner to disappear
+        await AsyncWebDriverWait(driver, timeout, poll).until(
+            AsyncEC.invisibility_of_element_located(spinner_locator))
+    except TimeoutException:
+        # Spinner might not appear at all (fast loading)
+        pass
+
+async def wait_for_element_stable(driver, locator, stable_time=1, timeout=10):
+    """
+    Wait until element position is stable (useful for animations).
+    
+    Args:
+        driver: AsyncWebDriver instance
+        locator: Tuple of (By.TYPE, "value")
+        stable_time: Time in seconds element must be stable
+        timeout: Maximum wait time in seconds
+        
+    Returns:
+        True if element is stable, False otherwise
+    """
+    interval = 0.1
+    if is_virtual_time(driver):
+        # Animations are off: two equal readings in a row mean stable
+        interval = stable_time = VIRTUAL_TIME_POLL
+    end_time = time.time() + timeout
+    last_location = None
+    stable_count = 0
+    
+    while time.time() < end_time:
+        try:
+            element = await driver.find_element(*locator)
+            current_location = await element.location()
+            
+            if last_location == current_location:
+                stable_count += interval
+                if stable_count >= stable_time:
+                    return True
+            else:
+                stable_count = 0
+            
+            last_location = current_location
+            await asyncio.sleep(interval)
+        except Exception:
+            return False
+    
+    return False
+
+async def wait_for_conditions(driver, conditions, mode="all", timeout=10, poll=COMPOSITE_POLL):
+    """
+    Wait on several conditions together in one poll loop (see utils.wait_helpers.wait_for_conditions).
+    
+    Args:
+        driver: AsyncWebDriver instance
+        conditions: Dict of name -> PageCondition or async callable(driver)
+        mode: "all", "any" or "first"
+        timeout: Maximum wait time in seconds for the whole set
+        poll: Seconds between ticks
+        
+    Returns:
+        WaitResult
+    """
+    names, page, other = split_conditions(conditions)
+    result = WaitResult(mode, names)
+    if is_virtual_time(driver):
+        poll = VIRTUAL_TIME_POLL
+    start = time.monotonic()
+    while True:
+        pending = set(result.pending)
+        checks = [name for name in page if name in pending]
+        outcomes = {}
+        if checks:
+            values = await driver.execute_script(COMPOSITE_SCRIPT, [page[name].check() for name in checks]) or []
+            outcomes.update(zip(checks, values))
+        for name, condition in other.items():
+            if name in pending:
+                try:
+                    outcomes[name] = bool(await condition(driver))
+                except (NoSuchElementException, StaleElementReferenceException):
+                    outcomes[name] = False
+        elapsed = time.monotonic() - start
+        if result.update(outcomes, elapsed) or elapsed >= timeout:
+            return result
+        await asyncio.sleep(min(poll, max(0.0, timeout - elapsed)))
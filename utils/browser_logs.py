@@ -0,0 +1,238 @@
+"""
+Rolling browser console and network capture, written only for failed tests.
+
+Chrome keeps console messages ("browser" log) and DevTools Network events
+("performance" log) when the session is created with goog:loggingPrefs
+(see enable_log_capture). A BrowserLogBuffer drains both logs from a
+background thread every DRAIN_INTERVAL seconds, so test steps never wait
+for it, and keeps only the most recent entries in fixed-size ring buffers:
+console messages as they are, network events folded into one summary per
+request (method, URL, status, type, error, duration). Entry text is
+truncated, so memory per browser stays bounded no matter how chatty the
+page is.
+
+Nothing is written for passing tests. On failure, write_failure_logs()
+does a last drain, saves both buffers gzipped as JSON
+(artifacts/browser_logs/) and returns a short text summary of console
+errors and failed requests for the report.
+"""
+import gzip
+import json
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from pathlib import Path
+
+LOGS_DIR = Path(__file__).parent.parent / "artifacts" / "browser_logs"
+
+CONSOLE_SIZE = 200  # console messages kept per browser
+NETWORK_SIZE = 200  # request summaries kept per browser
+MAX_TEXT = 500  # characters kept per message / URL
+DRAIN_INTERVAL = 2.0  # seconds
+
+LOGGING_PREFS = {"browser": "ALL", "performance": "ALL"}
+PERF_LOGGING_PREFS = {"enableNetwork": True, "enablePage": False}
+
+NETWORK_EVENTS = ("Network.requestWillBeSent", "Network.responseReceived",
+                  "Network.loadingFinished", "Network.loadingFailed")
+
+
+def enable_log_capture(options):
+    """
+    Ask chromedriver to keep console and network logs for a session.
+
+    Args:
+        options: ChromeOptions (modified in place)
+
+    Returns:
+        The options
+    """
+    options.set_capability("goog:loggingPrefs", LOGGING_PREFS)
+    options.add_experimental_option("perfLoggingPrefs", PERF_LOGGING_PREFS)
+    return options
+
+
+def _clip(text, limit=MAX_TEXT):
+    text = str(text)
+    return text if len(text) <= limit else text[:limit - 3] + "..."
+
+
+class BrowserLogBuffer:
+    """Bounded ring buffers of one browser's console messages and network requests."""
+
+    def __init__(self, driver, console_size=CONSOLE_SIZE, network_size=NETWORK_SIZE, interval=DRAIN_INTERVAL):
+        """
+        Initialize log buffer.
+
+        Args:
+            driver: WebDriver created with enable_log_capture()
+            console_size: Console messages kept
+            network_size: Request summaries kept
+            interval: Seconds between background drains
+        """
+        self.driver = driver
+        self.console = deque(maxlen=console_size)
+        self.network = deque(maxlen=network_size)
+        self.in_flight = OrderedDict()  # requestId -> summary, until finished or failed
+        self.network_size = network_size
+        self.interval = interval
+        self.dropped = 0  # entries that fell out of the ring buffers
+        self.available = True
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """
+        Start draining in the background.
+
+        Returns:
+            self
+        """
+        self._thread = threading.Thread(target=self._run, name="browser-logs", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.drain()
+
+    def stop(self):
+        """Stop the background drain (before the driver quits)."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(self.interval + 5)
+            self._thread = None
+
+    def _get_log(self, log_type):
+        # Command works on webdriver.Chrome and on Remote sessions alike
+        return self.driver.execute("getLog", {"type": log_type})["value"] or []
+
+    def drain(self):
+        """
+        Move new log entries from chromedriver into the ring buffers.
+
+        Returns:
+            Number of entries read (0 if the driver has no log support or is gone)
+        """
+        if not self.available:
+            return 0
+        with self._lock:
+            try:
+                console = self._get_log("browser")
+                performance = self._get_log("performance")
+            except Exception as e:
+                if "log type" in str(e).lower() or "unknown command" in str(e).lower():
+                    self.available = False  # not a Chromium session with logging prefs
+                return 0
+            for entry in console:
+                self._push(self.console, {"time": entry.get("timestamp"), "level": entry.get("level"),
+                                          "source": entry.get("source"), "message": _clip(entry.get("message", ""))})
+            for entry in performance:
+                self._network_event(entry)
+            return len(console) + len(performance)
+
+    def _push(self, buffer, item):
+        if len(buffer) == buffer.maxlen:
+            self.dropped += 1
+        buffer.append(item)
+
+    def _network_event(self, entry):
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, TypeError, ValueError):
+            return
+        method = message.get("method")
+        if method not in NETWORK_EVENTS:
+            return
+        params = message.get("params", {})
+        request_id = params.get("requestId")
+        if method == "Network.requestWillBeSent":
+            request = params.get("request", {})
+            self.in_flight[request_id] = {
+                "method": request.get("method"), "url": _clip(request.get("url", "")), "type": params.get("type"),
+                "status": None, "error": None, "start": params.get("timestamp"), "duration_ms": None}
+            while len(self.in_flight) > self.network_size:
+                self.in_flight.popitem(last=False)
+                self.dropped += 1
+            return
+        summary = self.in_flight.get(request_id)
+        if summary is None:
+            return
+        if method == "Network.responseReceived":
+            summary["status"] = params.get("response", {}).get("status")
+            return
+        if method == "Network.loadingFailed":
+            summary["error"] = _clip(params.get("errorText", "failed"))
+        if summary["start"] is not None and params.get("timestamp") is not None:
+            summary["duration_ms"] = round((params["timestamp"] - summary["start"]) * 1000, 1)
+        del self.in_flight[request_id]
+        self._push(self.network, summary)
+
+    def clear(self):
+        """Drop everything collected so far (e.g. when a shared browser moves to the next test)."""
+        self.drain()
+        with self._lock:
+            self.console.clear()
+            self.network.clear()
+            self.in_flight.clear()
+            self.dropped = 0
+
+    def snapshot(self):
+        """
+        Drain once more and copy the buffers.
+
+        Returns:
+            Dict with console, network (including still pending requests) and dropped
+        """
+        self.drain()
+        with self._lock:
+            pending = [{**summary, "error": summary["error"] or "pending"} for summary in self.in_flight.values()]
+            return {"console": list(self.console), "network": list(self.network) + pending,
+                    "dropped": self.dropped}
+
+
+def problems(snapshot, limit=20):
+    """
+    Console errors/warnings and failed requests of a snapshot.
+
+    Args:
+        snapshot: Output of BrowserLogBuffer.snapshot()
+        limit: Maximum lines per kind
+
+    Returns:
+        Multi-line string (empty if nothing went wrong)
+    """
+    console = [f"[{m['level']}] {m['message']}" for m in snapshot["console"]
+               if m["level"] in ("SEVERE", "WARNING")][-limit:]
+    network = [f"{r['method']} {r['url']} -> {r['error'] or r['status']}" for r in snapshot["network"]
+               if r["error"] or (r["status"] or 0) >= 400][-limit:]
+    lines = []
+    if console:
+        lines += ["Console:"] + [f"  {line}" for line in console]
+    if network:
+        lines += ["Failed requests:"] + [f"  {line}" for line in network]
+    return "\n".join(lines)
+
+
+def write_failure_logs(buffer, test_name, directory=LOGS_DIR):
+    """
+    Save a failed test's console and network buffers, gzipped.
+
+    Args:
+        buffer: BrowserLogBuffer of the test's browser
+        test_name: Test name (file name prefix)
+        directory: Output directory
+
+    Returns:
+        Tuple of (path to the .json.gz file, problems() text)
+    """
+    snapshot = buffer.snapshot()
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    name = re.sub(r"[^A-Za-z0-9_.-]+", "_", test_name)
+    path = directory / f"{name}_{time.strftime('%Y%m%d_%H%M%S')}.json.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        json.dump(snapshot, f, separators=(",", ":"))
+    return path, problems(snapshot)
@@ -0,0 +1,241 @@
+"""
+Pre-warmed Chrome profile template (`pytest --profile-template`).
+
+A fresh Chrome user-data-dir costs every launch the profile database
+setup, first-run work and a cold HTTP cache. In profile-template mode one
+warmed profile is built per environment (artifacts/profiles/<env>/template):
+Chrome is started once with first-run suppressed, visits the app pages in
+PROFILE_WARM_PATHS so their static assets land in the disk cache, and is
+shut down cleanly. Every browser launch then gets its own clone of that
+directory.
+
+Clones use copy-on-write (FICLONE reflinks, e.g. on btrfs/XFS) where the
+filesystem supports it and fall back to a plain copy. Hard links are not
+used: Chrome rewrites its cache index and SQLite files in place, so a
+linked clone would write back into the template.
+
+The template is rebuilt when it is older than PROFILE_TEMPLATE_MAX_AGE,
+when the warm paths or base URL change, or when Chrome was upgraded.
+Rebuilds can happen mid-session and in parallel worker processes, so the
+swap into place holds an exclusive lock on template.lock and clones hold
+it shared: a clone never sees the template directory disappear.
+"""
+import errno
+import json
+import os
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+PROFILES_DIR = Path(__file__).parent.parent / "artifacts" / "profiles"
+DEFAULT_MAX_AGE = 24 * 3600  # seconds
+
+MANIFEST_NAME = "template.json"
+
+# Chrome switches that skip first-run and background work in template and clones
+FIRST_RUN_ARGS = (
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--disable-component-update",
+    "--disable-background-networking",
+    "--disable-sync",
+    "--disable-default-apps",
+)
+
+# Per-process locks and per-session state that must not be carried into clones
+VOLATILE_PATHS = (
+    "SingletonLock", "SingletonSocket", "SingletonCookie", "lockfile",
+    "Crashpad", "BrowserMetrics", "ShaderCache",
+    "Default/Sessions", "Default/Current Session", "Default/Current Tabs",
+    "Default/Cookies", "Default/Cookies-journal", "Default/Network/Cookies", "Default/Network/Cookies-journal",
+    "Default/Local Storage", "Default/Session Storage", "Default/IndexedDB",
+)
+
+_FICLONE = 0x40049409  # Linux ioctl: share the source's extents (copy-on-write)
+
+
+def reflink_file(src, dst):
+    """
+    Clone a file with copy-on-write.
+
+    Args:
+        src: Source file
+        dst: Destination file (created)
+
+    Raises:
+        OSError: If the platform or filesystem does not support reflinks
+    """
+    import fcntl
+
+    with open(src, "rb") as source, open(dst, "wb") as target:
+        fcntl.ioctl(target.fileno(), _FICLONE, source.fileno())
+    shutil.copystat(src, dst)
+
+
+class ProfileTemplate:
+    """A warmed Chrome user-data-dir that browser launches clone."""
+
+    def __init__(self, environment, base_url, warm_paths=("/",), max_age=DEFAULT_MAX_AGE, root=None):
+        """
+        Initialize profile template.
+
+        Args:
+            environment: Environment name (one template per environment)
+            base_url: Application URL whose pages are visited while warming
+            warm_paths: Paths visited to fill the HTTP cache
+            max_age: Seconds before the template is rebuilt
+            root: Profiles directory (artifacts/profiles if None)
+        """
+        self.base_url = base_url.rstrip("/")
+        self.warm_paths = list(warm_paths)
+        self.max_age = max_age
+        self.directory = Path(root or PROFILES_DIR) / environment
+        self.path = self.directory / "template"
+        self.clone_method = None  # "reflink" or "copy", decided on the first clone
+
+    @contextmanager
+    def _locked(self, shared=False):
+        """Hold template.lock: exclusive while swapping a new template in, shared while cloning."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.directory / "template.lock", "w") as lock:
+            try:
+                import fcntl
+                fcntl.flock(lock, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            except ImportError:
+                pass
+            yield
+
+    def manifest(self):
+        """
+        Read the template manifest.
+
+        Returns:
+            Dict (created, base_url, warm_paths, browser_version) or None
+        """
+        try:
+            with open(self.path / MANIFEST_NAME, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def is_stale(self, browser_version=None):
+        """
+        Check whether the template must be (re)built.
+
+        Args:
+            browser_version: Installed Chrome version, if known
+
+        Returns:
+            Boolean
+        """
+        manifest = self.manifest()
+        if manifest is None:
+            return True
+        if time.time() - manifest.get("created", 0) > self.max_age:
+            return True
+        if manifest.get("base_url") != self.base_url or manifest.get("warm_paths") != self.warm_paths:
+            return True
+        return bool(browser_version and manifest.get("browser_version") != browser_version)
+
+    def build(self, launch):
+        """
+        Build the template: warm a fresh profile and swap it into place.
+
+        Args:
+            launch: Callable(user_data_dir) -> WebDriver started with that profile
+
+        Returns:
+            Path to the template directory
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix="template-", dir=self.directory))
+        (staging / "First Run").touch()
+        driver = launch(str(staging))
+        try:
+            for path in self.warm_paths:
+                driver.get(self.base_url + path)
+            browser_version = driver.capabilities.get("browserVersion")
+        finally:
+            # A clean exit flushes the disk cache and profile databases
+            driver.quit()
+
+        for name in VOLATILE_PATHS:
+            target = staging / name
+            if target.is_dir() and not target.is_symlink():
+                shutil.rmtree(target, ignore_errors=True)
+            elif target.exists() or target.is_symlink():
+                target.unlink()
+        with open(staging / MANIFEST_NAME, "w", encoding="utf-8") as f:
+            json.dump({"created": time.time(), "base_url": self.base_url, "warm_paths": self.warm_paths,
+                       "browser_version": browser_version}, f, indent=1)
+
+        old = None
+        with self._locked():
+            if self.path.exists():
+                old = self.path.with_name(f"template.old.{os.getpid()}")
+                self.path.rename(old)
+            staging.rename(self.path)
+        if old is not None:
+            shutil.rmtree(old, ignore_errors=True)
+        return self.path
+
+    def ensure(self, launch, rebuild=False):
+        """
+        Build the template if it is missing, stale or a rebuild is forced.
+
+        Args:
+            launch: Callable(user_data_dir) -> WebDriver (see build)
+            rebuild: Rebuild even if the template is fresh
+
+        Returns:
+            True if the template was (re)built
+        """
+        if rebuild or self.is_stale():
+            self.build(launch)
+            return True
+        return False
+
+    def _copy_file(self, src, dst):
+        if self.clone_method != "copy":
+            try:
+                reflink_file(src, dst)
+                self.clone_method = "reflink"
+                return dst
+            except (ImportError, OSError) as e:
+                if isinstance(e, OSError) and e.errno not in (
+                        errno.EOPNOTSUPP, errno.ENOTTY, errno.EXDEV, errno.EINVAL, errno.ENOSYS, errno.EBADF):
+                    raise
+                self.clone_method = "copy"
+        return shutil.copy2(src, dst)
+
+    def clone(self, destination=None):
+        """
+        Clone the template into a new user-data-dir.
+
+        Args:
+            destination: Directory to create (new temp dir next to the template if None)
+
+        Returns:
+            Path to the clone
+        """
+        if destination is None:
+            clones = self.directory / "clones"
+            clones.mkdir(parents=True, exist_ok=True)
+            destination = Path(tempfile.mkdtemp(prefix=f"{os.getpid()}-", dir=clones))
+            destination.rmdir()
+        with self._locked(shared=True):
+            shutil.copytree(self.path, destination, symlinks=True, copy_function=self._copy_file,
+                            ignore=shutil.ignore_patterns(MANIFEST_NAME))
+        return Path(destination)
+
+    @staticmethod
+    def discard(clone):
+        """
+        Delete a clone after its browser quit.
+
+        Args:
+            clone: Path returned by clone()
+        """
+        shutil.rmtree(clone, ignore_errors=True)
@@ -0,0 +1,298 @@
+"""
+Browser-state snapshots: restore a prepared app state instead of replaying UI steps.
+
+A snapshot captures cookies, localStorage, sessionStorage, the current URL
+and optionally IndexedDB after a setup sequence. Snapshots are cached on
+disk per environment and user (artifacts/states/<env>/<user>/<name>.json)
+with a TTL, so later tests (and later runs) restore the state in one call.
+
+`state_fixture` turns a setup function into a fixture that builds the state
+once per session and restores it for every other test:
+
+    @state_fixture("dashboard", ttl=3600)
+    def dashboard_state(driver):
+        LoginPage(driver, BASE_URL).login(USERNAME, PASSWORD)
+
+    def test_sidebar(dashboard_state):   # driver already on /dashboard, logged in
+        ...
+"""
+import inspect
+import json
+import re
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+STATES_DIR = Path(__file__).parent.parent / "artifacts" / "states"
+DEFAULT_TTL = 3600  # seconds
+
+DRIVER_ARGS = ("logged_in_driver", "driver")
+
+_READ_STORAGE_SCRIPT = """
+function dump(storage) {
+  var data = {};
+  for (var i = 0; i < storage.length; i++) {
+    var key = storage.key(i);
+    data[key] = storage.getItem(key);
+  }
+  return data;
+}
+return {local: dump(window.localStorage), session: dump(window.sessionStorage)};
+"""
+
+_WRITE_STORAGE_SCRIPT = """
+var state = arguments[0];
+window.localStorage.clear();
+window.sessionStorage.clear();
+Object.keys(state.local).forEach(function (k) { window.localStorage.setItem(k, state.local[k]); });
+Object.keys(state.session).forEach(function (k) { window.sessionStorage.setItem(k, state.session[k]); });
+"""
+
+# IndexedDB values must be structured-clone/JSON friendly to round-trip
+_READ_INDEXEDDB_SCRIPT = """
+var done = arguments[arguments.length - 1];
+if (!window.indexedDB || !indexedDB.databases) { done([]); return; }
+indexedDB.databases().then(function (infos) {
+  return Promise.all(infos.map(function (info) {
+    return new Promise(function (resolve) {
+      var request = indexedDB.open(info.name);
+      request.onerror = function () { resolve(null); };
+      request.onsuccess = function () {
+        var db = request.result, names = Array.prototype.slice.call(db.objectStoreNames);
+        if (!names.length) { db.close(); resolve({name: db.name, version: db.version, stores: []}); return; }
+        var tx = db.transaction(names, 'readonly'), stores = [];
+        names.forEach(function (storeName) {
+          var store = tx.objectStore(storeName), entry = {
+            name: storeName, keyPath: store.keyPath, autoIncrement: store.autoIncrement, records: []};
+          stores.push(entry);
+          store.openCursor().onsuccess = function (e) {
+            var cursor = e.target.result;
+            if (cursor) { entry.records.push([cursor.primaryKey, cursor.value]); cursor.continue(); }
+          };
+        });
+        tx.oncomplete = function () { db.close(); resolve({name: db.name, version: db.version, stores: stores}); };
+        tx.onerror = function () { db.close(); resolve(null); };
+      };
+    });
+  }));
+}).then(function (dbs) { done(dbs.filter(Boolean)); }, function () { done([]); });
+"""
+
+_WRITE_INDEXEDDB_SCRIPT = """
+var dbs = arguments[0], done = arguments[arguments.length - 1];
+Promise.all(dbs.map(function (snapshot) {
+  return new Promise(function (resolve) {
+    var del = indexedDB.deleteDatabase(snapshot.name);
+    del.onsuccess = del.onerror = del.onblocked = function () {
+      var request = indexedDB.open(snapshot.name, snapshot.version);
+      request.onupgradeneeded = function () {
+        snapshot.stores.forEach(function (s) {
+          request.result.createObjectStore(s.name, {keyPath: s.keyPath, autoIncrement: s.autoIncrement});
+        });
+      };
+      request.onerror = function () { resolve(false); };
+      request.onsuccess = function () {
+        var db = request.result, names = snapshot.stores.map(function (s) { return s.name; });
+        if (!names.length) { db.close(); resolve(true); return; }
+        var tx = db.transaction(names, 'readwrite');
+        snapshot.stores.forEach(function (s) {
+          var store = tx.objectStore(s.name);
+          s.records.forEach(function (r) { s.keyPath ? store.put(r[1]) : store.put(r[1], r[0]); });
+        });
+        tx.oncomplete = function () { db.close(); resolve(true); };
+        tx.onerror = function () { db.close(); resolve(false); };
+      };
+    };
+  });
+})).then(function (results) { done(results.every(Boolean)); });
+"""
+
+
+def _origin(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def capture_state(driver, indexeddb=False):
+    """
+    Capture the browser state of the current page's origin.
+
+    Args:
+        driver: Selenium WebDriver instance
+        indexeddb: Also capture IndexedDB databases
+
+    Returns:
+        Snapshot dict (url, cookies, local_storage, session_storage, indexeddb, created)
+    """
+    storage = driver.execute_script(_READ_STORAGE_SCRIPT) or {"local": {}, "session": {}}
+    return {
+        "url": driver.current_url,
+        "cookies": driver.get_cookies(),
+        "local_storage": storage["local"],
+        "session_storage": storage["session"],
+        "indexeddb": driver.execute_async_script(_READ_INDEXEDDB_SCRIPT) if indexeddb else None,
+        "created": time.time(),
+    }
+
+
+def restore_state(driver, snapshot, navigate=True):
+    """
+    Restore a snapshot into the browser.
+
+    Args:
+        driver: Selenium WebDriver instance
+        snapshot: Output of capture_state()
+        navigate: Load the snapshot URL afterwards (so the page sees the state)
+    """
+    url = snapshot["url"]
+    # Cookies and storage can only be written from a page of the same origin
+    if _origin(driver.current_url) != _origin(url):
+        driver.get(_origin(url) + "/")
+    driver.delete_all_cookies()
+    now = time.time()
+    for cookie in snapshot["cookies"]:
+        if cookie.get("expiry") and cookie["expiry"] < now:
+            continue
+        cookie = {k: v for k, v in cookie.items() if k != "sameSite" or v in ("Strict", "Lax", "None")}
+        driver.add_cookie(cookie)
+    driver.execute_script(_WRITE_STORAGE_SCRIPT, {
+        "local": snapshot["local_storage"], "session": snapshot["session_storage"]})
+    if snapshot.get("indexeddb"):
+        driver.execute_async_script(_WRITE_INDEXEDDB_SCRIPT, snapshot["indexeddb"])
+    if navigate:
+        driver.get(url)
+
+
+def _safe_name(value):
+    return re.sub(r"[^A-Za-z0-9_.@-]+", "_", value)
+
+
+class StateCache:
+    """On-disk snapshot cache for one environment and user."""
+
+    def __init__(self, environment, user, ttl=DEFAULT_TTL, root=None):
+        """
+        Initialize state cache.
+
+        Args:
+            environment: Environment name (e.g. "dev")
+            user: User the states were prepared for
+            ttl: Seconds a snapshot stays valid
+            root: Cache directory (artifacts/states if None)
+        """
+        self.ttl = ttl
+        self.directory = Path(root or STATES_DIR) / _safe_name(environment) / _safe_name(user)
+
+    def _path(self, name):
+        return self.directory / f"{_safe_name(name)}.json"
+
+    def load(self, name, ttl=None):
+        """
+        Load a snapshot if it exists and has not expired.
+
+        Args:
+            name: State name
+            ttl: Override the cache TTL
+
+        Returns:
+            Snapshot dict or None
+        """
+        path = self._path(name)
+        if not path.exists():
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        ttl = self.ttl if ttl is None else ttl
+        if time.time() - snapshot.get("created", 0) > ttl:
+            return None
+        return snapshot
+
+    def save(self, name, snapshot):
+        """
+        Save a snapshot.
+
+        Args:
+            name: State name
+            snapshot: Output of capture_state()
+
+        Returns:
+            Path to the snapshot file
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(name)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, indent=1)
+        return path
+
+    def invalidate(self, name):
+        """
+        Delete a snapshot.
+
+        Args:
+            name: State name
+        """
+        self._path(name).unlink(missing_ok=True)
+
+
+def state_fixture(name, ttl=DEFAULT_TTL, indexeddb=False, verify=None):
+    """
+    Turn a setup function into a fixture that restores a cached browser state.
+
+    The setup function takes `driver` or `logged_in_driver` (plus any other
+    fixtures) and performs the UI steps that lead to the state. The first
+    test that needs the state runs the steps and snapshots the result; other
+    tests, in this session or later ones within the TTL, restore the snapshot.
+
+    Args:
+        name: State name (cache key, per environment and user)
+        ttl: Seconds a snapshot stays valid
+        indexeddb: Also snapshot IndexedDB
+        verify: Callable(driver) -> bool checking a restored state; the steps
+            are replayed when it returns False (e.g. the server session expired)
+
+    Returns:
+        Decorator producing a pytest fixture that yields the driver
+    """
+    import pytest
+
+    def decorator(setup):
+        params = list(inspect.signature(setup).parameters)
+        driver_arg = next((p for p in params if p in DRIVER_ARGS), None)
+        if driver_arg is None:
+            raise TypeError(f"{setup.__name__} must take one of {DRIVER_ARGS}")
+
+        def fixture(request, **kwargs):
+            from config import ENVIRONMENT, USERNAME
+
+            driver = kwargs[driver_arg]
+            config = request.config
+            cache = StateCache(ENVIRONMENT, USERNAME, ttl)
+            built = config.__dict__.setdefault("_browser_states", {})
+            snapshot = built.get(name)
+            if snapshot is None and not config.getoption("refresh_states"):
+                snapshot = cache.load(name)
+            if snapshot is not None:
+                restore_state(driver, snapshot)
+                if verify is None or verify(driver):
+                    built[name] = snapshot
+                    yield driver
+                    return
+                cache.invalidate(name)
+            setup(**kwargs, **({"request": request} if "request" in params else {}))
+            built[name] = capture_state(driver, indexeddb)
+            cache.save(name, built[name])
+            yield driver
+
+        fixture.__name__ = setup.__name__
+        fixture.__qualname__ = setup.__qualname__
+        fixture.__doc__ = setup.__doc__
+        fixture.__module__ = setup.__module__
+        fixture.__signature__ = inspect.Signature(
+            [inspect.Parameter("request", inspect.Parameter.POSITIONAL_OR_KEYWORD)]
+            + [inspect.Parameter(p, inspect.Parameter.KEYWORD_ONLY) for p in params if p != "request"])
+        return pytest.fixture(fixture)
+
+    return decorator
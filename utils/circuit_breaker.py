@@ -0,0 +1,156 @@
+"""
+Fail-fast circuit breaker for an unreachable or broken target environment.
+
+Before the first browser test runs, a cheap HTTP health probe checks that
+BASE_URL answers. During the run, the breaker counts consecutive
+infrastructure-class failures (login/fixture setup errors, navigation
+timeouts, connection errors). Once the probe fails or the count reaches the
+threshold, the breaker opens and the remaining browser tests are skipped
+(or the run is aborted) immediately, with the reason in the report.
+"""
+import time
+import urllib.error
+import urllib.request
+
+# Fixtures whose tests depend on the target environment
+BROWSER_FIXTURES = ("driver", "logged_in_driver")
+
+# Error messages that point at the environment rather than the test
+INFRA_ERROR_MARKERS = (
+    "net::ERR_",
+    "ERR_CONNECTION",
+    "ERR_NAME_NOT_RESOLVED",
+    "Timed out receiving message from renderer",
+    "Connection refused",
+)
+
+
+class ProbeResult:
+    """Result of an environment health probe."""
+
+    def __init__(self, ok, reason, duration):
+        """
+        Initialize probe result.
+
+        Args:
+            ok: True if the environment looks healthy
+            reason: Human-readable result
+            duration: Probe duration in seconds
+        """
+        self.ok = ok
+        self.reason = reason
+        self.duration = duration
+
+    def __repr__(self):
+        return f"ProbeResult(ok={self.ok}, reason={self.reason!r}, duration={self.duration:.2f})"
+
+
+def probe_environment(base_url, paths=("/",), timeout=5):
+    """
+    Check that the target environment answers HTTP requests.
+
+    Any response below 500 counts as healthy (login redirects and 401/403
+    included); server errors, timeouts and connection errors do not.
+
+    Args:
+        base_url: Environment base URL
+        paths: Paths to request, relative to base_url
+        timeout: Timeout per request in seconds
+
+    Returns:
+        ProbeResult
+    """
+    start = time.perf_counter()
+    for path in paths:
+        url = base_url.rstrip("/") + path
+        try:
+            with urllib.request.urlopen(url, timeout=timeout) as response:
+                status = response.status
+        except urllib.error.HTTPError as e:
+            status = e.code
+        except Exception as e:
+            return ProbeResult(False, f"{url} unreachable: {e}", time.perf_counter() - start)
+        if status >= 500:
+            return ProbeResult(False, f"{url} returned HTTP {status}", time.perf_counter() - start)
+    return ProbeResult(True, f"{base_url} healthy", time.perf_counter() - start)
+
+
+def uses_browser(fixturenames):
+    """
+    Check whether a test depends on the target environment.
+
+    Args:
+        fixturenames: Fixture names the test uses
+
+    Returns:
+        Boolean
+    """
+    return any(name in fixturenames for name in BROWSER_FIXTURES)
+
+
+def is_infrastructure_failure(when, fixturenames, exc):
+    """
+    Classify a test failure as infrastructure-related.
+
+    Args:
+        when: Test phase ("setup", "call" or "teardown")
+        fixturenames: Fixture names the test uses
+        exc: Exception raised
+
+    Returns:
+        Boolean
+    """
+    if not uses_browser(fixturenames) or exc is None:
+        return False
+    # Browser/login fixtures failing to set up means the environment is broken
+    if when == "setup":
+        return True
+    message = str(exc)
+    return any(marker in message for marker in INFRA_ERROR_MARKERS)
+
+
+class CircuitBreaker:
+    """Opens after K consecutive infrastructure failures."""
+
+    def __init__(self, threshold=3):
+        """
+        Initialize circuit breaker.
+
+        Args:
+            threshold: Consecutive infrastructure failures before opening
+        """
+        self.threshold = threshold
+        self.consecutive_failures = 0
+        self.reason = None
+        self.skipped = 0
+
+    @property
+    def is_open(self):
+        """True once the breaker has tripped."""
+        return self.reason is not None
+
+    def trip(self, reason):
+        """
+        Open the breaker immediately.
+
+        Args:
+            reason: Why the breaker opened
+        """
+        if not self.is_open:
+            self.reason = reason
+
+    def record_success(self):
+        """Reset the consecutive failure count."""
+        self.consecutive_failures = 0
+
+    def record_failure(self, description):
+        """
+        Record an infrastructure failure.
+
+        Args:
+            description: Short description of the failure (test id and error)
+        """
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= self.threshold:
+            self.trip(f"{self.consecutive_failures} consecutive infrastructure failures "
+                      f"(last: {description})")
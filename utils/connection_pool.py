@@ -0,0 +1,197 @@
+"""
+Tuned keep-alive connection pool and per-command latency stats for WebDriver.
+
+Every find_element/click/execute_script/wait poll is an HTTP request to
+chromedriver. `configure_connection()` swaps the driver's connection manager
+for a shared urllib3 pool with keep-alive, TCP_NODELAY and explicit
+connect/read timeouts, and `LatencyRecorder` times every command so
+p50/p95/p99 per command name can be reported at session end.
+"""
+import json
+import math
+import socket
+import statistics
+import threading
+import time
+from pathlib import Path
+
+import urllib3
+from urllib3.connection import HTTPConnection
+
+LATENCY_DIR = Path(__file__).parent.parent / "artifacts" / "latency"
+
+# Shared pool managers, keyed by (pool_size, connect_timeout, read_timeout)
+_pool_managers = {}
+_pool_lock = threading.Lock()
+
+
+def get_pool_manager(pool_size=4, connect_timeout=5, read_timeout=120):
+    """
+    Get the shared keep-alive pool manager for a configuration.
+
+    Args:
+        pool_size: Connections kept alive per chromedriver host:port
+        connect_timeout: TCP connect timeout in seconds
+        read_timeout: Response timeout in seconds
+
+    Returns:
+        urllib3.PoolManager
+    """
+    key = (pool_size, connect_timeout, read_timeout)
+    with _pool_lock:
+        if key not in _pool_managers:
+            _pool_managers[key] = urllib3.PoolManager(
+                num_pools=16,
+                maxsize=pool_size,
+                block=False,
+                retries=False,
+                timeout=urllib3.Timeout(connect=connect_timeout, read=read_timeout),
+                # Defaults already set TCP_NODELAY; keep idle connections alive too
+                socket_options=HTTPConnection.default_socket_options + [
+                    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+                ],
+            )
+        return _pool_managers[key]
+
+
+def configure_connection(driver, pool_size=4, connect_timeout=5, read_timeout=120, recorder=None):
+    """
+    Route a driver's commands through the shared keep-alive pool.
+
+    Args:
+        driver: Selenium WebDriver instance
+        pool_size: Connections kept alive per chromedriver
+        connect_timeout: TCP connect timeout in seconds
+        read_timeout: Response timeout in seconds
+        recorder: LatencyRecorder to time every command (optional)
+
+    Returns:
+        True if the pool was installed, False if the executor is not supported
+    """
+    executor = driver.command_executor
+    if not hasattr(executor, "_conn"):
+        return False
+    client_config = getattr(executor, "_client_config", None)
+    if client_config is not None:
+        client_config.keep_alive = True
+        client_config.timeout = read_timeout
+    executor._conn = get_pool_manager(pool_size, connect_timeout, read_timeout)
+    if recorder is not None:
+        recorder.instrument(executor)
+    return True
+
+
+def percentile(sorted_values, pct):
+    """
+    Get a percentile from sorted values (nearest-rank).
+
+    Args:
+        sorted_values: Ascending list of numbers
+        pct: Percentile (0-100)
+
+    Returns:
+        Value at the percentile
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class LatencyRecorder:
+    """Collects WebDriver command latencies per command name."""
+
+    def __init__(self):
+        """Initialize latency recorder."""
+        self.samples = {}
+        self._lock = threading.Lock()
+        self._thread = threading.get_ident()
+
+    def record(self, command, duration):
+        """
+        Record one command latency.
+
+        Args:
+            command: WebDriver command name (e.g. "findElement")
+            duration: Latency in seconds
+        """
+        with self._lock:
+            self.samples.setdefault(command, []).append(duration)
+
+    def instrument(self, executor):
+        """
+        Time every command sent through a RemoteConnection (test thread only;
+        background log drains are not test commands).
+
+        Args:
+            executor: driver.command_executor
+        """
+        if getattr(executor, "_latency_recorder", None) is self:
+            return
+        execute = executor.execute
+
+        def timed_execute(command, params):
+            if threading.get_ident() != self._thread:
+                return execute(command, params)
+            start = time.perf_counter()
+            try:
+                return execute(command, params)
+            finally:
+                self.record(command, time.perf_counter() - start)
+
+        executor.execute = timed_execute
+        executor._latency_recorder = self
+
+    def summary(self):
+        """
+        Summarize latencies per command.
+
+        Returns:
+            Dict of command -> {count, mean, p50, p95, p99, max} (seconds),
+            slowest total time first
+        """
+        with self._lock:
+            samples = {command: sorted(values) for command, values in self.samples.items()}
+        result = {}
+        for command, values in sorted(samples.items(), key=lambda kv: -sum(kv[1])):
+            result[command] = {
+                "count": len(values),
+                "total": sum(values),
+                "mean": statistics.fmean(values),
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+                "p99": percentile(values, 99),
+                "max": values[-1],
+            }
+        return result
+
+    def format_summary(self):
+        """
+        Format the summary as a text table (milliseconds).
+
+        Returns:
+            Multi-line string
+        """
+        lines = [f"{'command':<28}{'count':>8}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}{'total s':>10}"]
+        for command, s in self.summary().items():
+            lines.append(
+                f"{command:<28}{s['count']:>8}{s['p50'] * 1000:>10.1f}{s['p95'] * 1000:>10.1f}"
+                f"{s['p99'] * 1000:>10.1f}{s['max'] * 1000:>10.1f}{s['total']:>10.2f}")
+        return "\n".join(lines)
+
+    def save(self, path=None):
+        """
+        Save the summary as JSON.
+
+        Args:
+            path: Output file (timestamped file in artifacts/latency if None)
+
+        Returns:
+            Path to the saved file
+        """
+        if path is None:
+            LATENCY_DIR.mkdir(parents=True, exist_ok=True)
+            path = LATENCY_DIR / f"latency_{time.strftime('%Y%m%d_%H%M%S')}.json"
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=1)
+        return Path(path)
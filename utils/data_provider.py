@@ -0,0 +1,339 @@
+"""
+Data-driven test expansion (`@pytest.mark.data`).
+
+Turns tests/test_data.py constants, CSV/JSONL files and combinations of
+factor values into parametrized tests:
+
+    @pytest.mark.data("TEST_USERS", only=["valid_user", "admin_user"])
+    def test_login(driver, email, password): ...
+
+    @pytest.mark.data("login_cases.csv", batch=True)        # tests/data/login_cases.csv
+    def test_login_cases(driver, email, password, expected): ...
+
+    @pytest.mark.data(combine={"user": [...], "page": [...]}, strategy="pairwise")
+    def test_pages(logged_in_driver, user, page): ...
+
+Row columns are matched to the test's argument names (`data_row` receives
+the whole row). Files are read row by row, never loaded whole; rows that
+are equivalent for the arguments the test uses are deduplicated.
+
+With `batch=True` the test is collected once and all rows run in sequence
+inside it, sharing the same warm driver/logged_in_driver; the page is
+reset between rows and every row's outcome is reported.
+"""
+import csv
+import importlib
+import itertools
+import json
+import time
+import traceback
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DATA_DIR = PROJECT_ROOT / "tests" / "data"
+TEST_DATA_MODULE = "tests.test_data"
+
+# Argument receiving the whole row
+ROW_ARGNAME = "data_row"
+
+
+class DataBatchFailure(AssertionError):
+    """One or more rows of a batch-mode data-driven test failed."""
+
+
+# --- Sources ---
+
+def _rows_from_value(value):
+    """Rows of an in-memory dataset (dict of rows, dict of scalars or list)."""
+    if isinstance(value, dict):
+        for key, row in value.items():
+            yield str(key), row if isinstance(row, dict) else {"value": row}
+    else:
+        for index, row in enumerate(value):
+            if isinstance(row, dict):
+                yield str(row.get("id", index)), row
+            else:
+                yield str(row), {"value": row}
+
+
+def iter_csv(path):
+    """
+    Stream rows of a CSV file (header row required).
+
+    Args:
+        path: CSV file
+
+    Yields:
+        (case id, row dict); the id is the "id" column or the row number
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        for number, row in enumerate(csv.DictReader(f), start=1):
+            case_id = row.pop("id", None)
+            yield f"row{number}" if case_id is None else case_id, row
+
+
+def iter_jsonl(path):
+    """
+    Stream rows of a JSON Lines file (one object per line).
+
+    Args:
+        path: JSONL file
+
+    Yields:
+        (case id, row dict); the id is the "id" key or the line number
+    """
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, start=1):
+            if line.strip():
+                row = json.loads(line)
+                case_id = row.pop("id", None)
+                yield f"line{number}" if case_id is None else str(case_id), row
+
+
+def load_source(source):
+    """
+    Iterate the rows of a data source.
+
+    Args:
+        source: tests/test_data.py constant name ("TEST_USERS"), CSV/JSONL
+            path (relative to tests/data/), dict/list, or callable returning rows
+
+    Yields:
+        (case id, row dict)
+    """
+    if callable(source):
+        source = source()
+    if not isinstance(source, (str, Path)):
+        yield from _rows_from_value(source)
+        return
+    suffix = Path(source).suffix.lower()
+    if suffix in (".csv", ".jsonl"):
+        path = Path(source) if Path(source).is_absolute() else DATA_DIR / source
+        yield from iter_csv(path) if suffix == ".csv" else iter_jsonl(path)
+        return
+    module = importlib.import_module(TEST_DATA_MODULE)
+    if not hasattr(module, source):
+        raise ValueError(f"Unknown data source {source!r} (not a CSV/JSONL file or {TEST_DATA_MODULE} constant)")
+    yield from _rows_from_value(getattr(module, source))
+
+
+# --- Combinations ---
+
+def all_combinations(factors):
+    """
+    Full cartesian product of factor values.
+
+    Args:
+        factors: Dict of name -> list of values
+
+    Yields:
+        Row dicts
+    """
+    names = list(factors)
+    for values in itertools.product(*(factors[name] for name in names)):
+        yield dict(zip(names, values))
+
+
+def pairwise(factors):
+    """
+    Reduce factor combinations to a set covering every pair of values (greedy).
+
+    Args:
+        factors: Dict of name -> list of values
+
+    Yields:
+        Row dicts
+    """
+    names = list(factors)
+    if len(names) < 2:
+        yield from all_combinations(factors)
+        return
+    values = {name: list(factors[name]) for name in names}
+    uncovered = {(a, i, b, j)
+                 for ai, a in enumerate(names) for b in names[ai + 1:]
+                 for i in range(len(values[a])) for j in range(len(values[b]))}
+
+    while uncovered:
+        # Seed with an uncovered pair, then fill the other factors greedily
+        a, i, b, j = min(uncovered, key=lambda p: (names.index(p[0]), p[1], names.index(p[2]), p[3]))
+        row = {a: i, b: j}
+        for name in names:
+            if name in row:
+                continue
+            def gain(k):
+                return sum(((n, row[n], name, k) if names.index(n) < names.index(name) else (name, k, n, row[n]))
+                           in uncovered for n in row)
+            row[name] = max(range(len(values[name])), key=gain)
+        for ai, x in enumerate(names):
+            for y in names[ai + 1:]:
+                uncovered.discard((x, row[x], y, row[y]))
+        yield {name: values[name][row[name]] for name in names}
+
+
+def _case_id(row):
+    return "-".join(str(value) for value in row.values())
+
+
+# --- Expansion ---
+
+def _normalize(value):
+    return value.strip() if isinstance(value, str) else value
+
+
+def dedupe(cases, keys):
+    """
+    Drop cases equivalent to an earlier one for the given columns.
+
+    Args:
+        cases: Iterable of (case id, row)
+        keys: Columns that matter (whole row if empty)
+
+    Yields:
+        (case id, row)
+    """
+    seen = set()
+    for case_id, row in cases:
+        projected = {key: _normalize(row.get(key)) for key in (keys or sorted(row))}
+        fingerprint = json.dumps(projected, sort_keys=True, default=str)
+        if fingerprint not in seen:
+            seen.add(fingerprint)
+            yield case_id, row
+
+
+def iter_cases(source=None, combine=None, strategy="all", only=None, limit=None, keys=(), unique=True):
+    """
+    Stream the cases of a data-driven test.
+
+    Args:
+        source: Data source (see load_source)
+        combine: Dict of factor name -> values (instead of source)
+        strategy: "all" (cartesian product) or "pairwise" for combine
+        only: Case ids to keep
+        limit: Maximum number of cases
+        keys: Columns used by the test (for deduplication)
+        unique: Drop equivalent cases
+
+    Yields:
+        (case id, row)
+    """
+    if combine is not None:
+        if strategy not in ("all", "pairwise"):
+            raise ValueError(f"strategy must be 'all' or 'pairwise', got {strategy!r}")
+        rows = pairwise(combine) if strategy == "pairwise" else all_combinations(combine)
+        cases = ((_case_id(row), row) for row in rows)
+    else:
+        cases = load_source(source)
+    if only is not None:
+        only = set(only)
+        cases = ((case_id, row) for case_id, row in cases if case_id in only)
+    if unique:
+        cases = dedupe(cases, keys)
+    if limit is not None:
+        cases = itertools.islice(cases, limit)
+    yield from cases
+
+
+def marker_cases(marker, argnames):
+    """
+    Cases of a `data` marker, with only the columns the test uses.
+
+    Args:
+        marker: pytest Mark (args/kwargs as for iter_cases)
+        argnames: Test argument names
+
+    Returns:
+        Tuple of (used column names, generator of (case id, values dict))
+    """
+    kwargs = dict(marker.kwargs)
+    kwargs.pop("batch", None)
+    source = marker.args[0] if marker.args else kwargs.pop("source", None)
+    cases = iter_cases(source, **kwargs)
+    first = next(cases, None)
+    if first is None:
+        return [], iter(())
+    columns = [name for name in argnames if name in first[1]]
+    wants_row = ROW_ARGNAME in argnames
+
+    def project(case):
+        case_id, row = case
+        values = {name: row.get(name) for name in columns}
+        if wants_row:
+            values[ROW_ARGNAME] = row
+        return case_id, values
+
+    # Re-run deduplication on the used columns only
+    kwargs["keys"] = columns
+    projected = (project(case) for case in iter_cases(source, **kwargs))
+    return columns + ([ROW_ARGNAME] if wants_row else []), projected
+
+
+# --- Batch mode ---
+
+def run_batch(func, kwargs, cases, run=None, reset=None):
+    """
+    Run all cases of a batch-mode test in sequence, with the same fixtures.
+
+    Args:
+        func: Test function
+        kwargs: Fixture values
+        cases: Iterable of (case id, values dict)
+        run: Callable(func, kwargs) running one case (default: call func)
+        reset: Callable run between cases (e.g. reset_page_state)
+
+    Returns:
+        List of row result dicts (id, outcome, duration, error); outcome is
+        "passed", "failed", "skipped" (pytest.skip in the row) or "xfailed"
+
+    Raises:
+        DataBatchFailure: If any case failed (chained to the first error)
+        pytest.skip.Exception: If every case was skipped
+    """
+    run = run or (lambda f, kw: f(**kw))
+    results, first_error = [], None
+    for index, (case_id, values) in enumerate(cases):
+        if index and reset:
+            reset()
+        start = time.perf_counter()
+        outcome, error = "passed", None
+        try:
+            run(func, {**kwargs, **values})
+        except pytest.skip.Exception as e:
+            outcome, error = "skipped", str(e.msg)
+        except pytest.xfail.Exception as e:
+            outcome, error = "xfailed", str(e.msg)
+        except (Exception, pytest.fail.Exception) as e:
+            first_error = first_error or e
+            outcome, error = "failed", "".join(traceback.format_exception_only(type(e), e)).strip()
+        results.append({"id": case_id, "outcome": outcome, "duration": time.perf_counter() - start,
+                        "error": error})
+    if first_error is not None:
+        failures = [r for r in results if r["outcome"] == "failed"]
+        error = DataBatchFailure(f"{len(failures)} of {len(results)} data rows failed:\n" + format_results(failures))
+        error.data_results = results
+        raise error from first_error
+    if results and all(r["outcome"] == "skipped" for r in results):
+        skip = pytest.skip.Exception(f"All {len(results)} data rows skipped:\n" + format_results(results))
+        skip.data_results = results
+        raise skip
+    return results
+
+
+def format_results(results):
+    """
+    Format row results for the report.
+
+    Args:
+        results: Output of run_batch()
+
+    Returns:
+        Multi-line string
+    """
+    lines = []
+    for r in results:
+        line = f"{r['id']}: {r['outcome']} ({r['duration']:.2f}s)"
+        if r["error"]:
+            line += f" - {r['error'].splitlines()[-1]}"
+        lines.append(line)
+    return "\n".join(lines)
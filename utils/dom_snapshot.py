@@ -0,0 +1,365 @@
+"""
+Compressed, content-addressed DOM snapshots of failed tests.
+
+A screenshot shows what the page looked like, not why a locator matched
+nothing. On failure, DomSnapshotWriter.capture() serializes the live DOM
+in one execute_script call (SNAPSHOT_SCRIPT): open shadow roots become
+declarative <template shadowrootmode> blocks, same-origin iframes are
+inlined as srcdoc, form state (values, checked, selected) is written into
+attributes and scripts/event handlers are dropped. The only work on the
+test thread is that script call plus a SHA-256 of the result.
+
+Gzipping and writing happen on a background thread. Snapshots are stored
+by content hash (artifacts/dom/<sha256>.js), so a page that fails the
+same way in many tests or retries is stored once; a repeat only refreshes
+the file's mtime for retention. Each file is a one-line JS call holding
+the gzipped DOM in base64, which lets the static viewer
+(artifacts/dom/viewer.html) load it with a <script> tag from file:// as
+well as over HTTP. The viewer renders the snapshot in a sandboxed iframe
+(no scripts run) and outlines the locator that failed; the report links
+to it.
+
+Usage:
+    python -m utils.dom_snapshot show <sha256> [-o page.html]   # decompress a snapshot
+"""
+import argparse
+import base64
+import gzip
+import hashlib
+import json
+import os
+import queue
+import sys
+import threading
+from pathlib import Path
+from urllib.parse import urlencode
+
+DOM_DIR = Path(__file__).parent.parent / "artifacts" / "dom"
+VIEWER_NAME = "viewer.html"
+
+MAX_CHARS = 5_000_000  # serialized DOM characters kept (larger pages are truncated)
+MAX_FRAME_DEPTH = 5  # nested same-origin iframes inlined
+
+# arguments[0]: maximum characters, arguments[1]: maximum iframe depth
+# Returns {url, title, html, nodes, truncated}
+SNAPSHOT_SCRIPT = r"""
+var limit = arguments[0], maxDepth = arguments[1], nodes = 0;
+var VOID = {area: 1, base: 1, br: 1, col: 1, embed: 1, hr: 1, img: 1, input: 1, link: 1, meta: 1,
+            param: 1, source: 1, track: 1, wbr: 1};
+var RAW = {style: 1, xmp: 1};
+function esc(text, attr) {
+  text = text.replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;');
+  return attr ? text.replace(/"/g, '&quot;') : text;
+}
+function attrs(el, skip) {
+  var out = '', list = el.attributes;
+  for (var i = 0; i < list.length; i++) {
+    var name = list[i].name;
+    if (/^on/i.test(name) || skip[name]) continue;
+    out += ' ' + name + '="' + esc(list[i].value, true) + '"';
+  }
+  return out;
+}
+function children(parent, depth) {
+  var out = '';
+  for (var n = parent.firstChild; n; n = n.nextSibling) out += node(n, depth);
+  return out;
+}
+function node(n, depth) {
+  nodes++;
+  if (n.nodeType === 3) return n.parentNode && RAW[n.parentNode.localName] ? n.data : esc(n.data);
+  if (n.nodeType === 8) return '<!--' + n.data.replace(/--/g, '- -') + '-->';
+  if (n.nodeType !== 1) return '';
+  var tag = n.localName, skip = {}, extra = '', inner = null;
+  if (tag === 'script' || tag === 'noscript') return '';
+  if (tag === 'input') {
+    skip = {value: 1, checked: 1};
+    if (n.type === 'checkbox' || n.type === 'radio') extra = n.checked ? ' checked' : '';
+    else if (n.type === 'password') extra = n.value ? ' value="***"' : '';
+    else if (n.type !== 'file') extra = ' value="' + esc(n.value, true) + '"';
+  } else if (tag === 'option') {
+    skip = {selected: 1};
+    extra = n.selected ? ' selected' : '';
+  } else if (tag === 'textarea') {
+    inner = esc(n.value);
+  } else if (tag === 'iframe' || tag === 'frame') {
+    var doc = null;
+    try { doc = n.contentDocument; } catch (e) {}
+    skip = {src: 1, srcdoc: 1};
+    if (doc && doc.documentElement && depth < maxDepth) {
+      extra = ' srcdoc="' + esc(serialize(doc, depth + 1), true) + '"';
+    } else if (n.getAttribute('src')) {
+      extra = ' data-snapshot-src="' + esc(n.getAttribute('src'), true) + '"';  // cross-origin, not loaded
+    }
+  }
+  var out = '<' + tag + attrs(n, skip) + extra + '>';
+  if (VOID[tag]) return out;
+  if (tag === 'head') out += '<base href="' + esc(n.ownerDocument.baseURI, true) + '">';
+  if (n.shadowRoot) {
+    out += '<template shadowrootmode="' + n.shadowRoot.mode + '">' + children(n.shadowRoot, depth) + '</template>';
+  }
+  if (inner !== null) out += inner;
+  else out += children(tag === 'template' ? n.content : n, depth);
+  return out + '</' + tag + '>';
+}
+function serialize(doc, depth) {
+  var type = doc.doctype ? '<!DOCTYPE ' + doc.doctype.name + '>' : '';
+  return type + node(doc.documentElement, depth);
+}
+var html = serialize(document, 0), truncated = html.length > limit;
+return {url: location.href, title: document.title, html: truncated ? html.slice(0, limit) : html,
+        nodes: nodes, truncated: truncated};
+"""
+
+# Static viewer: loads <hash>.js (which calls domSnapshot(base64 gzip)),
+# renders it sandboxed and outlines the elements the failed locator matches.
+VIEWER_HTML = r"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>DOM snapshot</title>
+<style>
+body { margin: 0; font: 13px sans-serif; display: flex; flex-direction: column; height: 100vh; }
+#bar { padding: 6px 10px; background: #222; color: #eee; }
+#bar code { color: #ffb; }
+#status.missing { color: #f88; }
+iframe { flex: 1; border: 0; width: 100%; }
+</style></head>
+<body>
+<div id="bar"><b id="title"></b> <span id="url"></span><br>
+Failed locator: <code id="locator">-</code> <span id="status"></span></div>
+<iframe id="page" sandbox="allow-same-origin"></iframe>
+<script>
+var params = new URLSearchParams(location.hash.slice(1));
+var by = params.get('by'), value = params.get('value');
+document.getElementById('title').textContent = params.get('test') || '';
+document.getElementById('url').textContent = params.get('url') || '';
+if (by) document.getElementById('locator').textContent = by + '=' + value;
+
+function roots(doc) {
+  // The document, its open shadow roots and inlined iframe documents
+  var found = [doc], all = doc.querySelectorAll('*');
+  for (var i = 0; i < all.length; i++) {
+    if (all[i].shadowRoot) found = found.concat(roots(all[i].shadowRoot));
+    if (all[i].localName === 'iframe' && all[i].contentDocument) found = found.concat(roots(all[i].contentDocument));
+  }
+  return found;
+}
+function locate(root) {
+  if (by === 'xpath') {
+    if (!root.evaluate) return [];
+    var result = root.evaluate(value, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null), out = [];
+    for (var i = 0; i < result.snapshotLength; i++) out.push(result.snapshotItem(i));
+    return out;
+  }
+  if (by === 'link text' || by === 'partial link text') {
+    return Array.prototype.filter.call(root.querySelectorAll('a'), function (a) {
+      var text = a.textContent.trim();
+      return by === 'link text' ? text === value : text.indexOf(value) !== -1;
+    });
+  }
+  var css = {id: '[id="' + value + '"]', name: '[name="' + value + '"]', 'class name': '.' + value,
+             'tag name': value}[by] || value;
+  return Array.prototype.slice.call(root.querySelectorAll(css));
+}
+function highlight(doc) {
+  if (!by) return;
+  var matches = [], status = document.getElementById('status');
+  roots(doc).forEach(function (root) {
+    try { matches = matches.concat(locate(root)); } catch (e) { status.textContent = 'invalid locator: ' + e; }
+  });
+  matches.forEach(function (el) {
+    el.style.outline = '3px solid #e00';
+    el.style.outlineOffset = '2px';
+  });
+  if (matches.length) {
+    matches[0].scrollIntoView({block: 'center'});
+    status.textContent = matches.length + ' match(es) in the snapshot (present but not in the expected state?)';
+  } else if (!status.textContent) {
+    status.textContent = 'no match in the snapshot: the element was not in the page';
+    status.className = 'missing';
+  }
+}
+window.domSnapshot = function (data) {
+  var bytes = Uint8Array.from(atob(data), function (c) { return c.charCodeAt(0); });
+  new Response(new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'))).text().then(function (html) {
+    var frame = document.getElementById('page');
+    frame.onload = function () { highlight(frame.contentDocument); };
+    frame.srcdoc = html;
+  });
+};
+var script = document.createElement('script');
+script.src = params.get('snapshot') + '.js';
+script.onerror = function () { document.getElementById('status').textContent = 'snapshot file not found'; };
+document.head.appendChild(script);
+</script>
+</body></html>
+"""
+
+
+def take_snapshot(driver, max_chars=MAX_CHARS):
+    """
+    Serialize the current page, shadow roots and same-origin iframes included.
+
+    Args:
+        driver: WebDriver instance
+        max_chars: Serialized characters kept
+
+    Returns:
+        Dict with url, title, html, nodes and truncated
+    """
+    return driver.execute_script(SNAPSHOT_SCRIPT, max_chars, MAX_FRAME_DEPTH)
+
+
+def encode(html):
+    """
+    Gzip a snapshot into the content of its <hash>.js file.
+
+    Args:
+        html: Serialized DOM
+
+    Returns:
+        Bytes
+    """
+    data = base64.b64encode(gzip.compress(html.encode("utf-8"), compresslevel=6)).decode("ascii")
+    return f'domSnapshot("{data}");\n'.encode("ascii")
+
+
+def decode(content):
+    """
+    Recover the serialized DOM from a <hash>.js file.
+
+    Args:
+        content: File content (bytes or str)
+
+    Returns:
+        HTML string
+    """
+    if isinstance(content, bytes):
+        content = content.decode("ascii")
+    data = content[content.index('"') + 1:content.rindex('"')]
+    return gzip.decompress(base64.b64decode(data)).decode("utf-8")
+
+
+class DomSnapshotWriter:
+    """Stores failure snapshots by content hash, compressing them on a background thread."""
+
+    def __init__(self, directory=DOM_DIR, store=None, max_chars=MAX_CHARS):
+        """
+        Initialize snapshot writer.
+
+        Args:
+            directory: Snapshot directory (the viewer is written there too)
+            store: ArtifactStore to index written snapshots in (optional)
+            max_chars: Serialized characters kept per snapshot
+        """
+        self.directory = Path(directory)
+        self.store = store
+        self.max_chars = max_chars
+        self.captured = 0
+        self.stored = 0  # new files written; captured - stored were already on disk
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def viewer_path(self):
+        return self.directory / VIEWER_NAME
+
+    def _write_viewer(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if not self.viewer_path.exists() or self.viewer_path.read_text(encoding="utf-8") != VIEWER_HTML:
+            self.viewer_path.write_text(VIEWER_HTML, encoding="utf-8")
+
+    def capture(self, driver, locator=None, test=None):
+        """
+        Snapshot the page and queue it for compression.
+
+        Args:
+            driver: WebDriver instance
+            locator: (by, value) that failed, highlighted in the viewer
+            test: Test node id
+
+        Returns:
+            Dict with digest, path (of the .js file, possibly not written yet), viewer (URL),
+            nodes and truncated
+        """
+        snapshot = take_snapshot(driver, self.max_chars)
+        digest = hashlib.sha256(snapshot["html"].encode("utf-8")).hexdigest()
+        path = self.directory / f"{digest}.js"
+        with self._lock:
+            self.captured += 1
+            if self._thread is None:
+                self._write_viewer()
+                self._thread = threading.Thread(target=self._run, name="dom-snapshots", daemon=True)
+                self._thread.start()
+        self._queue.put((digest, snapshot["html"], test))
+        params = {"snapshot": digest, "url": snapshot["url"], "test": test or ""}
+        if locator:
+            params.update(by=locator[0], value=locator[1])
+        return {"digest": digest, "path": path, "viewer": f"{self.viewer_path.resolve().as_uri()}#{urlencode(params)}",
+                "nodes": snapshot["nodes"], "truncated": snapshot["truncated"]}
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                self._store(*job)
+            except Exception:
+                pass  # a lost snapshot must never fail the run
+            finally:
+                self._queue.task_done()
+
+    def _store(self, digest, html, test):
+        path = self.directory / f"{digest}.js"
+        if path.exists():
+            os.utime(path)  # identical page seen again: keep it from expiring
+        else:
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            tmp_path.write_bytes(encode(html))
+            tmp_path.replace(path)
+            self.stored += 1
+        if self.store is not None:
+            self.store.add("dom_snapshot", path, test=test)
+
+    def finish(self, timeout=30):
+        """Wait for queued snapshots to be written."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join(timeout)
+
+    def summary(self):
+        """
+        One-line summary for the terminal.
+
+        Returns:
+            String
+        """
+        return (f"{self.captured} DOM snapshot(s) on failure, {self.stored} new file(s) "
+                f"({self.captured - self.stored} identical page(s) stored once) in {self.directory}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DOM snapshots of failed tests")
+    commands = parser.add_subparsers(dest="command", required=True)
+    show = commands.add_parser("show", help="Decompress a snapshot to HTML")
+    show.add_argument("digest", help="Snapshot hash (or path to its .js file)")
+    show.add_argument("-o", "--output", help="Output file (stdout if omitted)")
+    show.add_argument("--dir", default=str(DOM_DIR), help="Snapshot directory")
+    args = parser.parse_args(argv)
+
+    path = Path(args.digest)
+    if not path.exists():
+        path = Path(args.dir) / f"{args.digest}.js"
+    html = decode(path.read_bytes())
+    if args.output:
+        Path(args.output).write_text(html, encoding="utf-8")
+        print(json.dumps({"output": args.output, "chars": len(html)}))
+    else:
+        sys.stdout.write(html)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
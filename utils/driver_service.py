@@ -0,0 +1,159 @@
+"""
+Long-lived chromedriver service shared by every browser session of a worker.
+
+`webdriver.Chrome(...)` spawns its own chromedriver process per browser,
+polls until its port accepts connections and kills it again on quit().
+With the shared service (`pytest --driver-service=shared`, the default)
+each pytest process starts chromedriver once, on the first browser it
+needs, and creates every session against that running process with
+`webdriver.Remote`; driver.quit() only ends the browser session.
+
+Before each new session the service checks that chromedriver is still
+alive and restarts it if it crashed; a session request that fails because
+the process died in between is retried once on a fresh process. The
+service is shut down in pytest_sessionfinish.
+"""
+import urllib3
+from selenium.common.exceptions import WebDriverException
+
+
+def chrome_service(options):
+    """
+    Create (not start) a chromedriver service, resolving paths like webdriver.Chrome does.
+
+    Args:
+        options: ChromeOptions of the first session
+
+    Returns:
+        Tuple of (selenium Service, Chrome binary path or None)
+    """
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.common.driver_finder import DriverFinder
+
+    service = Service()
+    finder = DriverFinder(service, options)
+    browser_path = finder.get_browser_path() or None
+    service.path = service.env_path() or finder.get_driver_path()
+    return service, browser_path
+
+
+class DriverService:
+    """One chromedriver process, started lazily and restarted when it crashes."""
+
+    def __init__(self, service_factory=chrome_service):
+        """
+        Initialize driver service.
+
+        Args:
+            service_factory: Callable(options) -> (unstarted selenium Service, browser path or None)
+        """
+        self.service_factory = service_factory
+        self.service = None
+        self.browser_path = None
+        self.sessions = 0
+        self.restarts = 0
+        self.crashes = []  # exit codes of chromedriver processes that died
+
+    @property
+    def url(self):
+        """URL of the running chromedriver (None before start)."""
+        return self.service.service_url if self.service is not None else None
+
+    def is_running(self):
+        """
+        Check that the chromedriver process is alive and accepting connections.
+
+        Returns:
+            Boolean
+        """
+        if self.service is None or self.service.process is None:
+            return False
+        return self.service.process.poll() is None and self.service.is_connectable()
+
+    def start(self, options):
+        """
+        Start chromedriver.
+
+        Args:
+            options: ChromeOptions (used to locate chromedriver and Chrome)
+        """
+        self.service, self.browser_path = self.service_factory(options)
+        self.service.start()
+
+    def ensure_running(self, options):
+        """
+        Start chromedriver, or restart it if the process died.
+
+        Args:
+            options: ChromeOptions
+
+        Returns:
+            True if a (re)start happened
+        """
+        if self.is_running():
+            return False
+        if self.service is not None:
+            process = self.service.process
+            self.crashes.append(process.poll() if process is not None else None)
+            self.restarts += 1
+            self._stop_quietly()
+        self.start(options)
+        return True
+
+    def _connect(self, options):
+        from selenium import webdriver
+        from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection
+
+        if self.browser_path and not options.binary_location:
+            options.binary_location = self.browser_path
+            options.browser_version = None
+        executor = ChromiumRemoteConnection(remote_server_addr=self.url, browser_name="chrome",
+                                            vendor_prefix="goog", keep_alive=True,
+                                            ignore_proxy=options._ignore_local_proxy)
+        return webdriver.Remote(command_executor=executor, options=options)
+
+    def new_driver(self, options):
+        """
+        Open a browser session on the shared chromedriver.
+
+        Args:
+            options: ChromeOptions
+
+        Returns:
+            WebDriver instance (quit() ends the session, not chromedriver)
+        """
+        self.ensure_running(options)
+        try:
+            driver = self._connect(options)
+        except (WebDriverException, urllib3.exceptions.HTTPError, OSError):
+            if self.is_running():
+                raise
+            # chromedriver died between the liveness check and the request
+            self.ensure_running(options)
+            driver = self._connect(options)
+        self.sessions += 1
+        return driver
+
+    def _stop_quietly(self):
+        try:
+            self.service.stop()
+        except Exception:
+            pass
+
+    def stop(self):
+        """Shut chromedriver down (no-op if it never started)."""
+        if self.service is not None:
+            self._stop_quietly()
+            self.service = None
+
+    def summary(self):
+        """
+        One-line summary for the terminal report.
+
+        Returns:
+            String
+        """
+        text = f"{self.sessions} browser session(s) on one shared chromedriver"
+        if self.restarts:
+            text += f"; restarted {self.restarts} time(s) after crashes (exit codes: {self.crashes})"
+        return text
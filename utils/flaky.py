@@ -0,0 +1,237 @@
+"""
+In-process retry for flaky (timing-related) test failures.
+
+Instead of tearing down `driver`/`logged_in_driver` and starting over, a
+failed test body is rerun with the same warm browser and authenticated
+session. Only page state is reset between attempts. Every attempt is
+recorded with its timing, and per-test flakiness statistics are kept on
+disk so known-flaky tests can be scheduled last or run in isolation.
+
+Usage:
+    pytest --flaky-retries=2
+    pytest --flaky-retries=2 --quarantine=last    # known-flaky tests run last
+    pytest --quarantine=only                      # run only known-flaky tests
+
+    @pytest.mark.flaky(retries=3)                 # per-test override (or flaky(3))
+"""
+import json
+import os
+import time
+import traceback
+from pathlib import Path
+
+import pytest
+from selenium.common.exceptions import (
+    ElementClickInterceptedException,
+    ElementNotInteractableException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
+
+QUARANTINE_PATH = Path(__file__).parent.parent / "artifacts" / "flaky" / "quarantine.json"
+
+# Failures worth retrying: page timing, not test logic
+RETRYABLE_EXCEPTIONS = (
+    TimeoutException,
+    StaleElementReferenceException,
+    NoSuchElementException,
+    ElementClickInterceptedException,
+    ElementNotInteractableException,
+)
+
+# A test is quarantined when at least this share of its recent runs needed
+# a retry or failed, over at least QUARANTINE_MIN_RUNS runs
+QUARANTINE_RATE = 0.2
+QUARANTINE_MIN_RUNS = 3
+
+
+def reset_page_state(driver, landing_url=None):
+    """
+    Reset page state between attempts while keeping the browser alive.
+
+    Closes extra windows, dismisses open alerts and navigates to the landing
+    page. Without a landing URL (plain `driver` tests) cookies are also
+    cleared, since those tests start from a logged-out state.
+
+    Args:
+        driver: Selenium WebDriver instance
+        landing_url: URL to return to (e.g. dashboard for logged-in tests)
+    """
+    handles = driver.window_handles
+    for handle in handles[1:]:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(handles[0])
+
+    try:
+        driver.switch_to.alert.dismiss()
+    except Exception:
+        pass
+
+    if landing_url:
+        driver.get(landing_url)
+    else:
+        driver.delete_all_cookies()
+        driver.get("about:blank")
+
+
+def marker_retries(marker, default):
+    """
+    Retries requested by a flaky marker.
+
+    Args:
+        marker: flaky marker (flaky(3) or flaky(retries=3); no argument means at least one retry)
+        default: --flaky-retries value
+
+    Returns:
+        Number of retries
+    """
+    if marker.args:
+        return marker.args[0]
+    return marker.kwargs.get("retries", max(default, 1))
+
+
+def run_with_retries(func, kwargs, retries, reset=None, retry_on=RETRYABLE_EXCEPTIONS):
+    """
+    Run a test function, rerunning it on retryable failures.
+
+    Args:
+        func: Test function
+        kwargs: Fixture values to call it with
+        retries: Maximum number of extra attempts
+        reset: Callable run before each retry (e.g. reset_page_state)
+        retry_on: Exception types that trigger a retry
+
+    Returns:
+        List of attempt dicts (attempt, outcome, duration, error)
+
+    Raises:
+        The last exception if all attempts failed, or any non-retryable one
+    """
+    attempts = []
+    for attempt in range(1, retries + 2):
+        if attempt > 1 and reset:
+            reset()
+        start = time.perf_counter()
+        try:
+            func(**kwargs)
+        except (pytest.skip.Exception, pytest.xfail.Exception, KeyboardInterrupt):
+            raise  # not an attempt outcome
+        except (Exception, pytest.fail.Exception) as e:
+            attempts.append({
+                "attempt": attempt,
+                "outcome": "failed",
+                "duration": time.perf_counter() - start,
+                "error": "".join(traceback.format_exception_only(type(e), e)).strip(),
+            })
+            if isinstance(e, retry_on) and attempt <= retries:
+                continue
+            e.retry_attempts = attempts
+            raise
+        attempts.append({
+            "attempt": attempt,
+            "outcome": "passed",
+            "duration": time.perf_counter() - start,
+            "error": None,
+        })
+        return attempts
+
+
+def format_attempts(attempts):
+    """
+    Format attempts for the report.
+
+    Args:
+        attempts: Output of run_with_retries()
+
+    Returns:
+        Multi-line summary string
+    """
+    lines = []
+    for a in attempts:
+        line = f"Attempt {a['attempt']}: {a['outcome']} in {a['duration']:.2f}s"
+        if a["error"]:
+            line += f" - {a['error'].splitlines()[0]}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+class QuarantineStore:
+    """Per-test flakiness statistics, persisted between runs."""
+
+    def __init__(self, path=QUARANTINE_PATH):
+        """
+        Initialize quarantine store.
+
+        Args:
+            path: Path to the JSON store
+        """
+        self.path = Path(path)
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.stats = json.load(f)
+        except (OSError, ValueError):
+            self.stats = {}
+
+    def save(self):
+        """Save statistics to disk."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.stats, f, indent=1, sort_keys=True)
+        tmp_path.replace(self.path)
+
+    def record(self, nodeid, attempts):
+        """
+        Record the attempts of one test run.
+
+        Args:
+            nodeid: Test node id
+            attempts: Output of run_with_retries()
+        """
+        entry = self.stats.setdefault(nodeid, {"runs": 0, "flaky": 0, "failed": 0, "last_flaky": None})
+        entry["runs"] += 1
+        if attempts[-1]["outcome"] == "failed":
+            entry["failed"] += 1
+        elif len(attempts) > 1:
+            entry["flaky"] += 1
+            entry["last_flaky"] = time.strftime('%Y-%m-%d %H:%M:%S')
+
+    def flake_rate(self, nodeid):
+        """
+        Get the share of runs that needed a retry or failed.
+
+        Args:
+            nodeid: Test node id
+
+        Returns:
+            Rate between 0 and 1 (0 if never recorded)
+        """
+        entry = self.stats.get(nodeid)
+        if not entry or not entry["runs"]:
+            return 0.0
+        return (entry["flaky"] + entry["failed"]) / entry["runs"]
+
+    def is_quarantined(self, nodeid):
+        """
+        Check whether a test is known to be flaky.
+
+        Args:
+            nodeid: Test node id
+
+        Returns:
+            Boolean
+        """
+        entry = self.stats.get(nodeid)
+        return bool(entry and entry["runs"] >= QUARANTINE_MIN_RUNS
+                    and entry["flaky"] and self.flake_rate(nodeid) >= QUARANTINE_RATE)
+
+    def quarantined(self):
+        """
+        Get all quarantined tests.
+
+        Returns:
+            Set of node ids
+        """
+        return {nodeid for nodeid in self.stats if self.is_quarantined(nodeid)}
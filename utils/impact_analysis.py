@@ -0,0 +1,767 @@
+"""
+Test impact analysis: select only the tests affected by a change.
+
+Builds a dependency index from each test to the project modules, page-object
+classes/methods, fixtures, test-data keys and @pytest.mark.data files it uses
+(static AST analysis),
+optionally refined by runtime coverage of page_objects recorded during a run.
+Given a git diff, `select_tests()` returns the minimal affected test set.
+
+The index is cached on disk and updated incrementally: only files whose
+content hash changed are re-analyzed.
+
+Usage:
+    pytest --impact-base=origin/main           # run only affected tests
+    pytest --impact-record                     # record page_objects coverage
+    python -m utils.impact_analysis origin/main   # print affected node ids
+"""
+import argparse
+import ast
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+INDEX_PATH = PROJECT_ROOT / "artifacts" / "impact" / "index.json"
+INDEX_VERSION = 4
+
+# Changes to these files can affect every test
+GLOBAL_FILES = {"config.py", "pytest.ini", "requirements.txt"}
+CONFTEST = "conftest.py"
+TEST_DATA_MODULE = "tests.test_data"
+DATA_DIR = "tests/data"  # CSV/JSONL sources of @pytest.mark.data
+COVERAGE_PACKAGE = "page_objects"
+
+# Symbols that mean "the whole module changed"
+MODULE_SYMBOLS = {"<module>", "<imports>", "*"}
+
+_SKIP_DIRS = {".git", "artifacts", "reports", "venv", ".venv", "__pycache__", ".pytest_cache"}
+_HUNK_RE = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+
+# --- Static analysis ---
+
+def path_to_module(rel_path):
+    """
+    Convert a project-relative file path to a dotted module name.
+
+    Args:
+        rel_path: Path like "page_objects/login_page.py"
+
+    Returns:
+        Module name like "page_objects.login_page"
+    """
+    parts = Path(rel_path).with_suffix("").parts
+    if parts[-1] == "__init__":
+        parts = parts[:-1]
+    return ".".join(parts)
+
+
+def _is_fixture(node):
+    """Check whether a function definition is decorated with pytest.fixture."""
+    for dec in node.decorator_list:
+        target = dec.func if isinstance(dec, ast.Call) else dec
+        if isinstance(target, ast.Attribute) and target.attr == "fixture":
+            return True
+        if isinstance(target, ast.Name) and target.id == "fixture":
+            return True
+    return False
+
+
+def _markers(node):
+    """Collect pytest.mark.<name> markers applied to a test function."""
+    markers = []
+    for dec in node.decorator_list:
+        target = dec.func if isinstance(dec, ast.Call) else dec
+        if (isinstance(target, ast.Attribute) and isinstance(target.value, ast.Attribute)
+                and target.value.attr == "mark"):
+            markers.append(target.attr)
+    return markers
+
+
+def _data_sources(node):
+    """
+    Data sources named in @pytest.mark.data("SOURCE", only=[...]) decorators.
+
+    Returns:
+        Tuple of (test-data keys, data file paths)
+    """
+    data_keys, data_files = [], []
+    for dec in node.decorator_list:
+        if not (isinstance(dec, ast.Call) and isinstance(dec.func, ast.Attribute) and dec.func.attr == "data"
+                and isinstance(dec.func.value, ast.Attribute) and dec.func.value.attr == "mark"):
+            continue
+        if not (dec.args and isinstance(dec.args[0], ast.Constant) and isinstance(dec.args[0].value, str)):
+            continue  # combine=... or a callable: nothing on disk
+        source = dec.args[0].value
+        if Path(source).suffix.lower() in (".csv", ".jsonl"):
+            data_files.append(source if Path(source).is_absolute() else f"{DATA_DIR}/{source}")
+            continue
+        only = next((kw.value for kw in dec.keywords if kw.arg == "only"), None)
+        if (isinstance(only, (ast.List, ast.Tuple)) and only.elts
+                and all(isinstance(e, ast.Constant) and isinstance(e.value, str) for e in only.elts)):
+            data_keys.extend(f"{source}.{e.value}" for e in only.elts)
+        else:
+            data_keys.append(source)
+    return data_keys, data_files
+
+
+def _symbols(tree):
+    """
+    Map top-level definitions to line ranges.
+
+    Functions and classes become one symbol each, class methods become
+    "Class.method", and top-level dict literals also get one symbol per
+    constant key ("TEST_USERS.valid_user").
+    """
+    symbols = []
+    for node in tree.body:
+        start, end = node.lineno, node.end_lineno
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            symbols.append([node.name, start, end])
+        elif isinstance(node, ast.ClassDef):
+            symbols.append([node.name, start, end])
+            for item in node.body:
+                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    symbols.append([f"{node.name}.{item.name}", item.lineno, item.end_lineno])
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            symbols.append(["<imports>", start, end])
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            names = [t.id for t in targets if isinstance(t, ast.Name)]
+            for name in names:
+                symbols.append([name, start, end])
+                if isinstance(node.value, ast.Dict):
+                    for key, value in zip(node.value.keys, node.value.values):
+                        if isinstance(key, ast.Constant) and isinstance(key.value, str):
+                            symbols.append([f"{name}.{key.value}", key.lineno, value.end_lineno])
+    return symbols
+
+
+def _referenced(node, data_names):
+    """
+    Collect names and test-data keys referenced inside a function.
+
+    Args:
+        node: Function AST node
+        data_names: Names imported from the test-data module
+
+    Returns:
+        Tuple of (names, data_keys)
+    """
+    names, data_keys = set(), set()
+    keyed = set()
+    for child in ast.walk(node):
+        if isinstance(child, ast.Name):
+            names.add(child.id)
+        elif isinstance(child, ast.Attribute) and isinstance(child.value, ast.Name):
+            names.add(f"{child.value.id}.{child.attr}")
+        elif (isinstance(child, ast.Subscript) and isinstance(child.value, ast.Name)
+                and child.value.id in data_names):
+            key = child.slice
+            if isinstance(key, ast.Constant) and isinstance(key.value, str):
+                data_keys.add(f"{child.value.id}.{key.value}")
+                keyed.add(id(child.value))
+    # A data dict used without a constant key depends on all of its entries
+    for child in ast.walk(node):
+        if isinstance(child, ast.Name) and child.id in data_names and id(child) not in keyed:
+            data_keys.add(child.id)
+    return sorted(names), sorted(data_keys)
+
+
+def _fixture_args(node):
+    """
+    Fixtures a function needs: its arguments plus request.getfixturevalue("name") calls.
+
+    Args:
+        node: Function AST node
+
+    Returns:
+        List of fixture names
+    """
+    args = [a.arg for a in node.args.args if a.arg not in ("self", "request")]
+    for child in ast.walk(node):
+        if (isinstance(child, ast.Call) and isinstance(child.func, ast.Attribute)
+                and child.func.attr == "getfixturevalue" and child.args
+                and isinstance(child.args[0], ast.Constant) and isinstance(child.args[0].value, str)
+                and child.args[0].value not in args):
+            args.append(child.args[0].value)
+    return args
+
+
+def _import_nodes(node, in_function=False):
+    """Yield (import node, module level?) pairs; imports inside functions only run when called."""
+    for child in ast.iter_child_nodes(node):
+        if isinstance(child, (ast.Import, ast.ImportFrom)):
+            yield child, not in_function
+        else:
+            yield from _import_nodes(child, in_function or isinstance(
+                child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)))
+
+
+def _import_targets(node, project_modules):
+    """Yield (local name, [module, attribute or None]) for the project modules an import binds."""
+    if isinstance(node, ast.Import):
+        for alias in node.names:
+            if alias.name in project_modules:
+                yield alias.asname or alias.name, [alias.name, None]
+    elif node.module and not node.level:
+        for alias in node.names:
+            submodule = f"{node.module}.{alias.name}"
+            if submodule in project_modules:
+                yield alias.asname or alias.name, [submodule, None]
+            elif node.module in project_modules:
+                yield alias.asname or alias.name, [node.module, alias.name]
+
+
+def analyze_file(path, rel_path, project_modules):
+    """
+    Analyze a single Python file.
+
+    Args:
+        path: Absolute file path
+        rel_path: Project-relative path (posix)
+        project_modules: Set of module names that belong to the project
+
+    Returns:
+        Dict with symbols, imports, fixtures and tests
+    """
+    source = Path(path).read_text(encoding="utf-8")
+    tree = ast.parse(source, filename=str(path))
+
+    # local name -> [module, attribute or None]; module_imports: names bound at import time
+    imports, module_imports = {}, set()
+    for node, module_level in _import_nodes(tree):
+        for local, target in _import_targets(node, project_modules):
+            imports[local] = target
+            if module_level:
+                module_imports.add(local)
+
+    # Top-level functions: names they reference and names they import lazily
+    functions = {}
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            functions[node.name] = {
+                "calls": sorted({n.id for n in ast.walk(node) if isinstance(n, ast.Name)}),
+                "imports": sorted({local for child in ast.walk(node) if isinstance(child, (ast.Import, ast.ImportFrom))
+                                   for local, _ in _import_targets(child, project_modules)}),
+            }
+
+    data_names = {name for name, (module, attr) in imports.items()
+                  if module == TEST_DATA_MODULE and attr}
+
+    fixtures, tests = {}, {}
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            args = _fixture_args(node)
+            if _is_fixture(node):
+                fixtures[node.name] = args
+            elif node.name.startswith("test"):
+                names, data_keys = _referenced(node, data_names)
+                marker_keys, data_files = _data_sources(node)
+                tests[node.name] = {
+                    "symbol": node.name,
+                    "fixtures": args,
+                    "markers": _markers(node),
+                    "names": names,
+                    "data_keys": sorted(set(data_keys) | set(marker_keys)),
+                    "data_files": data_files,
+                }
+        elif isinstance(node, ast.ClassDef) and node.name.startswith("Test"):
+            for item in node.body:
+                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)) and item.name.startswith("test"):
+                    names, data_keys = _referenced(item, data_names)
+                    item_keys, item_files = _data_sources(item)
+                    class_keys, class_files = _data_sources(node)
+                    tests[f"{node.name}::{item.name}"] = {
+                        "symbol": f"{node.name}.{item.name}",
+                        "fixtures": _fixture_args(item),
+                        "markers": _markers(item) + _markers(node),
+                        "names": names,
+                        "data_keys": sorted(set(data_keys) | set(item_keys) | set(class_keys)),
+                        "data_files": item_files + class_files,
+                    }
+
+    return {
+        "module": path_to_module(rel_path),
+        "symbols": _symbols(tree),
+        "imports": imports,
+        "module_imports": sorted(module_imports),
+        "functions": functions,
+        "fixtures": fixtures,
+        "tests": tests,
+    }
+
+
+def _project_files(root):
+    """Yield (absolute, relative posix) paths of project Python files."""
+    for path in sorted(root.rglob("*.py")):
+        rel = path.relative_to(root)
+        if _SKIP_DIRS & set(rel.parts[:-1]):
+            continue
+        yield path, rel.as_posix()
+
+
+def _file_hash(path):
+    return hashlib.sha1(Path(path).read_bytes()).hexdigest()
+
+
+# --- Index ---
+
+def load_index(index_path=INDEX_PATH):
+    """
+    Load the cached index from disk.
+
+    Args:
+        index_path: Path to the index file
+
+    Returns:
+        Index dict (empty index if missing or outdated)
+    """
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get("version") == INDEX_VERSION:
+            return index
+    except (OSError, ValueError):
+        pass
+    return {"version": INDEX_VERSION, "files": {}, "coverage": {}}
+
+
+def save_index(index, index_path=INDEX_PATH):
+    """
+    Save the index to disk.
+
+    Args:
+        index: Index dict
+        index_path: Path to the index file
+    """
+    index_path = Path(index_path)
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = index_path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(index, f)
+    tmp_path.replace(index_path)
+
+
+def update_index(index, root=PROJECT_ROOT):
+    """
+    Re-analyze files whose content changed since the index was built.
+
+    Args:
+        index: Index dict (updated in place)
+        root: Project root
+
+    Returns:
+        List of re-analyzed relative paths
+    """
+    root = Path(root)
+    files = list(_project_files(root))
+    project_modules = {path_to_module(rel) for _, rel in files}
+    seen, updated = set(), []
+
+    for path, rel in files:
+        seen.add(rel)
+        digest = _file_hash(path)
+        entry = index["files"].get(rel)
+        if entry and entry["hash"] == digest:
+            continue
+        try:
+            analysis = analyze_file(path, rel, project_modules)
+        except SyntaxError:
+            continue
+        index["files"][rel] = {"hash": digest, "analysis": analysis}
+        updated.append(rel)
+
+    for rel in set(index["files"]) - seen:
+        del index["files"][rel]
+    return updated
+
+
+def build_index(root=PROJECT_ROOT, index_path=INDEX_PATH):
+    """
+    Load, incrementally update and save the index.
+
+    Args:
+        root: Project root
+        index_path: Path to the index file
+
+    Returns:
+        Up-to-date index dict
+    """
+    index = load_index(index_path)
+    if update_index(index, root):
+        save_index(index, index_path)
+    return index
+
+
+# --- Runtime coverage of page_objects ---
+
+class CoverageRecorder:
+    """Record which page-object methods run during each test."""
+
+    def __init__(self, root=PROJECT_ROOT, package=COVERAGE_PACKAGE):
+        """
+        Initialize coverage recorder.
+
+        Args:
+            root: Project root
+            package: Package directory to record calls in
+        """
+        self.root = Path(root)
+        self.prefix = str(self.root / package)
+        self.covered = set()
+        self._previous = None
+
+    def _profile(self, frame, event, arg):
+        if event != "call":
+            return
+        filename = frame.f_code.co_filename
+        if filename.startswith(self.prefix):
+            rel = Path(filename).relative_to(self.root).as_posix()
+            qualname = getattr(frame.f_code, "co_qualname", frame.f_code.co_name)
+            self.covered.add(f"{rel}::{qualname}")
+
+    def start(self):
+        """Start recording calls."""
+        self.covered = set()
+        self._previous = sys.getprofile()
+        sys.setprofile(self._profile)
+
+    def stop(self):
+        """
+        Stop recording calls.
+
+        Returns:
+            Sorted list of covered "path::Class.method" entries
+        """
+        sys.setprofile(self._previous)
+        return sorted(self.covered)
+
+
+# --- Diff parsing ---
+
+def parse_diff(diff_text):
+    """
+    Parse unified diff output into changed line numbers per file.
+
+    Args:
+        diff_text: Output of `git diff --unified=0`
+
+    Returns:
+        Dict of relative path -> set of changed lines (None = whole file)
+    """
+    changes = {}
+    current = None
+    old_path = None
+    for line in diff_text.splitlines():
+        if line.startswith("--- "):
+            old_path = line[6:] if line.startswith("--- a/") else None
+        elif line.startswith("+++ "):
+            if line.startswith("+++ b/"):
+                current = line[6:]
+                changes.setdefault(current, set())
+            else:
+                # File deleted: everything in it changed
+                current = None
+                if old_path:
+                    changes[old_path] = None
+        elif current and changes.get(current) is not None:
+            match = _HUNK_RE.match(line)
+            if match:
+                start = int(match.group(1))
+                count = int(match.group(2)) if match.group(2) is not None else 1
+                # Pure deletion: mark the line the hunk sits after
+                changes[current].update(range(start, start + max(count, 1)))
+    return changes
+
+
+def git_diff(base, root=PROJECT_ROOT):
+    """
+    Get changed lines between a git ref and the working tree.
+
+    Args:
+        base: Git ref to compare against (e.g. "origin/main", "HEAD~1")
+        root: Project root
+
+    Returns:
+        Output of parse_diff()
+    """
+    result = subprocess.run(
+        ["git", "diff", "--unified=0", "--no-color", "--no-renames", base, "--", "."],
+        capture_output=True, text=True, check=True, cwd=root,
+    )
+    changes = parse_diff(result.stdout)
+
+    # Untracked files count as fully changed
+    untracked = subprocess.run(
+        ["git", "ls-files", "--others", "--exclude-standard"],
+        capture_output=True, text=True, check=True, cwd=root,
+    )
+    for rel in untracked.stdout.splitlines():
+        changes[rel] = None
+    return changes
+
+
+def changed_symbols(index, changes):
+    """
+    Map changed lines to the symbols that contain them.
+
+    Args:
+        index: Index dict
+        changes: Output of parse_diff()/git_diff()
+
+    Returns:
+        Dict of relative path -> set of changed symbol names
+    """
+    result = {}
+    for rel, lines in changes.items():
+        entry = index["files"].get(rel)
+        if lines is None or entry is None:
+            result[rel] = {"*"}
+            continue
+        symbols = entry["analysis"]["symbols"]
+        names = set()
+        for line in lines:
+            # Narrowest symbol containing the line
+            containing = [s for s in symbols if s[1] <= line <= s[2]]
+            if containing:
+                names.add(min(containing, key=lambda s: s[2] - s[1])[0])
+            else:
+                names.add("<module>")
+        result[rel] = names
+    return result
+
+
+# --- Selection ---
+
+def _overlaps(symbol, dependency):
+    """Check whether a changed symbol affects a dependency on a symbol."""
+    if symbol in MODULE_SYMBOLS or dependency == "*":
+        return True
+    return (symbol == dependency or symbol.startswith(dependency + ".")
+            or dependency.startswith(symbol + "."))
+
+
+def _module_closure(index, module, modules_by_name, seen=None, module_level=False):
+    """
+    Project modules imported (transitively) by a module, including itself.
+
+    With module_level, only imports that run when the module is imported
+    are followed (not those inside functions).
+    """
+    seen = set() if seen is None else seen
+    if module in seen or module not in modules_by_name:
+        return seen
+    seen.add(module)
+    analysis = modules_by_name[module]
+    for local, (dep_module, _) in analysis["imports"].items():
+        if not module_level or local in analysis["module_imports"]:
+            _module_closure(index, dep_module, modules_by_name, seen, module_level)
+    return seen
+
+
+def _lazy_fixture_modules(conftest, names):
+    """Modules conftest imports inside the given fixtures or the conftest functions they call."""
+    functions, imports = conftest.get("functions", {}), conftest["imports"]
+    seen, stack, modules = set(), list(names), set()
+    while stack:
+        name = stack.pop()
+        if name in seen or name not in functions:
+            continue
+        seen.add(name)
+        modules.update(imports[local][0] for local in functions[name]["imports"] if local in imports)
+        stack.extend(functions[name]["calls"])
+    return modules
+
+
+def _fixture_closure(fixtures, names):
+    """All fixtures a test needs, following fixture-to-fixture dependencies."""
+    closure, stack = set(), list(names)
+    while stack:
+        name = stack.pop()
+        if name in closure:
+            continue
+        closure.add(name)
+        stack.extend(fixtures.get(name, []))
+    return closure
+
+
+def _test_dependencies(index, rel, test, modules_by_name):
+    """
+    Compute (module, symbol) dependencies of a single test.
+
+    Returns:
+        Set of (module name, symbol) tuples
+    """
+    analysis = index["files"][rel]["analysis"]
+    deps = set()
+    for local, (module, attr) in analysis["imports"].items():
+        if module == TEST_DATA_MODULE and attr:
+            continue  # handled via data keys
+        used = [n for n in test["names"] if n == local or n.startswith(local + ".")]
+        if not used:
+            continue
+        if attr:
+            deps.add((module, attr))
+        else:
+            for name in used:
+                deps.add((module, name.split(".", 1)[1] if "." in name else "*"))
+        # Modules the imported module depends on, e.g. BasePage for LoginPage
+        for dep_module in _module_closure(index, module, modules_by_name) - {module}:
+            deps.add((dep_module, "*"))
+    for key in test["data_keys"]:
+        deps.add((TEST_DATA_MODULE, key))
+    return deps
+
+
+def select_tests(index, changes):
+    """
+    Select the tests affected by a set of changes.
+
+    Args:
+        index: Up-to-date index dict
+        changes: Output of parse_diff()/git_diff()
+
+    Returns:
+        Tuple of (sorted list of node ids, dict of node id -> reason).
+        If a global file changed, every test is selected.
+    """
+    symbols = changed_symbols(index, changes)
+    modules_by_name = {e["analysis"]["module"]: e["analysis"] for e in index["files"].values()}
+    path_by_module = {a["module"]: rel for rel, a in
+                      ((r, e["analysis"]) for r, e in index["files"].items())}
+
+    conftest = index["files"].get(CONFTEST, {}).get(
+        "analysis", {"fixtures": {}, "imports": {}, "module_imports": [], "functions": {}})
+    fixtures = conftest["fixtures"]
+
+    # Modules loaded with conftest affect every test; those it imports inside
+    # functions (optional features) only affect the tests whose fixtures reach them
+    global_modules = set()
+    for local in conftest["module_imports"]:
+        global_modules |= _module_closure(index, conftest["imports"][local][0], modules_by_name,
+                                          module_level=True)
+    global_paths = set(GLOBAL_FILES) | {path_by_module[m] for m in global_modules if m in path_by_module}
+
+    all_tests = {}
+    for rel, entry in index["files"].items():
+        for name, test in entry["analysis"]["tests"].items():
+            all_tests[f"{rel}::{name}"] = (rel, test)
+
+    for rel, names in symbols.items():
+        if rel in global_paths:
+            return sorted(all_tests), {nodeid: f"global file changed: {rel}" for nodeid in all_tests}
+        if rel == CONFTEST and not names <= set(fixtures):
+            return sorted(all_tests), {nodeid: "conftest.py hooks changed" for nodeid in all_tests}
+
+    changed_fixtures = symbols.get(CONFTEST, set())
+    coverage = index.get("coverage", {})
+    reasons = {}
+
+    for nodeid, (rel, test) in all_tests.items():
+        reason = None
+
+        # The test module itself
+        if rel in symbols:
+            own = symbols[rel]
+            test_names = {t["symbol"] for t in index["files"][rel]["analysis"]["tests"].values()}
+            for symbol in own:
+                if _overlaps(symbol, test["symbol"]) or symbol not in test_names:
+                    reason = f"test module changed: {rel}::{symbol}"
+                    break
+
+        # Fixtures, and the modules they import lazily
+        if reason is None:
+            used_fixtures = _fixture_closure(fixtures, test["fixtures"])
+            hit = changed_fixtures & used_fixtures
+            if hit:
+                reason = f"fixture changed: {sorted(hit)[0]}"
+            for module in _lazy_fixture_modules(conftest, used_fixtures & set(fixtures)):
+                if reason:
+                    break
+                for dep_module in sorted(_module_closure(index, module, modules_by_name)):
+                    path = path_by_module.get(dep_module)
+                    if path in symbols:
+                        reason = f"fixture dependency changed: {path}"
+                        break
+
+        # CSV/JSONL files named in @pytest.mark.data
+        if reason is None:
+            for path in test.get("data_files", ()):
+                if path in symbols:
+                    reason = f"data file changed: {path}"
+                    break
+
+        # Page objects, utils and test data
+        if reason is None:
+            covered = coverage.get(nodeid)
+            for module, dependency in _test_dependencies(index, rel, test, modules_by_name):
+                path = path_by_module.get(module)
+                for symbol in symbols.get(path, ()):
+                    if not _overlaps(symbol, dependency):
+                        continue
+                    # Runtime coverage narrows method-level page-object changes
+                    if (covered is not None and path.startswith(COVERAGE_PACKAGE + "/")
+                            and "." in symbol and f"{path}::{symbol}" not in covered):
+                        continue
+                    reason = f"dependency changed: {path}::{symbol}"
+                    break
+                if reason:
+                    break
+
+        if reason:
+            reasons[nodeid] = reason
+
+    return sorted(reasons), reasons
+
+
+def _base_nodeid(nodeid):
+    """Strip parametrization from a node id."""
+    return nodeid.split("[", 1)[0]
+
+
+def affected_items(items, index, selected):
+    """
+    Split collected pytest items into affected and unaffected.
+
+    Items the index does not know about (e.g. tests added since the index
+    was built) are always kept.
+
+    Args:
+        items: Collected pytest items
+        index: Index dict
+        selected: Node ids returned by select_tests()
+
+    Returns:
+        Tuple of (kept items, deselected items)
+    """
+    selected = set(selected)
+    known = {f"{rel}::{name}" for rel, entry in index["files"].items()
+             for name in entry["analysis"]["tests"]}
+    keep, drop = [], []
+    for item in items:
+        base = _base_nodeid(item.nodeid)
+        (keep if base in selected or base not in known else drop).append(item)
+    return keep, drop
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print tests affected by changes since a git ref")
+    parser.add_argument("base", nargs="?", default="HEAD", help="Git ref to diff against")
+    parser.add_argument("--why", action="store_true", help="Show the reason each test was selected")
+    args = parser.parse_args(argv)
+
+    index = build_index()
+    selected, reasons = select_tests(index, git_diff(args.base))
+    for nodeid in selected:
+        print(f"{nodeid}  ({reasons[nodeid]})" if args.why else nodeid)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
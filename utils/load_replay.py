@@ -0,0 +1,564 @@
+"""
+Record a page-object journey's HTTP traffic once, replay it as browserless load.
+
+Recording drives a real browser through a journey from JOURNEYS (e.g.
+LoginPage.login, DashboardPage, logout) and reads the requests it sends
+from chromedriver's performance log (the same Network events as
+utils/browser_logs.py). Requests are grouped per step and kept relative to
+the application origin, so a recording can be replayed against any
+environment. Parameterization:
+
+    credentials     form/JSON/query values equal to a tests/test_data.py
+                    TEST_USERS email or password become {{email}} /
+                    {{password}}; each virtual user gets its own account
+    session tokens  Cookie and Authorization headers are not recorded;
+                    every virtual user keeps its own cookie jar filled
+                    from Set-Cookie, like a browser does
+    redirects       every hop is a recorded request, so the client never
+                    follows redirects itself; the recorded status of each
+                    hop is the expected one
+
+Replay runs hundreds of virtual users on one asyncio event loop over a
+keep-alive connection pool (AsyncHTTPPool from utils/async_driver.py).
+Each user runs the steps in order; a request fails when its status
+differs from the recorded one. The report gives per-step and per-request
+latency percentiles, error counts and throughput, and is saved to
+artifacts/load/.
+
+Usage:
+    python -m utils.load_replay record login_dashboard --standin      # real browser, local stand-in app
+    python -m utils.load_replay replay login_dashboard --users 300 --iterations 5 --ramp-up 10 --standin
+    python -m utils.load_replay replay login_dashboard --users 100 --duration 5m --base-url https://staging...
+"""
+import argparse
+import asyncio
+import base64
+import json
+import re
+import sys
+import time
+from pathlib import Path
+from urllib.parse import quote_plus, urlsplit
+
+LOAD_DIR = Path(__file__).parent.parent / "artifacts" / "load"
+RECORDINGS_DIR = LOAD_DIR / "recordings"
+
+# Resource types replayed (Chrome Network.ResourceType); static assets only with include_static
+RESOURCE_TYPES = {"Document", "XHR", "Fetch"}
+STATIC_TYPES = {"Stylesheet", "Script", "Image", "Font"}
+
+# Request headers kept; cookies and credentials are per virtual user
+KEPT_HEADERS = {"accept", "content-type", "x-requested-with"}
+
+PERCENTILES = (50, 90, 95, 99)
+QUIET_PERIOD = 0.5  # seconds without network events that end a recorded step
+STEP_TIMEOUT = 10.0  # seconds a recorded step may keep the network busy
+
+_TEMPLATE = re.compile(r"\{\{(\w+)\}\}")
+
+
+# --- Recording ---
+
+def _post_data(request):
+    if request.get("postData") is not None:
+        return request["postData"]
+    entries = request.get("postDataEntries") or []
+    return "".join(base64.b64decode(e["bytes"]).decode("utf-8", "replace") for e in entries if "bytes" in e)
+
+
+def parse_network_events(entries, base_url, include_static=False):
+    """
+    Turn performance-log entries into the requests to replay, in order.
+
+    Args:
+        entries: Performance log entries (dicts with a JSON "message")
+        base_url: Application URL; requests to other origins are dropped
+        include_static: Also keep stylesheets, scripts, images and fonts
+
+    Returns:
+        List of request dicts (method, path, headers, body, status, type)
+    """
+    origin = urlsplit(base_url)[:2]
+    types = RESOURCE_TYPES | (STATIC_TYPES if include_static else set())
+    requests, hops = [], {}  # hops: requestId -> latest request dict of its redirect chain
+    for entry in entries:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, TypeError, ValueError):
+            continue
+        params = message.get("params", {})
+        request_id = params.get("requestId")
+        if message.get("method") == "Network.requestWillBeSent":
+            if "redirectResponse" in params and request_id in hops:
+                hops[request_id]["status"] = params["redirectResponse"].get("status")
+            request = params.get("request", {})
+            url = urlsplit(request.get("url", ""))
+            if url[:2] != origin or params.get("type") not in types:
+                hops.pop(request_id, None)
+                continue
+            recorded = {
+                "method": request.get("method", "GET"),
+                "path": url.path + (f"?{url.query}" if url.query else ""),
+                "headers": {name: value for name, value in request.get("headers", {}).items()
+                            if name.lower() in KEPT_HEADERS},
+                "body": _post_data(request) or None,
+                "status": None,
+                "type": params.get("type"),
+            }
+            requests.append(recorded)
+            hops[request_id] = recorded
+        elif message.get("method") == "Network.responseReceived" and request_id in hops:
+            hops[request_id]["status"] = params.get("response", {}).get("status")
+    return requests
+
+
+def parameterize(requests, users):
+    """
+    Replace recorded credentials by {{email}} / {{password}} placeholders.
+
+    Args:
+        requests: Output of parse_network_events() (modified in place)
+        users: Dict like tests/test_data.TEST_USERS
+
+    Returns:
+        The requests
+    """
+    for user in users.values():
+        for field in ("email", "password"):
+            value = user.get(field)
+            if not value:
+                continue
+            for request in requests:
+                for key in ("path", "body"):
+                    text = request.get(key)
+                    if text and (value in text or quote_plus(value) in text):
+                        request[key] = text.replace(quote_plus(value), f"{{{{{field}}}}}").replace(
+                            value, f"{{{{{field}}}}}")
+    return requests
+
+
+class TrafficRecorder:
+    """Collects the requests of each journey step from a browser started with enable_log_capture()."""
+
+    def __init__(self, driver, base_url, include_static=False):
+        """
+        Initialize traffic recorder.
+
+        Args:
+            driver: WebDriver with performance logging enabled
+            base_url: Application URL
+            include_static: Also record static assets
+        """
+        self.driver = driver
+        self.base_url = base_url
+        self.include_static = include_static
+        self.steps = []
+
+    def _drain(self):
+        return self.driver.execute("getLog", {"type": "performance"})["value"] or []
+
+    def _settle(self):
+        """Read events until the network has been quiet for QUIET_PERIOD."""
+        entries, deadline = [], time.monotonic() + STEP_TIMEOUT
+        while time.monotonic() < deadline:
+            new = self._drain()
+            entries += new
+            if not new and entries:
+                break
+            time.sleep(QUIET_PERIOD)
+        return entries
+
+    def record_step(self, name, action):
+        """
+        Run one step and keep the requests it caused.
+
+        Args:
+            name: Step name (reported separately at replay)
+            action: Callable doing the step in the browser
+        """
+        self._drain()  # leftovers of earlier steps
+        action()
+        requests = parse_network_events(self._settle(), self.base_url, self.include_static)
+        self.steps.append({"name": name, "requests": requests})
+
+    def recording(self, journey, users):
+        """
+        The parameterized recording.
+
+        Args:
+            journey: Journey name
+            users: Dict like tests/test_data.TEST_USERS
+
+        Returns:
+            Recording dict (journey, recorded_from, steps)
+        """
+        for step in self.steps:
+            parameterize(step["requests"], users)
+        return {"journey": journey, "recorded_from": self.base_url, "steps": self.steps}
+
+
+def _step_open_login(driver, base_url, user):
+    from page_objects.login_page import LoginPage
+
+    page = LoginPage(driver, base_url)
+    page.navigate_to_login()
+    page.wait_until_ready()
+
+
+def _step_login(driver, base_url, user):
+    from page_objects.dashboard_page import DashboardPage
+    from page_objects.login_page import LoginPage
+
+    page = LoginPage(driver, base_url)
+    page.enter_email(user["email"])
+    page.enter_password(user["password"])
+    page.click_login_button()
+    DashboardPage(driver, base_url).wait_until_ready()
+
+
+def _step_dashboard(driver, base_url, user):
+    from page_objects.dashboard_page import DashboardPage
+
+    page = DashboardPage(driver, base_url)
+    page.navigate_to_dashboard()
+    page.wait_until_ready()
+
+
+def _step_logout(driver, base_url, user):
+    from page_objects.dashboard_page import DashboardPage
+    from page_objects.login_page import LoginPage
+
+    DashboardPage(driver, base_url).logout()
+    LoginPage(driver, base_url).wait_until_ready()
+
+
+# journey -> [(step name, callable(driver, base_url, user)), ...]
+JOURNEYS = {
+    "login_dashboard": [
+        ("open login", _step_open_login),
+        ("login", _step_login),
+        ("dashboard", _step_dashboard),
+        ("logout", _step_logout),
+    ],
+}
+
+
+def recording_path(journey, directory=RECORDINGS_DIR):
+    return Path(directory) / f"{journey}.json"
+
+
+def record(journey, base_url, user, users, headed=False, include_static=False):
+    """
+    Record a journey in a real Chrome.
+
+    Args:
+        journey: Key of JOURNEYS
+        base_url: Application URL
+        user: Account used while recording (an entry of users)
+        users: Dict like tests/test_data.TEST_USERS, for parameterization
+        headed: Show the browser window
+        include_static: Also record static assets
+
+    Returns:
+        Recording dict
+    """
+    from selenium import webdriver
+    from utils.browser_logs import enable_log_capture
+
+    options = enable_log_capture(webdriver.ChromeOptions())
+    if not headed:
+        options.add_argument("--headless=new")
+    driver = webdriver.Chrome(options=options)
+    try:
+        recorder = TrafficRecorder(driver, base_url, include_static)
+        for name, step in JOURNEYS[journey]:
+            recorder.record_step(name, lambda: step(driver, base_url, user))
+    finally:
+        driver.quit()
+    return recorder.recording(journey, users)
+
+
+# --- Replay ---
+
+def percentiles(values, points=PERCENTILES):
+    """
+    Nearest-rank percentiles.
+
+    Args:
+        values: Numbers
+        points: Percentiles wanted
+
+    Returns:
+        Dict of percentile -> value (empty if no values)
+    """
+    if not values:
+        return {}
+    ordered = sorted(values)
+    return {p: ordered[min(len(ordered) - 1, max(0, -(-p * len(ordered) // 100) - 1))] for p in points}
+
+
+def _fill(text, user, form):
+    encode = quote_plus if form else (lambda value: json.dumps(value)[1:-1])
+    return _TEMPLATE.sub(lambda m: encode(str(user.get(m.group(1), m.group(0)))), text)
+
+
+class VirtualUser:
+    """One simulated user: its account and cookie jar."""
+
+    def __init__(self, number, user):
+        """
+        Initialize virtual user.
+
+        Args:
+            number: User number (for reporting)
+            user: Account dict (email, password)
+        """
+        self.number = number
+        self.user = user
+        self.cookies = {}
+
+    def store_cookies(self, set_cookie_headers):
+        """Apply Set-Cookie response headers to the jar."""
+        for header in set_cookie_headers:
+            pair, _, attributes = header.partition(";")
+            name, _, value = pair.strip().partition("=")
+            if not value or "max-age=0" in attributes.lower().replace(" ", ""):
+                self.cookies.pop(name, None)
+            else:
+                self.cookies[name] = value
+
+    def headers(self, request):
+        headers = [(name, value) for name, value in request["headers"].items()]
+        if self.cookies:
+            headers.append(("Cookie", "; ".join(f"{k}={v}" for k, v in self.cookies.items())))
+        return headers
+
+
+class LoadReport:
+    """Latencies and errors collected during a replay."""
+
+    def __init__(self, journey, users):
+        """
+        Initialize load report.
+
+        Args:
+            journey: Journey name
+            users: Number of virtual users
+        """
+        self.journey = journey
+        self.users = users
+        self.steps = {}  # step name -> latencies (s)
+        self.requests = {}  # "step: METHOD path" -> latencies (s)
+        self.errors = {}  # step name -> count
+        self.error_samples = []
+        self.iterations = 0
+        self.elapsed = 0.0
+
+    @property
+    def total_requests(self):
+        return sum(len(latencies) for latencies in self.requests.values())
+
+    def to_dict(self):
+        """
+        JSON-serializable summary (latencies in ms).
+
+        Returns:
+            Dict
+        """
+        def stats(latencies):
+            return {"count": len(latencies),
+                    **{f"p{p}": round(v * 1000, 2) for p, v in percentiles(latencies).items()},
+                    "max": round(max(latencies) * 1000, 2) if latencies else None}
+        return {
+            "journey": self.journey, "users": self.users, "iterations": self.iterations,
+            "elapsed": round(self.elapsed, 2), "requests": self.total_requests,
+            "throughput": round(self.total_requests / self.elapsed, 1) if self.elapsed else None,
+            "errors": sum(self.errors.values()), "error_samples": self.error_samples,
+            "steps": {name: {**stats(latencies), "errors": self.errors.get(name, 0)}
+                      for name, latencies in self.steps.items()},
+            "per_request": {name: stats(latencies) for name, latencies in self.requests.items()},
+        }
+
+    def format(self):
+        """
+        Text table for the terminal.
+
+        Returns:
+            String
+        """
+        summary = self.to_dict()
+        lines = [f"{self.journey}: {self.users} users, {self.iterations} journeys, {summary['requests']} requests "
+                 f"in {self.elapsed:.1f}s ({summary['throughput']} req/s), {summary['errors']} errors",
+                 f"{'step':<24}{'count':>7}" + "".join(f"{f'p{p}':>9}" for p in PERCENTILES) + f"{'max':>9}{'errors':>8}"]
+        for name, stats in summary["steps"].items():
+            lines.append(f"{name:<24}{stats['count']:>7}" + "".join(f"{stats.get(f'p{p}', 0):>9.1f}" for p in PERCENTILES)
+                         + f"{stats['max'] or 0:>9.1f}{stats['errors']:>8}")
+        lines.append("(latencies in ms)")
+        return "\n".join(lines)
+
+
+async def _run_user(pool, recording, virtual_user, report, iterations, deadline, think_time):
+    done = 0
+    while (iterations is None or done < iterations) and (deadline is None or time.monotonic() < deadline):
+        for step in recording["steps"]:
+            step_start = time.monotonic()
+            for request in step["requests"]:
+                form = any(name.lower() == "content-type" and "x-www-form-urlencoded" in value
+                           for name, value in request["headers"].items())
+                payload = _fill(request["body"], virtual_user.user, form).encode("utf-8") if request["body"] else b""
+                path = _fill(request["path"], virtual_user.user, True)
+                start = time.monotonic()
+                try:
+                    status, headers, _ = await pool.send(request["method"], path, payload,
+                                                         virtual_user.headers(request))
+                except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+                    status, headers = None, {}
+                    error = f"{type(e).__name__}: {e}"
+                else:
+                    error = None if request["status"] in (None, status) else \
+                        f"{request['method']} {path}: {status}, recorded {request['status']}"
+                report.requests.setdefault(f"{step['name']}: {request['method']} {request['path']}", []).append(
+                    time.monotonic() - start)
+                virtual_user.store_cookies(headers.get("set-cookie", []))
+                if error:
+                    report.errors[step["name"]] = report.errors.get(step["name"], 0) + 1
+                    if len(report.error_samples) < 10:
+                        report.error_samples.append(f"user {virtual_user.number}: {error}")
+            report.steps.setdefault(step["name"], []).append(time.monotonic() - step_start)
+            if think_time:
+                await asyncio.sleep(think_time)
+        done += 1
+        report.iterations += 1
+
+
+async def replay(recording, base_url, users=100, iterations=1, duration=None, ramp_up=0.0, think_time=0.0,
+                 accounts=None, connections=None, timeout=30):
+    """
+    Replay a recording with many concurrent virtual users.
+
+    Args:
+        recording: Recording dict (see record())
+        base_url: Application URL to load
+        users: Number of concurrent virtual users
+        iterations: Journeys per user (None: until duration)
+        duration: Seconds to keep going (None: only iterations limit)
+        ramp_up: Seconds over which user starts are spread
+        think_time: Pause after each step in seconds
+        accounts: Account dicts handed out round-robin (TEST_USERS entries with a valid login)
+        connections: Connection pool size (one per user if None)
+        timeout: Timeout per request in seconds
+
+    Returns:
+        LoadReport
+    """
+    from utils.async_driver import AsyncHTTPPool
+
+    if iterations is None and duration is None:
+        raise ValueError("A replay needs iterations or a duration")
+    accounts = accounts or [{}]
+    report = LoadReport(recording["journey"], users)
+    pool = AsyncHTTPPool(base_url, size=connections or users, timeout=timeout)
+    start = time.monotonic()
+    deadline = start + duration if duration else None
+
+    async def delayed(number):
+        if ramp_up and users > 1:
+            await asyncio.sleep(ramp_up * number / (users - 1))
+        await _run_user(pool, recording, VirtualUser(number, accounts[number % len(accounts)]), report,
+                        iterations, deadline, think_time)
+
+    try:
+        await asyncio.gather(*(delayed(number) for number in range(users)))
+    finally:
+        await pool.close()
+    report.elapsed = time.monotonic() - start
+    return report
+
+
+def save_report(report, directory=LOAD_DIR, store=None):
+    """
+    Write a replay summary as JSON.
+
+    Args:
+        report: LoadReport
+        directory: Output directory
+        store: ArtifactStore the file is indexed in as "load_report" (None: not indexed)
+
+    Returns:
+        Path of the file
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{report.journey}_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    path.write_text(json.dumps(report.to_dict(), indent=2), encoding="utf-8")
+    if store is not None:
+        store.add("load_report", path)
+    return path
+
+
+def _valid_accounts(users, names):
+    if names:
+        return [users[name] for name in names.split(",")]
+    # Accounts the suite logs in with successfully (invalid_user is for negative tests)
+    return [user for name, user in users.items() if not name.startswith("invalid")]
+
+
+def main(argv=None):
+    from utils.soak import parse_duration
+
+    parser = argparse.ArgumentParser(description="Record a page-object journey's HTTP traffic and replay it as load")
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name in ("record", "replay"):
+        command = commands.add_parser(name)
+        command.add_argument("journey", choices=sorted(JOURNEYS))
+        command.add_argument("--base-url", default=None, help="Application URL (config.BASE_URL if omitted)")
+        command.add_argument("--standin", action="store_true", help="Start the local stand-in app and use it")
+    recording = commands.choices["record"]
+    recording.add_argument("--user", default="valid_user", help="TEST_USERS account used while recording")
+    recording.add_argument("--headed", action="store_true", help="Show the browser window")
+    recording.add_argument("--include-static", action="store_true", help="Also record CSS/JS/images/fonts")
+    load = commands.choices["replay"]
+    load.add_argument("--users", type=int, default=100, help="Concurrent virtual users")
+    load.add_argument("--iterations", type=int, default=None, help="Journeys per user (default 1)")
+    load.add_argument("--duration", type=parse_duration, default=None, help="Run for e.g. 5m instead")
+    load.add_argument("--ramp-up", type=float, default=0.0, help="Seconds over which users start")
+    load.add_argument("--think-time", type=float, default=0.0, help="Pause after each step (seconds)")
+    load.add_argument("--accounts", default=None, help="Comma-separated TEST_USERS keys (default: valid ones)")
+    args = parser.parse_args(argv)
+
+    from config import BASE_URL
+    from tests.test_data import TEST_USERS
+
+    app = None
+    base_url = args.base_url or BASE_URL
+    if args.standin:
+        from standin_app.server import StandinApp
+
+        app = StandinApp().start()
+        base_url = app.url
+    try:
+        path = recording_path(args.journey)
+        if args.command == "record":
+            result = record(args.journey, base_url, TEST_USERS[args.user], TEST_USERS, args.headed,
+                            args.include_static)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(result, indent=2), encoding="utf-8")
+            print(f"Recorded {sum(len(s['requests']) for s in result['steps'])} requests "
+                  f"in {len(result['steps'])} steps to {path}")
+            return 0
+        recording_data = json.loads(path.read_text(encoding="utf-8"))
+        iterations = args.iterations if args.iterations or args.duration else 1
+        report = asyncio.run(replay(recording_data, base_url, args.users, iterations, args.duration, args.ramp_up,
+                                    args.think_time, _valid_accounts(TEST_USERS, args.accounts)))
+    finally:
+        if app is not None:
+            app.stop()
+    print(report.format())
+    from utils.artifact_store import ArtifactStore
+
+    print(f"Report: {save_report(report, store=ArtifactStore())}")
+    return 1 if report.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
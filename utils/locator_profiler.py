@@ -0,0 +1,372 @@
+"""
+Locator performance analyzer (`pytest --profile-locators`).
+
+The first time a page object is used on a live page (an element found, or
+wait_until_ready() passing), every locator declared on its class is timed
+in that page with one script call: each locator is resolved `repeats`
+times the way the driver resolves it (CSS for By.ID/NAME/CLASS_NAME/
+TAG_NAME, XPath evaluation, a scan of every <a> for link text) and the
+mean cost per resolution and the number of matches are recorded. For the
+first match the script also looks for a faster unique equivalent in the
+DOM: an id, a name, a data-testid-like attribute, a unique tag.class, or
+a CSS path from the nearest ancestor with a unique id. Each page class is
+profiled once per URL path.
+
+The session summary ranks locators by cost (then match count) and lists
+suggestions where a locator uses a slow strategy, is ambiguous (several
+matches, the first one wins) or costs at least twice its suggestion.
+Locators over the budget are flagged; with --strict-locators the test that
+first reached the page fails, and so does the run. Results go to
+artifacts/locators/locators_<timestamp>.json.
+
+Usage:
+    pytest --profile-locators
+    pytest --strict-locators --locator-budget 1.5
+    python -m utils.locator_profiler --standin        # login + dashboard pages in a real Chrome
+"""
+import argparse
+import importlib
+import json
+import pkgutil
+import sys
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.by import By
+
+LOCATORS_DIR = Path(__file__).parent.parent / "artifacts" / "locators"
+
+# Strategies that cost a scan of the DOM (or of every link) per resolution
+SLOW_STRATEGIES = {By.LINK_TEXT, By.PARTIAL_LINK_TEXT, By.XPATH}
+
+# A locator costing this many times its suggestion is worth changing
+SUGGEST_RATIO = 2.0
+
+# Times every locator of one page and proposes a unique, fast equivalent for its first match.
+# arguments[0]: [[using, value], ...] (compiled, as sent to the driver); arguments[1]: repeats
+PROFILE_SCRIPT = """
+var checks = arguments[0], repeats = arguments[1];
+function resolve(using, value) {
+  if (using === 'css selector') return Array.prototype.slice.call(document.querySelectorAll(value));
+  var out = [];
+  if (using === 'xpath') {
+    var snap = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    for (var i = 0; i < snap.snapshotLength; i++) out.push(snap.snapshotItem(i));
+    return out;
+  }
+  var links = document.getElementsByTagName('a');
+  for (var j = 0; j < links.length; j++) {
+    var text = (links[j].innerText || links[j].textContent).trim();
+    if (using === 'link text' ? text === value : text.indexOf(value) !== -1) out.push(links[j]);
+  }
+  return out;
+}
+function cost(using, value) {
+  var found = resolve(using, value), start = performance.now();
+  for (var r = 0; r < repeats; r++) resolve(using, value);
+  return {ms: (performance.now() - start) / repeats, found: found};
+}
+function esc(value) {
+  return window.CSS && CSS.escape ? CSS.escape(value) : value.replace(/([^\\w-])/g, '\\\\$1');
+}
+function quoted(value) { return '"' + value.replace(/(["\\\\])/g, '\\\\$1') + '"'; }
+function unique(css, el) {
+  try {
+    var matches = document.querySelectorAll(css);
+    return matches.length === 1 && matches[0] === el;
+  } catch (e) { return false; }
+}
+function suggest(el) {
+  var tag = el.tagName.toLowerCase();
+  if (el.id && unique('[id=' + quoted(el.id) + ']', el)) return ['id', el.id, '[id=' + quoted(el.id) + ']'];
+  var name = el.getAttribute('name');
+  if (name && unique('[name=' + quoted(name) + ']', el)) return ['name', name, '[name=' + quoted(name) + ']'];
+  var attrs = ['data-testid', 'data-test', 'data-qa'];
+  for (var a = 0; a < attrs.length; a++) {
+    var attr = el.getAttribute(attrs[a]), css = '[' + attrs[a] + '=' + quoted(attr || '') + ']';
+    if (attr && unique(css, el)) return ['css selector', css, css];
+  }
+  for (var c = 0; c < el.classList.length; c++) {
+    var byClass = tag + '.' + esc(el.classList[c]);
+    if (unique(byClass, el)) return ['css selector', byClass, byClass];
+  }
+  var parts = [], node = el;
+  while (node && node.nodeType === 1) {
+    if (node !== el && node.id && unique('#' + esc(node.id), node)) { parts.unshift('#' + esc(node.id)); break; }
+    var part = node.tagName.toLowerCase(), same = 0, index = 0;
+    for (var sib = node.parentElement ? node.parentElement.firstElementChild : null; sib; sib = sib.nextElementSibling) {
+      if (sib.tagName === node.tagName) same++;
+      if (sib === node) index = same;
+    }
+    parts.unshift(same > 1 ? part + ':nth-of-type(' + index + ')' : part);
+    node = node.parentElement;
+  }
+  var path = parts.join(' > ');
+  return unique(path, el) ? ['css selector', path, path] : null;
+}
+var results = [];
+for (var i = 0; i < checks.length; i++) {
+  var result;
+  try {
+    var measured = cost(checks[i][0], checks[i][1]);
+    result = {count: measured.found.length, ms: measured.ms, suggestion: null, suggestion_ms: null};
+    var better = measured.found.length ? suggest(measured.found[0]) : null;
+    if (better) {
+      result.suggestion = [better[0], better[1]];
+      result.suggestion_ms = cost('css selector', better[2]).ms;
+    }
+  } catch (e) {
+    result = {count: 0, ms: null, error: String(e), suggestion: null, suggestion_ms: null};
+  }
+  results.push(result);
+}
+return {nodes: document.getElementsByTagName('*').length, results: results};
+"""
+
+
+class LocatorBudgetExceeded(AssertionError):
+    """A declared locator took longer than the resolution budget (--strict-locators)."""
+
+
+def page_classes():
+    """
+    Every BasePage subclass in page_objects/ (imported if necessary).
+
+    Returns:
+        Dict of class name -> class
+    """
+    import page_objects
+    from page_objects.base_page import BasePage
+
+    for module in pkgutil.iter_modules(page_objects.__path__):
+        importlib.import_module(f"page_objects.{module.name}")
+    classes, pending = {}, list(BasePage.__subclasses__())
+    while pending:
+        cls = pending.pop()
+        classes[cls.__name__] = cls
+        pending.extend(cls.__subclasses__())
+    return classes
+
+
+class LocatorProfiler:
+    """Times the declared locators of page objects on the live pages they are used on."""
+
+    def __init__(self, budget_ms=None, strict=False, repeats=20):
+        """
+        Initialize locator profiler.
+
+        Args:
+            budget_ms: Resolution budget per locator in milliseconds (None: no budget)
+            strict: Raise LocatorBudgetExceeded when a locator is over budget
+            repeats: Resolutions per locator and page (the mean is reported)
+        """
+        self.budget_ms = budget_ms
+        self.strict = strict
+        self.repeats = repeats
+        # (page class, element name) -> slowest measurement seen
+        self.stats = {}
+        self.pages = {}  # (page class, url path) -> DOM node count
+        self.violations = []
+        self._lock = threading.Lock()
+
+    def observe(self, page):
+        """
+        Profile a page object's locators unless this class was profiled on this URL path.
+
+        Args:
+            page: BasePage instance whose page is loaded in its driver
+
+        Raises:
+            LocatorBudgetExceeded: In strict mode, listing the locators over budget
+        """
+        try:
+            path = urlsplit(page.driver.current_url).path or "/"
+        except WebDriverException:
+            return
+        with self._lock:
+            if (type(page).__name__, path) in self.pages:
+                return
+            self.pages[type(page).__name__, path] = None
+        over = self.profile(page.driver, type(page), path)
+        if self.strict and over:
+            raise LocatorBudgetExceeded(
+                f"Locators over the {self.budget_ms} ms budget on {path}:\n"
+                + "\n".join(self.describe(stat) for stat in over))
+
+    def profile(self, driver, page_class, path):
+        """
+        Time every locator declared on page_class in the current page.
+
+        Args:
+            driver: WebDriver on the page
+            page_class: BasePage subclass
+            path: URL path of the page (for the report)
+
+        Returns:
+            List of the measurements over budget
+        """
+        elements = page_class._element_map
+        if not elements:
+            return []
+        try:
+            measured = driver.execute_script(PROFILE_SCRIPT, [list(e.compiled) for e in elements.values()],
+                                             self.repeats)
+        except WebDriverException:
+            return []  # page navigated away mid-script: it will be profiled on its next use
+        over = []
+        with self._lock:
+            self.pages[page_class.__name__, path] = measured["nodes"]
+            for (name, element), result in zip(elements.items(), measured["results"]):
+                stat = {"page": page_class.__name__, "element": name, "by": element[0], "value": element[1],
+                        "path": path, "nodes": measured["nodes"], **result}
+                key = (page_class.__name__, name)
+                previous = self.stats.get(key)
+                if previous is None or (stat["ms"] or 0) > (previous["ms"] or 0) or not previous["count"]:
+                    self.stats[key] = stat
+                if self.budget_ms is not None and (stat["ms"] or 0) > self.budget_ms:
+                    over.append(stat)
+            self.violations.extend(over)
+        return over
+
+    @staticmethod
+    def suggestion(stat):
+        """
+        The faster equivalent worth switching to, if any.
+
+        Args:
+            stat: Measurement dict
+
+        Returns:
+            (by, value) tuple or None
+        """
+        if not stat["suggestion"] or tuple(stat["suggestion"]) == (stat["by"], stat["value"]):
+            return None
+        slow = stat["by"] in SLOW_STRATEGIES or stat["count"] > 1
+        if slow or (stat["ms"] or 0) >= SUGGEST_RATIO * (stat["suggestion_ms"] or 0) > 0:
+            return tuple(stat["suggestion"])
+        return None
+
+    def ranked(self):
+        """
+        Measurements, most expensive first (ties: most matches first).
+
+        Returns:
+            List of measurement dicts
+        """
+        return sorted(self.stats.values(), key=lambda s: (-(s["ms"] or 0), -s["count"]))
+
+    def unprofiled(self):
+        """
+        Declared locators never seen on a live page during the run.
+
+        Returns:
+            List of "Page.ELEMENT" strings
+        """
+        return [f"{name}.{element}" for name, cls in sorted(page_classes().items())
+                for element in cls._element_map if (name, element) not in self.stats]
+
+    def describe(self, stat):
+        """One line for a measurement."""
+        cost = f"{stat['ms'] * 1000:8.1f} us" if stat["ms"] is not None else f"   error: {stat.get('error')}"
+        line = (f"{cost} {stat['count']:>4} match{'es' if stat['count'] != 1 else '  '}  "
+                f"{stat['page']}.{stat['element']} ({stat['by']}={stat['value']!r}) on {stat['path']}")
+        suggestion = self.suggestion(stat)
+        if suggestion:
+            line += f"\n{'':>27}-> {suggestion[0]}={suggestion[1]!r} ({stat['suggestion_ms'] * 1000:.1f} us)"
+        return line
+
+    def format(self, top=20):
+        """
+        Ranking for the terminal.
+
+        Args:
+            top: Number of locators shown
+
+        Returns:
+            String
+        """
+        ranked = self.ranked()
+        lines = [f"{len(ranked)} locators on {len(self.pages)} page(s), mean cost per resolution:"]
+        lines += [self.describe(stat) for stat in ranked[:top]]
+        if self.budget_ms is not None:
+            lines.append(f"{len({(v['page'], v['element']) for v in self.violations})} locator(s) over the "
+                         f"{self.budget_ms} ms budget")
+        missing = self.unprofiled()
+        if missing:
+            lines.append(f"Not seen on a live page: {', '.join(missing)}")
+        return "\n".join(lines)
+
+    def save(self, directory=LOCATORS_DIR):
+        """
+        Write the measurements as JSON.
+
+        Args:
+            directory: Output directory
+
+        Returns:
+            Path of the file
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"locators_{time.strftime('%Y%m%d_%H%M%S')}.json"
+        data = {
+            "budget_ms": self.budget_ms,
+            "pages": [{"page": page, "path": url, "nodes": nodes} for (page, url), nodes in self.pages.items()],
+            "locators": [{**stat, "suggested": self.suggestion(stat)} for stat in self.ranked()],
+            "unprofiled": self.unprofiled(),
+        }
+        path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the locators of the login and dashboard pages")
+    parser.add_argument("--base-url", default=None, help="Application URL (config.BASE_URL if omitted)")
+    parser.add_argument("--standin", action="store_true", help="Start the local stand-in app and use it")
+    parser.add_argument("--user", default="valid_user", help="TEST_USERS account to log in with")
+    parser.add_argument("--budget", type=float, default=None, help="Resolution budget per locator (ms)")
+    parser.add_argument("--headed", action="store_true", help="Show the browser window")
+    args = parser.parse_args(argv)
+
+    from selenium import webdriver
+
+    from config import BASE_URL, LOCATOR_BUDGET_MS, LOCATOR_PROFILE_REPEATS
+    from page_objects.dashboard_page import DashboardPage
+    from page_objects.login_page import LoginPage
+    from tests.test_data import TEST_USERS
+
+    app = None
+    base_url = args.base_url or BASE_URL
+    if args.standin:
+        from standin_app.server import StandinApp
+
+        app = StandinApp().start()
+        base_url = app.url
+    options = webdriver.ChromeOptions()
+    if not args.headed:
+        options.add_argument("--headless=new")
+    driver = webdriver.Chrome(options=options)
+    profiler = LocatorProfiler(args.budget if args.budget is not None else LOCATOR_BUDGET_MS,
+                               repeats=LOCATOR_PROFILE_REPEATS)
+    driver.locator_profiler = profiler
+    try:
+        login = LoginPage(driver, base_url)
+        login.navigate_to_login()
+        login.wait_until_ready()
+        user = TEST_USERS[args.user]
+        login.login(user["email"], user["password"])
+        DashboardPage(driver, base_url).wait_until_ready()
+    finally:
+        driver.quit()
+        if app is not None:
+            app.stop()
+    print(profiler.format())
+    print(f"Saved to: {profiler.save()}")
+    return 1 if profiler.violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,31 @@
+"""
+Locator helpers shared by the page objects and the wait helpers.
+
+Kept in utils so that utils modules never import page_objects.
+"""
+from selenium.webdriver.common.by import By
+
+
+def compile_locator(by, value):
+    """
+    Compile a locator to the form the driver sends over the wire.
+
+    Selenium rewrites By.ID/NAME/CLASS_NAME/TAG_NAME to CSS selectors on
+    every call; doing it once per class skips that on the hot path.
+
+    Args:
+        by: Selenium By locator type
+        value: Locator value
+
+    Returns:
+        Tuple of (by, value)
+    """
+    if by == By.ID:
+        return By.CSS_SELECTOR, f'[id="{value}"]'
+    if by == By.NAME:
+        return By.CSS_SELECTOR, f'[name="{value}"]'
+    if by == By.CLASS_NAME:
+        return By.CSS_SELECTOR, f".{value}"
+    if by == By.TAG_NAME:
+        return By.CSS_SELECTOR, value
+    return by, value
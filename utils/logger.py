@@ -86,6 +86,38 @@ class CustomLogger:
         return CustomLogger.get_logger(test_name, log_file)
 
 
+class LazyLogger:
+    """
+    Logger proxy that creates the real logger on first use.
+
+    Keeps module-level loggers (e.g. in conftest.py) from creating the log
+    directory and opening a log file at import/collection time.
+    """
+
+    def __init__(self, name="TestAutomation", log_file=None, level=logging.INFO):
+        """
+        Initialize lazy logger.
+
+        Args:
+            name: Logger name
+            log_file: Path to log file (auto-generated if None)
+            level: Logging level
+        """
+        self._name = name
+        self._log_file = log_file
+        self._level = level
+        self._logger = None
+
+    def _get(self):
+        """Create the underlying logger on first access."""
+        if self._logger is None:
+            self._logger = CustomLogger.get_logger(self._name, self._log_file, self._level)
+        return self._logger
+
+    def __getattr__(self, attr):
+        return getattr(self._get(), attr)
+
+
 # Convenience functions for quick logging
 
 def log_info(message, logger_name="TestAutomation"):
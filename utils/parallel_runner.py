@@ -0,0 +1,460 @@
+"""
+Local parallel runner with resource-aware worker autoscaling.
+
+Runs the suite as chunks of node ids in concurrent pytest worker processes
+(one browser each). Instead of a fixed worker count, an Autoscaler picks
+the number of concurrent workers from live CPU load, free memory and the
+wait-timeout rate observed in finished chunks:
+
+- it starts with one worker and ramps up while the machine has headroom,
+  never beyond the CPU count or what free memory allows per browser;
+- under pressure (high load, low memory, many TimeoutExceptions) it lowers
+  the target, so no new workers start until enough of them have finished;
+- new browsers are launched at most every PARALLEL_LAUNCH_INTERVAL seconds,
+  longer while under pressure, so startup spikes do not pile up.
+
+Every decision is appended to artifacts/parallel/<run>/decisions.jsonl
+(with the metrics it was based on) so the thresholds can be tuned.
+
+Usage:
+    python -m utils.parallel_runner                      # whole suite
+    python -m utils.parallel_runner --max-workers 4 -- -m example_suite
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+import xml.etree.ElementTree as ET
+from collections import deque
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+RUNS_DIR = PROJECT_ROOT / "artifacts" / "parallel"
+
+POLL_INTERVAL = 0.5  # seconds between scheduling decisions
+
+# Failure messages counted as wait timeouts
+TIMEOUT_MARKERS = ("TimeoutException", "Timed out", "timed out")
+
+# pytest options whose separate value is a path, not a test selection
+PATH_VALUE_OPTIONS = {"-c", "--rootdir", "--confcutdir", "--basetemp", "--ignore", "--ignore-glob", "--deselect",
+                      "--junitxml", "--junit-xml", "--html", "--log-file", "--durations-file"}
+
+
+def _config(name, default):
+    try:
+        import config
+    except Exception:
+        return default
+    return getattr(config, name, default)
+
+
+def read_load():
+    """
+    One-minute load average per CPU.
+
+    Returns:
+        Float (1.0 = all CPUs busy), or None where unavailable (Windows)
+    """
+    try:
+        return os.getloadavg()[0] / (os.cpu_count() or 1)
+    except (AttributeError, OSError):
+        return None
+
+
+def read_available_memory_mb(meminfo="/proc/meminfo"):
+    """
+    Memory available for new processes.
+
+    Args:
+        meminfo: Path to /proc/meminfo
+
+    Returns:
+        Megabytes, or None where unavailable (non-Linux)
+    """
+    try:
+        with open(meminfo, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def sample_resources():
+    """
+    Sample the live machine metrics the autoscaler uses.
+
+    Returns:
+        Dict with "load" and "memory_mb" (either may be None)
+    """
+    return {"load": read_load(), "memory_mb": read_available_memory_mb()}
+
+
+class Autoscaler:
+    """Chooses how many browser workers may run concurrently."""
+
+    def __init__(self, max_workers=None, min_workers=1, browser_memory_mb=None, memory_reserve_mb=None,
+                 high_load=None, low_load=None, timeout_rate_limit=None, launch_interval=None,
+                 adjust_interval=None, window=20, log_path=None):
+        """
+        Initialize autoscaler.
+
+        Args:
+            max_workers: Upper bound on workers (CPU count if None)
+            min_workers: Lower bound on workers
+            browser_memory_mb: Memory one worker's browser needs
+            memory_reserve_mb: Memory always left free
+            high_load: Load per CPU above which the pool shrinks
+            low_load: Load per CPU below which the pool may grow
+            timeout_rate_limit: Share of recent tests failing on wait timeouts above which the pool shrinks
+            launch_interval: Minimum seconds between browser launches
+            adjust_interval: Minimum seconds between target changes
+            window: Number of recent test outcomes used for the timeout rate
+            log_path: JSON Lines file receiving every decision (None: keep in memory only)
+        """
+        self.max_workers = max(min_workers, max_workers or _config("PARALLEL_MAX_WORKERS", 0) or os.cpu_count() or 1)
+        self.min_workers = min_workers
+        self.browser_memory_mb = browser_memory_mb or _config("PARALLEL_BROWSER_MEMORY_MB", 500)
+        self.memory_reserve_mb = memory_reserve_mb if memory_reserve_mb is not None else _config(
+            "PARALLEL_MEMORY_RESERVE_MB", 1024)
+        self.high_load = high_load or _config("PARALLEL_HIGH_LOAD", 0.9)
+        self.low_load = low_load or _config("PARALLEL_LOW_LOAD", 0.6)
+        self.timeout_rate_limit = timeout_rate_limit or _config("PARALLEL_TIMEOUT_RATE", 0.1)
+        self.launch_interval = launch_interval if launch_interval is not None else _config(
+            "PARALLEL_LAUNCH_INTERVAL", 2.0)
+        self.adjust_interval = adjust_interval if adjust_interval is not None else _config(
+            "PARALLEL_ADJUST_INTERVAL", 5.0)
+        self.log_path = Path(log_path) if log_path else None
+
+        self.target = min_workers  # ramp up from here
+        self.outcomes = deque(maxlen=window)  # True = test timed out
+        self.pressure = []
+        self.last_launch = None
+        self.last_adjust = None
+        self.decisions = []
+
+    @property
+    def timeout_rate(self):
+        """Share of recent tests that failed on a wait timeout."""
+        return sum(self.outcomes) / len(self.outcomes) if self.outcomes else 0.0
+
+    def record(self, tests, timeouts):
+        """
+        Record the outcome of a finished chunk.
+
+        Args:
+            tests: Number of tests that ran
+            timeouts: Number of them that failed on a wait timeout
+        """
+        self.outcomes.extend([True] * timeouts + [False] * max(0, tests - timeouts))
+
+    def capacity(self, sample, active):
+        """
+        Workers the machine can hold right now.
+
+        Args:
+            sample: Output of sample_resources()
+            active: Workers currently running (already counted in used memory)
+
+        Returns:
+            Int between min_workers and max_workers
+        """
+        capacity = self.max_workers
+        if sample.get("memory_mb") is not None:
+            spare = (sample["memory_mb"] - self.memory_reserve_mb) // self.browser_memory_mb
+            capacity = min(capacity, active + max(0, int(spare)))
+        return max(self.min_workers, capacity)
+
+    def _pressure(self, sample):
+        reasons = []
+        if sample.get("load") is not None and sample["load"] > self.high_load:
+            reasons.append(f"cpu load {sample['load']:.2f}")
+        if (sample.get("memory_mb") is not None
+                and sample["memory_mb"] < self.memory_reserve_mb + self.browser_memory_mb):
+            reasons.append(f"free memory {sample['memory_mb']} MB")
+        if len(self.outcomes) >= min(5, self.outcomes.maxlen) and self.timeout_rate > self.timeout_rate_limit:
+            reasons.append(f"timeout rate {self.timeout_rate:.0%}")
+        return reasons
+
+    def current_launch_interval(self):
+        """Seconds between launches; doubled for every active pressure reason."""
+        return self.launch_interval * (2 ** len(self.pressure))
+
+    def decide(self, sample, active, now=None):
+        """
+        Update the worker target from a metrics sample.
+
+        Args:
+            sample: Output of sample_resources()
+            active: Workers currently running
+            now: Monotonic time (time.monotonic() if None)
+
+        Returns:
+            Target number of concurrent workers
+        """
+        now = time.monotonic() if now is None else now
+        pressure = self._pressure(sample)
+        capacity = self.capacity(sample, active)
+        target, reason = self.target, None
+        can_adjust = self.last_adjust is None or now - self.last_adjust >= self.adjust_interval
+
+        if target > capacity:
+            target, reason = capacity, f"capacity {capacity}"
+        elif pressure and can_adjust and target > self.min_workers:
+            # Shrink below what is running so the pool drains under pressure
+            target, reason = max(self.min_workers, min(target, active) - 1), "pressure: " + ", ".join(pressure)
+        elif (not pressure and can_adjust and target < capacity and active >= target
+              and (sample.get("load") is None or sample["load"] < self.low_load)):
+            target, reason = target + 1, "headroom"
+
+        pressure_changed = pressure != self.pressure
+        self.pressure = pressure
+        if target != self.target:
+            self.target = target
+            self.last_adjust = now
+        if not self.decisions:
+            reason = reason or "initial"
+        if reason or pressure_changed:
+            self._log(sample, active, capacity, reason or ("pressure: " + ", ".join(pressure) if pressure
+                                                           else "pressure cleared"))
+        return self.target
+
+    def may_launch(self, active, now=None):
+        """
+        Check whether another worker may start now.
+
+        Args:
+            active: Workers currently running
+            now: Monotonic time (time.monotonic() if None)
+
+        Returns:
+            Boolean
+        """
+        now = time.monotonic() if now is None else now
+        if active >= self.target:
+            return False
+        return self.last_launch is None or now - self.last_launch >= self.current_launch_interval()
+
+    def launched(self, now=None):
+        """Record that a worker (browser) was started."""
+        self.last_launch = time.monotonic() if now is None else now
+
+    def _log(self, sample, active, capacity, reason):
+        decision = {
+            "time": time.time(),
+            "load": None if sample.get("load") is None else round(sample["load"], 3),
+            "memory_mb": sample.get("memory_mb"),
+            "timeout_rate": round(self.timeout_rate, 3),
+            "active": active,
+            "capacity": capacity,
+            "target": self.target,
+            "launch_interval": self.current_launch_interval(),
+            "reason": reason,
+        }
+        self.decisions.append(decision)
+        if self.log_path:
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(decision) + "\n")
+
+
+def parse_junit(path):
+    """
+    Count tests, failures and wait timeouts in a worker's JUnit XML report.
+
+    Args:
+        path: JUnit XML file
+
+    Returns:
+        Dict with "tests", "failed" and "timeouts" (all 0 if unreadable)
+    """
+    counts = {"tests": 0, "failed": 0, "timeouts": 0}
+    try:
+        root = ET.parse(path).getroot()
+    except (OSError, ET.ParseError):
+        return counts
+    for case in root.iter("testcase"):
+        counts["tests"] += 1
+        problems = [child for child in case if child.tag in ("failure", "error")]
+        if problems:
+            counts["failed"] += 1
+            text = " ".join((child.get("message") or "") + (child.text or "") for child in problems)
+            if any(marker in text for marker in TIMEOUT_MARKERS):
+                counts["timeouts"] += 1
+    return counts
+
+
+class CollectionError(RuntimeError):
+    """pytest --collect-only failed (bad arguments, import errors in tests or conftest)."""
+
+    def __init__(self, returncode, output):
+        super().__init__(f"Collection failed with exit code {returncode}")
+        self.returncode = returncode
+        self.output = output
+
+
+def collect(pytest_args=()):
+    """
+    Collect the node ids pytest would run.
+
+    Args:
+        pytest_args: Extra pytest arguments (selection, markers, ...)
+
+    Returns:
+        List of node ids (empty if nothing was selected)
+
+    Raises:
+        CollectionError: If collection failed
+    """
+    # The user's -q/-v would change the listing away from one node id per line
+    selection = [arg for arg in pytest_args
+                 if arg not in ("--quiet", "--verbose") and not re.fullmatch(r"-(q+|v+)", arg)]
+    result = subprocess.run(
+        [sys.executable, "-m", "pytest", "--collect-only", "-q", "-p", "no:cacheprovider", *selection],
+        cwd=PROJECT_ROOT, capture_output=True, text=True)
+    if result.returncode not in (0, 5):  # 5: no tests collected
+        raise CollectionError(result.returncode, result.stdout + result.stderr)
+    return [line.strip() for line in result.stdout.splitlines() if "::" in line and not line.startswith(" ")]
+
+
+def make_chunks(nodeids, chunk_size, store=None):
+    """
+    Split node ids into worker chunks, longest estimated tests first.
+
+    Args:
+        nodeids: Node ids to run
+        chunk_size: Tests per worker process
+        store: scheduler.DurationStore (loaded from disk if None)
+
+    Returns:
+        List of node id lists
+    """
+    from utils import scheduler
+
+    store = store or scheduler.DurationStore()
+    tests = [(nodeid, "driver") for nodeid in nodeids]
+    estimates = scheduler.estimate_durations(tests, store)
+    ordered = sorted(nodeids, key=lambda nodeid: (-estimates[nodeid], nodeid))
+    return [ordered[i:i + chunk_size] for i in range(0, len(ordered), chunk_size)]
+
+
+def worker_args(pytest_args):
+    """
+    Drop the test paths from pytest arguments, keeping only the options.
+
+    Collection selects the tests from the paths; workers get the options plus
+    their chunk's node ids, so no worker runs a whole path again.
+
+    Args:
+        pytest_args: Extra pytest arguments as given to collection
+
+    Returns:
+        List of the option arguments
+    """
+    options = []
+    for position, arg in enumerate(pytest_args):
+        previous = pytest_args[position - 1] if position else ""
+        if (not arg.startswith("-") and previous not in PATH_VALUE_OPTIONS
+                and (PROJECT_ROOT / arg.split("::")[0]).exists()):
+            continue
+        options.append(arg)
+    return options
+
+
+def _start_worker(index, nodeids, pytest_args, run_dir):
+    junit = run_dir / f"chunk_{index:03d}.xml"
+    command = [sys.executable, "-m", "pytest", "-p", "no:cacheprovider", f"--junitxml={junit}", *pytest_args]
+    if not any(arg.startswith("--html") for arg in pytest_args):
+        import importlib.util
+        if importlib.util.find_spec("pytest_html"):
+            command += [f"--html={run_dir / f'chunk_{index:03d}.html'}", "--self-contained-html"]
+    log = open(run_dir / f"chunk_{index:03d}.log", "w", encoding="utf-8")
+    # Workers index their artifacts under the parallel run's id
+    env = {**os.environ, "ARTIFACT_RUN_ID": run_dir.name}
+    process = subprocess.Popen(command + list(nodeids), cwd=PROJECT_ROOT, stdout=log, stderr=subprocess.STDOUT,
+                               env=env)
+    return {"index": index, "nodeids": nodeids, "process": process, "junit": junit, "log": log}
+
+
+def run(pytest_args=(), chunk_size=4, autoscaler=None, run_dir=None, sampler=sample_resources):
+    """
+    Run the suite in autoscaled parallel worker processes.
+
+    Args:
+        pytest_args: Extra pytest arguments for collection; workers get the options only
+        chunk_size: Tests per worker process
+        autoscaler: Autoscaler (default settings from config.py if None)
+        run_dir: Directory for worker reports and decisions (new one under artifacts/parallel if None)
+        sampler: Callable returning a metrics sample
+
+    Returns:
+        Dict with "tests", "failed", "timeouts", "chunks", "peak_workers", "exit_code", "run_dir"
+        (exit_code is pytest's if collection failed)
+    """
+    run_dir = Path(run_dir or RUNS_DIR / time.strftime("%Y%m%d_%H%M%S"))
+    run_dir.mkdir(parents=True, exist_ok=True)
+    autoscaler = autoscaler or Autoscaler(log_path=run_dir / "decisions.jsonl")
+
+    active, totals, exit_code = [], {"tests": 0, "failed": 0, "timeouts": 0}, 0
+    try:
+        nodeids = collect(pytest_args)
+    except CollectionError as e:
+        print(e.output, end="", file=sys.stderr)
+        print(f"[parallel] {e}", file=sys.stderr)
+        return {**totals, "chunks": 0, "peak_workers": 0, "exit_code": e.returncode, "run_dir": str(run_dir)}
+    pending = deque(enumerate(make_chunks(nodeids, chunk_size)))
+    options = worker_args(pytest_args)
+    chunks, peak = len(pending), 0
+    while pending or active:
+        for worker in [w for w in active if w["process"].poll() is not None]:
+            active.remove(worker)
+            worker["log"].close()
+            counts = parse_junit(worker["junit"])
+            autoscaler.record(counts["tests"], counts["timeouts"])
+            for key in totals:
+                totals[key] += counts[key]
+            if worker["process"].returncode not in (0, 5):  # 5: all deselected/skipped
+                exit_code = 1
+        target = autoscaler.decide(sampler(), len(active))
+        if pending and autoscaler.may_launch(len(active)):
+            index, nodeids = pending.popleft()
+            active.append(_start_worker(index, nodeids, options, run_dir))
+            autoscaler.launched()
+            peak = max(peak, len(active))
+            print(f"[parallel] chunk {index + 1}/{chunks} started "
+                  f"({len(active)} running, target {target})", flush=True)
+        elif pending or active:
+            time.sleep(POLL_INTERVAL)
+    return {**totals, "chunks": chunks, "peak_workers": peak, "exit_code": exit_code, "run_dir": str(run_dir)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the suite in autoscaled parallel pytest workers",
+                                     epilog="Arguments after -- are passed to pytest")
+    parser.add_argument("--max-workers", type=int, default=None, help="Upper bound on concurrent workers")
+    parser.add_argument("--min-workers", type=int, default=1, help="Lower bound on concurrent workers")
+    parser.add_argument("--chunk-size", type=int, default=4, help="Tests per worker process")
+    argv = list(sys.argv[1:] if argv is None else argv)
+    pytest_args = []
+    if "--" in argv:
+        split = argv.index("--")
+        argv, pytest_args = argv[:split], argv[split + 1:]
+    args = parser.parse_args(argv)
+
+    run_dir = RUNS_DIR / time.strftime("%Y%m%d_%H%M%S")
+    autoscaler = Autoscaler(max_workers=args.max_workers, min_workers=args.min_workers,
+                            log_path=run_dir / "decisions.jsonl")
+    result = run(pytest_args, args.chunk_size, autoscaler, run_dir)
+    print(f"[parallel] {result['tests']} tests in {result['chunks']} chunks, {result['failed']} failed "
+          f"({result['timeouts']} wait timeouts), peak {result['peak_workers']} workers")
+    print(f"[parallel] reports and autoscaler decisions: {result['run_dir']}")
+    return result["exit_code"]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
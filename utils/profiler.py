@@ -0,0 +1,280 @@
+"""
+Opt-in WebDriver command profiler (`pytest --profile`).
+
+Wraps the driver created in conftest.py and attributes the wall time of
+every WebDriver command to the test (and phase) and the calling page-object
+method (LoginPage.login, BasePage.click, ...). time.sleep() is patched
+while profiling so that WebDriverWait polling ("wait") is separated from
+explicit sleeps ("sleep"); screenshots are their own category.
+
+Outputs, written at session end to artifacts/profile/:
+    profile_<timestamp>.folded   collapsed stacks (flamegraph.pl, speedscope)
+    profile_<timestamp>.json     per-test breakdown and top-N hot spots
+"""
+import html
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+PROFILE_DIR = PROJECT_ROOT / "artifacts" / "profile"
+
+# Instrumentation layers never show up in stacks
+_EXCLUDED_FILES = {
+    str(PROJECT_ROOT / "utils" / "profiler.py"),
+    str(PROJECT_ROOT / "utils" / "connection_pool.py"),
+}
+_PAGE_OBJECTS_DIR = str(PROJECT_ROOT / "page_objects")
+_WAIT_MARKERS = ("selenium/webdriver/support/wait.py", "utils/wait_helpers.py")
+
+SCREENSHOT_COMMANDS = {"screenshot", "elementScreenshot", "fullPageScreenshot"}
+CATEGORIES = ("command", "wait", "sleep", "screenshot")
+
+
+def _frame_label(frame):
+    """Readable label for a project frame."""
+    code = frame.f_code
+    qualname = getattr(code, "co_qualname", code.co_name)
+    if code.co_filename.startswith(_PAGE_OBJECTS_DIR):
+        return qualname
+    return f"{Path(code.co_filename).stem}:{qualname}"
+
+
+class CommandProfiler:
+    """Collects WebDriver command, wait and sleep time per test and call stack."""
+
+    def __init__(self):
+        """Initialize profiler."""
+        self.current_test = None
+        self.current_phase = None
+        # (test, phase, stack tuple, category, leaf) -> [count, seconds]
+        self.samples = {}
+        # test -> {"setup": seconds, "call": ..., "teardown": ...}
+        self.phase_durations = {}
+        self._lock = threading.Lock()
+        self._thread = threading.get_ident()
+        self._original_sleep = None
+        self._phase_start = None
+
+    # --- Test tracking ---
+
+    def start_phase(self, nodeid, phase):
+        """
+        Mark the start of a test phase.
+
+        Args:
+            nodeid: Test node id
+            phase: "setup", "call" or "teardown"
+        """
+        self.current_test = nodeid
+        self.current_phase = phase
+        self._phase_start = time.perf_counter()
+
+    def end_phase(self):
+        """Mark the end of the current test phase."""
+        if self.current_test is None or self.current_phase is None:
+            return
+        elapsed = time.perf_counter() - self._phase_start
+        phases = self.phase_durations.setdefault(self.current_test, {})
+        phases[self.current_phase] = phases.get(self.current_phase, 0.0) + elapsed
+        self.current_phase = None
+
+    # --- Instrumentation ---
+
+    def _stack(self):
+        """Project frames of the caller, outermost first."""
+        frames = []
+        frame = sys._getframe(2)
+        while frame is not None:
+            filename = frame.f_code.co_filename
+            if filename.startswith(str(PROJECT_ROOT)) and filename not in _EXCLUDED_FILES:
+                frames.append(_frame_label(frame))
+            frame = frame.f_back
+        return tuple(reversed(frames))
+
+    def _record(self, stack, category, leaf, duration):
+        key = (self.current_test or "<no test>", self.current_phase or "-", stack, category, leaf)
+        with self._lock:
+            entry = self.samples.setdefault(key, [0, 0.0])
+            entry[0] += 1
+            entry[1] += duration
+
+    def instrument(self, executor):
+        """
+        Profile every command sent through a driver's RemoteConnection (main test
+        thread only, so background log drains don't count as test time).
+
+        Args:
+            executor: driver.command_executor
+        """
+        if getattr(executor, "_profiler", None) is self:
+            return
+        execute = executor.execute
+
+        def profiled_execute(command, params):
+            if threading.get_ident() != self._thread:
+                return execute(command, params)
+            stack = self._stack()
+            start = time.perf_counter()
+            try:
+                return execute(command, params)
+            finally:
+                category = "screenshot" if command in SCREENSHOT_COMMANDS else "command"
+                self._record(stack, category, command, time.perf_counter() - start)
+
+        executor.execute = profiled_execute
+        executor._profiler = self
+
+    def patch_sleep(self):
+        """Route time.sleep through the profiler (main test thread only)."""
+        if self._original_sleep is not None:
+            return
+        original = self._original_sleep = time.sleep
+
+        def profiled_sleep(seconds):
+            if threading.get_ident() != self._thread:
+                return original(seconds)
+            stack = self._stack()
+            # WebDriverWait / wait helper polling vs. explicit sleeps
+            in_wait = any(marker in f.f_code.co_filename.replace("\\", "/")
+                          for f in _walk(sys._getframe(1)) for marker in _WAIT_MARKERS)
+            start = time.perf_counter()
+            try:
+                return original(seconds)
+            finally:
+                category = "wait" if in_wait else "sleep"
+                self._record(stack, category, "time.sleep", time.perf_counter() - start)
+
+        time.sleep = profiled_sleep
+
+    def unpatch_sleep(self):
+        """Restore the original time.sleep."""
+        if self._original_sleep is not None:
+            time.sleep = self._original_sleep
+            self._original_sleep = None
+
+    # --- Reporting ---
+
+    def test_breakdown(self, nodeid):
+        """
+        Time per category for one test.
+
+        Args:
+            nodeid: Test node id
+
+        Returns:
+            Dict with command/wait/sleep/screenshot/other/total seconds
+        """
+        totals = dict.fromkeys(CATEGORIES, 0.0)
+        for (test, _, _, category, _), (_, seconds) in self.samples.items():
+            if test == nodeid:
+                totals[category] += seconds
+        total = sum(self.phase_durations.get(nodeid, {}).values())
+        # Python-side time: assertions, fixture code, page-object logic
+        totals["other"] = max(0.0, total - sum(totals.values()))
+        totals["total"] = total
+        return totals
+
+    def format_breakdown(self, nodeid):
+        """
+        Format one test's breakdown for the report.
+
+        Args:
+            nodeid: Test node id
+
+        Returns:
+            Single-line summary string
+        """
+        b = self.test_breakdown(nodeid)
+        return (f"total {b['total']:.2f}s = commands {b['command']:.2f}s, wait {b['wait']:.2f}s, "
+                f"sleep {b['sleep']:.2f}s, screenshots {b['screenshot']:.2f}s, other {b['other']:.2f}s")
+
+    def top(self, n=15):
+        """
+        Hot spots: time per (page-object method or caller, command/category).
+
+        Args:
+            n: Number of entries
+
+        Returns:
+            List of dicts (caller, operation, category, count, seconds), slowest first
+        """
+        grouped = {}
+        for (_, _, stack, category, leaf), (count, seconds) in self.samples.items():
+            caller = next((label for label in stack if ":" not in label), stack[-1] if stack else "<unknown>")
+            entry = grouped.setdefault((caller, leaf, category), [0, 0.0])
+            entry[0] += count
+            entry[1] += seconds
+        ranked = sorted(grouped.items(), key=lambda kv: -kv[1][1])[:n]
+        return [{"caller": caller, "operation": leaf, "category": category, "count": count, "seconds": seconds}
+                for (caller, leaf, category), (count, seconds) in ranked]
+
+    def folded_stacks(self):
+        """
+        Collapsed stack lines ("frame;frame;leaf value"), values in microseconds.
+
+        Returns:
+            List of strings
+        """
+        folded = {}
+        for (test, phase, stack, category, leaf), (_, seconds) in self.samples.items():
+            frames = [test, phase, *stack, f"{leaf} [{category}]"]
+            line = ";".join(frame.replace(";", ",").replace(" ", "_") for frame in frames)
+            folded[line] = folded.get(line, 0) + int(seconds * 1_000_000)
+        return [f"{line} {value}" for line, value in sorted(folded.items()) if value > 0]
+
+    def format_top(self, n=15):
+        """
+        Format the top-N table for the terminal.
+
+        Returns:
+            Multi-line string
+        """
+        lines = [f"{'seconds':>9} {'count':>6}  {'category':<10} {'caller':<40} operation"]
+        for row in self.top(n):
+            lines.append(f"{row['seconds']:>9.2f} {row['count']:>6}  {row['category']:<10} "
+                         f"{row['caller']:<40} {row['operation']}")
+        return "\n".join(lines)
+
+    def html_top(self, n=15):
+        """
+        Top-N table as HTML for the pytest-html summary.
+
+        Returns:
+            HTML string
+        """
+        rows = "".join(
+            f"<tr><td>{row['seconds']:.2f}</td><td>{row['count']}</td><td>{row['category']}</td>"
+            f"<td>{html.escape(row['caller'])}</td><td>{html.escape(row['operation'])}</td></tr>"
+            for row in self.top(n))
+        return (f"<h2>WebDriver profile (top {n})</h2><table>"
+                "<tr><th>Seconds</th><th>Count</th><th>Category</th><th>Caller</th><th>Operation</th></tr>"
+                f"{rows}</table>")
+
+    def save(self, n=15):
+        """
+        Write the folded stacks and JSON summary.
+
+        Returns:
+            Tuple of (folded path, json path)
+        """
+        PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        timestamp = time.strftime('%Y%m%d_%H%M%S')
+        folded_path = PROFILE_DIR / f"profile_{timestamp}.folded"
+        json_path = PROFILE_DIR / f"profile_{timestamp}.json"
+        folded_path.write_text("\n".join(self.folded_stacks()) + "\n", encoding="utf-8")
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "tests": {nodeid: self.test_breakdown(nodeid) for nodeid in self.phase_durations},
+                "top": self.top(n),
+            }, f, indent=1)
+        return folded_path, json_path
+
+
+def _walk(frame):
+    """Iterate a frame and its callers."""
+    while frame is not None:
+        yield frame
+        frame = frame.f_back
@@ -1,6 +1,3 @@
-import cv2
-import numpy as np
-import mss
 import threading
 import time
 from pathlib import Path
@@ -48,6 +45,11 @@ class ScreenRecorder:
         
     def _record(self):
         """Internal recording loop."""
+        # Heavy imports deferred until a recording actually starts
+        import cv2
+        import numpy as np
+        import mss
+
         self.sct = mss.mss()
         monitor = self.sct.monitors[1]  # Primary monitor
         
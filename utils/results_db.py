@@ -0,0 +1,311 @@
+"""
+Queryable SQLite results store (artifacts/results/results.db).
+
+Every pytest session streams its results into an indexed SQLite database:
+one row per run and one per test (node id, markers, environment, setup /
+call / teardown durations, outcome, retry count, artifact paths). Rows are
+buffered and written in batches, in WAL mode so parallel workers can write
+to the same database.
+
+Usage:
+    python -m utils.results_db runs                        # latest runs
+    python -m utils.results_db slowest -n 10 --days 7      # slowest tests
+    python -m utils.results_db trend test_login --days 90  # per-day duration and failures
+    python -m utils.results_db regressions --days 7 --baseline-days 30
+"""
+import argparse
+import json
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+DB_PATH = Path(__file__).parent.parent / "artifacts" / "results" / "results.db"
+
+BATCH_SIZE = 50  # test rows per write transaction
+
+# Markers that say nothing about the test itself
+IGNORED_MARKERS = {"parametrize", "usefixtures", "filterwarnings"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id TEXT PRIMARY KEY,
+    started REAL NOT NULL,
+    finished REAL,
+    environment TEXT,
+    exitstatus INTEGER,
+    tests INTEGER,
+    failed INTEGER
+);
+CREATE TABLE IF NOT EXISTS tests (
+    run_id TEXT NOT NULL,
+    nodeid TEXT NOT NULL,
+    started REAL NOT NULL,
+    environment TEXT,
+    markers TEXT,
+    outcome TEXT NOT NULL,
+    setup REAL,
+    call REAL,
+    teardown REAL,
+    duration REAL,
+    retries INTEGER NOT NULL DEFAULT 0,
+    artifacts TEXT
+);
+CREATE INDEX IF NOT EXISTS tests_by_time ON tests (started, nodeid, duration, outcome);
+CREATE INDEX IF NOT EXISTS tests_by_nodeid ON tests (nodeid, started);
+CREATE INDEX IF NOT EXISTS tests_by_run ON tests (run_id);
+CREATE INDEX IF NOT EXISTS runs_by_time ON runs (started);
+"""
+
+
+def connect(path=DB_PATH):
+    """
+    Open the results database, creating the schema if needed.
+
+    Args:
+        path: Database file
+
+    Returns:
+        sqlite3.Connection
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(path, timeout=30)
+    connection.row_factory = sqlite3.Row
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def marker_names(item):
+    """
+    Marker names recorded for a test.
+
+    Args:
+        item: pytest Item
+
+    Returns:
+        Sorted list of names
+    """
+    return sorted({marker.name for marker in item.iter_markers()} - IGNORED_MARKERS)
+
+
+class ResultsWriter:
+    """Collects the phases of each test and writes finished tests in batches."""
+
+    def __init__(self, run_id, environment, path=DB_PATH, batch_size=BATCH_SIZE):
+        """
+        Initialize results writer and record the run start.
+
+        Args:
+            run_id: Run id (shared with the artifact index)
+            environment: Environment name
+            path: Database file
+            batch_size: Tests buffered before a write
+        """
+        self.run_id = run_id
+        self.environment = environment
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.pending = {}  # nodeid -> test row being assembled
+        self.buffer = []
+        self.written = 0
+        self.connection = connect(self.path)
+        with self.connection as connection:
+            connection.execute("INSERT OR IGNORE INTO runs (id, started, environment) VALUES (?, ?, ?)",
+                               (run_id, time.time(), environment))
+
+    def record(self, nodeid, phase, outcome, duration, markers=(), retries=0, artifacts=()):
+        """
+        Record one test phase; the test is queued once its teardown is reported.
+
+        Args:
+            nodeid: Test node id
+            phase: "setup", "call" or "teardown"
+            outcome: "passed", "failed" or "skipped"
+            duration: Phase duration in seconds
+            markers: Marker names of the test
+            retries: Retry attempts beyond the first
+            artifacts: Artifact paths of this phase
+        """
+        row = self.pending.setdefault(nodeid, {
+            "nodeid": nodeid, "started": time.time() - duration, "markers": sorted(set(markers)),
+            "outcome": "passed", "setup": None, "call": None, "teardown": None, "retries": 0, "artifacts": []})
+        row[phase] = duration
+        row["retries"] = max(row["retries"], retries)
+        row["artifacts"].extend(str(a) for a in artifacts)
+        if outcome == "failed":
+            row["outcome"] = "failed" if phase == "call" else "error"
+        elif outcome == "skipped" and row["outcome"] == "passed":
+            row["outcome"] = "skipped"
+        if phase == "teardown":
+            self.buffer.append(self.pending.pop(nodeid))
+            if len(self.buffer) >= self.batch_size:
+                self.flush()
+
+    def flush(self):
+        """Write buffered tests in one transaction."""
+        if not self.buffer:
+            return
+        rows = [(self.run_id, r["nodeid"], r["started"], self.environment, ",".join(r["markers"]), r["outcome"],
+                 r["setup"], r["call"], r["teardown"],
+                 sum(r[p] or 0.0 for p in ("setup", "call", "teardown")), r["retries"],
+                 json.dumps(r["artifacts"]) if r["artifacts"] else None)
+                for r in self.buffer]
+        with self.connection as connection:
+            connection.executemany("INSERT INTO tests VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        self.written += len(rows)
+        self.buffer = []
+
+    def finish(self, exitstatus):
+        """
+        Flush remaining tests and record the run totals.
+
+        Args:
+            exitstatus: pytest exit status
+        """
+        # Tests interrupted before their teardown report
+        self.buffer.extend(self.pending.values())
+        self.pending = {}
+        self.flush()
+        with self.connection as connection:
+            # Parallel workers share the run id: totals come from all their rows
+            connection.execute(
+                "UPDATE runs SET finished = ?, exitstatus = MAX(COALESCE(exitstatus, 0), ?),"
+                " tests = (SELECT COUNT(*) FROM tests WHERE run_id = ?),"
+                " failed = (SELECT COUNT(*) FROM tests WHERE run_id = ? AND outcome IN ('failed', 'error'))"
+                " WHERE id = ?",
+                (time.time(), int(exitstatus), self.run_id, self.run_id, self.run_id))
+        self.connection.close()
+
+
+# --- Queries ---
+
+def _since(days, now=None):
+    return (time.time() if now is None else now) - days * 86400
+
+
+def latest_runs(connection, limit=10):
+    """
+    Latest runs, newest first.
+
+    Returns:
+        List of sqlite3.Row (id, started, finished, environment, exitstatus, tests, failed)
+    """
+    return connection.execute("SELECT * FROM runs ORDER BY started DESC LIMIT ?", (limit,)).fetchall()
+
+
+def slowest(connection, limit=10, days=7, now=None):
+    """
+    Tests with the highest average duration.
+
+    Args:
+        connection: Results database connection
+        limit: Number of tests
+        days: Look-back window
+        now: Current time (time.time() if None)
+
+    Returns:
+        List of sqlite3.Row (nodeid, runs, avg, max)
+    """
+    return connection.execute(
+        "SELECT nodeid, COUNT(*) AS runs, AVG(duration) AS avg, MAX(duration) AS max FROM tests"
+        " WHERE started >= ? AND outcome != 'skipped' GROUP BY nodeid ORDER BY avg DESC LIMIT ?",
+        (_since(days, now), limit)).fetchall()
+
+
+def trend(connection, nodeid, days=30, now=None):
+    """
+    Per-day average duration and failures of tests matching a node id.
+
+    Args:
+        connection: Results database connection
+        nodeid: Node id, or a substring of it
+        days: Look-back window
+        now: Current time (time.time() if None)
+
+    Returns:
+        List of sqlite3.Row (day, runs, avg, failed)
+    """
+    exact = connection.execute("SELECT 1 FROM tests WHERE nodeid = ? LIMIT 1", (nodeid,)).fetchone()
+    condition, value = ("nodeid = ?", nodeid) if exact else ("nodeid LIKE ?", f"%{nodeid}%")
+    return connection.execute(
+        "SELECT date(started, 'unixepoch', 'localtime') AS day, COUNT(*) AS runs, AVG(duration) AS avg,"
+        " SUM(outcome IN ('failed', 'error')) AS failed FROM tests"
+        f" WHERE {condition} AND started >= ? AND outcome != 'skipped' GROUP BY day ORDER BY day",
+        (value, _since(days, now))).fetchall()
+
+
+def regressions(connection, days=7, baseline_days=30, threshold=1.5, min_runs=3, now=None):
+    """
+    Tests that got slower or started failing compared to a baseline window.
+
+    Args:
+        connection: Results database connection
+        days: Recent window
+        baseline_days: Baseline window before the recent one
+        threshold: Recent/baseline average duration ratio counted as slower
+        min_runs: Runs needed in each window
+        now: Current time (time.time() if None)
+
+    Returns:
+        List of sqlite3.Row (nodeid, baseline, recent, ratio, baseline_fail_rate, recent_fail_rate), worst first;
+        ratio is None (listed first) when the baseline average is 0
+    """
+    recent_start = _since(days, now)
+    baseline_start = _since(days + baseline_days, now)
+    return connection.execute(
+        "WITH windows AS ("
+        "  SELECT nodeid, started >= ? AS recent, COUNT(*) AS runs, AVG(duration) AS avg,"
+        "         AVG(outcome IN ('failed', 'error')) AS fail_rate"
+        "  FROM tests WHERE started >= ? AND outcome != 'skipped' GROUP BY nodeid, recent)"
+        " SELECT b.nodeid, b.avg AS baseline, r.avg AS recent, r.avg / NULLIF(b.avg, 0) AS ratio,"
+        "        b.fail_rate AS baseline_fail_rate, r.fail_rate AS recent_fail_rate"
+        " FROM windows b JOIN windows r ON r.nodeid = b.nodeid AND r.recent = 1 AND b.recent = 0"
+        " WHERE b.runs >= ? AND r.runs >= ?"
+        "   AND (r.avg > b.avg * ? OR r.fail_rate > b.fail_rate + 0.2)"
+        " ORDER BY ratio IS NOT NULL, ratio DESC",
+        (recent_start, baseline_start, min_runs, min_runs, threshold)).fetchall()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query the test results database")
+    parser.add_argument("--db", default=str(DB_PATH), help="Database file")
+    commands = parser.add_subparsers(dest="command", required=True)
+    runs = commands.add_parser("runs", help="Latest runs")
+    runs.add_argument("-n", type=int, default=10)
+    slow = commands.add_parser("slowest", help="Slowest tests by average duration")
+    slow.add_argument("-n", type=int, default=10)
+    slow.add_argument("--days", type=float, default=7)
+    history = commands.add_parser("trend", help="Per-day duration and failures of a test")
+    history.add_argument("nodeid", help="Node id or part of it")
+    history.add_argument("--days", type=float, default=30)
+    regressed = commands.add_parser("regressions", help="Tests slower or failing more than in the baseline")
+    regressed.add_argument("--days", type=float, default=7, help="Recent window")
+    regressed.add_argument("--baseline-days", type=float, default=30, help="Baseline window before it")
+    regressed.add_argument("--threshold", type=float, default=1.5, help="Slowdown ratio")
+    args = parser.parse_args(argv)
+
+    connection = connect(args.db)
+    if args.command == "runs":
+        for row in latest_runs(connection, args.n):
+            print(f"{row['id']:<28} {time.strftime('%Y-%m-%d %H:%M', time.localtime(row['started']))}"
+                  f"  {row['environment'] or '-':<8} {row['tests'] or 0:>5} tests {row['failed'] or 0:>4} failed"
+                  f"  exit {row['exitstatus'] if row['exitstatus'] is not None else '-'}")
+    elif args.command == "slowest":
+        for row in slowest(connection, args.n, args.days):
+            print(f"{row['avg']:8.2f}s avg {row['max']:8.2f}s max {row['runs']:>5} runs  {row['nodeid']}")
+    elif args.command == "trend":
+        for row in trend(connection, args.nodeid, args.days):
+            print(f"{row['day']}  {row['avg']:8.2f}s avg {row['runs']:>5} runs {row['failed']:>4} failed")
+    else:
+        for row in regressions(connection, args.days, args.baseline_days, args.threshold):
+            ratio = f"x{row['ratio']:.2f}" if row['ratio'] is not None else "x-"
+            print(f"{ratio}  {row['baseline']:.2f}s -> {row['recent']:.2f}s"
+                  f"  fail {row['baseline_fail_rate']:.0%} -> {row['recent_fail_rate']:.0%}  {row['nodeid']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,266 @@
+"""
+Duration-aware test scheduling and sharding.
+
+Keeps a historical duration store per test node id (updated after every run)
+and uses it to split the suite into N balanced shards with the
+longest-processing-time-first (LPT) heuristic. Within a shard, tests that
+share a browser fixture run together (plain tests, then `driver`, then
+`logged_in_driver`) to maximise browser and session reuse.
+
+Every shard of a run must cut its split from the same estimates, so
+sharding reads durations only from a shared store (--durations-file or
+SHARD_DURATIONS_FILE; e.g. committed to the repo or fetched from CI
+storage). Without one, shards are split from the fixture-group defaults,
+which is deterministic but not duration-balanced. The per-machine store in
+artifacts/durations/ is still updated after every run and used for
+--group-fixtures ordering; merge the stores of all shards to refresh the
+shared one.
+
+Usage:
+    pytest --shard-count=4 --shard-index=0 --durations-file=ci/durations.json
+    pytest --group-fixtures                    # only reorder, no sharding
+    python -m utils.scheduler merge ci/durations.json shard0.json shard1.json ...
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+from pathlib import Path
+
+DURATIONS_PATH = Path(__file__).parent.parent / "artifacts" / "durations" / "durations.json"
+
+# Shared duration store for sharding (same file on every CI machine)
+DURATIONS_ENV = "SHARD_DURATIONS_FILE"
+
+# Weight of the latest run in the moving average
+EWMA_ALPHA = 0.3
+
+# Fixture groups in run order; a test belongs to the first group it uses
+FIXTURE_GROUPS = ["logged_in_driver", "driver"]
+NO_FIXTURE_GROUP = "none"
+GROUP_ORDER = [NO_FIXTURE_GROUP, "driver", "logged_in_driver"]
+
+# Estimates (seconds) for tests without history in their group
+DEFAULT_DURATIONS = {
+    "logged_in_driver": 20.0,
+    "driver": 10.0,
+    NO_FIXTURE_GROUP: 0.1,
+}
+
+
+class DurationStore:
+    """Historical test durations, keyed by node id."""
+
+    def __init__(self, path=DURATIONS_PATH):
+        """
+        Initialize duration store.
+
+        Args:
+            path: Path to the JSON store
+        """
+        self.path = Path(path)
+        self.durations = {}
+        self.load()
+
+    def load(self):
+        """Load durations from disk (empty store if missing or unreadable)."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.durations = json.load(f)
+        except (OSError, ValueError):
+            self.durations = {}
+
+    def save(self):
+        """Save durations to disk."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.durations, f, indent=1, sort_keys=True)
+        tmp_path.replace(self.path)
+
+    def update(self, nodeid, duration):
+        """
+        Record a new duration for a test.
+
+        Args:
+            nodeid: Test node id
+            duration: Total duration in seconds (setup + call + teardown)
+        """
+        entry = self.durations.get(nodeid)
+        if entry is None:
+            self.durations[nodeid] = {"avg": duration, "last": duration, "runs": 1}
+        else:
+            entry["avg"] = EWMA_ALPHA * duration + (1 - EWMA_ALPHA) * entry["avg"]
+            entry["last"] = duration
+            entry["runs"] += 1
+
+    def get(self, nodeid):
+        """
+        Get the average duration of a test.
+
+        Args:
+            nodeid: Test node id
+
+        Returns:
+            Average duration in seconds, or None if never recorded
+        """
+        entry = self.durations.get(nodeid)
+        return entry["avg"] if entry else None
+
+
+def fixture_group(fixturenames):
+    """
+    Get the browser fixture group of a test.
+
+    Args:
+        fixturenames: Fixture names the test uses
+
+    Returns:
+        Group name ("logged_in_driver", "driver" or "none")
+    """
+    for group in FIXTURE_GROUPS:
+        if group in fixturenames:
+            return group
+    return NO_FIXTURE_GROUP
+
+
+def estimate_durations(tests, store):
+    """
+    Estimate the duration of each test.
+
+    Tests without history get the median of known tests in the same fixture
+    group, or a default for that group.
+
+    Args:
+        tests: List of (nodeid, group) tuples
+        store: DurationStore (None: group defaults only)
+
+    Returns:
+        Dict of nodeid -> estimated seconds
+    """
+    if store is None:
+        return {nodeid: DEFAULT_DURATIONS[group] for nodeid, group in tests}
+    known_by_group = {}
+    for nodeid, group in tests:
+        duration = store.get(nodeid)
+        if duration is not None:
+            known_by_group.setdefault(group, []).append(duration)
+
+    estimates = {}
+    for nodeid, group in tests:
+        duration = store.get(nodeid)
+        if duration is None:
+            known = known_by_group.get(group)
+            duration = statistics.median(known) if known else DEFAULT_DURATIONS[group]
+        estimates[nodeid] = duration
+    return estimates
+
+
+def order_by_group(tests, estimates, last=()):
+    """
+    Order tests so that those sharing a fixture group run together.
+
+    Within a group, longer tests run first. Tests in `last` (e.g. known
+    flaky tests) are moved to the end of the run.
+
+    Args:
+        tests: List of (nodeid, group) tuples
+        estimates: Dict of nodeid -> seconds
+        last: Node ids to schedule after everything else
+
+    Returns:
+        Ordered list of node ids
+    """
+    last = set(last)
+
+    def key(test):
+        nodeid, group = test
+        return (nodeid in last, GROUP_ORDER.index(group), -estimates[nodeid], nodeid)
+
+    return [nodeid for nodeid, _ in sorted(tests, key=key)]
+
+
+def split_shards(tests, estimates, shard_count):
+    """
+    Split tests into balanced shards (longest-processing-time-first).
+
+    Args:
+        tests: List of (nodeid, group) tuples
+        estimates: Dict of nodeid -> seconds
+        shard_count: Number of shards
+
+    Returns:
+        List of shards, each a list of (nodeid, group) tuples
+    """
+    shards = [[] for _ in range(shard_count)]
+    loads = [0.0] * shard_count
+    for test in sorted(tests, key=lambda t: (-estimates[t[0]], t[0])):
+        # Least-loaded shard; ties go to the shard already running this group
+        target = min(range(shard_count),
+                     key=lambda i: (loads[i], test[1] not in {g for _, g in shards[i]}, i))
+        shards[target].append(test)
+        loads[target] += estimates[test[0]]
+    return shards
+
+
+def plan(tests, store, shard_count=1, shard_index=0, last=()):
+    """
+    Plan the tests one shard should run, in run order.
+
+    Args:
+        tests: List of (nodeid, group) tuples
+        store: DurationStore shared by all shards (None: group defaults only)
+        shard_count: Number of shards
+        shard_index: Index of this shard (0-based)
+        last: Node ids to schedule last within the shard
+
+    Returns:
+        Tuple of (ordered node ids, estimated shard duration in seconds)
+    """
+    if not 0 <= shard_index < shard_count:
+        raise ValueError(f"shard index {shard_index} out of range for {shard_count} shards")
+    estimates = estimate_durations(tests, store)
+    shard = split_shards(tests, estimates, shard_count)[shard_index]
+    ordered = order_by_group(shard, estimates, last)
+    return ordered, sum(estimates[nodeid] for nodeid in ordered)
+
+
+def merge_stores(target, sources):
+    """
+    Merge duration stores, e.g. those of all shards of a CI run.
+
+    Args:
+        target: DurationStore updated in place (not saved)
+        sources: DurationStores; for a test in several, the one with most runs wins
+
+    Returns:
+        Number of tests taken from the sources
+    """
+    taken = 0
+    for source in sources:
+        for nodeid, entry in source.durations.items():
+            current = target.durations.get(nodeid)
+            if current is None or entry["runs"] >= current["runs"]:
+                target.durations[nodeid] = dict(entry)
+                taken += 1
+    return taken
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Maintain the shared duration store used for sharding")
+    commands = parser.add_subparsers(dest="command", required=True)
+    merge = commands.add_parser("merge", help="Merge duration stores into a shared one")
+    merge.add_argument("target", help="Shared store (created if missing)")
+    merge.add_argument("sources", nargs="+", help="Stores to merge (e.g. artifacts/durations/durations.json of each shard)")
+    args = parser.parse_args(argv)
+
+    target = DurationStore(args.target)
+    taken = merge_stores(target, [DurationStore(path) for path in args.sources])
+    target.save()
+    print(f"{taken} test durations merged into {args.target} ({len(target.durations)} tests)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,392 @@
+"""
+Soak mode: repeat a journey on one browser for hours and watch resource growth.
+
+App-side leaks (detached DOM trees, listeners added on every visit,
+growing caches) only show after many repetitions in the same browser.
+run_soak() repeats an iteration callable (a test function under
+`pytest --soak`, or a page-object flow from FLOWS on the command line)
+until a duration or iteration count is reached, and samples after each
+iteration:
+
+    js_heap_mb   JS heap in use        (CDP Performance.getMetrics)
+    nodes        live DOM nodes        (same call)
+    listeners    JS event listeners    (same call)
+    rss_mb       resident memory of the browser and all its child
+                 processes (/proc, Linux only)
+    duration     iteration wall time
+
+Sampling costs one CDP round trip plus reading /proc stat files, a few
+milliseconds, taken between iterations so it never lands in the measured
+journey; no garbage collection is forced. Samples are appended to a CSV
+file as they are taken (artifacts/soak/), so a run killed after hours
+still leaves its series.
+
+detect_growth() flags sustained growth: after a warm-up share of the
+samples, the series is split into buckets, and a metric is flagged when
+every bucket median is at least the previous one and the last exceeds the
+first by more than its threshold. One-off spikes and sawtooth GC patterns
+do not trip it.
+
+Usage:
+    python -m utils.soak --flow dashboard --flow relogin --duration 2h
+    python -m utils.soak --flow dashboard --iterations 500 --base-url http://127.0.0.1:8000
+    pytest tests/test_pom_example.py -k dashboard --soak 1h
+"""
+import argparse
+import csv
+import os
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+SOAK_DIR = Path(__file__).parent.parent / "artifacts" / "soak"
+
+METRICS = ("js_heap_mb", "nodes", "listeners", "rss_mb", "duration")
+
+# Relative growth (last bucket median / first - 1) flagged per metric
+DEFAULT_THRESHOLDS = {"js_heap_mb": 0.1, "nodes": 0.1, "listeners": 0.1, "rss_mb": 0.1, "duration": 0.25}
+DEFAULT_BUCKETS = 5
+DEFAULT_WARMUP = 0.1  # share of samples ignored while caches fill up
+MIN_SAMPLES = 20  # fewer samples are not analysed
+
+_DURATION = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([smhd]?)\s*$")
+_UNITS = {"": 1, "s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_duration(text):
+    """
+    Parse a duration like "90", "30m", "2h" or "1.5d".
+
+    Args:
+        text: Duration string (plain numbers are seconds)
+
+    Returns:
+        Seconds as float
+    """
+    match = _DURATION.match(str(text))
+    if not match:
+        raise ValueError(f"Invalid duration {text!r} (use e.g. 90, 30m, 2h)")
+    return float(match.group(1)) * _UNITS[match.group(2)]
+
+
+def _thresholds():
+    try:
+        from config import SOAK_GROWTH_THRESHOLDS
+    except ImportError:
+        return DEFAULT_THRESHOLDS
+    return {**DEFAULT_THRESHOLDS, **SOAK_GROWTH_THRESHOLDS}
+
+
+# --- Sampling ---
+
+def _proc_children():
+    """Map of parent pid -> child pids from /proc."""
+    children = {}
+    for entry in os.scandir("/proc"):
+        if not entry.name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry.name}/stat", "rb") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # The command name may contain spaces/parentheses: fields start after the last ")"
+        ppid = int(stat[stat.rindex(b")") + 2:].split()[1])
+        children.setdefault(ppid, []).append(int(entry.name))
+    return children
+
+
+def process_tree_rss_mb(pid):
+    """
+    Resident memory of a process and all its descendants.
+
+    Args:
+        pid: Root process id
+
+    Returns:
+        Megabytes, or None if /proc is unavailable or the process is gone
+    """
+    try:
+        children = _proc_children()
+    except OSError:
+        return None
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    total, stack = 0, [pid]
+    while stack:
+        current = stack.pop()
+        try:
+            with open(f"/proc/{current}/statm") as f:
+                total += int(f.read().split()[1]) * page_size
+        except (OSError, ValueError, IndexError):
+            if current == pid:
+                return None
+            continue
+        stack.extend(children.get(current, ()))
+    return total / (1024 * 1024)
+
+
+def find_browser_pid(user_data_dir):
+    """
+    Find the main Chrome process started with a given profile directory.
+
+    Args:
+        user_data_dir: --user-data-dir of the browser (capabilities["chrome"]["userDataDir"])
+
+    Returns:
+        Pid, or None
+    """
+    if not user_data_dir or not os.path.isdir("/proc"):
+        return None
+    flag = f"--user-data-dir={user_data_dir}".encode()
+    for entry in os.scandir("/proc"):
+        if not entry.name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry.name}/cmdline", "rb") as f:
+                arguments = f.read().split(b"\0")
+        except OSError:
+            continue
+        # Child processes (renderer, gpu, ...) carry --type=
+        if flag in arguments and not any(a.startswith(b"--type=") for a in arguments):
+            return int(entry.name)
+    return None
+
+
+class ResourceSampler:
+    """Cheap per-iteration readings of one browser's memory, DOM and listener counts."""
+
+    def __init__(self, driver):
+        """
+        Initialize sampler.
+
+        Args:
+            driver: WebDriver instance (heap/DOM/listener readings need Chromium's CDP)
+        """
+        self.driver = driver
+        self.cdp = hasattr(driver, "execute_cdp_cmd")
+        if self.cdp:
+            try:
+                driver.execute_cdp_cmd("Performance.enable", {})
+            except Exception:
+                self.cdp = False
+        try:
+            user_data_dir = (driver.capabilities.get("chrome") or {}).get("userDataDir")
+        except Exception:
+            user_data_dir = None
+        self.browser_pid = find_browser_pid(user_data_dir)
+
+    def sample(self):
+        """
+        Take one reading.
+
+        Returns:
+            Dict of js_heap_mb, nodes, listeners, rss_mb (None where unavailable)
+        """
+        reading = {"js_heap_mb": None, "nodes": None, "listeners": None, "rss_mb": None}
+        if self.cdp:
+            try:
+                metrics = {m["name"]: m["value"] for m in
+                           self.driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]}
+                reading["js_heap_mb"] = round(metrics.get("JSHeapUsedSize", 0) / (1024 * 1024), 3)
+                reading["nodes"] = metrics.get("Nodes")
+                reading["listeners"] = metrics.get("JSEventListeners")
+            except Exception:
+                pass
+        if self.browser_pid is not None:
+            rss = process_tree_rss_mb(self.browser_pid)
+            reading["rss_mb"] = None if rss is None else round(rss, 1)
+        return reading
+
+
+# --- Analysis ---
+
+def detect_growth(series, thresholds=None, buckets=DEFAULT_BUCKETS, warmup=DEFAULT_WARMUP):
+    """
+    Flag metrics whose level keeps rising over the run.
+
+    Args:
+        series: Dict of metric -> list of values (None values are ignored)
+        thresholds: Dict of metric -> relative growth flagged (config/defaults if None)
+        buckets: Number of consecutive windows compared
+        warmup: Share of leading samples ignored
+
+    Returns:
+        Dict of metric -> {"first", "last", "growth"} for flagged metrics
+    """
+    thresholds = thresholds or _thresholds()
+    flagged = {}
+    for metric, values in series.items():
+        values = [v for v in values if v is not None]
+        values = values[int(len(values) * warmup):]
+        if metric not in thresholds or len(values) < max(MIN_SAMPLES, buckets * 2):
+            continue
+        size = len(values) // buckets
+        medians = [statistics.median(values[i * size:(i + 1) * size]) for i in range(buckets)]
+        rising = all(later >= earlier for earlier, later in zip(medians, medians[1:]))
+        if not rising or medians[0] <= 0:
+            continue
+        growth = medians[-1] / medians[0] - 1
+        if growth > thresholds[metric]:
+            flagged[metric] = {"first": medians[0], "last": medians[-1], "growth": growth}
+    return flagged
+
+
+class SoakResult:
+    """Samples of a soak run and the metrics flagged as growing."""
+
+    def __init__(self, name, path):
+        """
+        Initialize soak result.
+
+        Args:
+            name: Journey name
+            path: CSV time series file
+        """
+        self.name = name
+        self.path = Path(path)
+        self.series = {metric: [] for metric in METRICS}
+        self.iterations = 0
+        self.elapsed = 0.0
+        self.flagged = {}
+
+    def summary(self):
+        """
+        Multi-line summary for the report.
+
+        Returns:
+            String
+        """
+        lines = [f"{self.name}: {self.iterations} iterations in {self.elapsed / 60:.1f} min, samples in {self.path}"]
+        for metric in METRICS:
+            values = [v for v in self.series[metric] if v is not None]
+            if values:
+                lines.append(f"  {metric:<11} {values[0]:>10.2f} -> {values[-1]:>10.2f}  (max {max(values):.2f})")
+        for metric, growth in self.flagged.items():
+            lines.append(f"  GROWTH {metric}: {growth['first']:.2f} -> {growth['last']:.2f} "
+                         f"(+{growth['growth']:.0%}, rising in every window)")
+        return "\n".join(lines)
+
+
+def run_soak(name, iteration, sampler, duration=None, iterations=None, reset=None, directory=SOAK_DIR,
+             clock=time.monotonic):
+    """
+    Repeat an iteration on one browser, sampling resources after each one.
+
+    Args:
+        name: Journey name (file name prefix)
+        iteration: Callable running the journey once
+        sampler: ResourceSampler (or any object with sample())
+        duration: Seconds to keep going (None: only the iteration count limits)
+        iterations: Maximum iterations (None: only the duration limits)
+        reset: Callable run between iterations (e.g. reset_page_state)
+        directory: Output directory for the CSV time series
+        clock: Monotonic clock (injectable for tests)
+
+    Returns:
+        SoakResult (flagged is empty if nothing grew)
+    """
+    if duration is None and iterations is None:
+        raise ValueError("A soak run needs a duration or an iteration count")
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    safe_name = re.sub(r"[^A-Za-z0-9_.-]+", "_", name)
+    result = SoakResult(name, directory / f"{safe_name}_{time.strftime('%Y%m%d_%H%M%S')}.csv")
+    start = clock()
+    with open(result.path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(("iteration", "elapsed", *METRICS))
+        while (iterations is None or result.iterations < iterations) and \
+                (duration is None or clock() - start < duration):
+            if result.iterations and reset is not None:
+                reset()
+            began = clock()
+            iteration()
+            took = clock() - began
+            reading = sampler.sample()
+            reading["duration"] = round(took, 3)
+            result.iterations += 1
+            result.elapsed = clock() - start
+            for metric in METRICS:
+                result.series[metric].append(reading.get(metric))
+            writer.writerow((result.iterations, round(result.elapsed, 1),
+                             *("" if reading.get(m) is None else reading[m] for m in METRICS)))
+            f.flush()
+    result.flagged = detect_growth(result.series)
+    return result
+
+
+# --- Page-object flows (command line) ---
+
+def _flow_dashboard(driver, base_url, user):
+    from page_objects.dashboard_page import DashboardPage
+
+    page = DashboardPage(driver, base_url)
+    page.navigate_to_dashboard()
+    page.wait_until_ready()
+
+
+def _flow_relogin(driver, base_url, user):
+    from page_objects.dashboard_page import DashboardPage
+    from page_objects.login_page import LoginPage
+
+    DashboardPage(driver, base_url).logout()
+    LoginPage(driver, base_url).login(user["email"], user["password"])
+    DashboardPage(driver, base_url).wait_until_ready()
+
+
+# name -> callable(driver, base_url, user); run in the given order per iteration
+FLOWS = {
+    "dashboard": _flow_dashboard,
+    "relogin": _flow_relogin,
+}
+
+
+def _start_browser(headed):
+    from selenium import webdriver
+
+    options = webdriver.ChromeOptions()
+    options.add_argument("--start-maximized")
+    if not headed:
+        options.add_argument("--headless=new")
+    return webdriver.Chrome(options=options)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Repeat page-object flows on one browser and track resource growth")
+    parser.add_argument("--flow", action="append", choices=sorted(FLOWS), required=True,
+                        help="Flow run per iteration (repeat for several, run in order)")
+    parser.add_argument("--duration", type=parse_duration, default=None, help="e.g. 30m, 2h")
+    parser.add_argument("--iterations", type=int, default=None, help="Maximum iterations")
+    parser.add_argument("--base-url", default=None, help="Application URL (config.BASE_URL if omitted)")
+    parser.add_argument("--user", default="valid_user", help="Key of tests/test_data.TEST_USERS")
+    parser.add_argument("--headed", action="store_true", help="Show the browser window")
+    args = parser.parse_args(argv)
+    if args.duration is None and args.iterations is None:
+        parser.error("give --duration and/or --iterations")
+
+    from config import BASE_URL
+    from page_objects.login_page import LoginPage
+    from tests.test_data import TEST_USERS
+
+    base_url = args.base_url or BASE_URL
+    user = TEST_USERS[args.user]
+    driver = _start_browser(args.headed)
+    try:
+        LoginPage(driver, base_url).login(user["email"], user["password"])
+        flows = [FLOWS[name] for name in args.flow]
+
+        def iteration():
+            for flow in flows:
+                flow(driver, base_url, user)
+
+        result = run_soak("+".join(args.flow), iteration, ResourceSampler(driver), args.duration, args.iterations)
+    finally:
+        driver.quit()
+    print(result.summary())
+    return 1 if result.flagged else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
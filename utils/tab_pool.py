@@ -0,0 +1,165 @@
+"""
+Tab-pool mode: run read-only tests in tabs of one shared, logged-in browser.
+
+Instead of a browser process (and a login) per test, tests marked
+`@pytest.mark.tab_pool` get a fresh tab of a session-wide browser
+(`pytest --tab-pool=tab`), or a fresh tab in its own browser context with
+an isolated cookie jar and storage (`--tab-pool=context`, Chrome only).
+
+The pool keeps the window-handle bookkeeping: which test owns which tab,
+which extra windows/popups a test opened, and closes all of them when the
+test ends so the next test starts from a clean tab. The shared browser's
+first window stays open (on about:blank) so the browser never exits.
+"""
+ISOLATION_MODES = ("tab", "context")
+
+
+class TabLease:
+    """A tab handed out to one test."""
+
+    def __init__(self, pool, nodeid, handle, context_id=None):
+        """
+        Initialize tab lease.
+
+        Args:
+            pool: Owning TabPool
+            nodeid: Test node id
+            handle: Window handle of the test's tab
+            context_id: Browser context id (context isolation only)
+        """
+        self.pool = pool
+        self.nodeid = nodeid
+        self.handle = handle
+        self.context_id = context_id
+        self.sequence = pool.leased
+        self.extra_windows = []
+
+    def extra_handles(self):
+        """
+        Windows opened by the test besides its own tab.
+
+        Returns:
+            List of window handles
+        """
+        driver = self.pool.driver
+        known = {self.pool.home_handle, self.handle}
+        return [handle for handle in driver.window_handles if handle not in known]
+
+    def reset(self, landing_url=None):
+        """
+        Reset the tab between retry attempts, keeping it open.
+
+        Args:
+            landing_url: URL to return to (about:blank if None)
+        """
+        driver = self.pool.driver
+        self.pool._close_windows(self, self.extra_handles())
+        driver.switch_to.window(self.handle)
+        try:
+            driver.switch_to.alert.dismiss()
+        except Exception:
+            pass
+        driver.get(landing_url or "about:blank")
+
+    def describe(self):
+        """
+        Failure attribution text for the report.
+
+        Returns:
+            Multi-line string
+        """
+        lines = [f"tab {self.handle} of shared browser (test #{self.sequence}, isolation: {self.pool.isolation})"]
+        if self.context_id:
+            lines.append(f"browser context {self.context_id}")
+        for handle in self.extra_windows + self.extra_handles():
+            lines.append(f"window opened by this test: {handle}")
+        return "\n".join(lines)
+
+
+class TabPool:
+    """Hands out isolated tabs of one shared browser, one test at a time."""
+
+    def __init__(self, driver, isolation="tab", base_url=None, cookies=()):
+        """
+        Initialize tab pool.
+
+        Args:
+            driver: Selenium WebDriver of the shared browser
+            isolation: "tab" (shared cookies/storage) or "context" (isolated)
+            base_url: Application URL the cookies belong to
+            cookies: Session cookies installed in every new browser context
+        """
+        if isolation not in ISOLATION_MODES:
+            raise ValueError(f"isolation must be one of {ISOLATION_MODES}, got {isolation!r}")
+        self.driver = driver
+        self.isolation = isolation
+        self.base_url = base_url
+        self.cookies = list(cookies)
+        self.home_handle = driver.current_window_handle
+        self.leased = 0
+        self.leaked = []  # (nodeid, handle) of windows a test left open
+
+    def acquire(self, nodeid):
+        """
+        Open a fresh tab for a test and switch to it.
+
+        Args:
+            nodeid: Test node id (for attribution)
+
+        Returns:
+            TabLease
+        """
+        self.leased += 1
+        context_id = None
+        if self.isolation == "context":
+            context_id = self.driver.execute_cdp_cmd("Target.createBrowserContext", {})["browserContextId"]
+            # chromedriver uses the DevTools target id as the window handle
+            handle = self.driver.execute_cdp_cmd(
+                "Target.createTarget", {"url": "about:blank", "browserContextId": context_id})["targetId"]
+            self.driver.switch_to.window(handle)
+        else:
+            self.driver.switch_to.new_window("tab")
+            handle = self.driver.current_window_handle
+        if context_id and self.cookies:
+            # A new context starts logged out: reuse the shared session
+            self.driver.get(self.base_url)
+            for cookie in self.cookies:
+                self.driver.add_cookie(cookie)
+        return TabLease(self, nodeid, handle, context_id)
+
+    def summary(self):
+        """
+        One-line summary for the terminal report.
+
+        Returns:
+            String
+        """
+        text = f"{self.leased} test(s) ran in tabs of one shared browser (isolation: {self.isolation})"
+        if self.leaked:
+            text += f"; closed {len(self.leaked)} window(s) left open by: " + ", ".join(
+                sorted({nodeid for nodeid, _ in self.leaked}))
+        return text
+
+    def _close_windows(self, lease, handles):
+        """Close windows a test opened, remembering them for attribution."""
+        for handle in handles:
+            self.driver.switch_to.window(handle)
+            self.driver.close()
+            lease.extra_windows.append(handle)
+            self.leaked.append((lease.nodeid, handle))
+
+    def release(self, lease):
+        """
+        Close a test's tab and every window it opened.
+
+        Args:
+            lease: TabLease from acquire()
+        """
+        handles = self.driver.window_handles
+        self._close_windows(lease, [h for h in handles if h not in (self.home_handle, lease.handle)])
+        if lease.handle in handles:
+            self.driver.switch_to.window(lease.handle)
+            self.driver.close()
+        if lease.context_id:
+            self.driver.execute_cdp_cmd("Target.disposeBrowserContext", {"browserContextId": lease.context_id})
+        self.driver.switch_to.window(self.home_handle)
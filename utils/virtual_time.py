@@ -0,0 +1,128 @@
+"""
+Deterministic virtual-time mode (`pytest --virtual-time`).
+
+Spinner and animation waits spend real seconds on app-side timers
+(setTimeout/setInterval) and CSS transitions. In virtual-time mode the
+driver fixture switches Chrome to a virtual clock that fast-forwards to the
+next pending timer whenever the page is idle (paused while network fetches
+are pending), speeds up Web Animations, and disables CSS transitions and
+animations on every document. The spinner/stability helpers in
+utils/wait_helpers.py and utils/async_wait_helpers.py check
+`is_virtual_time(driver)` and drop their real-time grace periods.
+
+Only Chromium drivers support this (Chrome DevTools Protocol); on other
+browsers enabling the mode is a no-op.
+"""
+import json
+
+# Chrome DevTools Protocol virtual-time policy: fast-forward when idle,
+# but never while the page is still loading resources
+VIRTUAL_TIME_POLICY = "pauseIfNetworkFetchesPending"
+ANIMATION_PLAYBACK_RATE = 100
+
+DISABLE_ANIMATIONS_CSS = (
+    "*, *::before, *::after {"
+    " transition: none !important;"
+    " transition-duration: 0s !important;"
+    " animation-duration: 0s !important;"
+    " animation-delay: 0s !important;"
+    " animation-iteration-count: 1 !important;"
+    " scroll-behavior: auto !important;"
+    " caret-color: transparent !important; }"
+)
+
+# Runs before any page script on every new document
+DISABLE_ANIMATIONS_SCRIPT = """
+(function () {
+  var css = %s;
+  function inject() {
+    if (document.getElementById('__virtual_time_no_animations')) return;
+    var style = document.createElement('style');
+    style.id = '__virtual_time_no_animations';
+    style.textContent = css;
+    (document.head || document.documentElement).appendChild(style);
+  }
+  if (document.documentElement) inject();
+  else document.addEventListener('readystatechange', inject, {once: true});
+})();
+""" % json.dumps(DISABLE_ANIMATIONS_CSS)
+
+
+def virtual_time_commands(animations=False):
+    """
+    DevTools commands that enable virtual-time mode.
+
+    Args:
+        animations: Keep CSS transitions/animations enabled
+
+    Returns:
+        List of (command, params) tuples
+    """
+    commands = [
+        ("Emulation.setVirtualTimePolicy", {"policy": VIRTUAL_TIME_POLICY}),
+        ("Animation.enable", {}),
+        ("Animation.setPlaybackRate", {"playbackRate": ANIMATION_PLAYBACK_RATE}),
+    ]
+    if not animations:
+        commands.append(("Page.addScriptToEvaluateOnNewDocument", {"source": DISABLE_ANIMATIONS_SCRIPT}))
+    return commands
+
+
+def enable_virtual_time(driver, animations=False):
+    """
+    Switch a Chromium driver to virtual time.
+
+    Args:
+        driver: Selenium WebDriver instance
+        animations: Keep CSS transitions/animations enabled
+
+    Returns:
+        True if enabled, False if the driver has no DevTools support
+    """
+    from selenium.common.exceptions import WebDriverException
+
+    if not hasattr(driver, "execute_cdp_cmd"):
+        return False
+    try:
+        for command, params in virtual_time_commands(animations):
+            driver.execute_cdp_cmd(command, params)
+    except WebDriverException:
+        # Non-Chromium browser behind a remote session
+        return False
+    if not animations:
+        # Current document too, not only the next ones
+        driver.execute_script(DISABLE_ANIMATIONS_SCRIPT)
+    driver.virtual_time = True
+    return True
+
+
+async def enable_virtual_time_async(driver, animations=False):
+    """
+    Switch an AsyncWebDriver (Chrome) to virtual time.
+
+    Args:
+        driver: AsyncWebDriver instance
+        animations: Keep CSS transitions/animations enabled
+
+    Returns:
+        True
+    """
+    for command, params in virtual_time_commands(animations):
+        await driver.execute_cdp_cmd(command, params)
+    if not animations:
+        await driver.execute_script(DISABLE_ANIMATIONS_SCRIPT)
+    driver.virtual_time = True
+    return True
+
+
+def is_virtual_time(driver):
+    """
+    Check whether a driver runs in virtual-time mode.
+
+    Args:
+        driver: WebDriver or AsyncWebDriver instance
+
+    Returns:
+        Boolean
+    """
+    return getattr(driver, "virtual_time", False) is True
@@ -1,6 +1,14 @@
+import time
+
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException
+from utils.locators import compile_locator
+from utils.virtual_time import is_virtual_time
+
+# Virtual-time mode: page timers fast-forward, so poll fast and skip grace periods
+VIRTUAL_TIME_POLL = 0.05
+VIRTUAL_TIME_APPEAR_TIMEOUT = 0.25
 
 class CustomWaitHelpers:
     """Custom wait helper functions for common waiting scenarios."""
@@ -209,6 +217,45 @@ class CustomWaitHelpers:
             return True
         except TimeoutException:
             return False
+    
+    def wait_for_all(self, conditions, timeout=None):
+        """
+        Wait until every condition is met, checking them together in one poll loop.
+        
+        Args:
+            conditions: Dict of name -> condition (see wait_for_conditions)
+            timeout: Maximum wait time in seconds for the whole set
+            
+        Returns:
+            WaitResult (truthy if all were met; .met maps name -> seconds until met)
+        """
+        return wait_for_conditions(self.driver, conditions, "all", timeout or self.default_timeout)
+    
+    def wait_for_any(self, conditions, timeout=None):
+        """
+        Wait until at least one condition is met.
+        
+        Args:
+            conditions: Dict of name -> condition (see wait_for_conditions)
+            timeout: Maximum wait time in seconds
+            
+        Returns:
+            WaitResult (truthy if any was met; .met holds every condition met by then)
+        """
+        return wait_for_conditions(self.driver, conditions, "any", timeout or self.default_timeout)
+    
+    def wait_for_first(self, conditions, timeout=None):
+        """
+        Wait for whichever condition is met first (e.g. success vs. error message).
+        
+        Args:
+            conditions: Dict of name -> condition (see wait_for_conditions)
+            timeout: Maximum wait time in seconds
+            
+        Returns:
+            WaitResult (truthy if one was met; .first is its name)
+        """
+        return wait_for_conditions(self.driver, conditions, "first", timeout or self.default_timeout)
 
 
 # Standalone helper functions (alternative to class-based)
@@ -222,11 +269,14 @@ def wait_for_loading_spinner(driver, spinner_locator, timeout=10):
         spinner_locator: Tuple of (By.TYPE, "value") for spinner
         timeout: Maximum wait time in seconds
     """
+    appear_timeout, poll = 2, 0.5
+    if is_virtual_time(driver):
+        appear_timeout, poll = VIRTUAL_TIME_APPEAR_TIMEOUT, VIRTUAL_TIME_POLL
     try:
         # Wait for spinner to appear
-        WebDriverWait(driver, 2).until(EC.presence_of_element_located(spinner_locator))
+        WebDriverWait(driver, appear_timeout, poll).until(EC.presence_of_element_located(spinner_locator))
         # Wait for spinner to disappear
-        WebDriverWait(driver, timeout).until(EC.invisibility_of_element_located(spinner_locator))
+        WebDriverWait(driver, timeout, poll).until(EC.invisibility_of_element_located(spinner_locator))
     except TimeoutException:
         # Spinner might not appear at all (fast loading)
         pass
@@ -245,6 +295,10 @@ def wait_for_element_stable(driver, locator, stable_time=1, timeout=10):
         True if element is stable, False otherwise
     """
     import time
+    interval = 0.1
+    if is_virtual_time(driver):
+        # Animations are off: two equal readings in a row mean stable
+        interval = stable_time = VIRTUAL_TIME_POLL
     end_time = time.time() + timeout
     last_location = None
     stable_count = 0
@@ -255,15 +309,258 @@ def wait_for_element_stable(driver, locator, stable_time=1, timeout=10):
             current_location = element.location
             
             if last_location == current_location:
-                stable_count += 0.1
+                stable_count += interval
                 if stable_count >= stable_time:
                     return True
             else:
                 stable_count = 0
             
             last_location = current_location
-            time.sleep(0.1)
+            time.sleep(interval)
         except:
             return False
     
     return False
+
+
+# Composite waits: several conditions in one poll loop, so waiting for
+# N things costs the slowest of them instead of the sum of N wait loops.
+# In-page conditions are evaluated together in one script call per tick.
+
+COMPOSITE_POLL = 0.2  # seconds between ticks (one round trip each)
+
+# arguments[0]: [[kind, using, value, arg], ...]; returns one boolean per check
+COMPOSITE_SCRIPT = """
+var checks = arguments[0], results = [];
+function locateAll(using, value) {
+  if (using === 'css selector') return Array.prototype.slice.call(document.querySelectorAll(value));
+  if (using === 'xpath') {
+    var found = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null), out = [];
+    for (var i = 0; i < found.snapshotLength; i++) out.push(found.snapshotItem(i));
+    return out;
+  }
+  return Array.prototype.filter.call(document.getElementsByTagName('a'), function (a) {
+    var text = a.textContent.trim();
+    return using === 'link text' ? text === value : text.indexOf(value) !== -1;
+  });
+}
+function visible(el) {
+  var style = window.getComputedStyle(el);
+  return style.visibility !== 'hidden' && style.display !== 'none' && el.getClientRects().length > 0;
+}
+for (var i = 0; i < checks.length; i++) {
+  var kind = checks[i][0], arg = checks[i][3], ok = false;
+  if (kind === 'url_contains') ok = location.href.indexOf(arg) !== -1;
+  else if (kind === 'script') ok = !!(new Function('return (' + arg + ');'))();
+  else {
+    var els = locateAll(checks[i][1], checks[i][2]), el = els[0];
+    if (kind === 'present') ok = !!el;
+    else if (kind === 'visible') ok = !!el && visible(el);
+    else if (kind === 'clickable') ok = !!el && visible(el) && !el.disabled;
+    else if (kind === 'invisible') ok = !el || !visible(el);
+    else if (kind === 'count') ok = els.length === arg;
+    else if (kind === 'text') ok = !!el && (el.innerText || el.textContent).indexOf(arg) !== -1;
+    else if (kind === 'attribute') ok = !!el && el.getAttribute(arg[0]) === arg[1];
+  }
+  results.push(ok);
+}
+return results;
+"""
+
+
+class PageCondition:
+    """A condition checked inside the page, batched with the others of a composite wait."""
+    
+    def __init__(self, kind, locator=None, arg=None):
+        """
+        Initialize page condition (use the factory functions below).
+        
+        Args:
+            kind: Check kind understood by COMPOSITE_SCRIPT
+            locator: Tuple of (By.TYPE, "value"), None for page-level checks
+            arg: Extra argument of the check (count, text, ...)
+        """
+        self.kind = kind
+        self.locator = locator
+        self.arg = arg
+    
+    def __repr__(self):
+        target = f"{self.locator[0]}={self.locator[1]}" if self.locator else ""
+        arg = "" if self.arg is None else repr(self.arg)
+        return f"{self.kind}({', '.join(part for part in (target, arg) if part)})"
+    
+    def check(self):
+        """
+        The check sent to COMPOSITE_SCRIPT.
+        
+        Returns:
+            List of [kind, using, value, arg]
+        """
+        using, value = compile_locator(*self.locator) if self.locator else (None, None)
+        return [self.kind, using, value, self.arg]
+
+
+def element_present(locator):
+    """Element is in the DOM."""
+    return PageCondition("present", locator)
+
+def element_visible(locator):
+    """Element is in the DOM and displayed."""
+    return PageCondition("visible", locator)
+
+def element_clickable(locator):
+    """Element is displayed and not disabled."""
+    return PageCondition("clickable", locator)
+
+def element_invisible(locator):
+    """Element is absent or hidden (spinners, overlays)."""
+    return PageCondition("invisible", locator)
+
+def element_count(locator, count):
+    """Exactly count elements match."""
+    return PageCondition("count", locator, count)
+
+def text_in_element(locator, text):
+    """First matching element's rendered text contains text."""
+    return PageCondition("text", locator, text)
+
+def element_attribute(locator, attribute, value):
+    """First matching element's DOM attribute equals value (None: attribute absent)."""
+    return PageCondition("attribute", locator, [attribute, value])
+
+def url_contains(partial_url):
+    """Current URL contains partial_url."""
+    return PageCondition("url_contains", arg=partial_url)
+
+def script_true(expression):
+    """JavaScript expression evaluates truthy in the page."""
+    return PageCondition("script", arg=expression)
+
+
+class WaitResult:
+    """Which conditions of a composite wait were met, and when; truthy if the wait succeeded."""
+    
+    def __init__(self, mode, names):
+        """
+        Initialize wait result.
+        
+        Args:
+            mode: "all", "any" or "first"
+            names: Condition names in declaration order
+        """
+        if mode not in ("all", "any", "first"):
+            raise ValueError(f"Unknown composite wait mode {mode!r}")
+        self.mode = mode
+        self.names = list(names)
+        self.met = {}  # name -> seconds from the start of the wait
+        self.first = None
+        self.elapsed = 0.0
+        self.ok = False
+    
+    @property
+    def pending(self):
+        """Names of conditions not met (yet)."""
+        return [name for name in self.names if name not in self.met]
+    
+    def update(self, outcomes, elapsed):
+        """
+        Record one tick; a condition stays met once it was seen met.
+        
+        Args:
+            outcomes: Dict of name -> Boolean for the conditions checked this tick
+            elapsed: Seconds since the wait started
+            
+        Returns:
+            True when the wait is done
+        """
+        self.elapsed = elapsed
+        for name in self.names:
+            if outcomes.get(name) and name not in self.met:
+                if self.mode == "first" and self.met:
+                    break
+                self.met[name] = elapsed
+                if self.first is None:
+                    self.first = name
+        self.ok = not self.pending if self.mode == "all" else bool(self.met)
+        return self.ok
+    
+    def __bool__(self):
+        return self.ok
+    
+    def __repr__(self):
+        met = ", ".join(f"{name}@{seconds:.2f}s" for name, seconds in self.met.items())
+        return f"<WaitResult {self.mode} ok={self.ok} met=[{met}] pending={self.pending} elapsed={self.elapsed:.2f}s>"
+    
+    def describe(self):
+        """
+        Multi-line summary for logs and timeout messages.
+        
+        Returns:
+            String
+        """
+        lines = [f"{self.mode}: {'met' if self.ok else 'timed out'} after {self.elapsed:.2f}s"]
+        lines += [f"  {name}: met at {seconds:.2f}s" for name, seconds in self.met.items()]
+        lines += [f"  {name}: not met" for name in self.pending]
+        return "\n".join(lines)
+
+
+def split_conditions(conditions):
+    """
+    Separate in-page conditions from Python callables.
+    
+    Args:
+        conditions: Dict of name -> PageCondition or callable(driver), or a list of them
+        
+    Returns:
+        Tuple of (names, {name: PageCondition}, {name: callable})
+    """
+    if not isinstance(conditions, dict):
+        conditions = {repr(condition): condition for condition in conditions}
+    if not conditions:
+        raise ValueError("A composite wait needs at least one condition")
+    page = {name: c for name, c in conditions.items() if isinstance(c, PageCondition)}
+    other = {name: c for name, c in conditions.items() if not isinstance(c, PageCondition)}
+    return list(conditions), page, other
+
+
+def wait_for_conditions(driver, conditions, mode="all", timeout=10, poll=COMPOSITE_POLL):
+    """
+    Wait on several conditions together in one poll loop.
+    
+    Each tick checks every pending PageCondition in a single script call and
+    every pending callable (e.g. an expected_conditions object) once, so the
+    total wait is the slowest condition, not the sum of separate waits.
+    
+    Args:
+        driver: Selenium WebDriver instance
+        conditions: Dict of name -> PageCondition (element_count(), text_in_element(), ...)
+                    or callable(driver) returning a truthy value
+        mode: "all", "any" or "first" (first-of: only the earliest condition counts)
+        timeout: Maximum wait time in seconds for the whole set
+        poll: Seconds between ticks
+        
+    Returns:
+        WaitResult
+    """
+    names, page, other = split_conditions(conditions)
+    result = WaitResult(mode, names)
+    if is_virtual_time(driver):
+        poll = VIRTUAL_TIME_POLL
+    start = time.monotonic()
+    while True:
+        pending = set(result.pending)
+        checks = [name for name in page if name in pending]
+        outcomes = {}
+        if checks:
+            values = driver.execute_script(COMPOSITE_SCRIPT, [page[name].check() for name in checks]) or []
+            outcomes.update(zip(checks, values))
+        for name, condition in other.items():
+            if name in pending:
+                try:
+                    outcomes[name] = bool(condition(driver))
+                except (NoSuchElementException, StaleElementReferenceException):
+                    outcomes[name] = False
+        elapsed = time.monotonic() - start
+        if result.update(outcomes, elapsed) or elapsed >= timeout:
+            return result
+        time.sleep(min(poll, max(0.0, timeout - elapsed)))